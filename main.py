@@ -31,7 +31,14 @@ def main():
     # Run the FastAPI application
     print("🚀 Starting Hephaestus with Meta-Intelligence...")
     print("🧠 Autonomous evolution system will be activated!")
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    workers = config.get("api_runtime", {}).get("workers", 1)
+    if workers > 1:
+        # Multiple workers need an import string; the shared queue and leader lock
+        # make sure only one of them runs the agent cycle
+        print(f"🌐 Starting {workers} API workers (agent cycle runs in the leader worker)")
+        uvicorn.run("hephaestus.api.rest.main:app", host="0.0.0.0", port=8000, workers=workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=8000)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
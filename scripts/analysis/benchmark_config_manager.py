@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ConfigManager: composição do Hydra e latência por consulta
+Compara a navegação nos dicts aninhados + merge a cada chamada (antes) com o
+snapshot achatado (depois), e o reload com e sem mudança nos arquivos de config
+
+Uso: python scripts/analysis/benchmark_config_manager.py [--lookups N] [--compositions N]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from hephaestus.utils.config_loader import load_config  # noqa: E402
+from hephaestus.utils.config_manager import ConfigManager, _merge_agent_config, _merge_model_config  # noqa: E402
+
+KEYS = ["monitoring.refresh_interval", "models.architect_default.primary", "parallel_reality.max_parallel_tests",
+        "logging_pipeline.jsonl.path", "missing.key.path"]
+
+
+def walk(config, key, default=None):
+    """Consulta como era feita antes: split + navegação a cada chamada."""
+    value = config
+    try:
+        for k in key.split('.'):
+            value = value[k]
+        return value
+    except (KeyError, TypeError):
+        return default
+
+
+def per_call_ns(func, lookups: int) -> float:
+    started = time.perf_counter_ns()
+    for _ in range(lookups):
+        func()
+    return (time.perf_counter_ns() - started) / lookups
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--compositions", type=int, default=10)
+    args = parser.parse_args()
+    os.chdir(PROJECT_ROOT)  # load_config lê ./config
+
+    compose = []
+    for _ in range(args.compositions):
+        started = time.perf_counter()
+        config = load_config()
+        compose.append(time.perf_counter() - started)
+    print(f"Hydra composition:            median {statistics.median(compose) * 1000:8.2f} ms")
+
+    ConfigManager.stop_watching()
+    ConfigManager.reload_config()
+    reloads = []
+    for _ in range(args.compositions):
+        started = time.perf_counter()
+        ConfigManager.update_config("benchmark.marker", time.time())  # força a troca do snapshot
+        ConfigManager.reload_config()
+        reloads.append(time.perf_counter() - started)
+    print(f"reload_config (files intact): median {statistics.median(reloads) * 1000:8.2f} ms "
+          f"(Hydra runs: {ConfigManager.get_snapshot_stats()['hydra_compositions']})")
+
+    print(f"\n{'lookup':<56} {'before ns':>10} {'after ns':>10}")
+    for key in KEYS:
+        before = per_call_ns(lambda: walk(config, key), args.lookups)
+        after = per_call_ns(lambda: ConfigManager.get_config_value(key), args.lookups)
+        label = f"get_config_value({key!r})"
+        print(f"{label:<56} {before:10.0f} {after:10.0f}")
+    before = per_call_ns(lambda: _merge_agent_config(config, "ArchitectAgent"), args.lookups)
+    after = per_call_ns(lambda: ConfigManager.get_agent_config("ArchitectAgent"), args.lookups)
+    print(f"{'get_agent_config(ArchitectAgent)':<56} {before:10.0f} {after:10.0f}")
+    before = per_call_ns(lambda: _merge_model_config(config, "architect_default"), args.lookups)
+    after = per_call_ns(lambda: ConfigManager.get_model_config("architect_default"), args.lookups)
+    print(f"{'get_model_config(architect_default)':<56} {before:10.0f} {after:10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark do parse_json_response em respostas de 10 KB a 1 MB
+Mede o caminho estrito (JSON válido em markdown) e o reparo em passada única
+(vírgulas sobrando, aspas simples, chaves sem aspas, resposta truncada) e mostra
+o custo por KB, que deve ficar estável com o tamanho (tempo linear)
+
+Uso: python scripts/analysis/benchmark_json_parser.py [--runs N]
+"""
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from hephaestus.utils.json_parser import parse_json_response  # noqa: E402
+
+SIZES = [10 * 1024, 100 * 1024, 1024 * 1024]
+
+
+def valid_response(size: int) -> str:
+    item = {"file_path": "src/module.py", "operation": "REPLACE", "content": "def f():\n    return \"ok\"\n"}
+    unit = json.dumps(item) + ", "
+    items = ", ".join([json.dumps(item)] * max(1, size // len(unit)))
+    return f"Here is the patch:\n```json\n{{\"patches\": [{items}]}}\n```\nLet me know."
+
+
+def defective_response(size: int) -> str:
+    unit = "{file_path: 'src/module.py', operation: 'REPLACE', content: 'it\\'s \"quoted\"', done: True,}, "
+    return "```json\n{patches: [" + unit * max(1, size // len(unit)) + "\n```"
+
+
+def measure(text: str, runs: int, logger: logging.Logger) -> float:
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        value, error = parse_json_response(text, logger)
+        timings.append(time.perf_counter() - started)
+        assert error is None, error
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    logger = logging.getLogger("benchmark_json_parser")
+    logger.disabled = True
+    for name, build in (("valid (strict path)", valid_response), ("defective (repair pass)", defective_response)):
+        print(name)
+        for size in SIZES:
+            text = build(size)
+            seconds = measure(text, args.runs, logger)
+            print(f"  {len(text) / 1024:8.0f} KB   {seconds * 1000:9.2f} ms   {seconds * 1e6 / (len(text) / 1024):8.2f} us/KB")
+
+
+if __name__ == "__main__":
+    main()
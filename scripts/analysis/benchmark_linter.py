@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark do LinterAgent: execução completa (comportamento anterior) vs incremental
+Compara tempo de parede e bytes copiados para a alteração de um único arquivo
+
+Uso: python scripts/analysis/benchmark_linter.py [arquivo_alterado] [--runs N]
+"""
+
+import argparse
+import logging
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from hephaestus.agents.linter_agent import LinterAgent  # noqa: E402
+
+
+def run_full_copy() -> dict:
+    """O fluxo anterior: copia o projeto inteiro (sem .git) e roda o ruff na árvore toda."""
+    copied = {"bytes": 0}
+
+    def counting_copy(src, dst, *, follow_symlinks=True):
+        copied["bytes"] += Path(src).stat().st_size
+        return shutil.copy2(src, dst, follow_symlinks=follow_symlinks)
+
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="hephaestus_linter_bench_") as sandbox_dir:
+        shutil.copytree(PROJECT_ROOT, sandbox_dir, dirs_exist_ok=True,
+                        ignore=shutil.ignore_patterns('.git'), copy_function=counting_copy)
+        subprocess.run(['ruff', 'check', '--fix', '--exit-non-zero-on-fix', '--no-cache', '.'],
+                       capture_output=True, text=True, cwd=sandbox_dir)
+    return {"seconds": time.perf_counter() - started, "bytes_copied": copied["bytes"]}
+
+
+def run_incremental(changed_file: str, cache_dir: Path, warm: bool) -> dict:
+    # Execuções frias usam um arquivo de cache novo (get_lint_cache reaproveita instâncias pelo caminho)
+    cache_path = cache_dir / ("lint_cache.json" if warm else f"cold_{time.time_ns()}.json")
+    agent = LinterAgent(logging.getLogger("benchmark_linter"), project_root=str(PROJECT_ROOT),
+                        cache_path=str(cache_path))
+    started = time.perf_counter()
+    agent.run_linter_and_propose_objective(changed_files=[changed_file])
+    return {"seconds": time.perf_counter() - started, "bytes_copied": agent.last_run_stats["bytes_copied"]}
+
+
+def summarize(name: str, results: list) -> str:
+    seconds = [r["seconds"] for r in results]
+    return (f"{name:<22} median {statistics.median(seconds) * 1000:9.1f} ms   "
+            f"min {min(seconds) * 1000:9.1f} ms   bytes copied {results[0]['bytes_copied']:>12,}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("changed_file", nargs="?", default="src/hephaestus/agents/linter_agent.py")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    if shutil.which("ruff") is None:
+        sys.exit("ruff is not installed (poetry install --with dev)")
+
+    with tempfile.TemporaryDirectory(prefix="hephaestus_lint_cache_") as cache_dir:
+        cache_dir = Path(cache_dir)
+        full = [run_full_copy() for _ in range(args.runs)]
+        cold = [run_incremental(args.changed_file, cache_dir, warm=False) for _ in range(args.runs)]
+        run_incremental(args.changed_file, cache_dir, warm=True)
+        warm = [run_incremental(args.changed_file, cache_dir, warm=True) for _ in range(args.runs)]
+
+    print(f"One-file change: {args.changed_file} ({args.runs} runs each)")
+    print(summarize("full copy + ruff .", full))
+    print(summarize("incremental (cold)", cold))
+    print(summarize("incremental (cached)", warm))
+    speedup = statistics.median(r["seconds"] for r in full) / statistics.median(r["seconds"] for r in cold)
+    print(f"Cold incremental run is {speedup:.1f}x faster and copies "
+          f"{full[0]['bytes_copied'] / max(cold[0]['bytes_copied'], 1):.0f}x fewer bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark do ParallelRealityTester: corrida de estratégias em processos isolados
+Reporta, por sessão, o tempo até o vencedor e os CPU-segundos gastos com perdedores
+
+Uso: python scripts/analysis/benchmark_parallel_reality.py [--sessions N] [--slow-seconds S]
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(PROJECT_ROOT / "src"))
+
+from hephaestus.intelligence.parallel_reality_tester import ParallelRealityTester, StrategyType  # noqa: E402
+
+
+def make_project(root: Path, slow_seconds: float) -> dict:
+    """Projeto mínimo e um patch por estratégia: um rápido, um lento (gasta CPU) e um com sintaxe inválida."""
+    (root / "tests").mkdir(parents=True)
+    (root / "mod.py").write_text("def value():\n    return 1\n", encoding="utf-8")
+    (root / "tests" / "test_mod.py").write_text(
+        "import mod\n\n\ndef test_value():\n    assert mod.value() == 1\n", encoding="utf-8")
+    busy_test = [
+        "", "", "def test_busy():",
+        "    import time",
+        f"    deadline = time.time() + {slow_seconds}",
+        "    while time.time() < deadline:",
+        "        sum(range(10000))",
+    ]
+    return {
+        StrategyType.AGGRESSIVE.value: [
+            {"file_path": "mod.py", "operation": "REPLACE", "block_to_replace": "return 1", "content": "    return 1"}],
+        StrategyType.EXPERIMENTAL.value: [
+            {"file_path": "tests/test_mod.py", "operation": "INSERT", "content": "\n".join(busy_test)}],
+        StrategyType.OPTIMIZED.value: [
+            {"file_path": "mod.py", "operation": "REPLACE", "block_to_replace": "return 1", "content": "    return (1"}],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--slow-seconds", type=float, default=20.0,
+                        help="CPU-bound duration of the losing strategy's extra test")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    with tempfile.TemporaryDirectory(prefix="hephaestus_reality_bench_") as tmp:
+        tmp = Path(tmp)
+        patches = make_project(tmp / "project", args.slow_seconds)
+        tester = ParallelRealityTester(
+            {"parallel_reality": {"max_parallel_tests": 3, "data_dir": str(tmp / "parallel_tests")}},
+            logging.getLogger("benchmark_parallel_reality")
+        )
+        context = {
+            "project_root": str(tmp / "project"),
+            "patches_by_strategy": patches,
+            "test_command": [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            "validation_timeout": args.slow_seconds * 4,
+        }
+        races = []
+        try:
+            for index in range(args.sessions):
+                winner, session = asyncio.run(tester.test_multiple_realities("Tweak value", context))
+                race = session.comparison_matrix["race"]
+                races.append(race)
+                print(f"session {index + 1}: winner {winner.strategy_name if winner else None:<20} "
+                      f"time-to-winner {race['time_to_winner'] or 0:7.2f} s   "
+                      f"session {race['session_seconds']:7.2f} s   "
+                      f"wasted CPU {race['wasted_cpu_seconds']:7.2f} s   "
+                      f"killed {race['terminated_early']}   concurrency {race['concurrency']}")
+        finally:
+            tester.shutdown()
+
+    print(f"Median time-to-winner {statistics.median(r['time_to_winner'] or 0 for r in races):.2f} s, "
+          f"median wasted CPU {statistics.median(r['wasted_cpu_seconds'] for r in races):.2f} s "
+          f"(a losing strategy left to finish would burn ~{args.slow_seconds:.0f} CPU-seconds)")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,12 +7,17 @@ Um agente autônomo focado em aprimoramento recursivo de suas próprias capacida
 __version__ = "0.1.0"
 __author__ = "MrDeox"
 
-from .core.agent import HephaestusAgent
-from .core.brain import generate_next_objective
-from .core.memory import Memory
+from .utils.lazy_import import lazy_module_getattr
+
+# Re-exports carregados sob demanda: ``import hephaestus`` não importa o agente
+__getattr__ = lazy_module_getattr(__name__, {
+    "HephaestusAgent": ".core.agent",
+    "generate_next_objective": ".core.brain",
+    "Memory": ".core.memory",
+})
 
 __all__ = [
     "HephaestusAgent",
     "generate_next_objective", 
     "Memory",
-]
\ No newline at end of file
+]
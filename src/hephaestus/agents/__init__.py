@@ -1,14 +1,20 @@
 """Specialized agents for different tasks."""
 
-from .base import BaseAgent, AgentInterface, AgentRegistry
-from .architect_enhanced import ArchitectAgentEnhanced as ArchitectAgent
-from .maestro_enhanced import MaestroAgentEnhanced as MaestroAgent
-from .bug_hunter_enhanced import BugHunterAgentEnhanced as BugHunterAgent
-from .organizer_enhanced import OrganizerAgentEnhanced as OrganizerAgent
-from .performance_analyzer import PerformanceAnalysisAgent
-from .linter_agent import LinterAgent
-from .log_analysis_agent import LogAnalysisAgent
-from .self_reflection_agent import SelfReflectionAgent
+from hephaestus.utils.lazy_import import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    "BaseAgent": ".base",
+    "AgentInterface": ".base",
+    "AgentRegistry": ".base",
+    "ArchitectAgent": ".architect_enhanced:ArchitectAgentEnhanced",
+    "MaestroAgent": ".maestro_enhanced:MaestroAgentEnhanced",
+    "BugHunterAgent": ".bug_hunter_enhanced:BugHunterAgentEnhanced",
+    "OrganizerAgent": ".organizer_enhanced:OrganizerAgentEnhanced",
+    "PerformanceAnalysisAgent": ".performance_analyzer",
+    "LinterAgent": ".linter_agent",
+    "LogAnalysisAgent": ".log_analysis_agent",
+    "SelfReflectionAgent": ".self_reflection_agent",
+})
 
 __all__ = [
     "BaseAgent",
@@ -22,4 +28,4 @@ __all__ = [
     "LinterAgent", 
     "LogAnalysisAgent",
     "SelfReflectionAgent",
-]
\ No newline at end of file
+]
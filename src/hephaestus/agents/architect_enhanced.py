@@ -97,8 +97,12 @@ class ArchitectAgentEnhanced(EnhancedBaseAgent):
         # Build prompt
         prompt = self._build_plan_prompt(objective, manifest, file_content_context)
         
-        # Make LLM call with automatic retry and metrics
-        plan_json, error = await self.llm_call_json(prompt)
+        # Stream the plan so a malformed patch list aborts the call early
+        plan_json, error = await self.llm_call_json(
+            prompt,
+            stream=self.get_config_value('streaming', True),
+            field_validators={'patches': self._validate_patches_field}
+        )
         
         if error:
             return None, error
@@ -237,6 +241,10 @@ Respond with ONLY the JSON, no additional text.
         
         return None
     
+    def _validate_patches_field(self, patches: Any) -> Optional[str]:
+        """Streaming validator for the 'patches' field of a plan."""
+        return self._validate_plan_structure({'patches': patches})
+    
     async def _load_project_manifest(self) -> str:
         """
         Load the project manifest.
@@ -8,6 +8,7 @@ import threading
 from typing import Dict, Any, List
 from datetime import datetime
 from hephaestus.agents.base import BaseAgent, AgentCapability
+from hephaestus.utils.system_metrics import get_system_metrics_sampler
 
 class CycleMonitorAgent(BaseAgent):
     """Agente para monitorar ciclos de execução do sistema."""
@@ -82,19 +83,11 @@ class CycleMonitorAgent(BaseAgent):
     
     def _get_system_load(self) -> float:
         """Obter carga do sistema."""
-        try:
-            import psutil
-            return psutil.cpu_percent(interval=1)
-        except ImportError:
-            return 0.0
+        return get_system_metrics_sampler().latest().cpu_percent
     
     def _get_memory_usage(self) -> float:
         """Obter uso de memória."""
-        try:
-            import psutil
-            return psutil.virtual_memory().percent
-        except ImportError:
-            return 0.0
+        return get_system_metrics_sampler().latest().memory_percent
     
     def _analyze_cycle_performance(self, metrics: Dict[str, Any]):
         """Analisar performance dos ciclos."""
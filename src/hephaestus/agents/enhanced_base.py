@@ -122,6 +122,7 @@ class EnhancedBaseAgent(EnhancedAgentMixin, BaseAgent, ABC):
             'temperature': config.get('temperature', 0.4),
             'max_retries': config.get('max_retries', 3),
             'fallback_models': config.get('fallback_models', []),
+            'stream': config.get('streaming', False),
             **kwargs
         }
         
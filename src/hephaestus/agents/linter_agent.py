@@ -1,68 +1,155 @@
+import difflib
+import hashlib
+import json
 import logging
+import re
 import subprocess
 import tempfile
 import shutil
+import threading
+import time
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set
+
+# Ruff configuration files copied into the overlay so the rules match the project's
+RUFF_CONFIG_FILES = ("pyproject.toml", "ruff.toml", ".ruff.toml")
+
+_IMPORT_LINE = re.compile(r"^\s*(?:from\s+([\w.]+)\s+import|import\s+([\w.]+))", re.MULTILINE)
+
+
+class LintCache:
+    """
+    Lint results keyed by the file's content hash (plus the ruff version/config).
+
+    A file whose content was already linted is never handed to ruff again; its
+    cached fix diff (or the absence of one) is reused.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path) if path else None
+        self._results: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        if self.path and self.path.exists():
+            try:
+                self._results = json.loads(self.path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                self._results = {}
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            return self._results.get(key)
+
+    def put(self, key: str, diff: str):
+        with self._lock:
+            self._results[key] = diff
+            self._dirty = True
+
+    def save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(self._results)
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        tmp_path.replace(self.path)
+
+    def __len__(self):
+        return len(self._results)
+
+
+_shared_caches: Dict[str, LintCache] = {}
+_shared_caches_lock = threading.Lock()
+
+
+def get_lint_cache(path: str) -> LintCache:
+    """Cache shared by every LinterAgent of the process (one per cache file)."""
+    with _shared_caches_lock:
+        if path not in _shared_caches:
+            _shared_caches[path] = LintCache(Path(path))
+        return _shared_caches[path]
 
-import git
 
 class LinterAgent:
     """
     An agent that uses a static linter (ruff) to find, fix, and safely propose
     code quality improvements.
+
+    Runs are incremental: only the files changed by the current patch set (by
+    default, what git reports as changed since the previous run) are linted, files whose
+    content was already linted come from the ``LintCache``, and ruff applies its
+    fixes on an overlay holding just those files instead of a copy of the project.
     """
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, project_root: str = ".",
+                 cache_path: str = "data/cache/lint_cache.json", include_importers: bool = False):
         self.logger = logger
+        self.project_root = Path(project_root)
+        self.cache = get_lint_cache(cache_path)
+        # Importers are only needed by rules that look across modules
+        self.include_importers = include_importers
+        self.last_run_stats: Dict[str, float] = {}
+        self._import_graph: Dict[str, tuple] = {}
 
-    def run_linter_and_propose_objective(self) -> Optional[str]:
+    def run_linter_and_propose_objective(self, changed_files: Optional[Iterable[str]] = None) -> Optional[str]:
         """
-        Runs the ruff linter in a sandbox, generates a diff patch, and proposes
-        an objective if changes were made.
+        Runs the ruff linter on an overlay of the changed files, generates a
+        diff patch, and proposes an objective if changes were made.
+
+        Args:
+            changed_files: Paths (relative to the project root) modified by the
+                current patch set. Defaults to the git working-tree changes plus
+                the files committed since the previous lint run.
 
         Returns:
             A string containing an objective to apply the linting fixes, or None if
             no changes were made.
         """
         self.logger.info("🧹 Linter Agent: Starting secure linting process...")
+        started = time.perf_counter()
+        self.last_run_stats = {"files_considered": 0, "files_linted": 0, "cache_hits": 0, "bytes_copied": 0}
 
-        # Create a temporary sandbox directory
-        with tempfile.TemporaryDirectory(prefix="hephaestus_linter_") as sandbox_dir:
-            sandbox_path = Path(sandbox_dir)
-            project_root = Path(".")
-            
-            try:
-                # Copy project to sandbox, ignoring git directory
-                shutil.copytree(project_root, sandbox_path, dirs_exist_ok=True, ignore=shutil.ignore_patterns('.git'))
-                self.logger.info(f"Linter Agent: Project copied to sandbox: {sandbox_path}")
-
-                # Run ruff with --fix in the sandbox
-                command = ['ruff', 'check', '--fix', '--exit-non-zero-on-fix', '.']
-                result = subprocess.run(command, capture_output=True, text=True, cwd=sandbox_path)
-
-                if result.returncode != 1:
-                    self.logger.info("Linter Agent: No auto-fixable issues found by ruff.")
-                    return None
-
-                # Generate a diff patch
-                repo = git.Repo(sandbox_path)
-                repo.git.add(A=True) # Stage all changes made by ruff
-                
-                # Check if there are actual changes to diff
-                if not repo.is_dirty():
-                    self.logger.info("Linter Agent: Ruff indicated fixes, but no changes were detected by git.")
-                    return None
-
-                diff = repo.git.diff(repo.head.commit)
-
-                if not diff:
-                    self.logger.info("Linter Agent: No diff generated, no changes to propose.")
-                    return None
-
-                self.logger.info("Linter Agent: `ruff` found and fixed issues. Generating patch...")
-                
-                # Create a structured objective with the patch
-                objective = f"""
+        try:
+            files = self._python_files(changed_files if changed_files is not None else self._git_changed_files())
+            if self.include_importers:
+                files = sorted(set(files) | self._importers_of(files))
+            self.last_run_stats["files_considered"] = len(files)
+            if not files:
+                self.logger.info("Linter Agent: No changed Python files to lint.")
+                return None
+
+            config_key = self._config_key()
+            contents = {path: (self.project_root / path).read_bytes() for path in files}
+            keys = {path: f"{config_key}:{hashlib.blake2b(data, digest_size=16).hexdigest()}"
+                    for path, data in contents.items()}
+
+            diffs: Dict[str, str] = {}
+            to_lint = []
+            for path in files:
+                cached = self.cache.get(keys[path])
+                if cached is None:
+                    to_lint.append(path)
+                else:
+                    self.last_run_stats["cache_hits"] += 1
+                    diffs[path] = cached
+
+            if to_lint:
+                for path, diff in self._lint_on_overlay(to_lint, contents).items():
+                    diffs[path] = diff
+                    self.cache.put(keys[path], diff)
+
+            diff = "".join(diffs[path] for path in files if diffs.get(path))
+            if not diff:
+                self.logger.info("Linter Agent: No auto-fixable issues found by ruff.")
+                return None
+
+            self.logger.info("Linter Agent: `ruff` found and fixed issues. Generating patch...")
+
+            # Create a structured objective with the patch
+            objective = f"""
 [CHORE] Apply and validate automated linting fixes.
 
 The LinterAgent (using ruff) has automatically fixed style and quality issues. Please apply and validate the following patch.
@@ -71,11 +158,122 @@ The LinterAgent (using ruff) has automatically fixed style and quality issues. P
 {diff}
 ```
 """
-                return objective.strip()
+            return objective.strip()
 
-            except FileNotFoundError:
-                self.logger.error("Linter Agent: `ruff` or `git` command not found. Please ensure they are installed and in the PATH.")
-                return None
-            except Exception as e:
-                self.logger.error(f"An unexpected error occurred during linting: {e}", exc_info=True)
-                return None 
\ No newline at end of file
+        except FileNotFoundError:
+            self.logger.error("Linter Agent: `ruff` or `git` command not found. Please ensure they are installed and in the PATH.")
+            return None
+        except Exception as e:
+            self.logger.error(f"An unexpected error occurred during linting: {e}", exc_info=True)
+            return None
+        finally:
+            self.cache.save()
+            self.last_run_stats["duration_seconds"] = round(time.perf_counter() - started, 4)
+            self.logger.debug(f"Linter Agent run stats: {self.last_run_stats}")
+
+    def _lint_on_overlay(self, files: List[str], contents: Dict[str, bytes]) -> Dict[str, str]:
+        """Copies only ``files`` (and the ruff config) to an overlay, fixes them in place and diffs."""
+        with tempfile.TemporaryDirectory(prefix="hephaestus_linter_") as overlay_dir:
+            overlay = Path(overlay_dir)
+            for name in RUFF_CONFIG_FILES:
+                source = self.project_root / name
+                if source.is_file():
+                    shutil.copyfile(source, overlay / name)
+                    self.last_run_stats["bytes_copied"] += source.stat().st_size
+            for path in files:
+                target = overlay / path
+                target.parent.mkdir(parents=True, exist_ok=True)
+                target.write_bytes(contents[path])
+                self.last_run_stats["bytes_copied"] += len(contents[path])
+            self.logger.info(f"Linter Agent: {len(files)} changed file(s) copied to overlay: {overlay}")
+
+            # Run ruff with --fix on the overlay files only
+            command = ['ruff', 'check', '--fix', '--exit-non-zero-on-fix', '--no-cache', *files]
+            result = subprocess.run(command, capture_output=True, text=True, cwd=overlay)
+            self.last_run_stats["files_linted"] = len(files)
+            if result.returncode not in (0, 1):
+                raise RuntimeError(f"ruff failed (exit {result.returncode}): {result.stderr.strip()}")
+
+            diffs = {}
+            for path in files:
+                fixed = (overlay / path).read_bytes()
+                diffs[path] = "" if fixed == contents[path] else self._unified_diff(path, contents[path], fixed)
+            return diffs
+
+    @staticmethod
+    def _unified_diff(path: str, original: bytes, fixed: bytes) -> str:
+        lines = difflib.unified_diff(
+            original.decode("utf-8", errors="replace").splitlines(keepends=True),
+            fixed.decode("utf-8", errors="replace").splitlines(keepends=True),
+            fromfile=f"a/{path}", tofile=f"b/{path}"
+        )
+        return f"diff --git a/{path} b/{path}\n" + "".join(lines)
+
+    def _git(self, *args: str) -> List[str]:
+        return subprocess.run(['git', *args], capture_output=True, text=True,
+                              cwd=self.project_root, check=True).stdout.splitlines()
+
+    def _git_changed_files(self) -> List[str]:
+        """
+        Working-tree changes (staged, unstaged and untracked) plus the files of
+        the commits made since the previous lint run (cycles auto-commit their patches).
+        """
+        changed = self._git('diff', '--name-only', 'HEAD') + self._git('ls-files', '--others', '--exclude-standard')
+        head_key = f"__head__:{self.project_root.resolve()}"
+        head = self._git('rev-parse', 'HEAD')[0]
+        last_head = self.cache.get(head_key)
+        if last_head and last_head != head:
+            try:
+                changed += self._git('diff', '--name-only', last_head, head)
+            except subprocess.CalledProcessError:
+                pass  # History rewritten: the marker no longer exists
+        self.cache.put(head_key, head)
+        return changed
+
+    def _python_files(self, paths: Iterable[str]) -> List[str]:
+        files = set()
+        for path in paths:
+            relative = Path(path)
+            if relative.is_absolute():
+                relative = relative.resolve().relative_to(self.project_root.resolve())
+            if relative.suffix == ".py" and (self.project_root / relative).is_file():
+                files.add(relative.as_posix())
+        return sorted(files)
+
+    def _config_key(self) -> str:
+        """Ruff version + configuration: a change to either invalidates the cache."""
+        digest = hashlib.blake2b(digest_size=8)
+        version = subprocess.run(['ruff', '--version'], capture_output=True, text=True, check=True).stdout
+        digest.update(version.encode())
+        for name in RUFF_CONFIG_FILES:
+            source = self.project_root / name
+            if source.is_file():
+                digest.update(source.read_bytes())
+        return digest.hexdigest()
+
+    def _importers_of(self, files: List[str]) -> Set[str]:
+        """Python files of the project that import any of ``files`` (import graph cached by mtime)."""
+        modules = set()
+        for path in files:
+            parts = list(Path(path).with_suffix("").parts)
+            if parts and parts[0] == "src":
+                parts = parts[1:]
+            if parts and parts[-1] == "__init__":
+                parts = parts[:-1]
+            if parts:
+                modules.add(".".join(parts))
+
+        importers = set()
+        for source in self.project_root.rglob("*.py"):
+            relative = source.relative_to(self.project_root).as_posix()
+            if relative.startswith((".git/", ".venv/")) or "/__pycache__/" in relative:
+                continue
+            stat = source.stat()
+            cached = self._import_graph.get(relative)
+            if cached is None or cached[0] != (stat.st_mtime_ns, stat.st_size):
+                text = source.read_text(encoding="utf-8", errors="replace")
+                imports = frozenset(a or b for a, b in _IMPORT_LINE.findall(text))
+                cached = self._import_graph[relative] = ((stat.st_mtime_ns, stat.st_size), imports)
+            if any(name == module or name.startswith(module + ".") for name in cached[1] for module in modules):
+                importers.add(relative)
+        return importers - set(files)
@@ -4,38 +4,47 @@ import os
 
 from hephaestus.utils.llm_client import call_llm_api
 from hephaestus.utils.json_parser import parse_json_response
+from hephaestus.utils.log_index import LogIndex, get_log_index
 
 class LogAnalysisAgent:
     """
     An agent specialized in analyzing log files to identify issues and suggest improvements.
     """
-    def __init__(self, model_config: Dict[str, str], logger: logging.Logger):
+    def __init__(self, model_config: Dict[str, str], logger: logging.Logger,
+                 log_index: Optional[LogIndex] = None):
         self.model_config = model_config
         self.logger = logger
+        self.log_index = log_index or get_log_index()
 
     def analyze_logs(self, log_file_path: str, lines_to_analyze: int = 200) -> Optional[Dict[str, Any]]:
         """
-        Reads the tail of a log file and uses an LLM to analyze its content.
+        Analyzes the log entries written since the previous run using an LLM.
+
+        The file is tailed incrementally through the shared log index, so only
+        the delta since the last analysis is read (at most the most recent
+        ``lines_to_analyze`` entries).
 
         Args:
             log_file_path: The path to the log file.
-            lines_to_analyze: The number of recent lines to analyze.
+            lines_to_analyze: The maximum number of recent entries to analyze.
 
         Returns:
             A dictionary with the analysis results or None if an error occurs.
         """
-        self.logger.info(f"Analyzing last {lines_to_analyze} lines of '{log_file_path}'...")
+        self.logger.info(f"Analyzing new entries (up to {lines_to_analyze}) of '{log_file_path}'...")
         
         try:
-            with open(log_file_path, 'r', encoding='utf-8') as f:
-                log_lines = f.readlines()
-            
-            recent_lines = log_lines[-lines_to_analyze:]
-            if not recent_lines:
-                self.logger.warning(f"Log file '{log_file_path}' is empty or has fewer than {lines_to_analyze} lines. Nothing to analyze.")
-                return {"summary": "Log file is empty.", "issues": [], "suggested_objective": None}
+            if not os.path.exists(log_file_path):
+                raise FileNotFoundError(log_file_path)
+            self.log_index.add_source(log_file_path)
+            recent_entries = self.log_index.delta_since(
+                f"log_analysis:{log_file_path}", source=log_file_path, limit=lines_to_analyze
+            )
+            if not recent_entries:
+                self.logger.info(f"No new entries in '{log_file_path}' since the last analysis. Nothing to analyze.")
+                return {"summary": "No new log entries since the last analysis.", "issues": [], "suggested_objective": None}
             
-            log_content = "".join(recent_lines)
+            log_content = "\n".join(entry.to_line() for entry in recent_entries)
 
             prompt = self._build_analysis_prompt(log_content)
 
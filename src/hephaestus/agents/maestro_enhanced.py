@@ -102,8 +102,15 @@ class MaestroAgentEnhanced(EnhancedBaseAgent):
         # Build strategy selection prompt
         prompt = self._build_strategy_prompt(objective)
         
-        # Make LLM call
-        strategy_json, error = await self.llm_call_json(prompt)
+        # Make LLM call, validating fields as they stream in
+        strategy_json, error = await self.llm_call_json(
+            prompt,
+            stream=self.get_config_value('streaming', True),
+            field_validators={
+                'name': lambda name: None if isinstance(name, str) and name else "must be a non-empty string",
+                'confidence': lambda confidence: None if isinstance(confidence, (int, float)) and 0 <= confidence <= 1 else "must be a number between 0 and 1"
+            }
+        )
         
         if error:
             self.logger.error(f"Strategy selection failed: {error}")
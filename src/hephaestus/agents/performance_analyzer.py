@@ -1,9 +1,13 @@
 
-import pandas as pd
+from hephaestus.utils.evolution_rollups import get_evolution_rollups
 
 class PerformanceAnalysisAgent:
     """
     An agent dedicated to analyzing the performance of Hephaestus.
+
+    The numbers come from the incremental rollups of the evolution log
+    (``utils.evolution_rollups``), updated as each cycle is logged, so an
+    analysis costs O(strategies) instead of re-reading the whole history.
     """
 
     def __init__(self, evolution_log_path="logs/evolution_log.csv"):
@@ -20,51 +24,41 @@ class PerformanceAnalysisAgent:
 
         :return: A string containing the performance summary.
         """
-        try:
-            log_df = pd.read_csv(self.evolution_log_path)
-            if log_df.empty:
-                return "Evolution log is empty. No performance analysis available."
-        except FileNotFoundError:
-            return "Evolution log not found. No performance analysis available."
-        except pd.errors.EmptyDataError:
+        rollups = get_evolution_rollups(self.evolution_log_path)
+        summary = rollups.summary()
+        total = summary["total"]
+        if total["cycles"] == 0:
+            if not rollups.log_path.exists():
+                return "Evolution log not found. No performance analysis available."
             return "Evolution log is empty. No performance analysis available."
 
-        # Ensure 'status' column is boolean and present
-        if 'status' not in log_df.columns:
-            return "Evolution log is missing the 'status' column. No performance analysis available."
-        log_df['status'] = log_df['status'].eq(True) if log_df['status'].dtype == bool else log_df['status'].astype(str).str.lower().eq('sucesso')
-
-        total_cycles = len(log_df)
-        successful_cycles = log_df['status'].sum()
-        failed_cycles = total_cycles - successful_cycles
-        success_rate = (successful_cycles / total_cycles) * 100 if total_cycles > 0 else 0
-
         # Base summary
         summary_str = f"""Performance Summary:
-- Total Cycles: {total_cycles}
-- Successful Cycles: {successful_cycles}
-- Failed Cycles: {failed_cycles}
-- Success Rate: {success_rate:.2f}%"""
+- Total Cycles: {total['cycles']}
+- Successful Cycles: {total['successes']}
+- Failed Cycles: {total['failures']}
+- Success Rate: {total['success_rate']:.2f}%"""
 
-        # Average duration
-        if 'duration_seconds' in log_df.columns:
-            avg_duration = log_df['duration_seconds'].mean()
-            summary_str += f"\n- Average Cycle Duration: {avg_duration:.2f} seconds"
+        # Duration (percentiles are approximate, from the mergeable sketches)
+        if total["avg_duration"] is not None:
+            summary_str += f"\n- Average Cycle Duration: {total['avg_duration']:.2f} seconds"
+            summary_str += f" (p50: {total['p50_duration']:.2f}s, p90: {total['p90_duration']:.2f}s)"
         else:
             summary_str += f"\n- Average Cycle Duration: N/A"
 
         # Analysis by strategy
-        if 'estrategia_usada' in log_df.columns:
-            strategy_performance = log_df.groupby('estrategia_usada')['status'].agg(['sum', 'count'])
-            strategy_performance['failure_count'] = strategy_performance['count'] - strategy_performance['sum']
-            strategy_performance['success_rate'] = (strategy_performance['sum'] / strategy_performance['count']) * 100
-            strategy_performance = strategy_performance.sort_values(by='failure_count', ascending=False)
-
-            summary_str += "\n\nPerformance by Strategy (sorted by failures):\n"
-            for index, row in strategy_performance.iterrows():
-                summary_str += f"- Strategy '{index}': Success Rate: {row['success_rate']:.2f}% (Failures: {int(row['failure_count'])}/{int(row['count'])})\n"
-        else:
-            summary_str += "\n\nPerformance by Strategy: N/A\n"
+        strategies = sorted(summary["strategies"].items(), key=lambda item: item[1]["failures"], reverse=True)
+        summary_str += "\n\nPerformance by Strategy (sorted by failures):\n"
+        for name, row in strategies:
+            summary_str += f"- Strategy '{name}': Success Rate: {row['success_rate']:.2f}% (Failures: {row['failures']}/{row['cycles']})\n"
 
+        # Analysis by objective type ([BUGFIX], [CHORE], ...)
+        objective_types = sorted(summary["objective_types"].items(), key=lambda item: item[1]["cycles"], reverse=True)
+        summary_str += "\nPerformance by Objective Type:\n"
+        for name, row in objective_types:
+            summary_str += f"- {name}: Success Rate: {row['success_rate']:.2f}% ({row['successes']}/{row['cycles']})"
+            if row["p50_duration"] is not None:
+                summary_str += f", p50 duration: {row['p50_duration']:.2f}s"
+            summary_str += "\n"
 
         return summary_str
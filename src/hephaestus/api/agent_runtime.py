@@ -0,0 +1,264 @@
+"""
+Agent Runtime - Supervised cycle runner and read-only state snapshots for the API
+
+The REST server used to start a thread that spun up its own event loop for
+``CycleRunner.run`` while endpoints read ``agent.state`` concurrently. Here the
+cycle runner is a task on the server's own loop (its blocking stages run in the
+default executor), supervised with exponential back-off restarts, and every
+read goes through ``snapshot()``: an immutable copy captured whenever the cycle
+moves between stages, i.e. at points where the agent state is consistent.
+
+For multi-worker deployments (``uvicorn --workers N``) only one process holds
+the ``RuntimeLeaderLock`` and runs the agent; it writes each snapshot to a
+shared file that the other workers serve through ``SharedSnapshotReader``.
+Objectives are exchanged through the leased queue (``objective_leases``).
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from hephaestus.core.cycle_runner import CycleRunner
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def idle_snapshot(worker_active: bool = False) -> Dict[str, Any]:
+    """The snapshot served before the cycle runner publishes anything."""
+    return {
+        "worker_active": worker_active,
+        "phase": "not_started",
+        "cycle_count": 0,
+        "restarts": 0,
+        "current_cycle": {},
+        "queue_size": 0,
+        "version": 0,
+        "updated_at": None,
+        "pid": os.getpid(),
+    }
+
+
+class AgentRuntime:
+    """Runs the agent's cycle loop as a supervised task on the running event loop."""
+
+    def __init__(self, agent, queue_manager, logger: Optional[logging.Logger] = None,
+                 snapshot_path: Optional[Path] = None, restart_backoff: float = 1.0,
+                 max_restart_backoff: float = 60.0):
+        self.agent = agent
+        self.queue_manager = queue_manager
+        self.logger = logger or logging.getLogger("hephaestus.AgentRuntime")
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self.restart_backoff = restart_backoff
+        self.max_restart_backoff = max_restart_backoff
+
+        self.restarts = 0
+        self.runner: Optional[CycleRunner] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._version = 0
+        self._snapshot: Dict[str, Any] = idle_snapshot()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Starts the supervised cycle loop on the current event loop."""
+        if self.is_running:
+            return
+        self._stopping = False
+        self._task = asyncio.get_running_loop().create_task(self._supervise(), name="hephaestus-cycle-runner")
+        self.logger.info("🔄 Agent runtime started on the server event loop")
+
+    async def stop(self, timeout: float = 30.0):
+        """Lets the current cycle finish (up to ``timeout``), then cancels the loop."""
+        if self._task is None:
+            return
+        self._stopping = True
+        if self.runner is not None:
+            self.runner.stop()
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout)
+        except asyncio.TimeoutError:
+            self.logger.warning("Cycle did not finish in time - cancelling the runner task")
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._publish("stopped")
+
+    async def wait(self):
+        """Waits until the supervised loop ends (stop requested or cycle limit reached)."""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def _supervise(self):
+        backoff = self.restart_backoff
+        while not self._stopping:
+            self.runner = CycleRunner(self.agent, self.queue_manager, wait_for_objectives=True,
+                                      on_progress=self._publish)
+            started = time.monotonic()
+            try:
+                await self.runner.run()
+                # Normal return: stop requested or the configured cycle limit was reached
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if self._stopping:
+                    break
+                # A runner that survived a while gets a fresh back-off
+                if time.monotonic() - started > self.max_restart_backoff:
+                    backoff = self.restart_backoff
+                self.restarts += 1
+                self.logger.error(f"❌ Cycle runner crashed ({e}); restart #{self.restarts} in {backoff:.1f}s",
+                                  exc_info=True)
+                self._publish("restarting")
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_restart_backoff)
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+    def _capture(self, phase: str) -> Dict[str, Any]:
+        runner = self.runner
+        state = self.agent.state
+        current_cycle = {
+            "current_objective": state.current_objective,
+            "current_phase": phase,
+            "strategy_key": state.strategy_key,
+            "validation_result": list(state.validation_result),
+            "is_self_modifying": state.is_self_modifying,
+            "action_plan_summary": (state.action_plan_data or {}).get("analysis"),
+            "patches_to_apply": len(state.get_patches_to_apply()),
+            "applied_files_report": state.applied_files_report,
+        }
+        return {
+            "worker_active": self.is_running and phase not in ("stopped", "restarting"),
+            "phase": phase,
+            "cycle_count": runner.cycle_count if runner else 0,
+            "restarts": self.restarts,
+            "current_cycle": current_cycle,
+            "queue_size": self.queue_manager.qsize(),
+            "version": self._version + 1,
+            "updated_at": datetime.now().isoformat(),
+            "pid": os.getpid(),
+        }
+
+    def _publish(self, phase: str):
+        """Progress hook: captures the state and swaps the snapshot in one assignment."""
+        try:
+            # Normalised to JSON types, so every reader sees exactly what is served
+            snapshot = json.loads(json.dumps(self._capture(phase), default=str))
+        except Exception as e:
+            self.logger.warning(f"Failed to capture runtime snapshot: {e}")
+            return
+        self._version = snapshot["version"]
+        self._snapshot = snapshot
+        if self.snapshot_path is not None:
+            write_shared_snapshot(self.snapshot_path, snapshot, self.logger)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """A private copy of the latest snapshot; never reflects a half-finished stage."""
+        snapshot = copy.deepcopy(self._snapshot)
+        snapshot["worker_active"] = snapshot["worker_active"] and self.is_running
+        return snapshot
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "running": self.is_running,
+            "phase": self._snapshot["phase"],
+            "restarts": self.restarts,
+            "version": self._version,
+        }
+
+
+def write_shared_snapshot(path: Path, snapshot: Dict[str, Any], logger: Optional[logging.Logger] = None):
+    """Writes the snapshot atomically (temp file + rename) for the other API workers."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        if logger:
+            logger.warning(f"Failed to write shared runtime snapshot: {e}")
+
+
+class SharedSnapshotReader:
+    """Serves the leader's snapshot in follower workers (re-read only when the file changes)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._mtime_ns: Optional[int] = None
+        self._snapshot: Dict[str, Any] = idle_snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        try:
+            mtime_ns = self.path.stat().st_mtime_ns
+            if mtime_ns != self._mtime_ns:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    self._snapshot = json.load(f)
+                self._mtime_ns = mtime_ns
+        except (OSError, ValueError):
+            pass
+        return copy.deepcopy(self._snapshot)
+
+
+class RuntimeLeaderLock:
+    """
+    Non-blocking exclusive file lock electing the API worker that runs the agent.
+
+    The lock is released by the OS when the holder exits, so a replacement
+    worker started by uvicorn can take over. Without ``fcntl`` every process
+    considers itself the leader.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._fd: Optional[int] = None
+
+    @property
+    def held(self) -> bool:
+        return self._fd is not None
+
+    def acquire(self) -> bool:
+        if self._fd is not None or fcntl is None:
+            return True
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        os.ftruncate(fd, 0)
+        os.write(fd, str(os.getpid()).encode())
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is None:
+            return
+        try:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        finally:
+            os.close(self._fd)
+            self._fd = None
@@ -1,8 +1,8 @@
 import typer
 from dotenv import load_dotenv
-from hephaestus.core.agent import HephaestusAgent
 import logging
 from hephaestus.utils.config_loader import load_config
+from hephaestus.utils.logger_factory import LoggerFactory
 
 # Load environment variables from .env file
 load_dotenv(override=True)
@@ -19,7 +19,11 @@ def run(
     max_cycles: int = typer.Option(None, "--max-cycles", "-m", help="Maximum number of evolution cycles")
 ):
     """Run the Hephaestus agent"""
+    # Importado aqui para que comandos leves (cleanup, status) não carreguem o agente
+    from hephaestus.core.agent import HephaestusAgent
+
     config = load_config()
+    LoggerFactory.configure(config)
     agent = HephaestusAgent(
         logger_instance=logger,
         config=config,
@@ -28,12 +32,59 @@ def run(
     )
     agent.run()
 
+@app.command()
+def worker(
+    worker_id: str = typer.Option(None, "--worker-id", "-w", help="Worker id (default: <host>-<pid>)"),
+    max_cycles: int = typer.Option(None, "--max-cycles", "-m", help="Maximum number of evolution cycles")
+):
+    """Run an agent worker that leases objectives from the shared queue"""
+    import asyncio
+    import signal
+    from hephaestus.core.agent import HephaestusAgent
+    from hephaestus.api.agent_runtime import AgentRuntime
+    from hephaestus.utils.objective_leases import create_objective_queue, SharedMemorySync
+
+    config = load_config()
+    LoggerFactory.configure(config)
+    queue = create_objective_queue(config, worker_id=worker_id, logger=logger)
+    agent = HephaestusAgent(
+        logger_instance=logger,
+        config=config,
+        continuous_mode=False,
+        queue_manager=queue,
+        objective_stack_depth_for_testing=max_cycles,
+        disable_signal_handlers=True
+    )
+    memory_sync = SharedMemorySync(queue.backend, agent.memory, queue.worker_id, logger)
+    memory_sync.start(config.get("objective_queue", {}).get("memory_sync_seconds", 30.0))
+
+    async def serve():
+        runtime = AgentRuntime(agent, queue, logger)
+        await runtime.start()
+        stop_requested = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop_requested.set)
+        stop_task = asyncio.create_task(stop_requested.wait())
+        await asyncio.wait([stop_task, asyncio.create_task(runtime.wait())], return_when=asyncio.FIRST_COMPLETED)
+        stop_task.cancel()
+        await runtime.stop()
+
+    logger.info(f"👷 Worker {queue.worker_id} consuming the shared objective queue")
+    try:
+        asyncio.run(serve())
+    finally:
+        memory_sync.stop()
+        queue.close()
+
 @app.command()
 def submit(objective: str):
-    """Submit a new objective to the agent"""
-    # Implementation will be added after we refactor the agent to support this
-    typer.echo(f"Objective submitted: {objective}")
-    typer.echo("This functionality will be implemented in the next version")
+    """Submit a new objective to the shared objective queue"""
+    from hephaestus.utils.objective_leases import create_lease_backend
+
+    config = load_config()
+    objective_id = create_lease_backend(config).enqueue(objective)
+    typer.echo(f"Objective submitted: {objective} (id {objective_id})")
 
 @app.command()
 def status():
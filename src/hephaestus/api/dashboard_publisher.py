@@ -0,0 +1,223 @@
+"""
+Dashboard Publisher - Compute-once, delta-broadcast feed for dashboards
+
+The snapshot is computed once per tick, no matter how many clients are
+connected. It is diffed against the previous tick and each subscriber
+receives a compact delta, with a full keyframe on connect, every
+``keyframe_every`` ticks and whenever a slow subscriber falls behind. Every
+subscriber has its own bounded queue, so a slow client never delays the
+others: when its queue overflows the pending deltas are dropped and it is
+resynchronised with a keyframe.
+
+Message format (JSON):
+
+- ``{"type": "keyframe", "version": n, "timestamp": ..., "data": {...}}``
+- ``{"type": "delta", "version": n, "timestamp": ..., "changes": [[path, value], ...], "removed": [path, ...]}``
+
+``path`` is a list of dict keys; lists and scalars are replaced as a whole.
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+Path = List[str]
+
+
+def compute_delta(old: Dict[str, Any], new: Dict[str, Any], prefix: Optional[Path] = None) -> Tuple[List[Tuple[Path, Any]], List[Path]]:
+    """Returns ``(changes, removed)`` turning ``old`` into ``new``."""
+    prefix = prefix or []
+    changes: List[Tuple[Path, Any]] = []
+    removed: List[Path] = []
+    for key, value in new.items():
+        path = prefix + [key]
+        if key not in old:
+            changes.append((path, value))
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested_changes, nested_removed = compute_delta(old[key], value, path)
+            changes.extend(nested_changes)
+            removed.extend(nested_removed)
+        elif old[key] != value:
+            changes.append((path, value))
+    for key in old:
+        if key not in new:
+            removed.append(prefix + [key])
+    return changes, removed
+
+
+def apply_delta(state: Dict[str, Any], message: Dict[str, Any]) -> Dict[str, Any]:
+    """Applies a keyframe or delta message to ``state`` (the client-side logic, in Python)."""
+    if message["type"] == "keyframe":
+        return json.loads(json.dumps(message["data"]))
+    for path, value in message.get("changes", []):
+        target = state
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = value
+    for path in message.get("removed", []):
+        target = state
+        for key in path[:-1]:
+            target = target.get(key, {})
+        target.pop(path[-1], None)
+    return state
+
+
+class DashboardSubscriber:
+    """A connected client: a bounded queue of serialized messages."""
+
+    def __init__(self, max_queue: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.resyncs = 0
+        self.sent = 0
+
+    def offer(self, message: str, keyframe: Optional[str]):
+        """Enqueues without waiting; on overflow drops the backlog and resyncs with a keyframe."""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.resyncs += 1
+            self.queue.put_nowait(keyframe or message)
+
+    async def next_message(self) -> str:
+        message = await self.queue.get()
+        self.sent += 1
+        return message
+
+
+class DashboardPublisher:
+    """Computes a dashboard snapshot once per tick and fans deltas out to subscribers."""
+
+    def __init__(self, compute_snapshot: Callable[[], Dict[str, Any]], tick_seconds: float = 5.0,
+                 keyframe_every: int = 12, max_queue: int = 8, logger: Optional[logging.Logger] = None):
+        self.compute_snapshot = compute_snapshot
+        self.tick_seconds = tick_seconds
+        self.keyframe_every = max(1, keyframe_every)
+        self.max_queue = max(1, max_queue)
+        self.logger = logger or logging.getLogger("hephaestus.DashboardPublisher")
+
+        self.subscribers: List[DashboardSubscriber] = []
+        self.snapshot: Optional[Dict[str, Any]] = None
+        self.version = 0
+        self.snapshot_time = 0.0
+        self.computations = 0
+        self._keyframe: Optional[str] = None
+        self._ticks_since_keyframe = 0
+        self._compute_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task] = None
+
+    # ------------------------------------------------------------------
+    # Subscribers
+    # ------------------------------------------------------------------
+    def subscribe(self) -> DashboardSubscriber:
+        """Registers a subscriber; it starts with the current keyframe, if any."""
+        subscriber = DashboardSubscriber(self.max_queue)
+        if self._keyframe is not None:
+            subscriber.offer(self._keyframe, self._keyframe)
+        self.subscribers.append(subscriber)
+        self._ensure_running()
+        return subscriber
+
+    def unsubscribe(self, subscriber: DashboardSubscriber):
+        if subscriber in self.subscribers:
+            self.subscribers.remove(subscriber)
+
+    def broadcast(self, data: Dict[str, Any]):
+        """Sends an ad-hoc message (serialized once) to every subscriber."""
+        message = json.dumps(data, default=str)
+        for subscriber in list(self.subscribers):
+            subscriber.offer(message, self._keyframe)
+
+    # ------------------------------------------------------------------
+    # Snapshot
+    # ------------------------------------------------------------------
+    def _is_stale(self) -> bool:
+        return self.snapshot is None or time.monotonic() - self.snapshot_time >= self.tick_seconds
+
+    async def get_snapshot(self) -> Dict[str, Any]:
+        """The cached snapshot; recomputed only if older than one tick."""
+        if self._is_stale():
+            await self.refresh(only_if_stale=True)
+        return self.snapshot
+
+    async def refresh(self, only_if_stale: bool = False) -> Optional[str]:
+        """Computes a new snapshot and publishes it; returns the message sent (or None)."""
+        if self._compute_lock is None:
+            self._compute_lock = asyncio.Lock()
+        async with self._compute_lock:
+            # Another caller may have refreshed while we waited for the lock
+            if only_if_stale and not self._is_stale():
+                return None
+            loop = asyncio.get_running_loop()
+            snapshot = await loop.run_in_executor(None, self.compute_snapshot)
+            # Normalise to JSON types so diffs compare what clients actually see
+            snapshot = json.loads(json.dumps(snapshot, default=str))
+            self.computations += 1
+            return self._publish(snapshot)
+
+    def _publish(self, snapshot: Dict[str, Any]) -> Optional[str]:
+        previous = self.snapshot
+        self.snapshot = snapshot
+        self.snapshot_time = time.monotonic()
+        timestamp = datetime.now().isoformat()
+
+        changes, removed = compute_delta(previous, snapshot) if previous is not None else ([], [])
+        if previous is not None and not changes and not removed:
+            self._ticks_since_keyframe += 1
+            return None
+
+        self.version += 1
+        self._keyframe = json.dumps({"type": "keyframe", "version": self.version, "timestamp": timestamp, "data": snapshot})
+        self._ticks_since_keyframe += 1
+        if previous is None or self._ticks_since_keyframe >= self.keyframe_every:
+            self._ticks_since_keyframe = 0
+            message = self._keyframe
+        else:
+            message = json.dumps({
+                "type": "delta", "version": self.version, "timestamp": timestamp,
+                "changes": changes, "removed": removed
+            })
+
+        for subscriber in list(self.subscribers):
+            subscriber.offer(message, self._keyframe)
+        return message
+
+    # ------------------------------------------------------------------
+    # Tick loop
+    # ------------------------------------------------------------------
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while self.subscribers:
+            try:
+                # A REST read may already have refreshed the snapshot during this tick
+                await self.refresh(only_if_stale=True)
+                delay = self.tick_seconds - (time.monotonic() - self.snapshot_time)
+            except Exception as e:
+                self.logger.error(f"Dashboard snapshot failed: {e}")
+                delay = self.tick_seconds
+            await asyncio.sleep(max(0.0, delay))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "subscribers": len(self.subscribers),
+            "version": self.version,
+            "computations": self.computations,
+            "tick_seconds": self.tick_seconds,
+            "resyncs": sum(s.resyncs for s in self.subscribers)
+        }
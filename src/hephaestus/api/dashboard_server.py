@@ -2,9 +2,7 @@
 Simple Dashboard Server - Web interface for monitoring and validation
 """
 
-import json
 import asyncio
-from datetime import datetime
 from typing import Dict, Any
 
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -15,12 +13,13 @@ import uvicorn
 from hephaestus.monitoring import get_unified_dashboard
 from hephaestus.validation import get_unified_validator
 from hephaestus.utils.logger_factory import LoggerFactory
+from hephaestus.api.dashboard_publisher import DashboardPublisher
 
 
 class DashboardServer:
     """Simple web dashboard for Hephaestus monitoring and validation."""
     
-    def __init__(self, host: str = "localhost", port: int = 8080):
+    def __init__(self, host: str = "localhost", port: int = 8080, tick_seconds: float = 5.0):
         self.host = host
         self.port = port
         self.app = FastAPI(title="Hephaestus Dashboard")
@@ -30,6 +29,9 @@ class DashboardServer:
         self.dashboard = get_unified_dashboard()
         self.validator = get_unified_validator()
         
+        # Snapshot computed once per tick and shared by every client
+        self.publisher = DashboardPublisher(self._compute_snapshot, tick_seconds=tick_seconds, logger=self.logger)
+        
         # WebSocket connections
         self.connections: list[WebSocket] = []
         
@@ -46,6 +48,11 @@ class DashboardServer:
             """Serve the main dashboard page."""
             return HTMLResponse(self._get_dashboard_html())
         
+        @self.app.get("/api/dashboard-data")
+        async def dashboard_data():
+            """Get the cached real-time snapshot (same data as the WebSocket feed)."""
+            return await self.publisher.get_snapshot()
+        
         @self.app.get("/api/system/health")
         async def system_health():
             """Get system health summary."""
@@ -82,22 +89,26 @@ class DashboardServer:
             """WebSocket endpoint for real-time updates."""
             await websocket.accept()
             self.connections.append(websocket)
+            subscriber = self.publisher.subscribe()
             
             try:
                 while True:
-                    # Send real-time updates
-                    data = {
-                        "type": "update",
-                        "timestamp": datetime.now().isoformat(),
-                        "system_health": self.dashboard.get_system_summary(),
-                        "validation": self.validator.get_validation_summary()
-                    }
-                    
-                    await websocket.send_text(json.dumps(data))
-                    await asyncio.sleep(5)  # Update every 5 seconds
+                    # Keyframe on connect, then deltas; the publisher never waits for this client
+                    await websocket.send_text(await subscriber.next_message())
                     
-            except WebSocketDisconnect:
-                self.connections.remove(websocket)
+            except (WebSocketDisconnect, RuntimeError):
+                pass
+            finally:
+                self.publisher.unsubscribe(subscriber)
+                if websocket in self.connections:
+                    self.connections.remove(websocket)
+    
+    def _compute_snapshot(self) -> Dict[str, Any]:
+        """Dashboard snapshot published to every client."""
+        return {
+            "system_health": self.dashboard.get_system_summary(),
+            "validation": self.validator.get_validation_summary()
+        }
     
     def _get_dashboard_html(self) -> str:
         """Generate simple HTML dashboard."""
@@ -278,6 +289,25 @@ class DashboardServer:
     <script>
         let ws = null;
         let reconnectInterval = null;
+        let state = null;
+        
+        function applyDelta(target, message) {
+            for (const [path, value] of message.changes) {
+                let node = target;
+                for (const key of path.slice(0, -1)) {
+                    if (typeof node[key] !== 'object' || node[key] === null) node[key] = {};
+                    node = node[key];
+                }
+                node[path[path.length - 1]] = value;
+            }
+            for (const path of message.removed) {
+                let node = target;
+                for (const key of path.slice(0, -1)) {
+                    node = node[key] || {};
+                }
+                delete node[path[path.length - 1]];
+            }
+        }
         
         function connectWebSocket() {
             const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
@@ -295,8 +325,15 @@ class DashboardServer:
             };
             
             ws.onmessage = function(event) {
-                const data = JSON.parse(event.data);
-                updateDashboard(data);
+                const message = JSON.parse(event.data);
+                if (message.type === 'keyframe') {
+                    state = message.data;
+                } else if (message.type === 'delta' && state) {
+                    applyDelta(state, message);
+                } else {
+                    return;  // wait for the next keyframe
+                }
+                updateDashboard(state);
             };
             
             ws.onclose = function() {
@@ -419,19 +456,14 @@ class DashboardServer:
     
     async def broadcast_update(self, data: Dict[str, Any]):
         """Broadcast update to all connected clients."""
-        if self.connections:
-            message = json.dumps(data)
-            for connection in self.connections.copy():
-                try:
-                    await connection.send_text(message)
-                except Exception:
-                    self.connections.remove(connection)
+        # Queued per client: a slow connection does not hold up the others
+        self.publisher.broadcast(data)
 
 
 # Convenience function to start dashboard
-async def start_dashboard(host: str = "localhost", port: int = 8080):
+async def start_dashboard(host: str = "localhost", port: int = 8080, tick_seconds: float = 5.0):
     """Start the dashboard server."""
-    server = DashboardServer(host, port)
+    server = DashboardServer(host, port, tick_seconds)
     await server.start()
 
 
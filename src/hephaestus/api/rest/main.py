@@ -5,27 +5,32 @@ from fastapi.responses import HTMLResponse, JSONResponse
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import uvicorn
-import threading
 import logging
 import asyncio
 import time
 from datetime import datetime
 import json
 import os
+from pathlib import Path
 from contextlib import asynccontextmanager
 
 from dotenv import load_dotenv
 load_dotenv() # Carrega as variáveis de ambiente do arquivo .env
 
 from hephaestus.utils.queue_manager import QueueManager
+from hephaestus.utils.objective_leases import LeasedQueueManager, SharedMemorySync, create_objective_queue
 from hephaestus.core.agent import HephaestusAgent
 from hephaestus.utils.config_loader import load_config
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+from hephaestus.utils.logger_factory import LoggerFactory
+from hephaestus.utils.log_index import get_log_index
+from hephaestus.api.dashboard_publisher import DashboardPublisher
+from hephaestus.api.agent_runtime import AgentRuntime, RuntimeLeaderLock, SharedSnapshotReader, idle_snapshot
 from hephaestus.core.arthur_interface_generator import ArthurInterfaceGenerator
 from hephaestus.agents.error_detector_agent import ErrorDetectorAgent
 from hephaestus.agents.dependency_fixer_agent import DependencyFixerAgent
 from hephaestus.agents.cycle_monitor_agent import CycleMonitorAgent
 from hephaestus.agents.agent_expansion_coordinator import AgentExpansionCoordinator
-from hephaestus.core.cycle_runner import CycleRunner
 from hephaestus.services.orchestration.async_orchestrator import AgentType, AgentTask
 
 # Enhanced Systems Integration
@@ -57,9 +62,11 @@ logger = logging.getLogger(__name__)
 class OptimizedAgentInitializer:
     """Inicializador otimizado para agentes do sistema."""
     
-    def __init__(self, config: Dict[str, Any], logger: logging.Logger):
+    def __init__(self, config: Dict[str, Any], logger: logging.Logger, runs_cycles: bool = True):
         self.config = config
         self.logger = logger
+        # Workers que não executam o ciclo criam o agente com o perfil mínimo e sem monitoramento
+        self.runs_cycles = runs_cycles
     
     async def initialize_all_agents(self) -> Dict[str, Any]:
         """Inicializa todos os agentes de forma otimizada."""
@@ -100,8 +107,9 @@ class OptimizedAgentInitializer:
                 continue
             agents.update(result)
         
-        # Fase 3: Ativar monitoramento apenas após inicialização
-        await self._activate_monitoring(agents)
+        # Fase 3: Ativar monitoramento apenas após inicialização (só no worker do ciclo)
+        if self.runs_cycles:
+            await self._activate_monitoring(agents)
         
         end_time = time.time()
         self.logger.info(f"🚀 Inicialização otimizada concluída em {end_time - start_time:.2f}s")
@@ -149,7 +157,8 @@ class OptimizedAgentInitializer:
             config=self.config,
             continuous_mode=False,
             queue_manager=queue_manager,
-            disable_signal_handlers=hot_reload_enabled
+            disable_signal_handlers=hot_reload_enabled,
+            startup_profile=None if self.runs_cycles else "minimal"
         )
         return {"hephaestus_agent": agent}
     
@@ -178,40 +187,75 @@ class OptimizedAgentInitializer:
         self.logger.info("✅ Sistemas de monitoramento ativados")
 
 
-async def start_background_threads(logger: logging.Logger) -> None:
-    """Inicia threads de background de forma otimizada."""
-    global hephaestus_worker_thread, log_analyzer_thread
-    
-    # Criar threads em paralelo
-    def create_worker_thread():
-        return threading.Thread(target=worker_thread, daemon=True)
-    
-    def create_log_analyzer_thread():
-        return threading.Thread(target=periodic_log_analysis_task, daemon=True)
-    
-    # Executar criação de threads em executor separado para não bloquear
-    import concurrent.futures
+def configure_runtime(config: Dict[str, Any], logger: logging.Logger) -> bool:
+    """
+    Prepara a fila e decide se este processo executa o ciclo do agente.
+
+    Com vários workers do uvicorn (ou ``api_runtime.shared_queue``) a fila passa a
+    ser a fila arrendada de ``objective_queue`` e apenas o worker que obtém o lock
+    de líder roda o ciclo; os demais servem a API e o snapshot publicado pelo
+    líder. Com ``run_cycles: false`` nenhum worker da API roda ciclos e os
+    objetivos são processados por processos ``hephaestus worker``.
+    """
+    global queue_manager, runtime_leader_lock, runtime_snapshot_reader
+
+    runtime_config = config.get("api_runtime", {})
+    data_dir = Path(runtime_config.get("data_dir", "data/runtime"))
+    run_cycles = runtime_config.get("run_cycles", True)
+    if run_cycles and not (runtime_config.get("shared_queue", False) or runtime_config.get("workers", 1) > 1):
+        return True
+
+    queue_manager = create_objective_queue(config, logger=logger)
+    runtime_leader_lock = RuntimeLeaderLock(data_dir / "agent.lock")
+    if run_cycles and runtime_leader_lock.acquire():
+        logger.info(f"👑 Worker {os.getpid()} runs the agent cycle (shared queue)")
+        return True
+
+    runtime_snapshot_reader = SharedSnapshotReader(data_dir / "snapshot.json")
+    logger.info(f"🌐 Worker {os.getpid()} serves the API only; cycles run in the leader worker")
+    return False
+
+
+async def start_agent_runtime(config: Dict[str, Any], logger: logging.Logger) -> None:
+    """Inicia o ciclo do agente como tarefa supervisionada no loop do servidor."""
+    global agent_runtime, log_analyzer_job, shared_memory_sync
+
+    runtime_config = config.get("api_runtime", {})
+    snapshot_path = None
+    if runtime_leader_lock is not None:
+        snapshot_path = Path(runtime_config.get("data_dir", "data/runtime")) / "snapshot.json"
+
+    agent_runtime = AgentRuntime(
+        hephaestus_agent_instance, queue_manager, logger,
+        snapshot_path=snapshot_path,
+        restart_backoff=runtime_config.get("restart_backoff_seconds", 1.0),
+        max_restart_backoff=runtime_config.get("max_restart_backoff_seconds", 60.0)
+    )
+    await agent_runtime.start()
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-        # Criar threads em paralelo
-        worker_future = executor.submit(create_worker_thread)
-        log_future = executor.submit(create_log_analyzer_thread)
-        
-        # Aguardar criação
-        hephaestus_worker_thread = worker_future.result()
-        log_analyzer_thread = log_future.result()
-        
-        # Iniciar threads
-        hephaestus_worker_thread.start()
-        log_analyzer_thread.start()
+    # Com a fila arrendada, a memória é mesclada com a dos outros workers
+    if isinstance(queue_manager, LeasedQueueManager):
+        shared_memory_sync = SharedMemorySync(queue_manager.backend, hephaestus_agent_instance.memory,
+                                              queue_manager.worker_id, logger)
+        shared_memory_sync.start(config.get("objective_queue", {}).get("memory_sync_seconds", 30.0))
     
-    logger.info("🧵 Background threads started")
+    # Tarefas periódicas rodam no escalonador compartilhado, sem thread própria
+    log_analyzer_job = schedule_periodic_log_analysis()
+
+
+def runtime_snapshot() -> Dict[str, Any]:
+    """Snapshot somente leitura do ciclo (do próprio worker ou publicado pelo líder)."""
+    if agent_runtime is not None:
+        return agent_runtime.snapshot()
+    if runtime_snapshot_reader is not None:
+        return runtime_snapshot_reader.snapshot()
+    return idle_snapshot()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan context manager for FastAPI startup and shutdown events (OPTIMIZED)."""
-    global hephaestus_agent_instance, hephaestus_worker_thread, interface_generator, error_detector_agent, log_analyzer_thread, dependency_fixer_agent, cycle_monitor_agent, agent_expansion_coordinator
+    global hephaestus_agent_instance, interface_generator, error_detector_agent, log_analyzer_job, dependency_fixer_agent, cycle_monitor_agent, agent_expansion_coordinator
     
     # Startup
     logger.info("🚀 Starting Hephaestus Meta-Intelligence API Server (OPTIMIZED)...")
@@ -219,9 +263,12 @@ async def lifespan(app: FastAPI):
     try:
         # Load configuration
         config = load_config()
+        # Logs go through the queued pipeline: no disk I/O on the event loop
+        LoggerFactory.configure(config)
+        runs_cycles = configure_runtime(config, logger)
         
         # Inicializar agentes de forma otimizada
-        initializer = OptimizedAgentInitializer(config, logger)
+        initializer = OptimizedAgentInitializer(config, logger, runs_cycles=runs_cycles)
         results = await initializer.initialize_all_agents()
         
         # Armazenar instâncias nas variáveis globais
@@ -234,8 +281,9 @@ async def lifespan(app: FastAPI):
         cycle_monitor_agent = agents.get("cycle_monitor")
         agent_expansion_coordinator = agents.get("agent_expansion_coordinator")
         
-        # Iniciar threads de background de forma otimizada
-        await start_background_threads(logger)
+        # O ciclo roda como tarefa no loop do servidor (apenas no worker líder)
+        if runs_cycles and hephaestus_agent_instance:
+            await start_agent_runtime(config, logger)
         
         logger.info("✅ Hephaestus Meta-Intelligence API Server initialized successfully!")
         logger.info(f"⚡ Initialization time: {results['initialization_time']:.2f}s")
@@ -251,6 +299,16 @@ async def lifespan(app: FastAPI):
     logger.info("🔄 Shutting down Hephaestus Meta-Intelligence API Server...")
     
     try:
+        # Termina o ciclo em andamento antes de parar os subsistemas
+        if agent_runtime:
+            await agent_runtime.stop()
+        if shared_memory_sync:
+            shared_memory_sync.stop()
+        if isinstance(queue_manager, LeasedQueueManager):
+            queue_manager.close()
+        if runtime_leader_lock:
+            runtime_leader_lock.release()
+        
         # Parar sistemas de monitoramento primeiro
         if error_detector_agent:
             error_detector_agent.stop_monitoring()
@@ -262,7 +320,9 @@ async def lifespan(app: FastAPI):
         if hephaestus_agent_instance:
             hephaestus_agent_instance.stop_meta_intelligence()
         
-        # Threads daemon param automaticamente
+        # Jobs periódicos: aguarda as execuções em andamento
+        get_background_scheduler().shutdown(wait=True)
+        
         logger.info("✅ Hephaestus system shutdown complete!")
         
     except Exception as e:
@@ -370,13 +430,17 @@ security = HTTPBearer(auto_error=False)
 # Global instances
 queue_manager = QueueManager()
 hephaestus_agent_instance = None
-hephaestus_worker_thread = None
+agent_runtime = None
+shared_memory_sync = None
+runtime_leader_lock = None
+runtime_snapshot_reader = None
 interface_generator = None
 error_detector_agent = None
 dependency_fixer_agent = None
 cycle_monitor_agent = None
 agent_expansion_coordinator = None
-log_analyzer_thread = None
+log_analyzer_job = None
+dashboard_publisher = None
 
 # === AUTHENTICATION MODELS === #
 
@@ -524,88 +588,42 @@ def get_auth_user(credentials: HTTPAuthorizationCredentials = Depends(security))
 
 
 def periodic_log_analysis_task():
-    """A background task that periodically queues system monitoring tasks."""
-    logger.info("📊 Periodic System Monitoring Task started.")
-    analysis_interval_seconds = 300 # 5 minutes
-
-    # Initial delay
-    time.sleep(30)
-
-    while True:
-        try:
-            logger.info(f"Monitoring task sleeping for {analysis_interval_seconds} seconds.")
-            time.sleep(analysis_interval_seconds)
-
-            if hephaestus_agent_instance and queue_manager:
-                # --- Queue Log Analysis Task ---
-                logger.info("Queuing periodic log analysis task...")
-                log_analysis_objective = {
-                    "objective": "Periodically analyze system logs for errors and improvement opportunities.",
-                    "is_log_analysis_task": True,
-                }
-                queue_manager.put_objective(log_analysis_objective)
-                logger.info("Log analysis task queued successfully.")
-                
-                time.sleep(10)
-
-                # --- Queue Debt Hunter Task ---
-                logger.info("Queuing periodic debt hunter task...")
-                debt_hunter_objective = {
-                    "objective": "Proactively hunt for and prioritize technical debt.",
-                    "is_debt_hunter_task": True,
-                }
-                queue_manager.put_objective(debt_hunter_objective)
-                logger.info("Debt hunter task queued successfully.")
-
-                time.sleep(10)
-
-                # --- Queue Model Sommelier Task ---
-                logger.info("Queuing periodic model sommelier task...")
-                model_sommelier_objective = {
-                    "objective": "Proactively analyze agent performance and optimize model configurations.",
-                    "is_model_sommelier_task": True,
-                }
-                queue_manager.put_objective(model_sommelier_objective)
-                logger.info("Model sommelier task queued successfully.")
-
-                time.sleep(10)
-
-                # --- Queue Linter Task ---
-                logger.info("Queuing periodic linter task...")
-                linter_objective = {
-                    "objective": "Proactively run linter to find and fix code quality issues.",
-                    "is_linter_task": True,
-                }
-                queue_manager.put_objective(linter_objective)
-                logger.info("Linter task queued successfully.")
-
-        except Exception as e:
-            logger.error(f"❌ Error in periodic monitoring task: {e}", exc_info=True)
-            # Wait a bit longer after an error before retrying
-            time.sleep(60)
-
-def worker_thread():
-    """Starts the agent's main execution loop."""
-    global hephaestus_agent_instance
-    logger.info("🔄 Worker Thread started, preparing to launch agent loop...")
-    
-    # It's crucial to wait for the app to be fully started,
-    # otherwise the agent instance might not be ready.
-    time.sleep(2) 
-
-    if hephaestus_agent_instance:
-        try:
-            # The CycleRunner contains the main loop that handles both
-            # queued and continuously generated objectives. We just need to start it.
-            cycle_runner = CycleRunner(hephaestus_agent_instance, hephaestus_agent_instance.queue_manager)
-            # Create new event loop for the worker thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            loop.run_until_complete(cycle_runner.run())
-        except Exception as e:
-            logger.error(f"❌ Critical error in agent's main run loop: {e}", exc_info=True)
-    else:
-        logger.error("❌ Agent not initialized. Worker thread cannot start.")
+    """Queues the periodic system monitoring objectives (run by the background scheduler)."""
+    if not (hephaestus_agent_instance and queue_manager):
+        return
+
+    periodic_objectives = [
+        ("log analysis", {
+            "objective": "Periodically analyze system logs for errors and improvement opportunities.",
+            "is_log_analysis_task": True,
+        }),
+        ("debt hunter", {
+            "objective": "Proactively hunt for and prioritize technical debt.",
+            "is_debt_hunter_task": True,
+        }),
+        ("model sommelier", {
+            "objective": "Proactively analyze agent performance and optimize model configurations.",
+            "is_model_sommelier_task": True,
+        }),
+        ("linter", {
+            "objective": "Proactively run linter to find and fix code quality issues.",
+            "is_linter_task": True,
+        }),
+    ]
+    for name, objective in periodic_objectives:
+        queue_manager.put_objective(objective)
+        logger.info(f"Periodic {name} task queued successfully.")
+
+
+def schedule_periodic_log_analysis(analysis_interval_seconds: int = 300):
+    """Registers the periodic monitoring objectives in the shared background scheduler."""
+    logger.info("📊 Periodic System Monitoring Task scheduled.")
+    # Initial delay: one interval plus the previous 30s warm-up
+    return get_background_scheduler().schedule(
+        "periodic_log_analysis", periodic_log_analysis_task, interval=analysis_interval_seconds,
+        jitter=10.0, priority=JobPriority.NORMAL, max_runtime=10,
+        initial_delay=analysis_interval_seconds + 30
+    )
 
 def process_objective(objective_data: Any):
     """DEPRECATED: This logic is now handled by the CycleRunner.run() loop."""
@@ -804,8 +822,8 @@ async def health_check():
         uptime_seconds=int(time.time() - start_time),
         version="3.1.0",
         meta_intelligence_active=hephaestus_agent_instance.meta_intelligence_active if hephaestus_agent_instance else False,
-        worker_thread_alive=hephaestus_worker_thread.is_alive() if hephaestus_worker_thread else False,
-        queue_size=queue_manager._queue.qsize(),
+        worker_thread_alive=runtime_snapshot()["worker_active"],
+        queue_size=queue_manager.qsize(),
         orchestration_status=orchestration_status,
         performance_metrics=performance_metrics
     )
@@ -814,28 +832,12 @@ async def health_check():
 async def get_status():
     """Get detailed system status including all subsystems and current cycle/goal info"""
     meta_intelligence_status = {}
-    current_cycle_info = {}
     pipeline_metrics = {}
     if hephaestus_agent_instance:
         try:
             meta_intelligence_status = hephaestus_agent_instance.evolution_manager.get_evolution_report()
         except Exception as e:
             meta_intelligence_status = {"error": str(e)}
-        # --- NOVO: Info detalhada do ciclo/objetivo atual ---
-        try:
-            state = hephaestus_agent_instance.state
-            current_cycle_info = {
-                "current_objective": state.current_objective,
-                "current_phase": getattr(state, "current_phase", None),
-                "strategy_key": state.strategy_key,
-                "validation_result": state.validation_result,
-                "is_self_modifying": state.is_self_modifying,
-                "action_plan_summary": (state.action_plan_data or {}).get("analysis", None),
-                "patches_to_apply": len(state.get_patches_to_apply()),
-                "applied_files_report": state.applied_files_report,
-            }
-        except Exception as e:
-            current_cycle_info = {"error": f"Failed to extract current cycle info: {e}"}
         
         # --- NOVO: Métricas do pipeline otimizado ---
         try:
@@ -849,15 +851,18 @@ async def get_status():
                 pipeline_metrics = {"enabled": False}
         except Exception as e:
             pipeline_metrics = {"error": str(e)}
+    # Info do ciclo atual: snapshot consistente publicado entre as etapas do ciclo
+    snapshot = runtime_snapshot()
     return {
         "status": "running",
         "timestamp": datetime.now().isoformat(),
         "system_info": {
-            "queue_size": queue_manager._queue.qsize(),
-            "worker_active": hephaestus_worker_thread.is_alive() if hephaestus_worker_thread else False,
+            "queue_size": queue_manager.qsize(),
+            "worker_active": snapshot["worker_active"],
+            "cycle_count": snapshot["cycle_count"],
             "evolution_active": hephaestus_agent_instance.meta_intelligence_active if hephaestus_agent_instance else False
         },
-        "current_cycle": current_cycle_info,
+        "current_cycle": snapshot["current_cycle"],
         "meta_intelligence": meta_intelligence_status,
         "pipeline_metrics": pipeline_metrics,
         "performance_metrics": {
@@ -881,13 +886,14 @@ async def submit_objective(request: ObjectiveRequest, auth_user: dict = Depends(
         }
         
         queue_manager.put_objective(enhanced_objective)
+        queue_size = queue_manager.qsize()
         
         return {
             "status": "success",
             "message": f"Objective '{request.objective}' added to queue with priority {request.priority}",
             "objective_id": str(hash(request.objective)),
-            "queue_position": queue_manager._queue.qsize(),
-            "estimated_processing_time": queue_manager._queue.qsize() * 30  # Rough estimate
+            "queue_position": queue_size,
+            "estimated_processing_time": queue_size * 30  # Rough estimate
         }
     except Exception as e:
         logger.error(f"Error submitting objective: {e}")
@@ -899,15 +905,27 @@ async def get_queue_status(auth_user: dict = Depends(get_auth_user)):
     try:
         return {
             "status": "success",
-            "queue_size": queue_manager._queue.qsize(),
-            "queue_empty": queue_manager._queue.empty(),
-            "processing_active": hephaestus_worker_thread.is_alive() if hephaestus_worker_thread else False,
+            "queue_size": queue_manager.qsize(),
+            "queue_empty": queue_manager.is_empty(),
+            "processing_active": runtime_snapshot()["worker_active"],
+            "workers": queue_manager.worker_stats(),
             "message": "📋 Queue status retrieved successfully"
         }
     except Exception as e:
         logger.error(f"Error getting queue status: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/status/runtime", tags=["Core Operations"])
+async def get_runtime_snapshot():
+    """Read-only snapshot of the cycle runner, captured between cycle stages"""
+    return {
+        "status": "success",
+        "snapshot": runtime_snapshot(),
+        "runtime": agent_runtime.get_status() if agent_runtime else {"running": False},
+        "logging": LoggerFactory.get_pipeline_stats(),
+        "worker_pid": os.getpid()
+    }
+
 # === ORCHESTRATION ENDPOINTS === #
 
 @app.post("/orchestration/turbo-mode", tags=["Orchestration"])
@@ -1321,7 +1339,7 @@ async def get_system_metrics(auth_user: dict = Depends(get_auth_user)):
                 "turbo_mode_usage": getattr(hephaestus_agent_instance, 'turbo_mode_usage', 0)
             },
             "queue_metrics": {
-                "current_size": queue_manager._queue.qsize(),
+                "current_size": queue_manager.qsize(),
                 "processing_rate": "dynamic",
                 "avg_wait_time": "calculated"
             }
@@ -1337,25 +1355,29 @@ async def get_system_metrics(auth_user: dict = Depends(get_auth_user)):
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/monitoring/logs", tags=["Monitoring"])
-async def get_recent_logs(limit: int = 50, auth_user: dict = Depends(get_auth_user)):
-    """Get recent system logs"""
-    try:
-        # In a real implementation, you'd read from log files
-        # For now, return a sample structure
-        logs = [
-            {
-                "timestamp": datetime.now().isoformat(),
-                "level": "INFO",
-                "message": "Sample log entry",
-                "component": "hephaestus_agent"
-            }
-        ]
+async def get_recent_logs(limit: int = 50, level: Optional[str] = None, component: Optional[str] = None,
+                          cycle: Optional[int] = None, since: Optional[str] = None,
+                          until: Optional[str] = None, cursor: Optional[int] = None,
+                          auth_user: dict = Depends(get_auth_user)):
+    """Get recent system logs from the incremental log index (newest first, cursor-paginated)"""
+    try:
+        since_ts = datetime.fromisoformat(since).timestamp() if since else None
+        until_ts = datetime.fromisoformat(until).timestamp() if until else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="since/until must be ISO 8601 timestamps")
+    try:
+        page = get_log_index(config).query(
+            level=level, logger_name=component, cycle=cycle, since=since_ts, until=until_ts,
+            cursor=cursor, limit=min(max(limit, 1), 1000)
+        )
+        logs = page["entries"]
         
         return {
             "status": "success",
-            "logs": logs[:limit],
-            "total_entries": len(logs),
-            "message": f"📋 Retrieved {min(limit, len(logs))} recent log entries"
+            "logs": logs,
+            "total_entries": page["indexed_entries"],
+            "next_cursor": page["next_cursor"],
+            "message": f"📋 Retrieved {len(logs)} recent log entries"
         }
     except Exception as e:
         logger.error(f"Error getting logs: {e}")
@@ -1373,11 +1395,19 @@ async def get_dashboard_page():
 
 @app.get("/api/dashboard-data", tags=["Monitoring"])
 async def get_dashboard_data(auth_user: dict = Depends(get_auth_user)):
-    """Provides real-time data for the evolution dashboard."""
-    if hephaestus_agent_instance:
-        return hephaestus_agent_instance.get_evolution_dashboard_data()
-    else:
+    """Provides real-time data for the evolution dashboard (computed at most once per tick)."""
+    global dashboard_publisher
+    if not hephaestus_agent_instance:
         raise HTTPException(status_code=503, detail="Agent not initialized")
+    if dashboard_publisher is None:
+        dashboard_config = hephaestus_agent_instance.config.get("dashboard", {})
+        dashboard_publisher = DashboardPublisher(
+            hephaestus_agent_instance.get_evolution_dashboard_data,
+            tick_seconds=dashboard_config.get("tick_seconds", 5.0),
+            keyframe_every=dashboard_config.get("keyframe_every", 12),
+            logger=logger
+        )
+    return await dashboard_publisher.get_snapshot()
 
 # === CONFIGURATION ENDPOINTS === #
 
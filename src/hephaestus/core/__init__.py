@@ -1,10 +1,14 @@
 """Core components of the Hephaestus system."""
 
-from .agent import HephaestusAgent
-from .brain import generate_next_objective
-from .memory import Memory
-from .cycle_runner import CycleRunner
-from .state import AgentState
+from hephaestus.utils.lazy_import import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    "HephaestusAgent": ".agent",
+    "generate_next_objective": ".brain",
+    "Memory": ".memory",
+    "CycleRunner": ".cycle_runner",
+    "AgentState": ".state",
+})
 
 __all__ = [
     "HephaestusAgent",
@@ -12,4 +16,4 @@ __all__ = [
     "Memory", 
     "CycleRunner",
     "AgentState",
-]
\ No newline at end of file
+]
@@ -4,7 +4,7 @@ import csv
 import json
 import asyncio
 from datetime import datetime
-from typing import TYPE_CHECKING, Optional, Any
+from typing import TYPE_CHECKING, Optional, Any, Callable
 from pathlib import Path
 
 from hephaestus.utils.project_scanner import update_project_manifest
@@ -26,14 +26,47 @@ if TYPE_CHECKING:
     from hephaestus.core.agent import HephaestusAgent
 
 from hephaestus.utils.queue_manager import QueueManager
+from hephaestus.utils.background_scheduler import get_background_scheduler
+from hephaestus.utils.logger_factory import LoggerFactory
+from hephaestus.utils.evolution_rollups import get_evolution_rollups
 
 class CycleRunner:
     """Manages the main asynchronous execution loop of the Hephaestus agent."""
 
-    def __init__(self, agent: "HephaestusAgent", queue_manager: QueueManager):
+    def __init__(self, agent: "HephaestusAgent", queue_manager: QueueManager,
+                 wait_for_objectives: bool = False,
+                 on_progress: Optional[Callable[[str], None]] = None):
+        """
+        Args:
+            wait_for_objectives: When the queue is empty and continuous mode is off,
+                wait for new objectives instead of returning (server mode).
+            on_progress: Called on the event loop with the new phase name whenever
+                the cycle moves between stages; agent state is stable at that point.
+        """
         self.agent = agent
         self.queue_manager = queue_manager
+        self.wait_for_objectives = wait_for_objectives
+        self.on_progress = on_progress
         self.cycle_count = 0
+        self.phase = "starting"
+        self._stop_requested = False
+        self._cycle_failed = False
+
+    def stop(self):
+        """Asks the loop to return after the current cycle (or immediately if idle)."""
+        self._stop_requested = True
+
+    def _notify(self, phase: str):
+        self.phase = phase
+        if self.on_progress is not None:
+            try:
+                self.on_progress(phase)
+            except Exception as e:
+                self.agent.logger.warning(f"Cycle progress callback failed: {e}")
+
+    async def _run_blocking(self, func: Callable, *args) -> Any:
+        """Runs a blocking agent step in the default executor, keeping the loop responsive."""
+        return await asyncio.get_running_loop().run_in_executor(None, func, *args)
 
     async def _get_next_objective(self) -> Optional[Any]:
         """Gets the next objective. Returns objective data or None to stop."""
@@ -41,9 +74,10 @@ class CycleRunner:
             return self.agent.objective_stack.pop()
 
         if not self.queue_manager.is_empty():
-            objective_data = self.queue_manager.get_objective()
-            self.agent.logger.info(f"Objective transferred from queue to stack: {objective_data}")
-            return objective_data
+            objective_data = self.queue_manager.get_objective(timeout=0)
+            if objective_data is not None:
+                self.agent.logger.info(f"Objective transferred from queue to stack: {objective_data}")
+                return objective_data
 
         if self.agent.continuous_mode:
             self.agent.logger.info("Continuous mode: Generating new objective.")
@@ -65,6 +99,20 @@ class CycleRunner:
             await asyncio.sleep(delay)
             return new_objective
 
+        if self.wait_for_objectives:
+            self._notify("idle")
+            poll_seconds = self.agent.config.get("idle_poll_seconds", 1.0)
+            while not self._stop_requested:
+                if self.agent.objective_stack:
+                    return self.agent.objective_stack.pop()
+                if not self.queue_manager.is_empty():
+                    objective_data = self.queue_manager.get_objective(timeout=0)
+                    if objective_data is not None:
+                        self.agent.logger.info(f"Objective received from queue: {objective_data}")
+                        return objective_data
+                await asyncio.sleep(poll_seconds)
+            return None
+
         self.agent.logger.info("Objective stack empty, continuous mode disabled. Shutting down.")
         return None
 
@@ -134,16 +182,25 @@ class CycleRunner:
         # 🔮 Track cycle start time for learning
         self.agent.state.cycle_start_time = datetime.now()
 
-        if not self.agent._generate_manifest():
+        self._notify("manifest")
+        if not await self._run_blocking(self.agent._generate_manifest):
             self._handle_cycle_failure(objective_str, "MANIFEST_GENERATION_FAILED", "Could not generate project manifest.")
             return
 
-        if not self.agent._gather_information_phase():
+        self._notify("information_gathering")
+        if not await self._run_blocking(self.agent._gather_information_phase):
             self._handle_cycle_failure(objective_str, "INFORMATION_GATHERING_FAILED", "Could not read file context.")
             return
 
+        # Background jobs are held while the LLM stages and validation run
+        with get_background_scheduler().latency_critical("cycle"):
+            await self._run_cycle_stages(objective_str)
+
+    async def _run_cycle_stages(self, objective_str: str):
+        """Runs the architect, strategy and validation stages of a cycle."""
         try:
             # Stage 1: Parallel execution of Architect and Bug Hunter
+            self._notify("architect")
             architect_result = await self._run_architect_stage(objective_str)
             if not architect_result or not architect_result.success:
                 reason = architect_result.error_message if architect_result else "Architect task failed to produce a result."
@@ -154,6 +211,7 @@ class CycleRunner:
             self.agent.state.action_plan_data = action_plan
 
             # Stage 2: Parallel execution of Code Review and Maestro
+            self._notify("strategy")
             maestro_result, review_result = await self._run_strategy_stage(objective_str, action_plan)
             
             if review_result and not review_result.success:
@@ -171,8 +229,9 @@ class CycleRunner:
             
             self.agent.state.strategy_key = strategy_key
 
-            # Stage 3: Synchronous validation and application logic
-            self._run_validation_and_application(objective_str)
+            # Stage 3: Synchronous validation and application logic, off the event loop
+            self._notify("validation")
+            await self._run_blocking(self._run_validation_and_application, objective_str)
 
         except Exception as e:
             self.agent.logger.error(f"Asynchronous pipeline execution failed: {e}", exc_info=True)
@@ -324,6 +383,7 @@ class CycleRunner:
     def _handle_cycle_failure(self, objective: str, reason: str, context: str):
         """Handles the logic for a failed cycle."""
         self.agent.logger.warning(f"CYCLE FAILED! Reason: {reason}\nContext: {context}")
+        self._cycle_failed = True
         self.agent.memory.add_failed_objective(objective, reason, context)
         
         # 🔮 PREDICTIVE FAILURE ENGINE LEARNING
@@ -362,7 +422,8 @@ class CycleRunner:
     async def run(self) -> None:
         """Execute the main evolution loop."""
         self.agent.logger.info(f"Starting HephaestusAgent. Continuous Mode: {'ON' if self.agent.continuous_mode else 'OFF'}.")
-        while True:
+        self.queue_manager.start_consuming()
+        while not self._stop_requested:
             if self.agent.objective_stack_depth_for_testing is not None and self.cycle_count >= self.agent.objective_stack_depth_for_testing:
                 self.agent.logger.info("Execution cycle limit reached. Shutting down.")
                 break
@@ -372,15 +433,19 @@ class CycleRunner:
                 break
 
             self.cycle_count += 1
+            self._cycle_failed = False
+            self._notify("cycle_started")
             self.agent.logger.info(f"\n\n{'='*20} START CYCLE #{self.cycle_count} {'='*20}")
             self.agent.logger.info(f"OBJECTIVE: {current_objective}\n")
 
             if self._is_degenerative_loop(str(current_objective)):
                 self.agent.logger.error(f'Degenerative loop detected for objective. Discarding.')
                 self._handle_cycle_failure(str(current_objective), "DEGENERATIVE_LOOP_DETECTED", "Objective failed too many times consecutively.")
+                self.queue_manager.complete_objective(current_objective, success=False)
                 continue
 
             start_time = datetime.now()
+            logging_before = LoggerFactory.get_pipeline_stats()
             try:
                 await self._run_single_cycle(current_objective)
             except Exception as e:
@@ -388,9 +453,14 @@ class CycleRunner:
                 self._handle_cycle_failure(str(current_objective), "UNHANDLED_CYCLE_EXCEPTION", str(e))
             finally:
                 self._log_cycle_completion(str(current_objective), start_time, datetime.now())
-                self.agent.memory.save()
+                await self._run_blocking(self.agent.memory.save)
+                # Concludes the lease (shared queue) only after the memory is persisted
+                self.queue_manager.complete_objective(current_objective, success=not self._cycle_failed)
+                self._log_logging_cost(logging_before)
+                self._notify("cycle_finished")
                 await asyncio.sleep(self.agent.config.get("cycle_delay_seconds", 1))
 
+        self._notify("stopped")
         self.agent.logger.info(f"{'='*20} END OF HEPHAESTUS EXECUTION {'='*20}")
     
     def _learn_from_success(self):
@@ -444,6 +514,18 @@ class CycleRunner:
         except Exception as e:
             self.agent.logger.warning(f"Error learning from failure: {e}")
 
+    def _log_logging_cost(self, before: Optional[dict]):
+        """Records emitted/dropped and flush time spent by the logging pipeline during the cycle."""
+        after = LoggerFactory.get_pipeline_stats()
+        if before is None or after is None:
+            return
+        self.agent.logger.debug(
+            f"Logging cost for cycle #{self.cycle_count}: "
+            f"{after['emitted'] - before['emitted']} records emitted, "
+            f"{after['dropped'] - before['dropped']} dropped, "
+            f"{after['flush_latency_ms_total'] - before['flush_latency_ms_total']:.1f} ms flushing"
+        )
+
     def _log_cycle_completion(self, objective: str, start_time: datetime, end_time: datetime):
         """Logs the final status of the completed cycle."""
         duration = (end_time - start_time).total_seconds()
@@ -451,6 +533,11 @@ class CycleRunner:
         log_entry = [self.cycle_count, objective, "success" if success else "failure", round(duration, 2), "", self.agent.state.strategy_key or "N/A", start_time.isoformat(), end_time.isoformat(), reason, context]
         try:
             with open(self.agent.evolution_log_file, 'a', newline='', encoding='utf-8') as f:
+                start_offset = f.tell()
                 csv.writer(f).writerow(log_entry)
+                end_offset = f.tell()
         except IOError as e:
-            self.agent.logger.error(f"Failed to write to evolution log: {e}")
\ No newline at end of file
+            self.agent.logger.error(f"Failed to write to evolution log: {e}")
+            return
+        # Keeps the performance rollups current without re-reading the log
+        get_evolution_rollups(self.agent.evolution_log_file).record(log_entry, start_offset, end_offset)
\ No newline at end of file
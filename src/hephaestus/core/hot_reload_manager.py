@@ -1,5 +1,10 @@
 """
 Hot Reload Manager - Sistema REAL de hot reload e auto-evolução
+
+Mudanças de arquivo são agrupadas em lotes por uma janela de silêncio. Cada lote
+recarrega os módulos alterados e todos os que dependem deles (grafo reverso de
+imports), em ordem topológica e numa única passada; os callbacks rodam uma vez,
+depois que o lote inteiro foi recarregado.
 """
 
 import logging
@@ -9,7 +14,9 @@ import sys
 import os
 import time
 import threading
-from typing import Dict, Any, List, Callable
+from collections import deque
+from types import FunctionType, ModuleType
+from typing import Dict, Any, List, Callable, Iterable, Optional, Set
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -29,16 +36,36 @@ class ModuleReloadHandler(FileSystemEventHandler):
             module_path = event.src_path
             self.reload_manager._handle_file_change(module_path)
 
+    # Gravações atômicas (arquivo temporário + rename) chegam como criação ou movimento
+    on_created = on_modified
+
+    def on_moved(self, event):
+        """Callback quando arquivo é renomeado sobre um módulo."""
+        if not event.is_directory and event.dest_path.endswith('.py'):
+            self.reload_manager._handle_file_change(event.dest_path)
+
 class HotReloadManager:
     """Gerenciador REAL de hot reload de módulos."""
     
-    def __init__(self, logger: logging.Logger):
+    def __init__(self, logger: logging.Logger, config: Optional[Dict] = None):
         self.logger = logger
-        self.watched_modules = {}  # {module_name: {"path": path, "callbacks": []}}
+        settings = (config or {}).get("hot_reload", {})
+        self.watched_modules = {}  # {module_name: {"path": path, "last_modified": mtime}}
         self.file_observer = Observer()
         self.reload_callbacks = {}  # {module_name: [callbacks]}
         self.watching = False
-        self.last_reload_times = {}  # Debounce mechanism
+        self.watch_roots: List[Path] = []  # só módulos sob estas pastas entram no grafo de imports
+        
+        # Lote pendente: arquivos alterados desde o fim da última janela de silêncio
+        self.quiet_window = float(settings.get("quiet_window_seconds", 0.5))
+        self._pending_paths: Set[str] = set()
+        self._pending_since: Optional[float] = None
+        self._batch_timer: Optional[threading.Timer] = None
+        self._batch_lock = threading.Lock()
+        self._reload_lock = threading.Lock()  # um lote por vez
+        self._batch_counter = 0
+        self.last_batch_stats: Optional[Dict[str, Any]] = None
+        self.reload_history = deque(maxlen=int(settings.get("history_size", 50)))
         
         self.logger.info("🔄 Hot Reload Manager inicializado com capacidades REAIS")
     
@@ -56,6 +83,7 @@ class HotReloadManager:
                     
                     # Watch the directory containing the module
                     watch_dir = file_path.parent
+                    self._add_watch_root(watch_dir)
                     if not self.watching:
                         self.start_watching(str(watch_dir))
                     
@@ -71,6 +99,7 @@ class HotReloadManager:
     
     def start_watching(self, directory: str):
         """Iniciar monitoramento REAL de arquivos."""
+        self._add_watch_root(directory)
         if self.watching:
             self.logger.info(f"⚠️ Já está monitorando {directory}")
             return True
@@ -88,53 +117,184 @@ class HotReloadManager:
     
     def stop_watching(self):
         """Parar monitoramento."""
+        with self._batch_lock:
+            if self._batch_timer:
+                self._batch_timer.cancel()
+                self._batch_timer = None
+            self._pending_paths.clear()
+            self._pending_since = None
         if self.watching:
             self.file_observer.stop()
             self.file_observer.join()
             self.watching = False
             self.logger.info("🛑 Monitoramento de arquivos parado")
     
+    def _add_watch_root(self, directory) -> None:
+        root = Path(directory).resolve()
+        if root not in self.watch_roots:
+            self.watch_roots.append(root)
+    
     def _handle_file_change(self, file_path: str):
-        """Lidar com mudança de arquivo (com debounce)."""
-        current_time = time.time()
+        """Acumular mudança no lote pendente e reiniciar a janela de silêncio."""
+        path = str(Path(file_path).resolve())
+        with self._batch_lock:
+            if not self._pending_paths:
+                self._pending_since = time.perf_counter()
+            self._pending_paths.add(path)
+            if self._batch_timer:
+                self._batch_timer.cancel()
+            self._batch_timer = threading.Timer(self.quiet_window, self.flush_pending_changes)
+            self._batch_timer.daemon = True
+            self._batch_timer.start()
+    
+    def flush_pending_changes(self) -> Optional[Dict[str, Any]]:
+        """Recarregar agora o lote pendente (chamado ao fim da janela de silêncio)."""
+        with self._batch_lock:
+            if self._batch_timer:
+                self._batch_timer.cancel()
+                self._batch_timer = None
+            paths, self._pending_paths = self._pending_paths, set()
+            started, self._pending_since = self._pending_since, None
+        if not paths:
+            return None
+        
+        changed = self._modules_for_paths(paths)
+        if not changed:
+            return None
+        return self._reload_batch(changed, started, changed_files=len(paths))
+    
+    def _modules_for_paths(self, paths: Set[str]) -> List[str]:
+        """Módulos carregados cujo arquivo está entre os caminhos alterados."""
+        changed = []
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None)
+            if module_file and module_file.endswith(".py") and str(Path(module_file).resolve()) in paths:
+                changed.append(name)
+        return changed
+    
+    def _reloadable_modules(self) -> Dict[str, ModuleType]:
+        """Módulos carregados de arquivos sob as pastas observadas (ou observados diretamente)."""
+        watched_paths = {info["path"] for info in self.watched_modules.values()}
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            module_file = getattr(module, "__file__", None)
+            if not isinstance(module, ModuleType) or not module_file or not module_file.endswith(".py"):
+                continue
+            path = Path(module_file).resolve()
+            if str(path) in watched_paths or any(root in path.parents for root in self.watch_roots):
+                modules[name] = module
+        return modules
+    
+    @staticmethod
+    def _module_imports(module: ModuleType) -> Set[str]:
+        """Nomes dos módulos referenciados pelos globals (``import x`` e ``from x import y``)."""
+        imports = set()
+        for value in list(vars(module).values()):
+            if isinstance(value, ModuleType):
+                imports.add(value.__name__)
+            elif isinstance(value, (type, FunctionType)):
+                # Só classes e funções: outros objetos podem ser proxies de import preguiçoso
+                owner = getattr(value, "__module__", None)
+                if isinstance(owner, str):
+                    imports.add(owner)
+        imports.discard(module.__name__)
+        return imports
+    
+    def _reload_order(self, changed: Iterable[str]) -> List[str]:
+        """Módulos alterados e seus dependentes transitivos, dependências primeiro."""
+        modules = self._reloadable_modules()
+        changed = [name for name in changed if name in sys.modules]
+        for name in changed:
+            modules.setdefault(name, sys.modules[name])
         
-        # Debounce - evitar múltiplos reloads
-        if file_path in self.last_reload_times:
-            if current_time - self.last_reload_times[file_path] < 1.0:  # 1 segundo debounce
-                return
+        # Grafo reverso: módulo -> quem o importa
+        imports = {name: self._module_imports(module) & modules.keys() for name, module in modules.items()}
+        dependents: Dict[str, Set[str]] = {name: set() for name in modules}
+        for name, deps in imports.items():
+            for dep in deps:
+                dependents[dep].add(name)
         
-        self.last_reload_times[file_path] = current_time
+        affected = set(changed)
+        frontier = list(changed)
+        while frontier:
+            for dependent in dependents[frontier.pop()]:
+                if dependent not in affected:
+                    affected.add(dependent)
+                    frontier.append(dependent)
         
-        # Encontrar módulo correspondente
-        for module_name, module_info in self.watched_modules.items():
-            if module_info["path"] == file_path:
-                self._reload_module_real(module_name)
-                break
+        # Kahn restrito aos afetados; ciclos de import entram no fim, em ordem alfabética
+        indegree = {name: len(imports[name] & affected) for name in affected}
+        ready = sorted(name for name, degree in indegree.items() if degree == 0)
+        order = []
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in sorted(dependents[name] & affected):
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+        if len(order) < len(affected):
+            cyclic = sorted(affected - set(order))
+            self.logger.warning(f"⚠️ Imports circulares no hot reload, ordem alfabética para: {', '.join(cyclic)}")
+            order.extend(cyclic)
+        return order
     
-    def _reload_module_real(self, module_name: str):
-        """Recarregar módulo de forma REAL."""
-        try:
-            if module_name in sys.modules:
-                # Salvar referências importantes antes do reload
-                old_module = sys.modules[module_name]
-                
-                # Fazer reload real
-                importlib.reload(old_module)
-                
-                # Executar callbacks de reload
-                if module_name in self.reload_callbacks:
-                    for callback in self.reload_callbacks[module_name]:
-                        try:
-                            callback(module_name, old_module, sys.modules[module_name])
-                        except Exception as e:
-                            self.logger.error(f"❌ Erro em callback de reload: {e}")
-                
-                self.logger.info(f"🔄 Módulo {module_name} recarregado com SUCESSO")
-                return True
-                
-        except Exception as e:
-            self.logger.error(f"❌ Erro recarregando {module_name}: {e}")
-        return False
+    def _reload_batch(self, changed: List[str], started: Optional[float] = None,
+                      changed_files: int = 0) -> Dict[str, Any]:
+        """Recarregar o lote numa passada e depois disparar os callbacks uma única vez."""
+        with self._reload_lock:
+            pass_started = time.perf_counter()
+            started = started if started is not None else pass_started
+            order = self._reload_order(changed)
+            
+            reloaded, failed = [], {}
+            previous = {}
+            for module_name in order:
+                module = sys.modules.get(module_name)
+                if module is None:
+                    continue
+                previous[module_name] = module
+                try:
+                    importlib.reload(module)
+                    reloaded.append(module_name)
+                    module_file = getattr(module, "__file__", None)
+                    if module_name in self.watched_modules and module_file:
+                        self.watched_modules[module_name]["last_modified"] = os.path.getmtime(module_file)
+                except Exception as e:
+                    failed[module_name] = str(e)
+                    self.logger.error(f"❌ Erro recarregando {module_name}: {e}")
+            reload_seconds = time.perf_counter() - pass_started
+            
+            # Fan-out único: cada callback vê o lote inteiro já recarregado
+            for module_name in reloaded:
+                for callback in self.reload_callbacks.get(module_name, []):
+                    try:
+                        callback(module_name, previous[module_name], sys.modules[module_name])
+                    except Exception as e:
+                        self.logger.error(f"❌ Erro em callback de reload: {e}")
+            
+            self._batch_counter += 1
+            stats = {
+                "batch_id": self._batch_counter,
+                "timestamp": time.time(),
+                "changed_files": changed_files,
+                "changed_modules": sorted(changed),
+                "reload_order": reloaded,
+                "failed": failed,
+                "modules_reloaded": len(reloaded),
+                "reload_seconds": reload_seconds,
+                # Da primeira mudança do lote até o fim dos callbacks (inclui a janela de silêncio)
+                "latency_seconds": time.perf_counter() - started,
+            }
+            self.last_batch_stats = stats
+            self.reload_history.append(stats)
+        
+        self.logger.info(
+            f"🔄 Lote #{stats['batch_id']} de hot reload: {len(reloaded)} módulo(s) recarregado(s) "
+            f"em {reload_seconds * 1000:.1f} ms (latência {stats['latency_seconds'] * 1000:.1f} ms)"
+            + (f", {len(failed)} falha(s)" if failed else "")
+        )
+        return stats
     
     def register_reload_callback(self, module_name: str, callback: Callable):
         """Registrar callback para ser executado após reload."""
@@ -145,13 +305,29 @@ class HotReloadManager:
         self.logger.info(f"📋 Callback registrado para módulo {module_name}")
     
     def force_reload(self, module_name: str):
-        """Forçar reload manual de um módulo."""
-        return self._reload_module_real(module_name)
+        """Forçar reload manual de um módulo (e dos módulos que dependem dele)."""
+        if module_name not in sys.modules:
+            return False
+        stats = self._reload_batch([module_name])
+        return module_name in stats["reload_order"]
     
     def get_watched_modules(self) -> Dict[str, Dict]:
         """Obter lista de módulos sendo monitorados."""
         return self.watched_modules.copy()
     
+    def get_reload_stats(self) -> Dict[str, Any]:
+        """Latência e módulos recarregados por lote (últimos lotes)."""
+        history = list(self.reload_history)
+        latencies = sorted(batch["latency_seconds"] for batch in history)
+        return {
+            "batches": self._batch_counter,
+            "pending_files": len(self._pending_paths),
+            "last_batch": self.last_batch_stats,
+            "avg_modules_per_batch": (sum(b["modules_reloaded"] for b in history) / len(history)) if history else 0.0,
+            "median_latency_seconds": latencies[len(latencies) // 2] if latencies else None,
+            "history": history,
+        }
+    
     def __del__(self):
         """Cleanup ao destruir objeto."""
         self.stop_watching()
@@ -228,31 +404,29 @@ class SelfEvolutionEngine:
     
     def _collect_system_metrics(self) -> Dict[str, Any]:
         """Coletar métricas REAIS do sistema."""
-        import psutil
         import gc
+        from hephaestus.utils.system_metrics import get_system_metrics_sampler
         
         try:
-            # Métricas de sistema
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
+            # Métricas de sistema (amostra compartilhada, sem bloquear)
+            snapshot = get_system_metrics_sampler().latest()
             
             # Métricas de Python
             gc_stats = gc.get_stats()
             
             metrics = {
-                'cpu_usage': cpu_percent,
-                'memory_usage': memory.percent,
-                'memory_available': memory.available,
-                'disk_usage': disk.percent,
+                'cpu_usage': snapshot.cpu_percent,
+                'memory_usage': snapshot.memory_percent,
+                'memory_available': snapshot.memory_available,
+                'disk_usage': snapshot.disk_usage_percent,
                 'gc_collections': sum(stat['collections'] for stat in gc_stats),
-                'thread_count': threading.active_count(),
-                'timestamp': time.time()
+                'thread_count': snapshot.active_threads,
+                'timestamp': snapshot.timestamp
             }
             
             # Adicionar às séries históricas
-            self.metrics['cpu_usage'].append(cpu_percent)
-            self.metrics['memory_usage'].append(memory.percent)
+            self.metrics['cpu_usage'].append(snapshot.cpu_percent)
+            self.metrics['memory_usage'].append(snapshot.memory_percent)
             
             # Manter apenas últimos 50 valores
             for key in self.metrics:
@@ -3,6 +3,7 @@ import datetime
 import os
 import re
 import hashlib
+import threading
 from typing import List, Dict, Any, Optional, Set, Tuple
 from datetime import timezone # Adicionado
 from collections import defaultdict, Counter
@@ -72,6 +73,8 @@ class Memory:
         self.acquired_capabilities: List[Dict[str, Any]] = []
         self.recent_objectives_log: List[Dict[str, Any]] = [] # Novo atributo
         self.cycle_count: int = 0
+        # Guards the history lists: SharedMemorySync merges into them from a background thread
+        self.lock = threading.RLock()
         
         # Advanced memory features
         self.semantic_patterns: Dict[str, SemanticPattern] = {}
@@ -135,6 +138,10 @@ class Memory:
         """
         Saves the current memory state to the JSON file.
         """
+        with self.lock:
+            self._save()
+
+    def _save(self) -> None:
         data = {
             "completed_objectives": self.completed_objectives,
             "failed_objectives": self.failed_objectives,
@@ -170,8 +177,9 @@ class Memory:
             "date": self._get_timestamp(),
             "status": "completed"  # Adicionado status
         }
-        self.completed_objectives.append(record)
-        self._add_to_recent_objectives_log(objective, "success")
+        with self.lock:
+            self.completed_objectives.append(record)
+            self._add_to_recent_objectives_log(objective, "success")
 
     def _add_to_recent_objectives_log(self, objective: str, status: str, reason: Optional[str] = None) -> None:
         """Helper method to add to the recent objectives log and keep it trimmed."""
@@ -254,8 +262,9 @@ class Memory:
             "date": self._get_timestamp(),
             "status": "failed"  # Adicionado status
         }
-        self.failed_objectives.append(record)
-        self._add_to_recent_objectives_log(objective, "failure", reason=reason)
+        with self.lock:
+            self.failed_objectives.append(record)
+            self._add_to_recent_objectives_log(objective, "failure", reason=reason)
 
     def add_capability(self, capability_description: str, related_objective: Optional[str] = None) -> None:
         """
@@ -270,7 +279,33 @@ class Memory:
             "related_objective": related_objective,
             "date": self._get_timestamp()
         }
-        self.acquired_capabilities.append(record)
+        with self.lock:
+            self.acquired_capabilities.append(record)
+
+    def merge_shared_records(self, attribute: str, records: List[Dict[str, Any]]) -> int:
+        """
+        Merges history records published by other agent instances.
+
+        Args:
+            attribute: "completed_objectives", "failed_objectives" or "acquired_capabilities".
+            records: Records in the same format produced by the add_* methods.
+
+        Returns:
+            The number of records that were not already present.
+        """
+        with self.lock:
+            target: List[Dict[str, Any]] = getattr(self, attribute)
+            seen = {(r.get("objective") or r.get("description"), r.get("date")) for r in target}
+            added = 0
+            for record in records:
+                identity = (record.get("objective") or record.get("description"), record.get("date"))
+                if identity not in seen:
+                    seen.add(identity)
+                    target.append(record)
+                    added += 1
+            if added:
+                target.sort(key=lambda r: r.get("date", ""))
+            return added
 
     def get_history_summary(self, max_items_per_category: int = 3) -> str:
         """
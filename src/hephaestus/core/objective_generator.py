@@ -9,7 +9,9 @@ from hephaestus.core.prompt_builder import (
     build_memory_context_section,
     build_initial_objective_prompt,
     build_meta_analysis_objective_prompt,
-    build_standard_objective_prompt
+    build_standard_objective_prompt,
+    document_cache,
+    format_token_report
 )
 from hephaestus.core.memory import Memory
 from hephaestus.intelligence.model_optimizer import ModelOptimizer
@@ -33,12 +35,9 @@ def generate_next_objective(
 
     config = config or {}
 
-    # Read strategic documents
-    capabilities_content = ""
+    # Read strategic documents (relidos só quando o arquivo muda em disco)
     try:
-        with open("docs/CAPABILITIES.md", "r", encoding="utf-8") as f:
-            capabilities_content = f.read()
-        if logger: logger.info("docs/CAPABILITIES.md lido com sucesso.")
+        capabilities_content = document_cache.read("docs/CAPABILITIES.md")
     except FileNotFoundError:
         if logger: logger.warning("docs/CAPABILITIES.md não encontrado.")
         capabilities_content = "CAPABILITIES.md não encontrado."
@@ -46,11 +45,8 @@ def generate_next_objective(
         if logger: logger.error(f"Erro ao ler docs/CAPABILITIES.md: {e}")
         capabilities_content = f"Erro ao ler CAPABILITIES.md: {e}"
 
-    roadmap_content = ""
     try:
-        with open("docs/ROADMAP.md", "r", encoding="utf-8") as f:
-            roadmap_content = f.read()
-        if logger: logger.info("docs/ROADMAP.md lido com sucesso.")
+        roadmap_content = document_cache.read("docs/ROADMAP.md")
     except FileNotFoundError:
         if logger: logger.warning("docs/ROADMAP.md não encontrado.")
         roadmap_content = "ROADMAP.md não encontrado."
@@ -60,11 +56,9 @@ def generate_next_objective(
 
     # Read dashboard content for context
     dashboard_content = ""
+    dashboard_path = "templates/dashboard.html"
     try:
-        dashboard_path = "templates/dashboard.html"
-        with open(dashboard_path, "r", encoding="utf-8") as f:
-            dashboard_content = f.read()
-        if logger: logger.info(f"{dashboard_path} read successfully for context.")
+        dashboard_content = document_cache.read(dashboard_path)
     except Exception as e:
         if logger: logger.warning(f"Could not read {dashboard_path}: {e}")
 
@@ -149,6 +143,7 @@ def generate_next_objective(
     prompt: str
     if not current_manifest.strip() and not code_analysis_summary_str.strip(): # First cycle, no analysis
         prompt = build_initial_objective_prompt(memory_context_section)
+        template_name = "initial_objective"
     else:
         if current_objective and current_objective.startswith("[META-ANALYSIS OBJECTIVE]"):
             logger.info(f"Meta-analysis objective detected: {current_objective}")
@@ -164,6 +159,7 @@ def generate_next_objective(
                 capabilities_content=capabilities_content,
                 roadmap_content=roadmap_content
             )
+            template_name = "meta_analysis_objective"
         else:
             prompt = build_standard_objective_prompt(
                 memory_context_section=memory_context_section,
@@ -174,8 +170,11 @@ def generate_next_objective(
                 roadmap_content=roadmap_content,
                 dashboard_content=dashboard_content
             )
+            template_name = "standard_objective"
 
-    if logger: logger.debug(f"Prompt for generate_next_objective:\n{prompt}")
+    if logger:
+        logger.debug(format_token_report(template_name))
+        logger.debug(f"Prompt for generate_next_objective:\n{prompt}")
 
     # 4. Call LLM API using the centralized function
     content, error = call_llm_api(
@@ -3,24 +3,42 @@
 The functions here are used by the agent to modify project files.  Each
 instruction describes an ``INSERT``, ``REPLACE`` or ``DELETE_BLOCK``
 operation and this module executes them.
+
+Instructions are grouped by file and applied to an in-memory buffer: each
+file is read once, Python targets are compiled before anything touches disk
+and every file is then committed with a single atomic write-rename.
 """
 
 import os
 import re
 import logging
+import shutil
 from pathlib import Path
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Tuple, Type
+from typing import List, Dict, Any, Optional, Tuple, Type
+
+
+class PatchValidationError(ValueError):
+    """The patch set would leave one or more Python files unparsable; nothing was written."""
+
+    def __init__(self, errors: Dict[str, str]):
+        self.errors = errors
+        details = "; ".join(f"{path}: {error}" for path, error in errors.items())
+        super().__init__(f"Patch set produces invalid Python syntax: {details}")
 
 
 class PatchOperationHandler(ABC):
     """Abstract base class for a patch operation handler."""
 
-    def __init__(self, full_path: Path, lines: List[str], instruction: Dict[str, Any], logger: logging.Logger):
+    def __init__(self, full_path: Path, lines: List[str], instruction: Dict[str, Any], logger: logging.Logger,
+                 exists: Optional[bool] = None):
         self.full_path = full_path
         self.lines = lines
         self.instruction = instruction
         self.logger = logger
+        # Estado do arquivo no buffer (pode diferir do disco no meio de um lote)
+        self.exists = full_path.exists() if exists is None else exists
+        self.delete_file = False
 
     @abstractmethod
     def execute(self) -> Tuple[bool, List[str], bool]:
@@ -113,7 +131,7 @@ class ReplaceHandler(PatchOperationHandler):
                     f"Bloco literal '{pattern}' substituído em '{self.full_path}'.")
                 replaced = True
             else:
-                if self.full_path.exists():
+                if self.exists:
                     self.logger.warning(
                         f"Bloco literal '{pattern}' não encontrado em '{self.full_path}' para REPLACE.")
                 else:
@@ -121,10 +139,10 @@ class ReplaceHandler(PatchOperationHandler):
                         f"Tentativa de REPLACE de bloco específico '{pattern}' em arquivo inexistente '{self.full_path}'. Pulando.")
                     return False, self.lines, True
 
-        if not replaced and self.full_path.exists():
+        if not replaced and self.exists:
             self.logger.warning(
                 f"Nenhuma substituição realizada para '{pattern}' em '{self.full_path}'.")
-        elif not self.full_path.exists():
+        elif not self.exists:
             self.logger.info(f"Arquivo '{self.full_path}' será criado com o novo conteúdo.")
 
         return True, self.lines, False
@@ -134,14 +152,12 @@ class DeleteBlockHandler(PatchOperationHandler):
     def execute(self) -> Tuple[bool, List[str], bool]:
         pattern = self.instruction.get("block_to_delete")
         if pattern is None:
-            if self.full_path.exists():
-                try:
-                    os.remove(self.full_path)
-                    self.logger.info(
-                        f"Arquivo '{self.full_path}' removido com sucesso (DELETE_BLOCK com block_to_delete=None).")
-                except Exception as e:
-                    self.logger.error(f"Falha ao remover arquivo '{self.full_path}': {e}")
-                    return False, self.lines, True
+            if self.exists:
+                # A remoção acontece no commit do lote, junto com as escritas
+                self.delete_file = True
+                self.logger.info(
+                    f"Arquivo '{self.full_path}' marcado para remoção (DELETE_BLOCK com block_to_delete=None).")
+                return True, [], True
             else:
                 self.logger.warning(
                     f"Arquivo '{self.full_path}' não existe. Nada para deletar com DELETE_BLOCK.")
@@ -152,7 +168,7 @@ class DeleteBlockHandler(PatchOperationHandler):
                 f"Operação DELETE_BLOCK para '{self.full_path}' não especificou 'block_to_delete' válido. Pulando.")
             return False, self.lines, True
 
-        if not self.full_path.exists():
+        if not self.exists:
             self.logger.warning(
                 f"Arquivo '{self.full_path}' não existe. Nada para deletar com DELETE_BLOCK.")
             return True, self.lines, True
@@ -202,7 +218,7 @@ class DeleteBlockHandler(PatchOperationHandler):
         if deleted:
             self.logger.debug(
                 f"Bloco removido para '{pattern}' em '{self.full_path}'.")
-        elif self.full_path.exists():
+        elif self.exists:
             self.logger.warning(
                 f"Nenhuma deleção realizada para '{pattern}' em '{self.full_path}'.")
 
@@ -220,17 +236,75 @@ def get_handler(operation: str) -> Type[PatchOperationHandler]:
         raise ValueError(f"Operação desconhecida: {operation}")
     return handler
 
+class _FileBuffer:
+    """Conteúdo de um arquivo durante a aplicação de um lote de patches."""
+
+    __slots__ = ("full_path", "lines", "exists", "dirty", "delete")
+
+    def __init__(self, full_path: Path):
+        self.full_path = full_path
+        self.exists = full_path.exists()
+        self.lines: List[str] = []
+        if self.exists:
+            with open(full_path, "r", encoding="utf-8") as f:
+                self.lines = f.read().splitlines()
+        self.dirty = False
+        self.delete = False
+
+    @property
+    def content(self) -> str:
+        return "\n".join(self.lines)
+
+
+def _syntax_errors(buffers: Dict[Path, _FileBuffer]) -> Dict[str, str]:
+    """Compila em memória os arquivos Python que serão escritos; devolve os erros por arquivo."""
+    errors = {}
+    for full_path, buffer in buffers.items():
+        if full_path.suffix != ".py" or not (buffer.dirty and buffer.exists):
+            continue
+        try:
+            compile(buffer.content, str(full_path), "exec", dont_inherit=True)
+        except (SyntaxError, ValueError) as e:
+            line = f" (linha {e.lineno})" if getattr(e, "lineno", None) else ""
+            errors[str(full_path)] = f"{getattr(e, 'msg', e)}{line}"
+    return errors
+
+
+def _atomic_write(full_path: Path, content: str):
+    """Grava em um arquivo temporário no mesmo diretório e renomeia por cima do destino."""
+    full_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = full_path.with_name(f".{full_path.name}.{os.getpid()}.tmp")
+    try:
+        # O modo 0o666 respeita a umask, como um open() comum faria para um arquivo novo
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(content)
+        if full_path.exists():
+            shutil.copymode(full_path, tmp_path)
+        os.replace(tmp_path, full_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+
 def apply_patches(instructions: List[Dict[str, Any]], logger: logging.Logger, base_path: str = "."):
     """
     Aplica uma lista de instruções de patch aos arquivos.
+
+    As instruções são agrupadas por arquivo (mantendo a ordem de cada arquivo) e
+    aplicadas em memória. Antes de qualquer escrita, os alvos ``.py`` são
+    compilados; se algum deles ficaria inválido, ``PatchValidationError`` é
+    levantada e nenhum arquivo é alterado. Depois, cada arquivo é gravado uma
+    única vez com escrita atômica (arquivo temporário + rename).
     """
     overall_success = True
-    processed_files = set()
+    buffers: Dict[Path, _FileBuffer] = {}
 
     if base_path != ".":
         logger.info(f"Aplicando patches com base_path: '{Path(base_path).resolve()}'")
     else:
         logger.info("Aplicando patches com base_path: '.' (diretório atual)")
+    root = Path(base_path).resolve()
 
     for i, instruction in enumerate(instructions):
         file_path_str = instruction.get("file_path")
@@ -243,35 +317,31 @@ def apply_patches(instructions: List[Dict[str, Any]], logger: logging.Logger, ba
             continue
 
         normalized = Path(os.path.normpath(file_path_str))
-        full_path = Path(base_path).resolve() / normalized
-        processed_files.add(str(full_path))
+        full_path = root / normalized
 
         logger.info(f"Processando patch {i+1}/{len(instructions)}: {operation} em '{full_path}'")
 
-        lines: List[str] = []
-        if full_path.exists():
-            with open(full_path, "r", encoding="utf-8") as f:
-                lines = f.read().splitlines()
-        elif operation not in ["INSERT", "REPLACE"]:
-            logger.warning(
-                f"Operação '{operation}' em arquivo inexistente '{full_path}'. Pulando.")
-            continue
-        
-        full_path.parent.mkdir(parents=True, exist_ok=True)
-
         try:
+            buffer = buffers.get(full_path)
+            if buffer is None:
+                buffer = buffers[full_path] = _FileBuffer(full_path)
+
+            if not buffer.exists and operation not in ["INSERT", "REPLACE"]:
+                logger.warning(
+                    f"Operação '{operation}' em arquivo inexistente '{full_path}'. Pulando.")
+                continue
+
             handler_class = get_handler(operation)
-            handler = handler_class(full_path, lines, instruction, logger)
+            handler = handler_class(full_path, list(buffer.lines), instruction, logger, exists=buffer.exists)
             success, new_lines, skip_write = handler.execute()
 
             if not success:
                 overall_success = False
-            
-            if not skip_write:
-                with open(full_path, "w", encoding="utf-8") as f:
-                    f.write("\n".join(new_lines))
-                logger.info(
-                    f"Arquivo '{full_path}' salvo após operação '{operation}'.")
+
+            if handler.delete_file:
+                buffer.lines, buffer.exists, buffer.dirty, buffer.delete = [], False, False, True
+            elif not skip_write:
+                buffer.lines, buffer.exists, buffer.dirty = new_lines, True, True
 
         except ValueError as e:
             logger.error(f"Erro ao processar patch {i+1}: {e}")
@@ -282,9 +352,33 @@ def apply_patches(instructions: List[Dict[str, Any]], logger: logging.Logger, ba
             overall_success = False
             continue
 
+    errors = _syntax_errors(buffers)
+    if errors:
+        for path, error in errors.items():
+            logger.error(f"Patch deixaria '{path}' com sintaxe inválida: {error}")
+        logger.error(f"Nenhum arquivo foi alterado: {len(errors)} arquivo(s) Python inválido(s) após os patches.")
+        raise PatchValidationError(errors)
+
+    written = []
+    for full_path, buffer in buffers.items():
+        try:
+            if buffer.exists and buffer.dirty:
+                _atomic_write(full_path, buffer.content)
+                written.append(str(full_path))
+                logger.info(f"Arquivo '{full_path}' salvo após o lote de patches.")
+            elif buffer.delete and full_path.exists():
+                os.remove(full_path)
+                written.append(str(full_path))
+                logger.info(f"Arquivo '{full_path}' removido com sucesso.")
+        except OSError as e:
+            logger.error(f"Falha ao gravar '{full_path}': {e}")
+            overall_success = False
+
+    processed_files = {str(path) for path in buffers}
     if overall_success:
         logger.info(
-            f"Todas as {len(instructions)} instruções de patch processadas. Arquivos afetados (tentativas): {processed_files}")
+            f"Todas as {len(instructions)} instruções de patch processadas em {len(written)} gravação(ões). "
+            f"Arquivos afetados (tentativas): {processed_files}")
     else:
         logger.warning(
             f"Algumas instruções de patch falharam ou foram puladas. Verifique os logs. Arquivos afetados (tentativas): {processed_files}")
@@ -307,6 +401,9 @@ class PatchApplicator:
             
         Returns:
             True if all patches were applied successfully, False otherwise
+
+        Raises:
+            PatchValidationError: if the patches would leave a Python file unparsable
         """
         return apply_patches(instructions, self.logger, self.base_path)
     
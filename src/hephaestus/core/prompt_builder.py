@@ -1,7 +1,177 @@
-# Este módulo conterá funções para construir os diversos prompts
-# usados pela função generate_next_objective em agent/brain.py.
+# Este módulo contém as funções que constroem os diversos prompts
+# usados pela função generate_next_objective em core/objective_generator.py.
+#
+# Os templates são pré-compilados uma única vez em trechos literais e seções.
+# Cada seção é renderizada a partir do seu conteúdo de origem e guardada num
+# cache indexado pelo hash desse conteúdo: a cada chamada só as seções que
+# mudaram são renderizadas de novo, e o prompt é montado juntando os
+# fragmentos em cache. Cada montagem registra um relatório de tokens por seção.
+
+import hashlib
+import os
+import threading
+from dataclasses import dataclass
+from string import Formatter
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Mesma heurística de orçamento do llm_client (~4 caracteres por token)
+CHARS_PER_TOKEN = 4
+
+
+def estimate_prompt_tokens(text: str) -> int:
+    """Estimativa aproximada de tokens de um trecho de prompt."""
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def content_digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+
+@dataclass
+class SectionReport:
+    """Custo de uma seção na última montagem do template."""
+    section: str
+    chars: int
+    tokens: int
+    cached: bool
+
+
+class PromptTemplate:
+    """
+    Template pré-compilado: trechos literais intercalados com seções ``{nome}``.
+
+    ``renderers`` transforma o conteúdo de origem de uma seção no fragmento que
+    entra no prompt (padrão: o próprio conteúdo). O fragmento de cada seção é
+    reaproveitado enquanto o hash do conteúdo de origem não mudar.
+    """
+
+    def __init__(self, name: str, text: str,
+                 renderers: Optional[Dict[str, Callable[[str], str]]] = None):
+        self.name = name
+        self.renderers = renderers or {}
+        # [(literal, seção ou None)], calculado uma única vez
+        self.parts: List[Tuple[str, Optional[str]]] = [
+            (literal, field) for literal, field, _, _ in Formatter().parse(text)
+        ]
+        self.sections = [field for _, field in self.parts if field is not None]
+        literals = "".join(literal for literal, _ in self.parts)
+        self.literal_chars = len(literals)
+        self.literal_tokens = estimate_prompt_tokens(literals)
+
+        # seção -> (valor de origem, hash, fragmento)
+        self._fragments: Dict[str, Tuple[str, str, str]] = {}
+        self._lock = threading.Lock()
+        self.last_report: List[SectionReport] = []
+        self.stats = {"renders": 0, "section_renders": 0, "section_hits": 0}
+
+    def _fragment(self, section: str, value: str) -> Tuple[str, bool]:
+        cached = self._fragments.get(section)
+        if cached is not None:
+            # Mesmo objeto (ex.: documento lido do cache): nem precisa de hash
+            if cached[0] is value:
+                return cached[2], True
+            digest = content_digest(value)
+            if cached[1] == digest:
+                self._fragments[section] = (value, digest, cached[2])
+                return cached[2], True
+        else:
+            digest = content_digest(value)
+        renderer = self.renderers.get(section)
+        fragment = renderer(value) if renderer else value
+        self._fragments[section] = (value, digest, fragment)
+        return fragment, False
+
+    def render(self, **values: str) -> str:
+        """Monta o prompt; ``values`` traz o conteúdo de origem de cada seção."""
+        missing = [section for section in self.sections if section not in values]
+        if missing:
+            raise KeyError(f"Prompt template '{self.name}' is missing sections: {', '.join(missing)}")
+
+        with self._lock:
+            pieces: List[str] = []
+            report: Dict[str, SectionReport] = {}
+            for literal, section in self.parts:
+                pieces.append(literal)
+                if section is None:
+                    continue
+                fragment, cached = self._fragment(section, values[section] or "")
+                pieces.append(fragment)
+                if section not in report:
+                    report[section] = SectionReport(section, 0, 0, cached)
+                entry = report[section]
+                entry.chars += len(fragment)
+                entry.tokens += estimate_prompt_tokens(fragment)
+                self.stats["section_hits" if cached else "section_renders"] += 1
+
+            self.stats["renders"] += 1
+            self.last_report = [
+                SectionReport("(template)", self.literal_chars, self.literal_tokens, True)
+            ] + list(report.values())
+            return "".join(pieces)
+
+    def token_report(self) -> List[Dict[str, object]]:
+        """Tokens por seção na última montagem, da mais cara para a mais barata."""
+        total = sum(entry.tokens for entry in self.last_report) or 1
+        return [
+            {
+                "section": entry.section,
+                "chars": entry.chars,
+                "tokens": entry.tokens,
+                "share": round(entry.tokens / total, 3),
+                "cached": entry.cached,
+            }
+            for entry in sorted(self.last_report, key=lambda entry: entry.tokens, reverse=True)
+        ]
+
+
+class DocumentCache:
+    """
+    Conteúdo de arquivos usados nos prompts (CAPABILITIES, ROADMAP, dashboard).
+
+    O arquivo só é relido quando ``mtime``/tamanho mudam; enquanto isso é
+    devolvido o mesmo objeto ``str``, o que permite ao template reconhecer a
+    seção como inalterada sem recalcular o hash.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Tuple[int, int], str]] = {}
+        self._lock = threading.Lock()
+
+    def read(self, path: str) -> str:
+        """Lê ``path`` (propaga ``OSError``, como ``open``)."""
+        stat = os.stat(path)
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        with self._lock:
+            self._entries[path] = (key, content)
+        return content
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+document_cache = DocumentCache()
+
+
+def format_token_report(template_name: str) -> str:
+    """Relatório legível de tokens por seção da última montagem do template."""
+    template = PROMPT_TEMPLATES[template_name]
+    lines = [f"Prompt '{template_name}' token report:"]
+    for entry in template.token_report():
+        status = "cached" if entry["cached"] else "rendered"
+        lines.append(f"  - {entry['section']}: ~{entry['tokens']} tokens ({entry['share']:.0%}, {status})")
+    return "\n".join(lines)
+
+
+def get_prompt_token_report(template_name: str) -> List[Dict[str, object]]:
+    return PROMPT_TEMPLATES[template_name].token_report()
 
-from typing import Optional
 
 def build_memory_context_section(memory_summary: Optional[str]) -> str:
     """
@@ -18,11 +188,7 @@ Consider this history to avoid repeating failures, build on successes, and ident
     return memory_context_section
 
 
-def build_initial_objective_prompt(memory_context_section: str) -> str:
-    """
-    Constrói o prompt para gerar o objetivo inicial quando não há manifesto ou análise de código.
-    """
-    prompt_template = """
+INITIAL_OBJECTIVE_TEMPLATE = PromptTemplate("initial_objective", """
 [Context]
 You are the 'Planejador Estratégico' do agente autônomo Hephaestus. Este é o primeiro ciclo de execução, o manifesto do projeto ainda não existe e a análise de código não retornou dados significativos. Sua tarefa é propor um objetivo inicial para criar documentação básica do projeto ou realizar uma análise inicial.
 {memory_section}
@@ -34,23 +200,9 @@ You are the 'Planejador Estratégico' do agente autônomo Hephaestus. Este é o
 
 [Your Task]
 Generate ONLY a single text string containing the initial objective. Be concise and direct.
-"""
-    return prompt_template.format(memory_section=memory_context_section)
+""")
 
-
-def build_meta_analysis_objective_prompt(
-    current_objective: str,
-    original_failed_objective: str,
-    error_reason_for_meta: str,
-    performance_summary_str: str,
-    memory_context_section: str,
-    capabilities_content: str,
-    roadmap_content: str
-) -> str:
-    """
-    Constrói o prompt para gerar um objetivo estratégico após uma meta-análise de falha.
-    """
-    meta_analysis_prompt_template = f"""
+META_ANALYSIS_OBJECTIVE_TEMPLATE = PromptTemplate("meta_analysis_objective", """
 [Main Context]
 You are the 'Meta-Strategic Planner' for the Hephaestus agent. Your task is to perform a deep meta-analysis of a previous failure and propose a new, more strategic objective to address the root cause, rather than just fixing the symptom.
 
@@ -96,25 +248,9 @@ Based on the meta-analysis objective, the original failure details, and the over
 
 [REQUIRED FORMAT]
 Generate ONLY a single text string containing the NEXT STRATEGIC OBJECTIVE. Be concise, but specific enough to be actionable.
-"""
-    # Note: The original code directly assigned this template to `prompt`.
-    # Here, we return it so it can be assigned to `prompt` in the calling function.
-    return meta_analysis_prompt_template
-
+""")
 
-def build_standard_objective_prompt(
-    memory_context_section: str,
-    performance_summary_str: str,
-    code_analysis_summary_str: str,
-    current_manifest: str,
-    capabilities_content: str,
-    roadmap_content: str,
-    dashboard_content: str
-) -> str:
-    """
-    Constrói o prompt padrão para gerar o próximo objetivo estratégico.
-    """
-    prompt_template = """
+STANDARD_OBJECTIVE_TEMPLATE = PromptTemplate("standard_objective", """
 [Main Context]
 You are the 'Planejador Estratégico Avançado' do agente autônomo Hephaestus. Sua principal responsabilidade é identificar e propor o próximo objetivo de desenvolvimento mais impactante para a evolução do agente ou do projeto em análise.
 
@@ -203,13 +339,65 @@ You are the 'Planejador Estratégico Avançado' do agente autônomo Hephaestus.
 [Your Task]
 Based on ALL the information provided (metrics, manifest, history), generate ONLY a single text string containing the NEXT STRATEGIC OBJECTIVE. The objective should be the most impactful and logical for the project's evolution at this moment.
 Be concise, but specific enough to be actionable.
-"""
-    return prompt_template.format(
+""", renderers={
+    "current_manifest": lambda manifest: manifest if manifest.strip() else "N/A (Manifesto non-existent or empty)",
+    "dashboard_content": lambda dashboard: dashboard if dashboard.strip() else "N/A (Dashboard file not found or empty)",
+})
+
+PROMPT_TEMPLATES: Dict[str, PromptTemplate] = {
+    template.name: template
+    for template in (INITIAL_OBJECTIVE_TEMPLATE, META_ANALYSIS_OBJECTIVE_TEMPLATE, STANDARD_OBJECTIVE_TEMPLATE)
+}
+
+
+def build_initial_objective_prompt(memory_context_section: str) -> str:
+    """
+    Constrói o prompt para gerar o objetivo inicial quando não há manifesto ou análise de código.
+    """
+    return INITIAL_OBJECTIVE_TEMPLATE.render(memory_section=memory_context_section)
+
+
+def build_meta_analysis_objective_prompt(
+    current_objective: str,
+    original_failed_objective: str,
+    error_reason_for_meta: str,
+    performance_summary_str: str,
+    memory_context_section: str,
+    capabilities_content: str,
+    roadmap_content: str
+) -> str:
+    """
+    Constrói o prompt para gerar um objetivo estratégico após uma meta-análise de falha.
+    """
+    return META_ANALYSIS_OBJECTIVE_TEMPLATE.render(
+        current_objective=current_objective,
+        original_failed_objective=original_failed_objective,
+        error_reason_for_meta=error_reason_for_meta,
+        performance_summary_str=performance_summary_str,
+        memory_context_section=memory_context_section,
+        capabilities_content=capabilities_content,
+        roadmap_content=roadmap_content
+    )
+
+
+def build_standard_objective_prompt(
+    memory_context_section: str,
+    performance_summary_str: str,
+    code_analysis_summary_str: str,
+    current_manifest: str,
+    capabilities_content: str,
+    roadmap_content: str,
+    dashboard_content: str
+) -> str:
+    """
+    Constrói o prompt padrão para gerar o próximo objetivo estratégico.
+    """
+    return STANDARD_OBJECTIVE_TEMPLATE.render(
         memory_section=memory_context_section,
         performance_summary=performance_summary_str,
         code_analysis_summary=code_analysis_summary_str,
-        current_manifest=current_manifest if current_manifest.strip() else "N/A (Manifesto non-existent or empty)",
+        current_manifest=current_manifest,
         capabilities_content=capabilities_content,
         roadmap_content=roadmap_content,
-        dashboard_content=dashboard_content if dashboard_content.strip() else "N/A (Dashboard file not found or empty)"
-    )
\ No newline at end of file
+        dashboard_content=dashboard_content
+    )
@@ -0,0 +1,205 @@
+"""
+Service Container - Grafo de subsistemas instanciados sob demanda
+
+Cada subsistema do agente é declarado com uma fábrica, suas dependências e o
+perfil de inicialização a que pertence:
+
+- ``minimal``: só o necessário para o agente existir (estado, memória, fila)
+- ``cycle``: o que o ciclo de evolução usa em toda execução
+- ``full``: todos os subsistemas de inteligência em background
+
+``start_profile`` instancia os serviços até o perfil pedido; qualquer outro é
+criado no primeiro acesso. O tempo de construção de cada serviço (sem contar
+suas dependências) e das importações adiadas fica disponível em
+``startup_report``.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hephaestus.utils.lazy_import import import_timings
+
+PROFILES = ("minimal", "cycle", "full")
+
+
+class ServiceResolutionError(RuntimeError):
+    """Erro ao resolver um serviço (desconhecido ou com dependência circular)"""
+
+
+@dataclass
+class ServiceSpec:
+    """Declaração de um subsistema"""
+    name: str
+    factory: Callable[[], Any]
+    depends_on: Tuple[str, ...] = ()
+    profile: str = "full"
+
+
+@dataclass
+class ServiceTiming:
+    """Tempo de construção de um serviço"""
+    name: str
+    seconds: float
+    profile: str
+    trigger: str  # "profile" ou "on_demand"
+    dependencies: List[str] = field(default_factory=list)
+
+
+class ServiceContainer:
+    """Registro de subsistemas com instanciação preguiçosa e relatório de inicialização"""
+
+    def __init__(self, logger: logging.Logger):
+        self.logger = logger.getChild("ServiceContainer")
+        self._specs: Dict[str, ServiceSpec] = {}
+        self._instances: Dict[str, Any] = {}
+        self._timings: Dict[str, ServiceTiming] = {}
+        self._resolving: List[str] = []
+        self._child_seconds: List[float] = []
+        self._lock = threading.RLock()
+        self._trigger = "on_demand"
+        self._imports_before = set(import_timings)
+        self.profile: Optional[str] = None
+        self.profile_seconds = 0.0
+
+    def register(self, name: str, factory: Callable[[], Any], depends_on: Tuple[str, ...] = (),
+                 profile: str = "full"):
+        """Declara um serviço; a fábrica só roda no primeiro acesso ou ao iniciar o perfil"""
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of {PROFILES}")
+        self._specs[name] = ServiceSpec(name, factory, tuple(depends_on), profile)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs or name in self._instances
+
+    def is_started(self, name: str) -> bool:
+        return name in self._instances
+
+    def set(self, name: str, instance: Any):
+        """Substitui (ou injeta) a instância de um serviço"""
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        """Retorna o serviço, construindo-o (e às dependências) se necessário"""
+        instance = self._instances.get(name, _MISSING)
+        if instance is not _MISSING:
+            return instance
+
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            spec = self._specs.get(name)
+            if spec is None:
+                raise ServiceResolutionError(f"Unknown service '{name}'")
+            if name in self._resolving:
+                cycle = " -> ".join(self._resolving + [name])
+                raise ServiceResolutionError(f"Circular service dependency: {cycle}")
+
+            parent = self._resolving[-1] if self._resolving else None
+            self._resolving.append(name)
+            self._child_seconds.append(0.0)
+            start = time.perf_counter()
+            try:
+                for dependency in spec.depends_on:
+                    self.get(dependency)
+                instance = spec.factory()
+            finally:
+                total = time.perf_counter() - start
+                nested = self._child_seconds.pop()
+                self._resolving.pop()
+                if self._child_seconds:
+                    self._child_seconds[-1] += total
+
+            # Tempo exclusivo: dependências (declaradas ou acessadas na fábrica) são descontadas
+            self._instances[name] = instance
+            self._timings[name] = ServiceTiming(
+                name=name,
+                seconds=max(0.0, total - nested),
+                profile=spec.profile,
+                trigger=f"dependency of {parent}" if parent else self._trigger,
+                dependencies=list(spec.depends_on)
+            )
+            if self._trigger == "on_demand" and parent is None:
+                self.logger.debug(f"Service '{name}' created on demand in {total:.3f}s")
+            return instance
+
+    def start_profile(self, profile: str) -> Dict[str, Any]:
+        """Instancia, em ordem de registro, todos os serviços até o perfil informado"""
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown profile '{profile}', expected one of {PROFILES}")
+        level = PROFILES.index(profile)
+        self.profile = profile
+        self._trigger = "profile"
+        start = time.perf_counter()
+        try:
+            for spec in list(self._specs.values()):
+                if PROFILES.index(spec.profile) <= level:
+                    self.get(spec.name)
+        finally:
+            self._trigger = "on_demand"
+            self.profile_seconds = time.perf_counter() - start
+        return self.startup_report()
+
+    def startup_report(self, top: int = 15) -> Dict[str, Any]:
+        """Tempos de construção por serviço e das importações adiadas"""
+        timings = sorted(self._timings.values(), key=lambda t: t.seconds, reverse=True)
+        imports = sorted(
+            ((label, seconds) for label, seconds in import_timings.items() if label not in self._imports_before),
+            key=lambda item: item[1], reverse=True
+        )
+        return {
+            "profile": self.profile,
+            "profile_seconds": round(self.profile_seconds, 4),
+            "services_started": len(self._instances),
+            "services_deferred": sorted(name for name in self._specs if name not in self._instances),
+            "services": [
+                {"name": t.name, "seconds": round(t.seconds, 4), "profile": t.profile, "trigger": t.trigger}
+                for t in timings
+            ],
+            "deferred_imports": [{"module": label, "seconds": round(seconds, 4)} for label, seconds in imports[:top]]
+        }
+
+    def format_startup_report(self, top: int = 10) -> str:
+        """Relatório legível para o log de inicialização"""
+        report = self.startup_report(top)
+        lines = [
+            f"⏱️ Startup profile '{report['profile']}': {report['profile_seconds']:.2f}s, "
+            f"{report['services_started']} services started, {len(report['services_deferred'])} deferred"
+        ]
+        for service in report["services"][:top]:
+            lines.append(f"   {service['seconds']:7.3f}s  {service['name']} ({service['trigger']})")
+        if report["deferred_imports"]:
+            lines.append("   Slowest deferred imports:")
+            for entry in report["deferred_imports"][:5]:
+                lines.append(f"   {entry['seconds']:7.3f}s  {entry['module']}")
+        return "\n".join(lines)
+
+
+_MISSING = object()
+
+
+class ServiceAttribute:
+    """
+    Atributo de classe que delega a um ``ServiceContainer`` em ``instance.services``.
+
+    Ler o atributo cria o serviço sob demanda; atribuir substitui a instância
+    (útil para testes e para recuperação de erros).
+    """
+
+    def __init__(self, service_name: Optional[str] = None):
+        self.service_name = service_name
+
+    def __set_name__(self, owner, name):
+        if self.service_name is None:
+            self.service_name = name
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return instance.services.get(self.service_name)
+
+    def __set__(self, instance, value):
+        instance.services.set(self.service_name, value)
@@ -1,9 +1,17 @@
 """Meta-intelligence and self-improvement components."""
 
-from .model_optimizer import ModelOptimizer, get_model_optimizer
-from .knowledge_system import AdvancedKnowledgeSystem, get_knowledge_system
-from .root_cause_analyzer import RootCauseAnalyzer, get_root_cause_analyzer
-from .self_awareness import SelfAwarenessCore, get_self_awareness_core
+from hephaestus.utils.lazy_import import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    "ModelOptimizer": ".model_optimizer",
+    "get_model_optimizer": ".model_optimizer",
+    "AdvancedKnowledgeSystem": ".knowledge_system",
+    "get_knowledge_system": ".knowledge_system",
+    "RootCauseAnalyzer": ".root_cause_analyzer",
+    "get_root_cause_analyzer": ".root_cause_analyzer",
+    "SelfAwarenessCore": ".self_awareness",
+    "get_self_awareness_core": ".self_awareness",
+})
 
 __all__ = [
     "ModelOptimizer",
@@ -14,4 +22,4 @@ __all__ = [
     "get_root_cause_analyzer",
     "SelfAwarenessCore",
     "get_self_awareness_core",
-]
\ No newline at end of file
+]
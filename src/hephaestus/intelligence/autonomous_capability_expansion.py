@@ -32,6 +32,8 @@ import statistics
 import numpy as np
 from abc import ABC, abstractmethod
 
+from hephaestus.utils.rate_limiter import background_llm_task
+
 class CapabilityDomain(Enum):
     """Domínios de capacidade"""
     ANALYSIS = "analysis"                   # Análise de dados e código
@@ -896,6 +898,7 @@ class AutonomousCapabilityExpansion:
         self.discovery_thread.start()
         self.logger.info("🔄 Capability expansion started")
     
+    @background_llm_task
     def _expansion_loop(self):
         """Loop principal de expansão"""
         while not self.should_stop.wait(self.discovery_interval):
@@ -6,9 +6,14 @@ aprendem uns com os outros e desenvolvem insights coletivos em tempo real.
 
 É como uma "mente coletiva" onde cada agente contribui com suas experiências
 e todos se beneficiam do conhecimento compartilhado.
+
+O estado é persistido num CollectiveNetworkStore (SQLite WAL, escrita em lote);
+na partida só o índice do conhecimento é carregado e o conteúdo de cada item é
+hidratado quando acessado.
 """
 
 import asyncio
+import atexit
 import logging
 import time
 import json
@@ -16,8 +21,8 @@ import threading
 from typing import Dict, Any, List, Optional, Set, Tuple, Callable
 from datetime import datetime, timedelta, date
 from pathlib import Path
-from dataclasses import dataclass, field
-from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
+from collections import defaultdict, deque, OrderedDict
 from enum import Enum
 import uuid
 import hashlib
@@ -26,7 +31,9 @@ import statistics
 
 from hephaestus.utils.config_loader import load_config
 from hephaestus.utils.llm_client import call_llm_api
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
 from hephaestus.utils.json_parser import parse_json_response
+from hephaestus.intelligence.collective_network_store import CollectiveNetworkStore, complete_knowledge_row
 
 
 class KnowledgeType(Enum):
@@ -69,6 +76,8 @@ class KnowledgeItem:
     failed_applications: int = 0
     tags: List[str] = field(default_factory=list)
     related_knowledge: List[str] = field(default_factory=list)
+    # False enquanto content/context não foram carregados do store
+    hydrated: bool = field(default=True, repr=False, compare=False)
     
     def __post_init__(self):
         if not self.knowledge_id:
@@ -183,6 +192,9 @@ class CollectiveIntelligenceNetwork:
         self.knowledge_retention_days = config.get("collective_intelligence", {}).get("retention_days", 30)
         self.insight_generation_interval = config.get("collective_intelligence", {}).get("insight_interval", 300)  # 5 minutos
         self.auto_cleanup_enabled = config.get("collective_intelligence", {}).get("auto_cleanup", True)
+        self.max_hydrated_items = config.get("collective_intelligence", {}).get("max_hydrated_items", 200)
+        self.store_flush_interval = config.get("collective_intelligence", {}).get("store_flush_interval", 5)
+        self.store_compaction_interval = config.get("collective_intelligence", {}).get("store_compaction_interval", 3600)
         
         # Armazenamento de conhecimento
         self.knowledge_base: Dict[str, KnowledgeItem] = {}
@@ -194,13 +206,17 @@ class CollectiveIntelligenceNetwork:
         self.knowledge_by_agent: Dict[str, List[str]] = defaultdict(list)
         self.knowledge_by_tag: Dict[str, List[str]] = defaultdict(list)
         
+        # Itens com conteúdo em memória, do menos ao mais recentemente acessado
+        self._hydrated_ids: "OrderedDict[str, None]" = OrderedDict()
+        
         # Sistema de broadcasting
         self.broadcast_subscribers: Dict[str, List[Callable]] = defaultdict(list)
         
         # Threading
         self.network_lock = threading.Lock()
-        self.insight_generation_thread: Optional[threading.Thread] = None
+        self.insight_generation_job = None
         self.insight_generation_running = False
+        self.store_jobs = []
         
         # Métricas
         self.metrics = {
@@ -211,18 +227,23 @@ class CollectiveIntelligenceNetwork:
             "successful_collaborations": 0
         }
         
-        # Diretórios
+        # Diretórios (knowledge/, insights/ e agents/ só existem em instalações antigas)
         self.network_dir = Path("data/collective_intelligence")
         self.knowledge_dir = self.network_dir / "knowledge"
         self.insights_dir = self.network_dir / "insights"
         self.agents_dir = self.network_dir / "agents"
+        self.network_dir.mkdir(parents=True, exist_ok=True)
         
-        # Criar diretórios
-        for directory in [self.network_dir, self.knowledge_dir, self.insights_dir, self.agents_dir]:
-            directory.mkdir(parents=True, exist_ok=True)
+        # Store em arquivo único
+        self.store = CollectiveNetworkStore(
+            self.network_dir / "network.db", self.logger,
+            batch_size=config.get("collective_intelligence", {}).get("store_batch_size", 100)
+        )
+        atexit.register(self.store.close)
         
         # Carregar estado existente
         self._load_existing_network_state()
+        self._start_store_maintenance()
         
         # Iniciar sistema de insights
         self._start_insight_generation()
@@ -377,13 +398,16 @@ class CollectiveIntelligenceNetwork:
                         tag_ids.update(self.knowledge_by_tag[tag])
                     candidate_ids = candidate_ids.intersection(tag_ids)
                 
-                # Buscar por relevância de texto
+                # Buscar por relevância de texto (conteúdo pesquisado no store, sem hidratar)
+                content_matches = self.store.content_matches(query)
                 scored_results = []
                 for knowledge_id in candidate_ids:
                     knowledge_item = self.knowledge_base[knowledge_id]
                     
                     # Calcular score de relevância
-                    relevance_score = self._calculate_text_relevance(query, knowledge_item)
+                    relevance_score = self._calculate_text_relevance(
+                        query, knowledge_item, content_match=knowledge_id in content_matches
+                    )
                     value_score = knowledge_item.calculate_value_score()
                     
                     combined_score = relevance_score * 0.7 + value_score * 0.3
@@ -396,6 +420,7 @@ class CollectiveIntelligenceNetwork:
                 
                 # Atualizar estatísticas de acesso
                 for item in results:
+                    self._hydrate(item)
                     item.access_count += 1
                     item.last_accessed = datetime.now()
                 
@@ -546,6 +571,35 @@ class CollectiveIntelligenceNetwork:
             self.logger.error(f"❌ Error generating recommendations: {e}")
             return []
     
+    def get_knowledge(self, knowledge_id: str) -> Optional[KnowledgeItem]:
+        """
+        Retorna um item de conhecimento com conteúdo carregado
+        """
+        with self.network_lock:
+            knowledge_item = self.knowledge_base.get(knowledge_id)
+            if knowledge_item is not None:
+                self._hydrate(knowledge_item)
+            return knowledge_item
+    
+    def _hydrate(self, knowledge_item: KnowledgeItem):
+        """Carrega content/context do store e descarta o conteúdo menos usado acima do limite"""
+        knowledge_id = knowledge_item.knowledge_id
+        if not knowledge_item.hydrated:
+            loaded = self.store.load_content(knowledge_id)
+            if loaded is not None:
+                knowledge_item.content, knowledge_item.context = loaded
+            knowledge_item.hydrated = True
+        self._hydrated_ids[knowledge_id] = None
+        self._hydrated_ids.move_to_end(knowledge_id)
+        
+        while len(self._hydrated_ids) > self.max_hydrated_items:
+            evicted_id, _ = self._hydrated_ids.popitem(last=False)
+            evicted = self.knowledge_base.get(evicted_id)
+            if evicted is None or self.store.has_pending_content(evicted_id):
+                continue
+            # Cópia sem conteúdo: referências já entregues a chamadores continuam completas
+            self.knowledge_base[evicted_id] = replace(evicted, content="", context={}, hydrated=False)
+    
     def subscribe_to_knowledge_updates(self, agent_id: str, callback: Callable[[KnowledgeItem], None]):
         """
         Subscreve a updates de conhecimento
@@ -564,37 +618,44 @@ class CollectiveIntelligenceNetwork:
             return
         
         self.insight_generation_running = True
-        self.insight_generation_thread = threading.Thread(target=self._insight_generation_loop, daemon=True)
-        self.insight_generation_thread.start()
+        self.insight_generation_job = get_background_scheduler().schedule(
+            "collective_insight_generation", self._insight_generation_tick,
+            interval=self.insight_generation_interval, jitter=min(30.0, self.insight_generation_interval * 0.1),
+            priority=JobPriority.LOW, max_runtime=120, initial_delay=0
+        )
         
         self.logger.info("🔮 Collective insight generation started")
     
-    def _insight_generation_loop(self):
-        """Loop de geração de insights coletivos"""
-        while self.insight_generation_running:
-            try:
-                # Gerar insights periodicamente
-                insights = self._generate_collective_insights()
-                
-                with self.network_lock:
-                    for insight in insights:
-                        self.collective_insights[insight.insight_id] = insight
-                        self._save_collective_insight(insight)
-                        
-                        # Broadcast insight para subscribers
-                        self._broadcast_insight(insight)
-                        
-                        self.metrics["total_insights_generated"] += 1
-                
-                if insights:
-                    self.logger.info(f"🔮 Generated {len(insights)} collective insights")
+    def _start_store_maintenance(self):
+        """Agenda a gravação em lote e a compactação do store"""
+        scheduler = get_background_scheduler()
+        self.store_jobs = [
+            scheduler.schedule(
+                "collective_store_flush", self.store.flush,
+                interval=self.store_flush_interval, priority=JobPriority.NORMAL, max_runtime=5
+            ),
+            scheduler.schedule(
+                "collective_store_compaction", self.store.compact,
+                interval=self.store_compaction_interval, jitter=60.0, priority=JobPriority.LOW, max_runtime=60
+            ),
+        ]
+    
+    def _insight_generation_tick(self):
+        """Uma rodada de geração de insights coletivos"""
+        insights = self._generate_collective_insights()
+        
+        with self.network_lock:
+            for insight in insights:
+                self.collective_insights[insight.insight_id] = insight
+                self._save_collective_insight(insight)
                 
-                # Aguardar próximo ciclo
-                time.sleep(self.insight_generation_interval)
+                # Broadcast insight para subscribers
+                self._broadcast_insight(insight)
                 
-            except Exception as e:
-                self.logger.error(f"❌ Error in insight generation loop: {e}")
-                time.sleep(30)  # Aguardar mais tempo em caso de erro
+                self.metrics["total_insights_generated"] += 1
+        
+        if insights:
+            self.logger.info(f"🔮 Generated {len(insights)} collective insights")
     
     def _generate_collective_insights(self) -> List[CollectiveInsight]:
         """Gera insights coletivos usando LLM"""
@@ -797,14 +858,16 @@ class CollectiveIntelligenceNetwork:
             self.logger.error(f"❌ Error analyzing agent interactions: {e}")
             return {}
     
-    def _calculate_text_relevance(self, query: str, knowledge_item: KnowledgeItem) -> float:
+    def _calculate_text_relevance(self, query: str, knowledge_item: KnowledgeItem,
+                                  content_match: Optional[bool] = None) -> float:
         """Calcula relevância de texto simples"""
         try:
             query_lower = query.lower()
             
             # Verificar correspondências
             title_match = query_lower in knowledge_item.title.lower()
-            content_match = query_lower in knowledge_item.content.lower()
+            if content_match is None:
+                content_match = query_lower in knowledge_item.content.lower()
             tag_match = any(query_lower in tag.lower() for tag in knowledge_item.tags)
             
             # Calcular score
@@ -844,106 +907,153 @@ class CollectiveIntelligenceNetwork:
             self.logger.error(f"❌ Error broadcasting insight: {e}")
     
     def _load_existing_network_state(self):
-        """Carrega estado existente da rede"""
+        """Carrega estado existente da rede (apenas o índice do conhecimento)"""
         try:
+            self._migrate_legacy_json_state()
+            
             # Carregar perfis de agentes
-            for agent_file in self.agents_dir.glob("*.json"):
-                with open(agent_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    profile = AgentProfile(**data)
-                    self.agent_profiles[profile.agent_id] = profile
+            for data in self.store.load_agents():
+                data["last_active"] = datetime.fromisoformat(data["last_active"])
+                profile = AgentProfile(**data)
+                self.agent_profiles[profile.agent_id] = profile
             
-            # Carregar conhecimento
-            for knowledge_file in self.knowledge_dir.glob("*.json"):
-                with open(knowledge_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Converter string para enum
-                    data["knowledge_type"] = KnowledgeType(data["knowledge_type"])
-                    data["relevance"] = KnowledgeRelevance(data["relevance"])
-                    # Converter timestamps
-                    data["created_at"] = datetime.fromisoformat(data["created_at"])
-                    data["last_accessed"] = datetime.fromisoformat(data["last_accessed"])
-                    
-                    knowledge_item = KnowledgeItem(**data)
-                    self.knowledge_base[knowledge_item.knowledge_id] = knowledge_item
-                    
-                    # Reconstruir índices
-                    self.knowledge_by_type[knowledge_item.knowledge_type].append(knowledge_item.knowledge_id)
-                    self.knowledge_by_agent[knowledge_item.source_agent].append(knowledge_item.knowledge_id)
-                    for tag in knowledge_item.tags:
-                        self.knowledge_by_tag[tag].append(knowledge_item.knowledge_id)
+            # Carregar índice do conhecimento; content/context são hidratados no acesso
+            for row in self.store.load_knowledge_index():
+                knowledge_item = self._knowledge_from_row(row)
+                knowledge_item.hydrated = False
+                self.knowledge_base[knowledge_item.knowledge_id] = knowledge_item
+                
+                # Reconstruir índices
+                self.knowledge_by_type[knowledge_item.knowledge_type].append(knowledge_item.knowledge_id)
+                self.knowledge_by_agent[knowledge_item.source_agent].append(knowledge_item.knowledge_id)
+                for tag in knowledge_item.tags:
+                    self.knowledge_by_tag[tag].append(knowledge_item.knowledge_id)
             
             # Carregar insights
-            for insight_file in self.insights_dir.glob("*.json"):
-                with open(insight_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    data["created_at"] = datetime.fromisoformat(data["created_at"])
-                    insight = CollectiveInsight(**data)
-                    self.collective_insights[insight.insight_id] = insight
+            for data in self.store.load_insights():
+                data["created_at"] = datetime.fromisoformat(data["created_at"])
+                insight = CollectiveInsight(**data)
+                self.collective_insights[insight.insight_id] = insight
             
             self.logger.info(f"📁 Loaded network state: {len(self.agent_profiles)} agents, {len(self.knowledge_base)} knowledge items")
             
         except Exception as e:
             self.logger.error(f"❌ Error loading network state: {e}")
     
+    def _migrate_legacy_json_state(self):
+        """Importa os arquivos JSON por item de versões anteriores para o store"""
+        sources = [
+            (self.agents_dir, lambda data: self.store.put_agent(data["agent_id"], data)),
+            (self.knowledge_dir, lambda data: self.store.put_knowledge(self._legacy_knowledge_row(data))),
+            (self.insights_dir, lambda data: self.store.put_insight(data["insight_id"], data)),
+        ]
+        migrated = 0
+        for directory, put in sources:
+            if not directory.is_dir():
+                continue
+            for item_file in directory.glob("*.json"):
+                try:
+                    with open(item_file, 'r', encoding='utf-8') as f:
+                        put(json.load(f))
+                    migrated += 1
+                except Exception as e:
+                    self.logger.warning(f"⚠️ Skipping unreadable network file {item_file}: {e}")
+            self.store.flush()
+            target = directory.with_name(f"{directory.name}.migrated")
+            if target.exists():
+                target = directory.with_name(f"{directory.name}.migrated-{int(time.time())}")
+            directory.rename(target)
+        
+        if migrated:
+            self.logger.info(f"📦 Migrated {migrated} legacy network files into {self.store.db_path.name}")
+    
+    @classmethod
+    def _legacy_knowledge_row(cls, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Completa um item legado e garante que ele pode ser carregado (ValueError/KeyError se não)"""
+        row = complete_knowledge_row(data)
+        if row["relevance"] not in {relevance.value for relevance in KnowledgeRelevance}:
+            row["relevance"] = KnowledgeRelevance.MEDIUM.value
+        cls._knowledge_from_row(row)
+        return row
+    
+    @staticmethod
+    def _knowledge_from_row(row: Dict[str, Any]) -> KnowledgeItem:
+        return KnowledgeItem(
+            knowledge_id=row["knowledge_id"],
+            knowledge_type=KnowledgeType(row["knowledge_type"]),
+            source_agent=row["source_agent"],
+            title=row["title"],
+            content=row.get("content", ""),
+            context=row.get("context", {}),
+            relevance=KnowledgeRelevance(row["relevance"]),
+            confidence=row["confidence"],
+            created_at=datetime.fromisoformat(row["created_at"]),
+            last_accessed=datetime.fromisoformat(row["last_accessed"]),
+            access_count=row["access_count"],
+            validation_count=row["validation_count"],
+            success_applications=row["success_applications"],
+            failed_applications=row["failed_applications"],
+            tags=row["tags"],
+            related_knowledge=row["related_knowledge"]
+        )
+    
     def _save_agent_profile(self, agent_id: str, profile: AgentProfile):
         """Salva perfil do agente"""
         try:
-            profile_file = self.agents_dir / f"{agent_id}.json"
-            with open(profile_file, 'w', encoding='utf-8') as f:
-                data = {
-                    "agent_id": profile.agent_id,
-                    "agent_type": profile.agent_type,
-                    "capabilities": list(profile.capabilities) if isinstance(profile.capabilities, set) else profile.capabilities,
-                    "expertise_areas": list(profile.expertise_areas) if isinstance(profile.expertise_areas, set) else profile.expertise_areas,
-                    "contribution_score": profile.contribution_score,
-                    "reputation_score": profile.reputation_score,
-                    "knowledge_shared": profile.knowledge_shared,
-                    "knowledge_consumed": profile.knowledge_consumed,
-                    "successful_collaborations": profile.successful_collaborations,
-                    "failed_collaborations": profile.failed_collaborations,
-                    "last_active": profile.last_active.isoformat(),
-                    "specialization_tags": list(profile.specialization_tags) if isinstance(profile.specialization_tags, set) else profile.specialization_tags
-                }
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            data = {
+                "agent_id": profile.agent_id,
+                "agent_type": profile.agent_type,
+                "capabilities": list(profile.capabilities) if isinstance(profile.capabilities, set) else profile.capabilities,
+                "expertise_areas": list(profile.expertise_areas) if isinstance(profile.expertise_areas, set) else profile.expertise_areas,
+                "contribution_score": profile.contribution_score,
+                "reputation_score": profile.reputation_score,
+                "knowledge_shared": profile.knowledge_shared,
+                "knowledge_consumed": profile.knowledge_consumed,
+                "successful_collaborations": profile.successful_collaborations,
+                "failed_collaborations": profile.failed_collaborations,
+                "last_active": profile.last_active.isoformat(),
+                "specialization_tags": list(profile.specialization_tags) if isinstance(profile.specialization_tags, set) else profile.specialization_tags
+            }
+            self.store.put_agent(agent_id, data)
                 
         except Exception as e:
             self.logger.error(f"❌ Error saving agent profile: {e}")
     
     def _save_knowledge_item(self, knowledge_item: KnowledgeItem):
-        """Salva item de conhecimento"""
+        """Salva item de conhecimento (sem tocar no conteúdo se ele não foi hidratado)"""
         try:
-            knowledge_file = self.knowledge_dir / f"{knowledge_item.knowledge_id}.json"
-            with open(knowledge_file, 'w', encoding='utf-8') as f:
-                # Preparar contexto para serialização JSON
-                context_for_json = {}
-                for key, value in knowledge_item.context.items():
-                    if isinstance(value, set):
-                        context_for_json[key] = list(value)
-                    elif isinstance(value, (datetime, date)):
-                        context_for_json[key] = value.isoformat()
-                    else:
-                        context_for_json[key] = value
-                
-                data = {
-                    "knowledge_id": knowledge_item.knowledge_id,
-                    "knowledge_type": knowledge_item.knowledge_type.value,
-                    "source_agent": knowledge_item.source_agent,
-                    "title": knowledge_item.title,
-                    "content": knowledge_item.content,
-                    "context": context_for_json,
-                    "relevance": knowledge_item.relevance.value,
-                    "confidence": knowledge_item.confidence,
-                    "created_at": knowledge_item.created_at.isoformat(),
-                    "last_accessed": knowledge_item.last_accessed.isoformat(),
-                    "access_count": knowledge_item.access_count,
-                    "validation_count": knowledge_item.validation_count,
-                    "success_applications": knowledge_item.success_applications,
-                    "failed_applications": knowledge_item.failed_applications,
-                    "tags": list(knowledge_item.tags) if isinstance(knowledge_item.tags, set) else knowledge_item.tags,
-                    "related_knowledge": list(knowledge_item.related_knowledge) if isinstance(knowledge_item.related_knowledge, set) else knowledge_item.related_knowledge
-                }
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            # Preparar contexto para serialização JSON
+            context_for_json = {}
+            for key, value in knowledge_item.context.items():
+                if isinstance(value, set):
+                    context_for_json[key] = list(value)
+                elif isinstance(value, (datetime, date)):
+                    context_for_json[key] = value.isoformat()
+                else:
+                    context_for_json[key] = value
+            
+            data = {
+                "knowledge_id": knowledge_item.knowledge_id,
+                "knowledge_type": knowledge_item.knowledge_type.value,
+                "source_agent": knowledge_item.source_agent,
+                "title": knowledge_item.title,
+                "content": knowledge_item.content,
+                "context": context_for_json,
+                "relevance": knowledge_item.relevance.value,
+                "confidence": knowledge_item.confidence,
+                "created_at": knowledge_item.created_at.isoformat(),
+                "last_accessed": knowledge_item.last_accessed.isoformat(),
+                "access_count": knowledge_item.access_count,
+                "validation_count": knowledge_item.validation_count,
+                "success_applications": knowledge_item.success_applications,
+                "failed_applications": knowledge_item.failed_applications,
+                "tags": list(knowledge_item.tags) if isinstance(knowledge_item.tags, set) else knowledge_item.tags,
+                "related_knowledge": list(knowledge_item.related_knowledge) if isinstance(knowledge_item.related_knowledge, set) else knowledge_item.related_knowledge
+            }
+            self.store.put_knowledge(data, with_content=knowledge_item.hydrated)
+            if knowledge_item.hydrated:
+                self._hydrated_ids[knowledge_item.knowledge_id] = None
+                self._hydrated_ids.move_to_end(knowledge_item.knowledge_id)
                 
         except Exception as e:
             self.logger.error(f"❌ Error saving knowledge item: {e}")
@@ -951,21 +1061,19 @@ class CollectiveIntelligenceNetwork:
     def _save_collective_insight(self, insight: CollectiveInsight):
         """Salva insight coletivo"""
         try:
-            insight_file = self.insights_dir / f"{insight.insight_id}.json"
-            with open(insight_file, 'w', encoding='utf-8') as f:
-                data = {
-                    "insight_id": insight.insight_id,
-                    "title": insight.title,
-                    "description": insight.description,
-                    "contributing_agents": list(insight.contributing_agents) if isinstance(insight.contributing_agents, set) else insight.contributing_agents,
-                    "contributing_knowledge": list(insight.contributing_knowledge) if isinstance(insight.contributing_knowledge, set) else insight.contributing_knowledge,
-                    "confidence": insight.confidence,
-                    "potential_impact": insight.potential_impact,
-                    "applications": list(insight.applications) if isinstance(insight.applications, set) else insight.applications,
-                    "created_at": insight.created_at.isoformat(),
-                    "validated_by": list(insight.validated_by) if isinstance(insight.validated_by, set) else insight.validated_by
-                }
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            data = {
+                "insight_id": insight.insight_id,
+                "title": insight.title,
+                "description": insight.description,
+                "contributing_agents": list(insight.contributing_agents) if isinstance(insight.contributing_agents, set) else insight.contributing_agents,
+                "contributing_knowledge": list(insight.contributing_knowledge) if isinstance(insight.contributing_knowledge, set) else insight.contributing_knowledge,
+                "confidence": insight.confidence,
+                "potential_impact": insight.potential_impact,
+                "applications": list(insight.applications) if isinstance(insight.applications, set) else insight.applications,
+                "created_at": insight.created_at.isoformat(),
+                "validated_by": list(insight.validated_by) if isinstance(insight.validated_by, set) else insight.validated_by
+            }
+            self.store.put_insight(insight.insight_id, data)
                 
         except Exception as e:
             self.logger.error(f"❌ Error saving collective insight: {e}")
@@ -976,6 +1084,8 @@ class CollectiveIntelligenceNetwork:
             "active_agents": len(self.agent_profiles),
             "knowledge_items": len(self.knowledge_base),
             "collective_insights": len(self.collective_insights),
+            "hydrated_knowledge_items": len(self._hydrated_ids),
+            "pending_writes": self.store.pending_count,
             "metrics": self.metrics,
             "insight_generation_running": self.insight_generation_running,
             "top_contributors": sorted(
@@ -1016,14 +1126,14 @@ class CollectiveIntelligenceNetwork:
                     
                     # Remover do knowledge base
                     del self.knowledge_base[knowledge_id]
-                    
-                    # Remover arquivo
-                    knowledge_file = self.knowledge_dir / f"{knowledge_id}.json"
-                    if knowledge_file.exists():
-                        knowledge_file.unlink()
+                    self._hydrated_ids.pop(knowledge_id, None)
                     
                     removed_count += 1
                 
+                # Remover do store numa única transação
+                self.store.delete_knowledge(to_remove)
+                self.store.flush()
+                
                 if removed_count > 0:
                     self.logger.info(f"🧹 Cleaned up {removed_count} old knowledge items")
                     
@@ -1033,8 +1143,13 @@ class CollectiveIntelligenceNetwork:
     def stop_insight_generation(self):
         """Para a geração de insights"""
         self.insight_generation_running = False
-        if self.insight_generation_thread:
-            self.insight_generation_thread.join(timeout=5)
+        if self.insight_generation_job:
+            self.insight_generation_job.cancel()
+            self.insight_generation_job = None
+        for job in self.store_jobs:
+            job.cancel()
+        self.store_jobs = []
+        self.store.flush()
         self.logger.info("🛑 Collective insight generation stopped")
     
     def share_evolution_knowledge(self, agent_id: str, evolution_type: str, details: Dict[str, Any]) -> Optional[str]:
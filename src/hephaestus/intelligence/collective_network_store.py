@@ -0,0 +1,286 @@
+"""
+🗄️ COLLECTIVE NETWORK STORE
+Armazenamento em arquivo único (SQLite WAL) do estado da Collective Intelligence Network.
+
+Substitui os arquivos JSON individuais por perfil, conhecimento e insight. As
+escritas são acumuladas e gravadas em lote numa única transação; na partida só
+o índice do conhecimento (tudo menos ``content`` e ``context``) é lido, e o
+conteúdo é hidratado sob demanda. A compactação (checkpoint do WAL e VACUUM
+quando há muitas páginas livres) roda como job de background.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+# Colunas carregadas na partida (o índice); content e context ficam no disco
+KNOWLEDGE_INDEX_COLUMNS = (
+    "knowledge_id", "knowledge_type", "source_agent", "title", "relevance", "confidence",
+    "created_at", "last_accessed", "access_count", "validation_count",
+    "success_applications", "failed_applications", "tags", "related_knowledge",
+)
+KNOWLEDGE_JSON_COLUMNS = ("tags", "related_knowledge")
+# Sem estas colunas o item não pode ser reconstruído: a linha é rejeitada em put_knowledge
+KNOWLEDGE_REQUIRED_COLUMNS = ("knowledge_id", "knowledge_type", "source_agent")
+# As demais são completadas (ex.: JSON legado sem "relevance"); datas ausentes viram o momento da escrita
+KNOWLEDGE_DEFAULTS = {
+    "title": "", "relevance": "medium", "confidence": 0.5, "access_count": 0, "validation_count": 0,
+    "success_applications": 0, "failed_applications": 0, "tags": [], "related_knowledge": [],
+}
+_SQLITE_TYPES = (str, int, float, bytes)
+
+
+def complete_knowledge_row(row: Dict[str, Any], with_content: bool = True) -> Dict[str, Any]:
+    """Cópia da linha com as colunas opcionais completadas; ValueError se faltar uma obrigatória"""
+    missing = [column for column in KNOWLEDGE_REQUIRED_COLUMNS if row.get(column) in (None, "")]
+    if missing:
+        raise ValueError(f"knowledge row {row.get('knowledge_id')!r} is missing {', '.join(missing)}")
+    completed = {key: list(value) if isinstance(value, list) else value for key, value in KNOWLEDGE_DEFAULTS.items()}
+    completed.update((key, value) for key, value in row.items() if value is not None)
+    now = datetime.now().isoformat()
+    completed.setdefault("created_at", now)
+    completed.setdefault("last_accessed", completed["created_at"])
+    if with_content:
+        completed.setdefault("content", "")
+        completed.setdefault("context", {})
+    return completed
+
+
+class CollectiveNetworkStore:
+    """
+    Estado persistente da rede em um banco SQLite com escrita em lote.
+
+    - ``put_*`` apenas registra a escrita pendente (a última versão de cada item vence)
+    - ``flush`` grava todas as pendências numa transação; é chamado pelo job
+      periódico ou quando o lote atinge ``batch_size``
+    - ``put_knowledge(..., with_content=False)`` atualiza só as colunas do índice,
+      sem sobrescrever o conteúdo de itens que não foram hidratados
+    - uma linha que não pode ser gravada é descartada (com log) no ``flush``;
+      ela não impede a gravação das demais nem fica presa nas pendências
+    """
+
+    def __init__(self, db_path: Path, logger: Optional[logging.Logger] = None, batch_size: int = 100):
+        self.db_path = Path(db_path)
+        self.logger = logger or logging.getLogger(__name__)
+        self.batch_size = max(1, batch_size)
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.create_function("py_lower", 1, lambda text: text.lower() if text else "", deterministic=True)
+        self._lock = threading.RLock()
+        self._init_schema()
+
+        # Pendências: (tabela, id) -> (row, with_content); row None = remoção
+        self._pending: Dict[Tuple[str, str], Tuple[Optional[Dict[str, Any]], bool]] = {}
+        self.stats = {"rows_written": 0, "batches_written": 0, "rows_rejected": 0, "compactions": 0}
+        self._closed = False
+
+    def _init_schema(self):
+        with self._lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS knowledge (
+                    knowledge_id TEXT PRIMARY KEY,
+                    knowledge_type TEXT NOT NULL,
+                    source_agent TEXT NOT NULL,
+                    title TEXT NOT NULL,
+                    relevance TEXT NOT NULL,
+                    confidence REAL NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_accessed TEXT NOT NULL,
+                    access_count INTEGER NOT NULL DEFAULT 0,
+                    validation_count INTEGER NOT NULL DEFAULT 0,
+                    success_applications INTEGER NOT NULL DEFAULT 0,
+                    failed_applications INTEGER NOT NULL DEFAULT 0,
+                    tags TEXT NOT NULL DEFAULT '[]',
+                    related_knowledge TEXT NOT NULL DEFAULT '[]',
+                    content TEXT NOT NULL DEFAULT '',
+                    context TEXT NOT NULL DEFAULT '{}'
+                )
+            """)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS agents (agent_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS insights (insight_id TEXT PRIMARY KEY, data TEXT NOT NULL)")
+
+    # ------------------------------------------------------------------
+    # Escrita em lote
+    # ------------------------------------------------------------------
+    def put_knowledge(self, row: Dict[str, Any], with_content: bool = True):
+        """
+        Registra a versão atual de um item (``row`` com as colunas do índice e, opcionalmente, content/context).
+
+        Colunas opcionais ausentes são completadas; sem as obrigatórias levanta ValueError.
+        """
+        row = complete_knowledge_row(row, with_content)
+        key = ("knowledge", row["knowledge_id"])
+        with self._lock:
+            previous = self._pending.get(key)
+            if not with_content and previous is not None and previous[0] is not None and previous[1]:
+                # Conteúdo ainda não gravado de uma escrita anterior
+                row = {**row, "content": previous[0]["content"], "context": previous[0]["context"]}
+                with_content = True
+            self._pending[key] = (row, with_content)
+            self._flush_if_full()
+
+    def put_agent(self, agent_id: str, data: Dict[str, Any]):
+        with self._lock:
+            self._pending[("agents", agent_id)] = (data, True)
+            self._flush_if_full()
+
+    def put_insight(self, insight_id: str, data: Dict[str, Any]):
+        with self._lock:
+            self._pending[("insights", insight_id)] = (data, True)
+            self._flush_if_full()
+
+    def delete_knowledge(self, knowledge_ids: List[str]):
+        with self._lock:
+            for knowledge_id in knowledge_ids:
+                self._pending[("knowledge", knowledge_id)] = (None, False)
+            self._flush_if_full()
+
+    def has_pending_content(self, knowledge_id: str) -> bool:
+        """Se o conteúdo do item ainda só existe em memória"""
+        with self._lock:
+            pending = self._pending.get(("knowledge", knowledge_id))
+            return pending is not None and pending[0] is not None and pending[1]
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def _flush_if_full(self):
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> int:
+        """Grava todas as escritas pendentes numa única transação"""
+        with self._lock:
+            if not self._pending or self._closed:
+                return 0
+            pending, self._pending = self._pending, {}
+
+            # Serializa antes da transação: uma linha inválida é descartada sem afetar o lote
+            statements = []
+            for key, (row, with_content) in pending.items():
+                try:
+                    statements.append((key, self._statement(key, row, with_content)))
+                except (KeyError, TypeError, ValueError) as e:
+                    self.stats["rows_rejected"] += 1
+                    self.logger.error(f"❌ Dropping unwritable {key[0]} row {key[1]!r}: {e!r}")
+
+            try:
+                with self._conn:
+                    for _, (sql, params) in statements:
+                        self._conn.execute(sql, params)
+            except sqlite3.Error as e:
+                # Falha do banco (I/O, lock): as linhas do lote voltam para a próxima tentativa,
+                # sem sobrescrever as mais novas; a transação já foi desfeita
+                retry = {key: pending[key] for key, _ in statements}
+                retry.update(self._pending)
+                self._pending = retry
+                self.logger.error(f"❌ Error flushing collective network store: {e}")
+                return 0
+            self.stats["rows_written"] += len(statements)
+            self.stats["batches_written"] += 1
+            return len(statements)
+
+    def _statement(self, key: Tuple[str, str], row: Optional[Dict[str, Any]],
+                   with_content: bool) -> Tuple[str, List[Any]]:
+        """SQL e parâmetros de uma pendência; KeyError/TypeError/ValueError se a linha não pode ser gravada"""
+        table, item_id = key
+        if row is None:
+            return "DELETE FROM knowledge WHERE knowledge_id = ?", [item_id]
+        if table != "knowledge":
+            key_column = "agent_id" if table == "agents" else "insight_id"
+            return (f"INSERT OR REPLACE INTO {table} ({key_column}, data) VALUES (?, ?)",
+                    [item_id, json.dumps(row, ensure_ascii=False, default=str)])
+
+        values = {column: row[column] for column in KNOWLEDGE_INDEX_COLUMNS}
+        for column in KNOWLEDGE_JSON_COLUMNS:
+            values[column] = json.dumps(values[column], ensure_ascii=False)
+        update_columns = [column for column in KNOWLEDGE_INDEX_COLUMNS if column != "knowledge_id"]
+        if with_content:
+            values["content"] = row["content"]
+            values["context"] = json.dumps(row["context"], ensure_ascii=False, default=str)
+            update_columns += ["content", "context"]
+        for column, value in values.items():
+            # Todas as colunas são NOT NULL; tipos que o SQLite não aceita falhariam só na transação
+            if not isinstance(value, _SQLITE_TYPES):
+                raise TypeError(f"column {column} has unsupported value {value!r}")
+
+        columns = list(values)
+        sql = (f"INSERT INTO knowledge ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+               f"ON CONFLICT(knowledge_id) DO UPDATE SET "
+               f"{', '.join(f'{column} = excluded.{column}' for column in update_columns)}")
+        return sql, [values[column] for column in columns]
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def load_knowledge_index(self) -> List[Dict[str, Any]]:
+        """Linhas do índice do conhecimento, sem content/context"""
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT {', '.join(KNOWLEDGE_INDEX_COLUMNS)} FROM knowledge")
+            rows = [dict(zip(KNOWLEDGE_INDEX_COLUMNS, values)) for values in cursor]
+        for row in rows:
+            for column in KNOWLEDGE_JSON_COLUMNS:
+                row[column] = json.loads(row[column])
+        return rows
+
+    def load_content(self, knowledge_id: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """``(content, context)`` de um item, ou None se não existir"""
+        with self._lock:
+            pending = self._pending.get(("knowledge", knowledge_id))
+            if pending is not None and pending[0] is not None and pending[1]:
+                return pending[0]["content"], pending[0]["context"]
+            row = self._conn.execute(
+                "SELECT content, context FROM knowledge WHERE knowledge_id = ?", (knowledge_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def content_matches(self, text: str) -> Set[str]:
+        """Ids dos itens cujo conteúdo contém ``text`` (sem diferenciar maiúsculas)"""
+        self.flush()
+        with self._lock:
+            cursor = self._conn.execute(
+                "SELECT knowledge_id FROM knowledge WHERE instr(py_lower(content), ?) > 0", (text.lower(),)
+            )
+            return {row[0] for row in cursor}
+
+    def load_agents(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute("SELECT data FROM agents")]
+
+    def load_insights(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [json.loads(row[0]) for row in self._conn.execute("SELECT data FROM insights")]
+
+    # ------------------------------------------------------------------
+    # Manutenção
+    # ------------------------------------------------------------------
+    def compact(self, vacuum_free_ratio: float = 0.25) -> Dict[str, Any]:
+        """Grava pendências, faz checkpoint do WAL e VACUUM se muitas páginas estiverem livres"""
+        self.flush()
+        with self._lock:
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+            free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+            vacuumed = page_count > 0 and free_pages / page_count >= vacuum_free_ratio
+            if vacuumed:
+                self._conn.execute("VACUUM")
+            self.stats["compactions"] += 1
+        return {"page_count": page_count, "free_pages": free_pages, "vacuumed": vacuumed}
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self.flush()
+            self._closed = True
+            self._conn.close()
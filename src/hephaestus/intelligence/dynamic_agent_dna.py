@@ -16,7 +16,6 @@ Este sistema implementa evolução darwiniana para agentes através de:
 import json
 import logging
 import time
-import threading
 import random
 import hashlib
 import copy
@@ -30,6 +29,8 @@ import statistics
 import numpy as np
 from abc import ABC, abstractmethod
 
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
 class GeneType(Enum):
     """Tipos de genes cognitivos"""
     STRATEGY = "strategy"               # Estratégias de resolução
@@ -273,9 +274,8 @@ class DynamicAgentDNA:
             "dominant_gene_history": []
         }
         
-        # Threading
-        self.should_stop = threading.Event()
-        self.evolution_thread = None
+        # Job periódico no escalonador de background
+        self.evolution_job = None
         
         # Load existing data
         self._load_population_data()
@@ -549,18 +549,12 @@ class DynamicAgentDNA:
     
     def _start_evolution_engine(self):
         """Inicia engine de evolução em background"""
-        self.evolution_thread = threading.Thread(target=self._evolution_loop, daemon=True)
-        self.evolution_thread.start()
+        self.evolution_job = get_background_scheduler().schedule(
+            "agent_dna_evolution", self._advance_generation, interval=self.generation_interval,
+            jitter=min(60.0, self.generation_interval * 0.1), priority=JobPriority.LOW, max_runtime=60
+        )
         self.logger.info("🔄 Evolution engine started")
     
-    def _evolution_loop(self):
-        """Loop principal de evolução"""
-        while not self.should_stop.wait(self.generation_interval):
-            try:
-                self._advance_generation()
-            except Exception as e:
-                self.logger.error(f"❌ Error in evolution loop: {e}")
-    
     def _advance_generation(self):
         """Avança uma geração completa"""
         if not self.agent_populations:
@@ -912,10 +906,8 @@ class DynamicAgentDNA:
         """Encerra sistema de DNA"""
         self.logger.info("🛑 Shutting down Dynamic Agent DNA System...")
         
-        self.should_stop.set()
-        
-        if self.evolution_thread and self.evolution_thread.is_alive():
-            self.evolution_thread.join(timeout=5)
+        if self.evolution_job:
+            self.evolution_job.cancel()
         
         # Salvar dados
         self._save_population_data()
@@ -7,6 +7,10 @@ Sistema para monitorar e analisar a evolução do sistema ao longo do tempo:
 3. Detecção de regressões
 4. Relatórios de evolução
 5. Previsões de performance futura
+
+As séries ficam num MetricSegmentStore (segmentos binários append-only por
+métrica), e as tendências são calculadas sobre os arrays recortados por busca
+binária, sem filtrar listas de objetos.
 """
 
 import json
@@ -16,10 +20,15 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from pathlib import Path
-import matplotlib.pyplot as plt
 import numpy as np
 from collections import defaultdict, deque
 
+from hephaestus.utils.lazy_import import lazy_import
+from hephaestus.intelligence.metric_segment_store import MetricSegmentStore
+
+# matplotlib is only needed to render charts
+plt = lazy_import("matplotlib.pyplot")
+
 @dataclass
 class EvolutionMetric:
     """Métrica de evolução capturada"""
@@ -75,12 +84,15 @@ class EvolutionAnalytics:
         self.retention_days = config.get("evolution_analytics", {}).get("retention_days", 30)
         self.analysis_interval_hours = config.get("evolution_analytics", {}).get("analysis_interval_hours", 6)
         self.min_data_points = config.get("evolution_analytics", {}).get("min_data_points", 10)
+        segment_hours = config.get("evolution_analytics", {}).get("segment_hours", 24)
         
         # Diretórios
         self.data_dir = Path("data/evolution_analytics")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Armazenamento
+        # Armazenamento: séries persistidas em segmentos; as amostras recentes
+        # (com contexto) ficam só em memória
+        self.store = MetricSegmentStore(self.data_dir / "metrics", segment_seconds=segment_hours * 3600, logger=self.logger)
         self.metrics_history: Dict[str, deque] = defaultdict(lambda: deque(maxlen=1000))
         self.trends_history: List[EvolutionTrend] = []
         
@@ -103,10 +115,7 @@ class EvolutionAnalytics:
             )
             
             self.metrics_history[metric_name].append(metric)
-            
-            # Salvar periodicamente
-            if len(self.metrics_history[metric_name]) % 10 == 0:
-                self._save_metrics(metric_name)
+            self.store.append(metric_name, metric.timestamp.timestamp(), float(value))
                 
         except Exception as e:
             self.logger.error(f"❌ Error capturing metric {metric_name}: {e}")
@@ -115,23 +124,17 @@ class EvolutionAnalytics:
         """Analisa tendências dos últimos N dias"""
         try:
             trends = []
-            cutoff_date = datetime.now() - timedelta(days=days)
-            
-            for metric_name, metrics in self.metrics_history.items():
-                # Filtrar métricas recentes
-                recent_metrics = [
-                    m for m in metrics 
-                    if m.timestamp >= cutoff_date
-                ]
+            cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+            
+            for metric_name in self.store.metric_names():
+                # Janela recente, já ordenada por timestamp
+                timestamps, values = self.store.range(metric_name, start=cutoff)
                 
-                if len(recent_metrics) < self.min_data_points:
+                if len(values) < self.min_data_points:
                     continue
                 
-                # Ordenar por timestamp
-                recent_metrics.sort(key=lambda x: x.timestamp)
-                
                 # Calcular tendência
-                trend = self._calculate_trend(metric_name, recent_metrics, days)
+                trend = self._calculate_trend(metric_name, timestamps, values, days)
                 if trend:
                     trends.append(trend)
             
@@ -146,31 +149,32 @@ class EvolutionAnalytics:
             self.logger.error(f"❌ Error analyzing trends: {e}")
             return []
     
-    def _calculate_trend(self, metric_name: str, metrics: List[EvolutionMetric], days: int) -> Optional[EvolutionTrend]:
-        """Calcula tendência para uma métrica específica"""
+    def _calculate_trend(self, metric_name: str, timestamps: np.ndarray, values: np.ndarray, days: int) -> Optional[EvolutionTrend]:
+        """Calcula tendência para uma métrica a partir dos arrays (timestamps em epoch, valores)"""
         try:
-            if len(metrics) < 2:
+            if len(values) < 2:
                 return None
             
-            # Extrair valores e timestamps
-            values = [m.value for m in metrics]
-            timestamps = [m.timestamp for m in metrics]
+            # Dias desde o início da janela
+            x = (timestamps - timestamps[0]) / 86400.0
+            y = values
             
-            # Converter timestamps para dias desde o início
-            start_time = timestamps[0]
-            days_since_start = [(t - start_time).total_seconds() / 86400 for t in timestamps]
-            
-            # Calcular regressão linear
-            slope, intercept = np.polyfit(days_since_start, values, 1)
+            # Regressão linear por mínimos quadrados (forma fechada)
+            x_centered = x - x.mean()
+            y_centered = y - y.mean()
+            sxx = float(np.dot(x_centered, x_centered))
+            slope = float(np.dot(x_centered, y_centered) / sxx) if sxx > 0 else 0.0
+            intercept = float(y.mean() - slope * x.mean())
             
             # Calcular R² (confiança)
-            y_pred = [slope * x + intercept for x in days_since_start]
-            ss_res = sum((y - y_pred[i]) ** 2 for i, y in enumerate(values))
-            ss_tot = sum((y - np.mean(values)) ** 2 for y in values)
+            residuals = y - (slope * x + intercept)
+            ss_res = float(np.dot(residuals, residuals))
+            ss_tot = float(np.dot(y_centered, y_centered))
             r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0
             
             # Determinar tipo de tendência
-            change_percentage = ((values[-1] - values[0]) / values[0]) * 100 if values[0] != 0 else 0
+            start_value, end_value = float(y[0]), float(y[-1])
+            change_percentage = ((end_value - start_value) / start_value) * 100 if start_value != 0 else 0
             
             if abs(change_percentage) < 5:
                 trend_type = "stable"
@@ -187,10 +191,10 @@ class EvolutionAnalytics:
                 slope=slope,
                 confidence=r_squared,
                 period_days=days,
-                start_value=values[0],
-                end_value=values[-1],
+                start_value=start_value,
+                end_value=end_value,
                 change_percentage=change_percentage,
-                data_points=len(metrics)
+                data_points=len(values)
             )
             
         except Exception as e:
@@ -237,18 +241,14 @@ class EvolutionAnalytics:
     def generate_evolution_chart(self, metric_name: str, days: int = 7) -> Optional[str]:
         """Gera gráfico de evolução para uma métrica"""
         try:
-            cutoff_date = datetime.now() - timedelta(days=days)
-            metrics = [
-                m for m in self.metrics_history[metric_name]
-                if m.timestamp >= cutoff_date
-            ]
+            cutoff = (datetime.now() - timedelta(days=days)).timestamp()
+            epochs, values = self.store.range(metric_name, start=cutoff)
             
-            if len(metrics) < 2:
+            if len(values) < 2:
                 return None
             
             # Preparar dados
-            timestamps = [m.timestamp for m in metrics]
-            values = [m.value for m in metrics]
+            timestamps = [datetime.fromtimestamp(t) for t in epochs]
             
             # Criar gráfico
             plt.figure(figsize=(12, 6))
@@ -260,8 +260,8 @@ class EvolutionAnalytics:
             plt.xticks(rotation=45)
             
             # Adicionar linha de tendência
-            if len(metrics) >= 2:
-                trend = self._calculate_trend(metric_name, metrics, days)
+            if len(values) >= 2:
+                trend = self._calculate_trend(metric_name, epochs, values, days)
                 if trend and trend.confidence > 0.1:
                     x_trend = [timestamps[0], timestamps[-1]]
                     y_trend = [trend.start_value, trend.end_value]
@@ -284,11 +284,17 @@ class EvolutionAnalytics:
         """Prediz performance futura baseada em tendências"""
         try:
             # Usar dados dos últimos 14 dias para predição
-            recent_trends = [t for t in self.trends_history if t.metric_name == metric_name]
-            if not recent_trends:
-                return None
-            
-            latest_trend = recent_trends[-1]
+            cutoff = (datetime.now() - timedelta(days=14)).timestamp()
+            timestamps, values = self.store.range(metric_name, start=cutoff)
+            latest_trend = None
+            if len(values) >= self.min_data_points:
+                latest_trend = self._calculate_trend(metric_name, timestamps, values, 14)
+            if latest_trend is None:
+                # Sem dados suficientes: recorre à última tendência analisada
+                recent_trends = [t for t in self.trends_history if t.metric_name == metric_name]
+                if not recent_trends:
+                    return None
+                latest_trend = recent_trends[-1]
             
             # Calcular predição
             current_value = latest_trend.end_value
@@ -317,20 +323,10 @@ class EvolutionAnalytics:
     def _load_existing_data(self):
         """Carrega dados existentes"""
         try:
-            # Carregar métricas
+            # Migrar o histórico JSON legado para o store de segmentos
             metrics_file = self.data_dir / "metrics_history.json"
             if metrics_file.exists():
-                with open(metrics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for metric_name, metrics_data in data.items():
-                        for metric_dict in metrics_data:
-                            metric = EvolutionMetric(
-                                timestamp=datetime.fromisoformat(metric_dict["timestamp"]),
-                                metric_name=metric_dict["metric_name"],
-                                value=metric_dict["value"],
-                                context=metric_dict.get("context", {})
-                            )
-                            self.metrics_history[metric_name].append(metric)
+                self._migrate_json_metrics(metrics_file)
             
             # Carregar tendências
             trends_file = self.data_dir / "trends_history.json"
@@ -341,31 +337,28 @@ class EvolutionAnalytics:
                         trend = EvolutionTrend(**trend_dict)
                         self.trends_history.append(trend)
             
-            self.logger.info(f"📊 Loaded {sum(len(metrics) for metrics in self.metrics_history.values())} metrics and {len(self.trends_history)} trends")
+            total_metrics = sum(self.store.count(name) for name in self.store.metric_names())
+            self.logger.info(f"📊 Loaded {total_metrics} metrics and {len(self.trends_history)} trends")
             
         except Exception as e:
             self.logger.error(f"❌ Error loading existing data: {e}")
     
-    def _save_metrics(self, metric_name: str):
-        """Salva métricas para arquivo"""
-        try:
-            metrics_file = self.data_dir / "metrics_history.json"
-            
-            # Carregar dados existentes
-            data = {}
-            if metrics_file.exists():
-                with open(metrics_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-            
-            # Atualizar dados
-            data[metric_name] = [m.to_dict() for m in self.metrics_history[metric_name]]
-            
-            # Salvar
-            with open(metrics_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-                
-        except Exception as e:
-            self.logger.error(f"❌ Error saving metrics: {e}")
+    def _migrate_json_metrics(self, metrics_file: Path):
+        """Importa o metrics_history.json antigo para o store e o renomeia"""
+        with open(metrics_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        for metric_name, metrics_data in data.items():
+            if self.store.count(metric_name) > 0:
+                continue
+            samples = sorted(
+                (datetime.fromisoformat(m["timestamp"]).timestamp(), float(m["value"]))
+                for m in metrics_data
+            )
+            if samples:
+                timestamps, values = np.array(samples, dtype=np.float64).T
+                self.store.append_many(metric_name, timestamps, values)
+        metrics_file.replace(metrics_file.with_suffix(".json.migrated"))
+        self.logger.info(f"📦 Migrated {len(data)} metric series from {metrics_file.name}")
     
     def _save_trends(self):
         """Salva tendências para arquivo"""
@@ -387,12 +380,12 @@ class EvolutionAnalytics:
         try:
             cutoff_date = datetime.now() - timedelta(days=self.retention_days)
             
-            # Limpar métricas antigas
+            # Limpar métricas antigas: segmentos expirados são apagados inteiros
+            dropped_segments = self.store.drop_before(cutoff_date.timestamp())
             for metric_name in list(self.metrics_history.keys()):
-                self.metrics_history[metric_name] = deque(
-                    [m for m in self.metrics_history[metric_name] if m.timestamp >= cutoff_date],
-                    maxlen=1000
-                )
+                recent = self.metrics_history[metric_name]
+                while recent and recent[0].timestamp < cutoff_date:
+                    recent.popleft()
             
             # Limpar tendências antigas
             self.trends_history = [
@@ -400,7 +393,7 @@ class EvolutionAnalytics:
                 if datetime.now() - timedelta(days=t.period_days) >= cutoff_date
             ]
             
-            self.logger.info(f"🧹 Cleaned up data older than {self.retention_days} days")
+            self.logger.info(f"🧹 Cleaned up data older than {self.retention_days} days ({dropped_segments} metric segments dropped)")
             
         except Exception as e:
             self.logger.error(f"❌ Error cleaning up old data: {e}")
@@ -11,7 +11,7 @@ import json
 import logging
 import os
 import time
-from typing import Dict, Any, List, Optional, Callable, Tuple
+from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 from pathlib import Path
 import asyncio
@@ -19,7 +19,8 @@ import threading
 import copy
 import tempfile
 import shutil
-import subprocess
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass
 import yaml
 import importlib
@@ -29,6 +30,8 @@ from concurrent.futures import ThreadPoolExecutor
 from hephaestus.utils.config_loader import load_config
 from hephaestus.utils.llm_client import call_llm_api
 from hephaestus.utils.json_parser import parse_json_response
+from hephaestus.utils.backup_store import get_backup_store
+from hephaestus.utils.git_utils import GitCommitBatch
 
 
 @dataclass
@@ -76,6 +79,7 @@ class RealEvolutionCallbacks:
         self.prompts_dir = Path("data/prompts")
         self.workflows_dir = Path("data/workflows")
         self.agents_dir = Path("data/agents")
+        self.runtime_config_file = self.config_dir / "runtime_config.yaml"
         
         # Criar diretórios necessários
         for directory in [self.config_dir, self.prompts_dir, self.workflows_dir, self.agents_dir]:
@@ -84,86 +88,130 @@ class RealEvolutionCallbacks:
         # Thread pool para execução assíncrona
         self.executor = ThreadPoolExecutor(max_workers=4)
         
+        # Backups deduplicados por conteúdo e commits agrupados por ciclo
+        backup_settings = config.get("evolution_backups", {})
+        self.backup_store = get_backup_store(backup_settings.get("store_dir", "data/backups/store"))
+        self.git_batch = GitCommitBatch(self.logger, Path.cwd())
+        self._cycle_depth = 0
+        self._cycle_changes: List[EvolutionChange] = []
+        self._cycle_started: Optional[float] = None
+        self._cycle_baseline: Dict[str, float] = {}
+        self.cycle_history = deque(maxlen=backup_settings.get("cycle_history_size", 50))
+        
         # Carregar estado existente
         self._load_existing_state()
         
         self.logger.info("🔧 Real Evolution Callbacks initialized - Sistema 100% FUNCIONAL!")
     
-    def _commit_evolution_changes(self, change: EvolutionChange) -> bool:
+    def _commit_evolution_changes(self, change: EvolutionChange, paths: List[Path]) -> bool:
         """
-        Faz commit automático das mudanças de evolução no Git
+        Registra os arquivos da mudança no commit do ciclo atual.
+        Fora de um ciclo (evolution_cycle) o commit é feito na hora.
         """
         try:
-            # Verificar se estamos em um repositório Git
-            if not self._is_git_repository():
-                self.logger.warning("⚠️ Not in a Git repository, skipping commit")
-                return False
-            
-            # Adicionar arquivos modificados
-            self._run_git_command(['git', 'add', '.'])
-            
-            # Gerar mensagem de commit
-            commit_message = self._generate_commit_message(change)
-            
-            # Fazer commit
-            success, output = self._run_git_command(['git', 'commit', '-m', commit_message])
-            
-            if success:
-                # Obter hash do commit
-                commit_hash = self._get_last_commit_hash()
-                change.git_committed = True
-                change.commit_hash = commit_hash
-                
-                if commit_hash:
-                    self.logger.info(f"✅ Evolution changes committed: {commit_hash[:8]}")
-                    if change.audit_trail is not None:
-                        change.audit_trail.append(f"Changes committed to Git: {commit_hash[:8]}")
-                else:
-                    self.logger.info("✅ Evolution changes committed (no hash available)")
-                    if change.audit_trail is not None:
-                        change.audit_trail.append("Changes committed to Git (no hash available)")
-                return True
-            else:
-                self.logger.error(f"❌ Failed to commit evolution changes: {output}")
-                change.error_message = f"Git commit failed: {output}"
-                return False
-                
+            self.git_batch.stage(paths, self._generate_commit_message(change))
+            with self.changes_lock:
+                self._cycle_changes.append(change)
+                in_cycle = self._cycle_depth > 0
+            if not in_cycle:
+                self._flush_cycle()
+            return True
         except Exception as e:
             self.logger.error(f"❌ Error committing evolution changes: {e}")
             change.error_message = f"Git commit error: {e}"
             return False
     
-    def _is_git_repository(self) -> bool:
-        """Verifica se estamos em um repositório Git"""
+    @contextmanager
+    def evolution_cycle(self):
+        """
+        Agrupa as mudanças aplicadas dentro do bloco num único commit,
+        feito ao sair do bloco mais externo.
+        """
+        with self.changes_lock:
+            if self._cycle_depth == 0:
+                self._begin_cycle()
+            self._cycle_depth += 1
         try:
-            success, _ = self._run_git_command(['git', 'rev-parse', '--git-dir'])
-            return success
-        except:
-            return False
+            yield self
+        finally:
+            with self.changes_lock:
+                self._cycle_depth -= 1
+                outermost = self._cycle_depth == 0
+            if outermost:
+                self._flush_cycle()
     
-    def _run_git_command(self, command: List[str]) -> Tuple[bool, str]:
-        """Executa comando Git e retorna sucesso e output"""
-        try:
-            result = subprocess.run(
-                command,
-                capture_output=True,
-                text=True,
-                cwd=Path.cwd(),
-                timeout=30
+    def _begin_cycle(self):
+        self._cycle_started = time.perf_counter()
+        store_stats = self.backup_store.get_stats()
+        self._cycle_baseline = {
+            "processes_spawned": self.git_batch.stats["processes_spawned"],
+            "bytes_written": store_stats["bytes_written"],
+            "bytes_deduplicated": store_stats["bytes_deduplicated"],
+        }
+    
+    def _flush_cycle(self) -> Optional[Dict[str, Any]]:
+        """Commit único das mudanças do ciclo e registro do custo (processos, bytes, tempo)."""
+        with self.changes_lock:
+            changes, self._cycle_changes = self._cycle_changes, []
+            if self._cycle_started is None:
+                self._begin_cycle()
+            started, self._cycle_started = self._cycle_started, None
+        if not changes:
+            return None
+        
+        summary = f"🤖 Evolution cycle: {len(changes)} changes" if len(changes) > 1 else None
+        commit_hash = self.git_batch.flush(summary)
+        for change in changes:
+            if commit_hash:
+                change.git_committed = True
+                change.commit_hash = commit_hash
+                if change.audit_trail is not None:
+                    change.audit_trail.append(f"Changes committed to Git: {commit_hash[:8]}")
+        
+        store_stats = self.backup_store.get_stats()
+        stats = {
+            "finished_at": datetime.now().isoformat(),
+            "changes": len(changes),
+            "commit_hash": commit_hash,
+            "processes_spawned": self.git_batch.stats["processes_spawned"] - self._cycle_baseline["processes_spawned"],
+            "backup_bytes_written": store_stats["bytes_written"] - self._cycle_baseline["bytes_written"],
+            "backup_bytes_deduplicated": store_stats["bytes_deduplicated"] - self._cycle_baseline["bytes_deduplicated"],
+            "seconds": time.perf_counter() - started,
+        }
+        self.cycle_history.append(stats)
+        if commit_hash:
+            self.logger.info(
+                f"✅ Evolution changes committed: {commit_hash[:8]} ({stats['changes']} change(s), "
+                f"{stats['processes_spawned']} process(es), {stats['backup_bytes_written']} backup bytes, "
+                f"{stats['seconds'] * 1000:.1f} ms)"
             )
-            return result.returncode == 0, result.stdout.strip()
+        return stats
+    
+    def get_cycle_stats(self) -> Dict[str, Any]:
+        """Custo dos últimos ciclos de evolução e totais do store de backups e do git."""
+        return {
+            "cycles": list(self.cycle_history),
+            "backup_store": self.backup_store.get_stats(),
+            "git": dict(self.git_batch.stats),
+        }
+    
+    def _snapshot_files(self, label: str, paths: List[Path]) -> str:
+        """Backup (deduplicado) dos arquivos antes da mudança; devolve o id do manifesto."""
+        try:
+            return self.backup_store.snapshot([str(p) for p in paths], label=label)
         except Exception as e:
-            return False, str(e)
+            self.logger.error(f"Error creating backup snapshot: {e}")
+            return ""
     
-    def _get_last_commit_hash(self) -> Optional[str]:
-        """Obtém o hash do último commit"""
+    def _restore_files(self, manifest_id: str, paths: List[Path]) -> List[str]:
+        """Restaura do manifesto os arquivos indicados."""
+        if not manifest_id:
+            return []
         try:
-            success, output = self._run_git_command(['git', 'rev-parse', 'HEAD'])
-            if success:
-                return output.strip()
-        except:
-            pass
-        return None
+            return self.backup_store.restore(manifest_id, [str(p) for p in paths])
+        except Exception as e:
+            self.logger.error(f"Error restoring backup snapshot {manifest_id}: {e}")
+            return []
     
     def _generate_commit_message(self, change: EvolutionChange) -> str:
         """Gera mensagem de commit para mudança de evolução"""
@@ -200,6 +248,10 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 # Se não conseguiu otimizar, usar prompt padrão melhorado
                 new_prompt = self._get_default_prompt(target)
             
+            # Backup dos arquivos que a mudança vai tocar
+            touched = [self.prompts_dir / f"{target}_prompt.txt", self.runtime_config_file]
+            backup = self._snapshot_files(f"prompt_{target}", touched)
+            
             # Aplicar a mudança
             success = self._apply_prompt_change(target, new_prompt)
             
@@ -213,6 +265,12 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                     new_value=new_prompt,
                     applied_at=datetime.now(),
                     success=True,
+                    rollback_data={
+                        "target": target,
+                        "old_prompt": old_prompt,
+                        "backup": backup,
+                        "paths": [str(p) for p in touched]
+                    },
                     audit_trail=[
                         f"Optimized prompt for {target}",
                         f"Modification: {modification}",
@@ -222,7 +280,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 )
                 
                 # Fazer commit das mudanças
-                self._commit_evolution_changes(change)
+                self._commit_evolution_changes(change, touched)
                 
                 with self.changes_lock:
                     self.applied_changes.append(change)
@@ -251,6 +309,9 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
             # Obter valor atual
             current_value = self._get_current_strategy_value(strategy)
             
+            touched = [self.runtime_config_file]
+            backup = self._snapshot_files(f"strategy_{strategy}", touched)
+            
             # Aplicar mudança REAL
             success = self._apply_real_parameter_change(strategy, "strategy", new_value, current_value)
             
@@ -267,7 +328,8 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                     rollback_data={
                         "strategy": strategy,
                         "old_value": current_value,
-                        "config_backup": self._backup_config()
+                        "backup": backup,
+                        "paths": [str(p) for p in touched]
                     },
                     audit_trail=[
                         f"Updated strategy {strategy} in dynamic config",
@@ -277,7 +339,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 )
                 
                 # Fazer commit das mudanças
-                self._commit_evolution_changes(change)
+                self._commit_evolution_changes(change, touched)
                 
                 with self.changes_lock:
                     self.applied_changes.append(change)
@@ -307,6 +369,9 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
             # Obter valor atual
             current_value = self._get_current_parameter_value(parameter, component)
             
+            touched = [self.runtime_config_file]
+            backup = self._snapshot_files(f"param_{component}_{parameter}", touched)
+            
             # Aplicar mudança REAL
             success = self._apply_real_parameter_change(parameter, component, new_value, current_value)
             
@@ -324,7 +389,8 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                         "parameter": parameter,
                         "component": component,
                         "old_value": current_value,
-                        "config_backup": self._backup_config()
+                        "backup": backup,
+                        "paths": [str(p) for p in touched]
                     },
                     audit_trail=[
                         f"Applied parameter tuning to {component}",
@@ -334,7 +400,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 )
                 
                 # Fazer commit das mudanças
-                self._commit_evolution_changes(change)
+                self._commit_evolution_changes(change, touched)
                 
                 with self.changes_lock:
                     self.applied_changes.append(change)
@@ -362,7 +428,9 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 return False
             
             # Backup do workflow atual
-            old_workflow = self._get_workflow_definition(workflow)
+            old_workflow = copy.deepcopy(self._get_workflow_definition(workflow))
+            touched = [self.runtime_config_file, self.workflows_dir / f"{workflow}_workflow.yaml"]
+            backup = self._snapshot_files(f"workflow_{workflow}", touched)
             
             # Aplicar modificação REAL
             success = self._apply_real_workflow_change(workflow, modification, impact)
@@ -380,7 +448,8 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                     rollback_data={
                         "workflow": workflow,
                         "old_definition": old_workflow,
-                        "backup_file": self._backup_workflow(workflow, old_workflow)
+                        "backup": backup,
+                        "paths": [str(p) for p in touched]
                     },
                     audit_trail=[
                         f"Applied workflow modification to {workflow}",
@@ -391,7 +460,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 )
                 
                 # Fazer commit das mudanças
-                self._commit_evolution_changes(change)
+                self._commit_evolution_changes(change, touched)
                 
                 with self.changes_lock:
                     self.applied_changes.append(change)
@@ -419,7 +488,9 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 return False
             
             # Backup do comportamento atual
-            old_behavior = self._get_agent_behavior(agent)
+            old_behavior = copy.deepcopy(self._get_agent_behavior(agent))
+            touched = [self.runtime_config_file, self.agents_dir / f"{agent}_config.yaml"]
+            backup = self._snapshot_files(f"behavior_{agent}", touched)
             
             # Aplicar mudança REAL
             success = self._apply_real_behavior_change(agent, behavior, change)
@@ -438,7 +509,8 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                         "agent": agent,
                         "behavior": behavior,
                         "old_behavior": old_behavior,
-                        "backup_file": self._backup_agent_config(agent, old_behavior)
+                        "backup": backup,
+                        "paths": [str(p) for p in touched]
                     },
                     audit_trail=[
                         f"Applied behavior change to {agent}",
@@ -449,7 +521,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
                 )
                 
                 # Fazer commit das mudanças
-                self._commit_evolution_changes(change_obj)
+                self._commit_evolution_changes(change_obj, touched)
                 
                 with self.changes_lock:
                     self.applied_changes.append(change_obj)
@@ -498,6 +570,18 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
             if success:
                 if change.audit_trail is not None:
                     change.audit_trail.append(f"Successfully rolled back at {datetime.now()}")
+                # O rollback entra no mesmo commit em lote do ciclo
+                rollback = EvolutionChange(
+                    change_id=f"rollback_{change_id}",
+                    change_type="rollback",
+                    description=f"Rollback {change.description}",
+                    old_value=change.new_value,
+                    new_value=change.old_value,
+                    applied_at=datetime.now(),
+                    success=True
+                )
+                paths = [Path(p) for p in change.rollback_data.get("paths", [self.runtime_config_file])]
+                self._commit_evolution_changes(rollback, paths)
                 self.logger.info(f"✅ Successfully rolled back change {change_id}")
                 return True
             else:
@@ -810,78 +894,6 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
         """Obtém comportamento atual do agente"""
         return self.dynamic_config.get("agents", {}).get(agent, {})
     
-    def _create_backup(self, target: str, content: str) -> str:
-        """Cria backup do conteúdo"""
-        try:
-            backup_dir = Path("data/backups")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir / f"{target}_backup_{timestamp}.txt"
-            
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
-            return str(backup_file)
-            
-        except Exception as e:
-            self.logger.error(f"Error creating backup: {e}")
-            return ""
-    
-    def _backup_config(self) -> str:
-        """Cria backup da configuração"""
-        try:
-            backup_dir = Path("data/backups")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir / f"config_backup_{timestamp}.yaml"
-            
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                yaml.dump(self.dynamic_config, f, default_flow_style=False)
-            
-            return str(backup_file)
-            
-        except Exception as e:
-            self.logger.error(f"Error backing up config: {e}")
-            return ""
-    
-    def _backup_workflow(self, workflow: str, definition: Dict[str, Any]) -> str:
-        """Cria backup do workflow"""
-        try:
-            backup_dir = Path("data/backups")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir / f"{workflow}_workflow_backup_{timestamp}.yaml"
-            
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                yaml.dump(definition, f, default_flow_style=False)
-            
-            return str(backup_file)
-            
-        except Exception as e:
-            self.logger.error(f"Error backing up workflow: {e}")
-            return ""
-    
-    def _backup_agent_config(self, agent: str, config: Dict[str, Any]) -> str:
-        """Cria backup da configuração do agente"""
-        try:
-            backup_dir = Path("data/backups")
-            backup_dir.mkdir(parents=True, exist_ok=True)
-            
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_file = backup_dir / f"{agent}_config_backup_{timestamp}.yaml"
-            
-            with open(backup_file, 'w', encoding='utf-8') as f:
-                yaml.dump(config, f, default_flow_style=False)
-            
-            return str(backup_file)
-            
-        except Exception as e:
-            self.logger.error(f"Error backing up agent config: {e}")
-            return ""
-    
     def _get_config_files_status(self) -> Dict[str, str]:
         """Obtém status dos arquivos de configuração"""
         return {
@@ -996,6 +1008,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
             self.dynamic_config["workflows"][workflow] = old_definition
             
             self._save_dynamic_config()
+            self._restore_files(rollback_data.get("backup", ""), [self.workflows_dir / f"{workflow}_workflow.yaml"])
             
             return True
             
@@ -1016,6 +1029,7 @@ Auto-generated by Hephaestus Real-Time Evolution Engine
             self.dynamic_config["agents"][agent] = old_behavior
             
             self._save_dynamic_config()
+            self._restore_files(rollback_data.get("backup", ""), [self.agents_dir / f"{agent}_config.yaml"])
             
             return True
             
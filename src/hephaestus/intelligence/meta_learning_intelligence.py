@@ -15,7 +15,6 @@ Este sistema observa os próprios padrões de aprendizado e otimiza:
 import json
 import logging
 import time
-import threading
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -26,6 +25,8 @@ import numpy as np
 import statistics
 import hashlib
 
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
 class LearningType(Enum):
     """Tipos de aprendizado que o sistema pode fazer"""
     ERROR_CORRECTION = "error_correction"
@@ -187,9 +188,8 @@ class MetaLearningIntelligence:
             "memory_optimizations": 0
         }
         
-        # Threading
-        self.analysis_thread = None
-        self.should_stop = threading.Event()
+        # Job periódico no escalonador de background
+        self.analysis_job = None
         
         # Load existing data
         self._load_learning_data()
@@ -770,33 +770,31 @@ class MetaLearningIntelligence:
     def _start_continuous_analysis(self):
         """Inicia análise contínua em background"""
         
-        if self.analysis_thread is None or not self.analysis_thread.is_alive():
-            self.analysis_thread = threading.Thread(target=self._analysis_loop, daemon=True)
-            self.analysis_thread.start()
+        if self.analysis_job is None or not self.analysis_job.active:
+            # Roda a cada minuto
+            self.analysis_job = get_background_scheduler().schedule(
+                "meta_learning_analysis", self._analysis_tick, interval=60, jitter=6.0,
+                priority=JobPriority.LOW, max_runtime=30
+            )
     
-    def _analysis_loop(self):
-        """Loop de análise contínua"""
+    def _analysis_tick(self):
+        """Uma rodada de análise contínua"""
         
-        while not self.should_stop.wait(60):  # Run every minute
-            try:
-                # Detect patterns
-                self._detect_learning_patterns()
-                
-                # Check for biases
-                self.detect_learning_bias()
-                
-                # Optimize memory
-                if len(self.adaptive_memory) > 50:
-                    self.optimize_memory_retention()
-                
-                # Update analytics
-                self._update_learning_analytics()
-                
-                # Save state
-                self._save_learning_data()
-                
-            except Exception as e:
-                self.logger.error(f"Error in analysis loop: {e}")
+        # Detect patterns
+        self._detect_learning_patterns()
+        
+        # Check for biases
+        self.detect_learning_bias()
+        
+        # Optimize memory
+        if len(self.adaptive_memory) > 50:
+            self.optimize_memory_retention()
+        
+        # Update analytics
+        self._update_learning_analytics()
+        
+        # Save state
+        self._save_learning_data()
     
     def _update_learning_analytics(self):
         """Atualiza analytics de aprendizado"""
@@ -1054,10 +1052,8 @@ class MetaLearningIntelligence:
         
         self.logger.info("🛑 Shutting down Meta-Learning Intelligence...")
         
-        self.should_stop.set()
-        
-        if self.analysis_thread and self.analysis_thread.is_alive():
-            self.analysis_thread.join(timeout=5)
+        if self.analysis_job:
+            self.analysis_job.cancel()
         
         # Final save
         self._save_learning_data()
@@ -0,0 +1,201 @@
+"""
+📼 METRIC SEGMENT STORE
+Armazenamento append-only das séries de métricas da Evolution Analytics.
+
+Cada métrica tem um diretório próprio com segmentos binários por janela de
+tempo (um dia por padrão). Cada amostra é um registro de tamanho fixo
+(timestamp, valor) anexado ao segmento corrente, sem reler nem reescrever o
+histórico. A leitura mapeia os segmentos com ``np.memmap`` e recorta o
+intervalo pedido por busca binária; a retenção apaga segmentos inteiros.
+"""
+
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, unquote
+
+import numpy as np
+
+# Registro binário de tamanho fixo (16 bytes) anexado a cada amostra
+METRIC_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("value", "<f8"),
+])
+
+SEGMENT_SUFFIX = ".seg"
+
+
+class MetricSegmentStore:
+    """
+    Séries temporais por métrica em segmentos binários apenas anexados.
+
+    - Escrita: um ``write`` de 16 bytes por amostra no segmento da janela corrente
+    - Leitura: segmentos sobrepostos ao intervalo via ``np.memmap`` + ``searchsorted``
+    - Retenção: ``drop_before`` remove arquivos de segmentos expirados por inteiro
+
+    Os timestamps de uma métrica são mantidos não decrescentes (uma amostra com
+    relógio atrasado é gravada com o último timestamp), o que garante a ordem
+    exigida pela busca binária.
+    """
+
+    def __init__(self, data_dir: Path, segment_seconds: float = 86400.0,
+                 logger: Optional[logging.Logger] = None):
+        self.data_dir = Path(data_dir)
+        self.segment_seconds = max(1.0, float(segment_seconds))
+        self.logger = logger or logging.getLogger(__name__)
+        self._lock = threading.RLock()
+
+        # Índices de segmento existentes (ordenados) e último timestamp por métrica
+        self._segments: Dict[str, List[int]] = {}
+        self._last_timestamp: Dict[str, float] = {}
+        self._scan()
+
+    # ------------------------------------------------------------------
+    # Layout em disco
+    # ------------------------------------------------------------------
+    def _metric_dir(self, metric_name: str) -> Path:
+        return self.data_dir / quote(metric_name, safe="")
+
+    def _segment_path(self, metric_name: str, index: int) -> Path:
+        return self._metric_dir(metric_name) / f"{index:012d}{SEGMENT_SUFFIX}"
+
+    def _segment_index(self, timestamp: float) -> int:
+        return int(timestamp // self.segment_seconds)
+
+    def _scan(self):
+        """Descobre métricas e segmentos já gravados"""
+        if not self.data_dir.exists():
+            return
+        for metric_dir in self.data_dir.iterdir():
+            if not metric_dir.is_dir():
+                continue
+            indexes = sorted(
+                int(path.stem) for path in metric_dir.glob(f"*{SEGMENT_SUFFIX}") if path.stem.isdigit()
+            )
+            if not indexes:
+                continue
+            metric_name = unquote(metric_dir.name)
+            self._segments[metric_name] = indexes
+            last = self._read_segment(metric_name, indexes[-1])
+            if len(last):
+                self._last_timestamp[metric_name] = float(last["timestamp"][-1])
+
+    def _read_segment(self, metric_name: str, index: int) -> np.ndarray:
+        """Mapeia um segmento (ignorando um registro final truncado por queda do processo)"""
+        path = self._segment_path(metric_name, index)
+        try:
+            count = path.stat().st_size // METRIC_RECORD_DTYPE.itemsize
+        except FileNotFoundError:
+            count = 0
+        if count == 0:
+            return np.zeros(0, dtype=METRIC_RECORD_DTYPE)
+        return np.memmap(path, dtype=METRIC_RECORD_DTYPE, mode="r", shape=(count,))
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def append(self, metric_name: str, timestamp: float, value: float):
+        """Anexa uma amostra ao segmento corrente da métrica"""
+        self.append_many(metric_name, np.array([timestamp], dtype=np.float64),
+                         np.array([value], dtype=np.float64))
+
+    def append_many(self, metric_name: str, timestamps: np.ndarray, values: np.ndarray):
+        """Anexa amostras em lote (usado também na migração do histórico JSON)"""
+        records = np.zeros(len(timestamps), dtype=METRIC_RECORD_DTYPE)
+        if len(records) == 0:
+            return
+        records["value"] = values
+
+        with self._lock:
+            last = self._last_timestamp.get(metric_name, -np.inf)
+            records["timestamp"] = np.maximum.accumulate(np.maximum(np.asarray(timestamps, dtype=np.float64), last))
+            self._last_timestamp[metric_name] = float(records["timestamp"][-1])
+
+            indexes = (records["timestamp"] // self.segment_seconds).astype(np.int64)
+            boundaries = np.flatnonzero(np.diff(indexes)) + 1
+            metric_dir = self._metric_dir(metric_name)
+            metric_dir.mkdir(parents=True, exist_ok=True)
+            segments = self._segments.setdefault(metric_name, [])
+            for chunk in np.split(records, boundaries):
+                index = self._segment_index(float(chunk["timestamp"][0]))
+                with open(self._segment_path(metric_name, index), "ab") as f:
+                    f.write(chunk.tobytes())
+                if not segments or segments[-1] != index:
+                    segments.append(index)
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def metric_names(self) -> List[str]:
+        with self._lock:
+            return [name for name, segments in self._segments.items() if segments]
+
+    def range(self, metric_name: str, start: Optional[float] = None,
+              end: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Amostras com ``start <= timestamp < end`` como arrays (timestamps, valores).
+
+        Apenas os segmentos que cobrem o intervalo são mapeados; dentro deles o
+        recorte é feito por ``searchsorted``.
+        """
+        with self._lock:
+            segments = list(self._segments.get(metric_name, []))
+        if start is not None:
+            first = np.searchsorted(segments, self._segment_index(start), side="left")
+            segments = segments[first:]
+        if end is not None:
+            last = np.searchsorted(segments, self._segment_index(end), side="right")
+            segments = segments[:last]
+
+        timestamps, values = [], []
+        for index in segments:
+            records = self._read_segment(metric_name, index)
+            column = records["timestamp"]
+            lo = np.searchsorted(column, start, side="left") if start is not None else 0
+            hi = np.searchsorted(column, end, side="left") if end is not None else len(records)
+            if hi > lo:
+                timestamps.append(np.array(column[lo:hi]))
+                values.append(np.array(records["value"][lo:hi]))
+
+        if not timestamps:
+            return np.zeros(0, dtype=np.float64), np.zeros(0, dtype=np.float64)
+        return np.concatenate(timestamps), np.concatenate(values)
+
+    def count(self, metric_name: str) -> int:
+        """Número de amostras gravadas da métrica (pelo tamanho dos arquivos)"""
+        with self._lock:
+            segments = list(self._segments.get(metric_name, []))
+        total = 0
+        for index in segments:
+            try:
+                total += self._segment_path(metric_name, index).stat().st_size // METRIC_RECORD_DTYPE.itemsize
+            except FileNotFoundError:
+                pass
+        return total
+
+    # ------------------------------------------------------------------
+    # Retenção
+    # ------------------------------------------------------------------
+    def drop_before(self, cutoff: float) -> int:
+        """
+        Remove os segmentos inteiramente anteriores a ``cutoff``.
+
+        O segmento que contém o corte é mantido; as leituras por intervalo já
+        ignoram as amostras antigas que restam nele.
+        """
+        cutoff_index = self._segment_index(cutoff)
+        removed = 0
+        with self._lock:
+            for metric_name, segments in self._segments.items():
+                keep_from = int(np.searchsorted(segments, cutoff_index, side="left"))
+                for index in segments[:keep_from]:
+                    try:
+                        self._segment_path(metric_name, index).unlink()
+                        removed += 1
+                    except FileNotFoundError:
+                        pass
+                    except OSError as e:
+                        self.logger.error(f"Failed to remove metric segment {metric_name}/{index}: {e}")
+                del segments[:keep_from]
+        return removed
@@ -6,6 +6,7 @@ fine-tuning datasets, enabling the AI to literally train better versions
 of itself. This is where we achieve true model-level self-improvement!
 """
 
+import atexit
 import json
 import logging
 import hashlib
@@ -15,6 +16,7 @@ import time
 import threading
 import queue
 import statistics
+import zlib
 from typing import Dict, Any, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
@@ -24,6 +26,12 @@ from collections import defaultdict, deque
 from hephaestus.utils.llm_client import call_llm_api
 from hephaestus.utils.json_parser import parse_json_response
 
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 
 @dataclass
 class ModelPerformanceData:
@@ -56,45 +64,56 @@ class FineTuningDataset:
     metadata: Dict[str, Any]
 
 
-class ModelOptimizer:
+class PerformanceDataRecorder:
     """
-    Advanced system for model self-optimization through performance data collection
-    and fine-tuning dataset generation.
+    Write-behind recorder for model performance data.
+
+    Keeps one long-lived WAL-mode SQLite connection, buffers captured rows and
+    flushes them in batches (on size or interval) from a background thread.
+    Per-agent rollups are maintained in the same transaction so summaries never
+    need to scan the raw table.
     """
-    
-    def __init__(self, model_config: Dict[str, str], logger: logging.Logger):
-        self.model_config = model_config
+
+    CODECS = ("none", "zlib", "zstd")
+    _STOP = object()
+    _FLUSH = object()
+
+    def __init__(self, db_path: Path, logger: logging.Logger, batch_size: int = 50,
+                 flush_interval: float = 2.0, text_compression: str = "zstd",
+                 on_batch_written: Optional[Callable[[List[ModelPerformanceData]], None]] = None):
+        self.db_path = Path(db_path)
         self.logger = logger
-        
-        # Initialize database for performance tracking
-        self.db_path = Path("reports/model_performance.db")
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.on_batch_written = on_batch_written
+
+        if text_compression == "zstd" and not ZSTD_AVAILABLE:
+            self.logger.info("zstandard not installed - falling back to zlib for prompt/response blobs")
+            text_compression = "zlib"
+        if text_compression not in self.CODECS:
+            raise ValueError(f"Unknown text compression '{text_compression}', expected one of {self.CODECS}")
+        self.text_compression = text_compression
+        self._zstd_compressor = zstandard.ZstdCompressor(level=3) if text_compression == "zstd" else None
+
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self._init_database()
-        
-        # Performance tracking
-        self.performance_data = []
-        self.quality_thresholds = {
-            "architect": 0.8,
-            "maestro": 0.75,
-            "code_review": 0.9,
-            "error_analysis": 0.7,
-            "performance_analysis": 0.8
-        }
-        
-        # Fine-tuning management
-        self.datasets = {}
-        self.optimization_history = []
-        
-        # Advanced analytics
-        self.performance_trends = defaultdict(list)
-        self.prompt_effectiveness = {}
-        
-        self.logger.info("🚀 ModelOptimizer initialized - Ready for self-optimization!")
-    
-    def _init_database(self):
-        """Initialize SQLite database for performance tracking"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn_lock = threading.Lock()
+        self._init_schema()
+
+        self._pending: "queue.Queue[ModelPerformanceData]" = queue.Queue()
+        self._stop_event = threading.Event()
+        self._closed = False
+        self.stats = {"rows_written": 0, "batches_written": 0, "last_flush_seconds": 0.0}
+        self._writer_thread = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer_thread.start()
+        atexit.register(self.close)
+
+    def _init_schema(self):
+        """Create tables, indexes and rollups, migrating older databases in place."""
+        with self._conn_lock, self._conn:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS performance_data (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     timestamp TEXT NOT NULL,
@@ -106,11 +125,39 @@ class ModelOptimizer:
                     quality_score REAL NOT NULL,
                     context_metadata TEXT,
                     prompt_text TEXT,
-                    response_text TEXT
+                    response_text TEXT,
+                    text_codec TEXT NOT NULL DEFAULT 'none'
                 )
             """)
-            
-            conn.execute("""
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(performance_data)")}
+            if "text_codec" not in columns:
+                self._conn.execute("ALTER TABLE performance_data ADD COLUMN text_codec TEXT NOT NULL DEFAULT 'none'")
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_performance_agent_time
+                ON performance_data (agent_type, timestamp)
+            """)
+
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS agent_performance_rollup (
+                    agent_type TEXT PRIMARY KEY,
+                    total_calls INTEGER NOT NULL,
+                    success_calls INTEGER NOT NULL,
+                    quality_sum REAL NOT NULL,
+                    last_timestamp TEXT
+                )
+            """)
+            rollup_rows = self._conn.execute("SELECT COUNT(*) FROM agent_performance_rollup").fetchone()[0]
+            if rollup_rows == 0:
+                # Databases written before the rollup existed get it rebuilt once
+                self._conn.execute("""
+                    INSERT INTO agent_performance_rollup
+                    SELECT agent_type, COUNT(*), SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
+                           SUM(quality_score), MAX(timestamp)
+                    FROM performance_data
+                    GROUP BY agent_type
+                """)
+
+            self._conn.execute("""
                 CREATE TABLE IF NOT EXISTS fine_tuning_datasets (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
                     name TEXT NOT NULL,
@@ -123,6 +170,197 @@ class ModelOptimizer:
                     metadata TEXT
                 )
             """)
+
+    def record(self, perf_data: ModelPerformanceData):
+        """Queue a performance record; returns immediately."""
+        if self._closed:
+            self.logger.warning("PerformanceDataRecorder is closed - dropping performance record")
+            return
+        self._pending.put(perf_data)
+
+    def _encode_text(self, text: str) -> Any:
+        data = text.encode("utf-8")
+        if self.text_compression == "zstd":
+            return self._zstd_compressor.compress(data)
+        if self.text_compression == "zlib":
+            return zlib.compress(data, 6)
+        return text
+
+    @staticmethod
+    def decode_text(value: Any, codec: str) -> str:
+        """Decode a stored prompt/response column according to its codec."""
+        if value is None:
+            return ""
+        if codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is required to read zstd-compressed performance data")
+            return zstandard.ZstdDecompressor().decompress(value).decode("utf-8")
+        if codec == "zlib":
+            return zlib.decompress(value).decode("utf-8")
+        return value
+
+    def _drain(self, block: bool) -> List[ModelPerformanceData]:
+        """Collect up to one batch from the pending queue."""
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    item = self._pending.get(timeout=timeout)
+                else:
+                    item = self._pending.get_nowait()
+            except queue.Empty:
+                break
+            if item is self._STOP or item is self._FLUSH:
+                # Markers end the batch early so flush()/close() never wait out flush_interval
+                self._pending.task_done()
+                break
+            batch.append(item)
+        return batch
+
+    def _write_batch(self, batch: List[ModelPerformanceData]):
+        rows = []
+        rollup: Dict[str, List[Any]] = {}
+        for perf_data in batch:
+            timestamp = perf_data.timestamp.isoformat()
+            rows.append((
+                timestamp,
+                perf_data.agent_type,
+                perf_data.prompt_hash,
+                perf_data.response_hash,
+                perf_data.success,
+                perf_data.execution_time,
+                perf_data.quality_score,
+                json.dumps(perf_data.context_metadata, default=str),
+                self._encode_text(perf_data.prompt),
+                self._encode_text(perf_data.response),
+                self.text_compression
+            ))
+            entry = rollup.setdefault(perf_data.agent_type, [0, 0, 0.0, timestamp])
+            entry[0] += 1
+            entry[1] += 1 if perf_data.success else 0
+            entry[2] += perf_data.quality_score
+            entry[3] = max(entry[3], timestamp)
+
+        start = time.perf_counter()
+        with self._conn_lock, self._conn:
+            self._conn.executemany("""
+                INSERT INTO performance_data (
+                    timestamp, agent_type, prompt_hash, response_hash,
+                    success, execution_time, quality_score, context_metadata,
+                    prompt_text, response_text, text_codec
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+            self._conn.executemany("""
+                INSERT INTO agent_performance_rollup (agent_type, total_calls, success_calls, quality_sum, last_timestamp)
+                VALUES (?, ?, ?, ?, ?)
+                ON CONFLICT(agent_type) DO UPDATE SET
+                    total_calls = total_calls + excluded.total_calls,
+                    success_calls = success_calls + excluded.success_calls,
+                    quality_sum = quality_sum + excluded.quality_sum,
+                    last_timestamp = MAX(COALESCE(last_timestamp, ''), excluded.last_timestamp)
+            """, [(agent_type, *values) for agent_type, values in rollup.items()])
+
+        self.stats["rows_written"] += len(rows)
+        self.stats["batches_written"] += 1
+        self.stats["last_flush_seconds"] = time.perf_counter() - start
+
+        if self.on_batch_written:
+            try:
+                self.on_batch_written(batch)
+            except Exception as e:
+                self.logger.error(f"Post-write analysis failed: {e}")
+
+    def _write_and_ack(self, batch: List[ModelPerformanceData]):
+        try:
+            self._write_batch(batch)
+        except Exception as e:
+            self.logger.error(f"Failed to persist {len(batch)} performance records: {e}")
+        finally:
+            for _ in batch:
+                self._pending.task_done()
+
+    def _writer_loop(self):
+        while not self._stop_event.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write_and_ack(batch)
+
+    def flush(self):
+        """Synchronously persist everything queued so far, including in-flight batches."""
+        if self._writer_thread.is_alive():
+            self._pending.put(self._FLUSH)
+        else:
+            while True:
+                batch = self._drain(block=False)
+                if not batch:
+                    break
+                self._write_and_ack(batch)
+        self._pending.join()
+
+    def execute(self, sql: str, params: Tuple = ()) -> List[Tuple]:
+        """Run a statement on the shared connection and return all rows."""
+        with self._conn_lock, self._conn:
+            return self._conn.execute(sql, params).fetchall()
+
+    def close(self):
+        """Stop the writer thread, flush pending rows and close the connection."""
+        if self._closed:
+            return
+        self._closed = True
+        self._stop_event.set()
+        self._pending.put(self._STOP)
+        self._writer_thread.join(timeout=self.flush_interval + 1)
+        try:
+            self.flush()
+        finally:
+            with self._conn_lock:
+                self._conn.close()
+
+
+class ModelOptimizer:
+    """
+    Advanced system for model self-optimization through performance data collection
+    and fine-tuning dataset generation.
+    """
+    
+    def __init__(self, model_config: Dict[str, str], logger: logging.Logger,
+                 storage_config: Optional[Dict[str, Any]] = None):
+        self.model_config = model_config
+        self.logger = logger
+        storage_config = storage_config or {}
+        
+        # Write-behind database for performance tracking
+        self.db_path = Path(storage_config.get("db_path", "reports/model_performance.db"))
+        self.recorder = PerformanceDataRecorder(
+            self.db_path,
+            logger,
+            batch_size=storage_config.get("batch_size", 50),
+            flush_interval=storage_config.get("flush_interval_seconds", 2.0),
+            text_compression=storage_config.get("text_compression", "zstd"),
+            on_batch_written=self._analyze_written_batch
+        )
+        
+        # Performance tracking
+        self.performance_data = []
+        self.quality_thresholds = {
+            "architect": 0.8,
+            "maestro": 0.75,
+            "code_review": 0.9,
+            "error_analysis": 0.7,
+            "performance_analysis": 0.8
+        }
+        
+        # Fine-tuning management
+        self.datasets = {}
+        self.optimization_history = []
+        
+        # Advanced analytics
+        self.performance_trends = defaultdict(list)
+        self.prompt_effectiveness = {}
+        
+        self.logger.info("🚀 ModelOptimizer initialized - Ready for self-optimization!")
     
     def capture_performance_data(self, agent_type: str, prompt: str, response: str,
                                success: bool, execution_time: float, 
@@ -147,9 +385,9 @@ class ModelOptimizer:
             context_metadata=context_metadata or {}
         )
         
-        # Store in memory and database
+        # Store in memory; the recorder persists it in the background
         self.performance_data.append(perf_data)
-        self._store_performance_data(perf_data)
+        self.recorder.record(perf_data)
         
         # Update trends
         self.performance_trends[agent_type].append({
@@ -166,9 +404,6 @@ class ModelOptimizer:
         if len(self.performance_data) % 100 == 0:
             self._auto_optimize()
         
-        # Real-time pattern analysis
-        self._analyze_real_time_patterns(agent_type, perf_data)
-        
         self.logger.debug(f"Captured performance data for {agent_type}: quality={quality_score:.3f}")
         return quality_score
     
@@ -283,27 +518,13 @@ class ModelOptimizer:
         
         return max(0.0, min(1.0, context_score))
     
-    def _store_performance_data(self, perf_data: ModelPerformanceData):
-        """Store performance data in database."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO performance_data (
-                    timestamp, agent_type, prompt_hash, response_hash,
-                    success, execution_time, quality_score, context_metadata,
-                    prompt_text, response_text
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                perf_data.timestamp.isoformat(),
-                perf_data.agent_type,
-                perf_data.prompt_hash,
-                perf_data.response_hash,
-                perf_data.success,
-                perf_data.execution_time,
-                perf_data.quality_score,
-                json.dumps(perf_data.context_metadata),
-                perf_data.prompt,
-                perf_data.response
-            ))
+    def _analyze_written_batch(self, batch: List[ModelPerformanceData]):
+        """Run real-time pattern analysis off the hot path, once per agent type in a batch."""
+        latest_by_agent = {}
+        for perf_data in batch:
+            latest_by_agent[perf_data.agent_type] = perf_data
+        for agent_type, perf_data in latest_by_agent.items():
+            self._analyze_real_time_patterns(agent_type, perf_data)
     
     def _mark_for_fine_tuning(self, perf_data: ModelPerformanceData):
         """Mark high-quality data for fine-tuning dataset."""
@@ -425,22 +646,21 @@ class ModelOptimizer:
                 f.write(json.dumps(sample) + '\n')
         
         # Save metadata to database
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("""
-                INSERT INTO fine_tuning_datasets (
-                    name, agent_type, created_at, quality_threshold,
-                    performance_improvement, sample_count, dataset_path, metadata
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                dataset.name,
-                dataset.agent_type,
-                dataset.created_at.isoformat(),
-                dataset.quality_threshold,
-                dataset.performance_improvement,
-                len(dataset.samples),
-                str(dataset_path),
-                json.dumps(dataset.metadata)
-            ))
+        self.recorder.execute("""
+            INSERT INTO fine_tuning_datasets (
+                name, agent_type, created_at, quality_threshold,
+                performance_improvement, sample_count, dataset_path, metadata
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, (
+            dataset.name,
+            dataset.agent_type,
+            dataset.created_at.isoformat(),
+            dataset.quality_threshold,
+            dataset.performance_improvement,
+            len(dataset.samples),
+            str(dataset_path),
+            json.dumps(dataset.metadata)
+        ))
         
         self.logger.info(f"💾 Fine-tuning dataset saved: {dataset_path}")
     
@@ -626,33 +846,26 @@ Focus on:
 
     def get_agent_performance_summary(self) -> Dict[str, Dict[str, Any]]:
         """
-        Retrieves and summarizes performance data for each agent from the database.
+        Summarizes performance for each agent from the maintained rollup table.
         """
         summary = {}
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    SELECT
-                        agent_type,
-                        COUNT(*),
-                        SUM(CASE WHEN success = 1 THEN 1 ELSE 0 END),
-                        AVG(quality_score)
-                    FROM performance_data
-                    GROUP BY agent_type
-                """)
-                rows = cursor.fetchall()
-                
-                for row in rows:
-                    agent_type, total_calls, success_calls, avg_quality = row
-                    success_rate = (success_calls / total_calls) if total_calls > 0 else 0
-                    summary[agent_type] = {
-                        "total_calls": total_calls,
-                        "success_calls": success_calls,
-                        "success_rate": round(success_rate, 3),
-                        "average_quality_score": round(avg_quality, 3),
-                        "needs_evolution": success_rate < 0.8 or avg_quality < 0.75
-                    }
+            self.recorder.flush()
+            rows = self.recorder.execute("""
+                SELECT agent_type, total_calls, success_calls, quality_sum / total_calls
+                FROM agent_performance_rollup
+                WHERE total_calls > 0
+            """)
+            
+            for agent_type, total_calls, success_calls, avg_quality in rows:
+                success_rate = success_calls / total_calls
+                summary[agent_type] = {
+                    "total_calls": total_calls,
+                    "success_calls": success_calls,
+                    "success_rate": round(success_rate, 3),
+                    "average_quality_score": round(avg_quality, 3),
+                    "needs_evolution": success_rate < 0.8 or avg_quality < 0.75
+                }
             return summary
         except Exception as e:
             self.logger.error(f"Failed to get agent performance summary from DB: {e}")
@@ -843,9 +1056,10 @@ Focus on:
 # Global instance
 _model_optimizer = None
 
-def get_model_optimizer(model_config: Dict[str, str], logger: logging.Logger) -> ModelOptimizer:
+def get_model_optimizer(model_config: Dict[str, str], logger: logging.Logger,
+                        storage_config: Optional[Dict[str, Any]] = None) -> ModelOptimizer:
     """Factory function to get a singleton instance of the ModelOptimizer."""
     global _model_optimizer
     if _model_optimizer is None:
-        _model_optimizer = ModelOptimizer(model_config, logger)
+        _model_optimizer = ModelOptimizer(model_config, logger, storage_config)
     return _model_optimizer
\ No newline at end of file
@@ -2,22 +2,39 @@
 🧪 PARALLEL REALITY TESTING SYSTEM
 Sistema revolucionário que executa múltiplas estratégias simultaneamente
 e escolhe a melhor em tempo real - a 3ª meta-funcionalidade!
+
+Cada estratégia roda seu pipeline de patch + validação num processo próprio,
+dentro de um sandbox isolado, e transmite scores intermediários por um pipe.
+Assim que ``_should_terminate_early`` decide que nenhuma estratégia ainda em
+execução pode superar a líder, os processos perdedores (e os seus filhos, como
+o pytest) são mortos. A concorrência é dimensionada pelas CPUs e pela memória
+disponíveis.
 """
 
 import asyncio
 import json
 import logging
+import multiprocessing
+import os
+import re
+import resource
+import shutil
+import signal
+import subprocess
+import tempfile
 import time
 import uuid
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple, Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 import threading
 import copy
 
+import psutil
+
 class RealityTestStatus(Enum):
     """Status de um teste de realidade paralela"""
     PENDING = "pending"
@@ -35,6 +52,162 @@ class StrategyType(Enum):
     EXPERIMENTAL = "experimental"
     OPTIMIZED = "optimized"
 
+# Pesos do score composto (risco negativo: menor risco é melhor)
+SCORE_WEIGHTS = {"success": 0.4, "quality": 0.3, "efficiency": 0.2, "risk": -0.1}
+
+# Probabilidade de sucesso a priori de cada tipo, usada quando não há patches nem testes para rodar
+STRATEGY_PRIORS = {
+    StrategyType.CONSERVATIVE: 0.8,
+    StrategyType.AGGRESSIVE: 0.6,
+    StrategyType.BALANCED: 0.75,
+    StrategyType.EXPERIMENTAL: 0.65,
+    StrategyType.OPTIMIZED: 0.85
+}
+
+# Linha de progresso do ``pytest -q`` (ex.: ``..F.s  [ 40%]``)
+_PYTEST_PROGRESS = re.compile(r"^([.FEsxX]+)\s*(?:\[\s*(\d+)%\])?\s*$")
+
+# Diretórios que nunca vão para o sandbox de uma estratégia
+_SANDBOX_IGNORE = shutil.ignore_patterns(".git", "__pycache__", ".venv", "venv", ".pytest_cache",
+                                         ".mypy_cache", ".ruff_cache", "node_modules")
+
+
+def composite_score(success: float, quality: float, efficiency: float, risk: float) -> float:
+    """Score composto de um teste de realidade"""
+    return (success * SCORE_WEIGHTS["success"] + quality * SCORE_WEIGHTS["quality"] +
+            efficiency * SCORE_WEIGHTS["efficiency"] + risk * SCORE_WEIGHTS["risk"])
+
+
+def score_pipeline_result(strategy_type: StrategyType, strategy_config: Dict[str, Any], *,
+                          ran_pipeline: bool, patch_ok: bool, tests_passed: int, tests_failed: int,
+                          tests_ok: Optional[bool], elapsed: float, time_budget: float) -> Dict[str, float]:
+    """
+    Scores de uma estratégia a partir do resultado do seu pipeline.
+
+    Sem patches nem testes (``ran_pipeline`` falso) o score vem da probabilidade a
+    priori do tipo de estratégia; caso contrário, da proporção de testes que passaram,
+    zerada se os patches foram rejeitados ou se o pytest falhou sem reportar falhas
+    (erro de coleta, timeout).
+    """
+    if not ran_pipeline:
+        success = STRATEGY_PRIORS.get(strategy_type, 0.7)
+        efficiency = 1.0 / strategy_config.get("timeout_multiplier", 1.0) * 0.8
+    else:
+        total = tests_passed + tests_failed
+        success = tests_passed / total if total else 1.0
+        if not patch_ok or (tests_ok is False and tests_failed == 0):
+            success = 0.0
+        efficiency = max(0.0, 1.0 - elapsed / time_budget) if time_budget > 0 else 0.0
+    return {
+        "success_probability": success,
+        "quality_score": success * 0.9,
+        "efficiency_score": efficiency
+    }
+
+
+def _cpu_seconds_of_self_and_children() -> float:
+    own = resource.getrusage(resource.RUSAGE_SELF)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _cpu_seconds_of_tree(pid: int) -> float:
+    """CPU consumida por um processo vivo e seus descendentes (inclusive filhos já colhidos)"""
+    try:
+        process = psutil.Process(pid)
+        times = process.cpu_times()
+        total = times.user + times.system + getattr(times, "children_user", 0.0) + getattr(times, "children_system", 0.0)
+        for child in process.children(recursive=True):
+            try:
+                child_times = child.cpu_times()
+                total += child_times.user + child_times.system
+            except psutil.Error:
+                pass
+        return total
+    except psutil.Error:
+        return 0.0
+
+
+def _reality_worker(test_id: str, strategy_type_value: str, strategy_config: Dict[str, Any],
+                    pipeline: Dict[str, Any], started_at: float, conn):
+    """
+    Processo de uma estratégia: copia o projeto para um sandbox, aplica os patches
+    (com pré-validação de sintaxe) e roda o comando de testes, enviando progresso e
+    o resultado por ``conn``. Roda numa sessão própria para que o pai possa matar o
+    grupo inteiro (worker + pytest) de uma vez.
+    """
+    if hasattr(os, "setsid"):
+        os.setsid()
+    strategy_type = StrategyType(strategy_type_value)
+    patches = pipeline.get("patches") or []
+    test_command = pipeline.get("test_command")
+    time_budget = pipeline.get("time_budget", 0.0)
+    logger = logging.getLogger("hephaestus.ParallelRealityTester.worker")
+
+    def send(kind: str, **payload):
+        payload["elapsed"] = time.time() - started_at
+        payload["cpu_seconds"] = _cpu_seconds_of_self_and_children()
+        conn.send((kind, payload))
+
+    try:
+        patch_ok, tests_ok = True, None
+        passed = failed = 0
+        ran_pipeline = bool(patches or test_command)
+        if ran_pipeline:
+            with tempfile.TemporaryDirectory(prefix=f"hephaestus_reality_{test_id[:8]}_") as sandbox:
+                shutil.copytree(pipeline.get("project_root", "."), sandbox, dirs_exist_ok=True, ignore=_SANDBOX_IGNORE)
+                send("progress", stage="sandbox_ready", success_upper_bound=1.0)
+
+                if patches:
+                    from hephaestus.core.patch_applicator import apply_patches, PatchValidationError
+                    try:
+                        patch_ok = apply_patches(patches, logger, base_path=sandbox)
+                    except PatchValidationError as e:
+                        patch_ok = False
+                        send("progress", stage="patches_rejected", success_upper_bound=0.0, detail=str(e))
+                    else:
+                        send("progress", stage="patches_applied", success_upper_bound=1.0 if patch_ok else 0.0)
+
+                if patch_ok and test_command:
+                    process = subprocess.Popen(test_command, cwd=sandbox, stdout=subprocess.PIPE,
+                                               stderr=subprocess.STDOUT, text=True, errors="replace")
+                    remaining = time_budget - (time.time() - started_at) if time_budget else None
+                    timer = threading.Timer(max(0.0, remaining), process.kill) if remaining is not None else None
+                    if timer:
+                        timer.start()
+                    try:
+                        for line in process.stdout:
+                            match = _PYTEST_PROGRESS.match(line.strip())
+                            if not match:
+                                continue
+                            marks, percent = match.groups()
+                            passed += sum(marks.count(c) for c in ".sxX")
+                            failed += sum(marks.count(c) for c in "FE")
+                            # Total estimado pelo percentual do pytest: melhor caso = todo o resto passa
+                            estimated_total = (passed + failed) * 100 / int(percent) if percent and int(percent) else 0
+                            upper = (estimated_total - failed) / estimated_total if estimated_total else 1.0
+                            send("progress", stage="testing", tests_passed=passed, tests_failed=failed,
+                                 success_upper_bound=max(0.0, upper))
+                        tests_ok = process.wait() == 0
+                    finally:
+                        if timer:
+                            timer.cancel()
+
+        elapsed = time.time() - started_at
+        scores = score_pipeline_result(strategy_type, strategy_config, ran_pipeline=ran_pipeline, patch_ok=patch_ok,
+                                       tests_passed=passed, tests_failed=failed, tests_ok=tests_ok,
+                                       elapsed=elapsed, time_budget=time_budget)
+        send("result", success=scores["success_probability"] > 0.5, execution_time=elapsed,
+             tests_passed=passed, tests_failed=failed, **scores)
+    except BaseException as e:
+        try:
+            send("error", message=f"{type(e).__name__}: {e}")
+        except (OSError, ValueError):
+            pass
+    finally:
+        conn.close()
+
+
 @dataclass
 class RealityTest:
     """Representa um teste de realidade (estratégia sendo executada)"""
@@ -54,23 +227,25 @@ class RealityTest:
     intermediate_results: List[Dict[str, Any]] = field(default_factory=list)
     error_messages: List[str] = field(default_factory=list)
     resource_usage: Dict[str, float] = field(default_factory=dict)
+    # Melhor probabilidade de sucesso ainda alcançável (atualizada pelo progresso do processo)
+    success_upper_bound: float = 1.0
+    time_budget: float = 0.0
     
     def calculate_composite_score(self) -> float:
         """Calcula score composto baseado em múltiplos fatores"""
-        # Weighted scoring (ajustável baseado no contexto)
-        success_weight = 0.4
-        quality_weight = 0.3
-        efficiency_weight = 0.2
-        risk_weight = -0.1  # Negative because lower risk is better
-        
-        self.composite_score = (
-            self.success_probability * success_weight +
-            self.quality_score * quality_weight +
-            self.efficiency_score * efficiency_weight +
-            self.risk_score * risk_weight
+        self.composite_score = composite_score(
+            self.success_probability, self.quality_score, self.efficiency_score, self.risk_score
         )
-        
         return self.composite_score
+
+    def score_upper_bound(self, now: float) -> float:
+        """Maior score composto que o teste ainda pode atingir se terminar agora"""
+        if self.status not in (RealityTestStatus.PENDING, RealityTestStatus.RUNNING):
+            return self.composite_score
+        elapsed = now - self.start_time.timestamp() if self.start_time else 0.0
+        efficiency = max(0.0, 1.0 - elapsed / self.time_budget) if self.time_budget > 0 else 1.0
+        success = self.success_upper_bound
+        return composite_score(success, success * 0.9, efficiency, 1.0 - success)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -78,7 +253,7 @@ class RealityTest:
             "test_id": self.test_id,
             "strategy_name": self.strategy_name,
             "strategy_type": self.strategy_type.value,
-            "strategy_config": self.strategy_config,
+            "strategy_config": {k: v.value if isinstance(v, Enum) else v for k, v in self.strategy_config.items()},
             "status": self.status.value,
             "start_time": self.start_time.isoformat() if self.start_time else None,
             "end_time": self.end_time.isoformat() if self.end_time else None,
@@ -90,7 +265,9 @@ class RealityTest:
             "composite_score": self.composite_score,
             "intermediate_results": self.intermediate_results,
             "error_messages": self.error_messages,
-            "resource_usage": self.resource_usage
+            "resource_usage": self.resource_usage,
+            "success_upper_bound": self.success_upper_bound,
+            "time_budget": self.time_budget
         }
 
 @dataclass 
@@ -120,6 +297,10 @@ class ParallelRealityTester:
     - Dynamic winner selection
     - Learning from strategy comparisons
     - Resource usage optimization
+
+    Cada estratégia roda em um processo isolado; perdedores são mortos assim que
+    não podem mais superar a líder. ``session.comparison_matrix["race"]`` registra
+    o tempo até o vencedor e os CPU-segundos gastos com perdedores.
     """
     
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
@@ -132,14 +313,20 @@ class ParallelRealityTester:
         self.winner_selection_interval = config.get("parallel_reality", {}).get("winner_selection_interval", 30)  # seconds
         self.min_execution_time = config.get("parallel_reality", {}).get("min_execution_time", 10)  # seconds
         self.max_session_time = config.get("parallel_reality", {}).get("max_session_time", 300)  # 5 minutes
+        self.memory_per_test_mb = config.get("parallel_reality", {}).get("memory_per_test_mb", 512)
+        self.race_check_interval = config.get("parallel_reality", {}).get("race_check_interval", 0.25)  # seconds
+        self.data_dir = Path(config.get("parallel_reality", {}).get("data_dir", "data/parallel_tests"))
         
         # State
         self.active_sessions: Dict[str, ParallelTestSession] = {}
         self.strategy_performance_history: Dict[str, List[float]] = {}
         self.comparison_history: List[Dict[str, Any]] = []
         
-        # Threading
-        self.executor = ThreadPoolExecutor(max_workers=self.max_parallel_tests)
+        # Processos das estratégias (forkserver quando disponível, como o SandboxRunner)
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._mp_context = multiprocessing.get_context(start_method)
+        # session_id -> {test_id: (processo, conexão)}: cada sessão só limita e mata os próprios processos
+        self._running_processes: Dict[str, Dict[str, Any]] = {}
         self.monitoring_thread = None
         self.should_stop = threading.Event()
         
@@ -165,6 +352,12 @@ class ParallelRealityTester:
     async def test_multiple_realities(self, objective: str, context: Dict[str, Any] = None) -> Tuple[RealityTest, ParallelTestSession]:
         """
         🚀 CORE FUNCTION: Executa múltiplas estratégias em paralelo
+
+        O ``context`` descreve o pipeline de cada estratégia: ``patches`` (comuns a
+        todas), ``patches_by_strategy`` (por tipo de estratégia) ou
+        ``strategy_config["patches"]``, ``test_command`` (ex.: pytest),
+        ``project_root`` (copiado para o sandbox) e ``validation_timeout`` (em
+        segundos, multiplicado pelo ``timeout_multiplier`` da estratégia).
         
         Returns:
             Tuple[RealityTest, ParallelTestSession]: (winning_test, session_data)
@@ -199,7 +392,7 @@ class ParallelRealityTester:
             self.logger.info(f"  - {test.strategy_name} ({test.strategy_type.value})")
         
         # Execute tests in parallel
-        winner_test = await self._execute_parallel_tests(session)
+        winner_test = await self._execute_parallel_tests(session, context or {})
         
         # Finalize session
         session.end_time = datetime.now()
@@ -341,125 +534,176 @@ class ParallelRealityTester:
             }
         }
     
-    async def _execute_parallel_tests(self, session: ParallelTestSession) -> Optional[RealityTest]:
-        """Executa testes em paralelo e monitora performance"""
-        
-        # Start all tests
-        test_futures = {}
-        for test in session.reality_tests:
-            future = self.executor.submit(self._execute_single_test, test, session.objective)
-            test_futures[future] = test
+    def _resource_aware_concurrency(self) -> int:
+        """Quantas estratégias rodam ao mesmo tempo: limitado por CPUs e memória disponíveis"""
+        cpus = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+        available_mb = psutil.virtual_memory().available / (1024 ** 2)
+        by_memory = int(available_mb // self.memory_per_test_mb) if self.memory_per_test_mb > 0 else cpus
+        return max(1, min(self.max_parallel_tests, cpus, by_memory))
+
+    def _pipeline_for(self, test: RealityTest, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Pipeline de patch + validação de uma estratégia"""
+        validation_timeout = context.get("validation_timeout", self.max_session_time)
+        return {
+            "patches": test.strategy_config.get("patches") or context.get("patches_by_strategy", {}).get(
+                test.strategy_type.value, context.get("patches", [])),
+            "test_command": context.get("test_command"),
+            "project_root": os.path.abspath(context.get("project_root", ".")),
+            "time_budget": validation_timeout * test.strategy_config.get("timeout_multiplier", 1.0)
+        }
+
+    def _kill_test_process(self, running: Dict[str, Any], test_id: str) -> float:
+        """Mata o grupo de processos de um teste da sessão e devolve a CPU que ele consumiu"""
+        process, conn = running.pop(test_id, (None, None))
+        if process is None:
+            return 0.0
+        cpu_seconds = _cpu_seconds_of_tree(process.pid) if process.is_alive() else 0.0
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        if process.is_alive():
+            # O worker pode ainda não ter criado a própria sessão
+            process.kill()
+        process.join(timeout=5)
+        conn.close()
+        return cpu_seconds
+
+    async def _execute_parallel_tests(self, session: ParallelTestSession, context: Dict[str, Any] = None) -> Optional[RealityTest]:
+        """Executa as estratégias em processos paralelos e mata as perdedoras assim que possível"""
+        context = context or {}
+        loop = asyncio.get_running_loop()
+        messages: asyncio.Queue = asyncio.Queue()
+        concurrency = self._resource_aware_concurrency()
+        pending = deque(session.reality_tests)
+        tests_by_id = {test.test_id: test for test in session.reality_tests}
+        running = self._running_processes.setdefault(session.session_id, {})
+        cpu_by_test: Dict[str, float] = {}
+        session_start = time.time()
+        deadline = session_start + self.max_session_time
+
+        def watch(test_id: str, conn):
+            def on_readable():
+                try:
+                    while conn.poll():
+                        messages.put_nowait((test_id, conn.recv()))
+                except (EOFError, OSError):
+                    loop.remove_reader(conn.fileno())
+                    messages.put_nowait((test_id, None))
+            loop.add_reader(conn.fileno(), on_readable)
+
+        async def start_next():
+            test = pending.popleft()
+            pipeline = self._pipeline_for(test, context)
+            test.time_budget = pipeline["time_budget"]
             test.status = RealityTestStatus.RUNNING
             test.start_time = datetime.now()
-        
-        self.logger.info(f"🚀 Started {len(test_futures)} parallel reality tests")
-        
-        # Monitor progress and select winner
-        winner_test = None
-        session_start = time.time()
-        
-        while test_futures and (time.time() - session_start) < self.max_session_time:
-            # Check for completed tests
-            for future in as_completed(test_futures.keys(), timeout=1):
-                test = test_futures[future]
+            parent_conn, child_conn = self._mp_context.Pipe(duplex=False)
+            process = self._mp_context.Process(
+                target=_reality_worker,
+                args=(test.test_id, test.strategy_type.value, test.strategy_config, pipeline,
+                      test.start_time.timestamp(), child_conn),
+                daemon=True
+            )
+            await loop.run_in_executor(None, process.start)
+            child_conn.close()
+            running[test.test_id] = (process, parent_conn)
+            watch(test.test_id, parent_conn)
+
+        def finish(test: RealityTest, status: RealityTestStatus):
+            test.status = status
+            test.end_time = datetime.now()
+            test.execution_time = (test.end_time - test.start_time).total_seconds()
+
+        def stop_process(test_id: str) -> float:
+            entry = running.get(test_id)
+            if entry and not entry[1].closed:
                 try:
-                    result = future.result()
-                    test.status = RealityTestStatus.COMPLETED
-                    test.end_time = datetime.now()
-                    test.execution_time = (test.end_time - test.start_time).total_seconds()
-                    
-                    # Update test scores based on result
-                    self._update_test_scores(test, result)
-                    
-                    self.logger.info(f"✅ Test completed: {test.strategy_name} (score: {test.composite_score:.3f})")
-                    
-                except Exception as e:
-                    test.status = RealityTestStatus.FAILED
-                    test.error_messages.append(str(e))
-                    self.logger.warning(f"❌ Test failed: {test.strategy_name} - {e}")
-                
-                del test_futures[future]
-            
-            # Check if we should terminate early based on clear winner
-            if self._should_terminate_early(session):
-                self.logger.info("🏁 Early termination triggered - clear winner detected")
-                break
-            
-            # Check for winner every interval
-            current_winner = self._get_current_winner(session)
-            if current_winner and current_winner != winner_test:
-                winner_test = current_winner
-                self.logger.info(f"🏆 New leader: {winner_test.strategy_name} (score: {winner_test.composite_score:.3f})")
-            
-            await asyncio.sleep(1)  # Small delay to prevent busy waiting
-        
-        # Cancel remaining tests if we terminated early
-        for future in test_futures.keys():
-            future.cancel()
-            test_futures[future].status = RealityTestStatus.TERMINATED_EARLY
-        
+                    loop.remove_reader(entry[1].fileno())
+                except (ValueError, OSError):
+                    pass
+            return self._kill_test_process(running, test_id)
+
+        self.logger.info(f"🚀 Racing {len(pending)} parallel reality tests ({concurrency} at a time)")
+        try:
+            while pending and len(running) < concurrency:
+                await start_next()
+
+            while running:
+                now = time.time()
+                if now >= deadline:
+                    self.logger.warning(f"⏱️ Session time limit reached ({self.max_session_time}s)")
+                    break
+                # Com um líder definido, reavalia periodicamente: o limite superior dos demais cai com o tempo
+                has_leader = any(t.status == RealityTestStatus.COMPLETED for t in session.reality_tests)
+                wait = min(deadline - now, self.race_check_interval) if has_leader else deadline - now
+                try:
+                    test_id, message = await asyncio.wait_for(messages.get(), timeout=wait)
+                except asyncio.TimeoutError:
+                    message = test_id = None
+
+                if test_id is not None:
+                    test = tests_by_id[test_id]
+                    if message is None:
+                        # Processo encerrou: sem resultado é falha
+                        self._kill_test_process(running, test_id)
+                        if test.status == RealityTestStatus.RUNNING:
+                            finish(test, RealityTestStatus.FAILED)
+                            test.error_messages.append("Strategy process exited without a result")
+                            self.logger.warning(f"❌ Test failed: {test.strategy_name} - process exited without a result")
+                        if pending and len(running) < concurrency:
+                            await start_next()
+                        continue
+
+                    kind, payload = message
+                    cpu_by_test[test_id] = payload.get("cpu_seconds", 0.0)
+                    if kind == "progress":
+                        test.success_upper_bound = min(test.success_upper_bound, payload.get("success_upper_bound", 1.0))
+                        test.intermediate_results.append({"timestamp": datetime.now().isoformat(), **payload})
+                    elif kind == "result":
+                        finish(test, RealityTestStatus.COMPLETED)
+                        self._update_test_scores(test, payload)
+                        test.resource_usage = {"cpu_seconds": payload.get("cpu_seconds", 0.0)}
+                        self.logger.info(f"✅ Test completed: {test.strategy_name} (score: {test.composite_score:.3f})")
+                    elif kind == "error":
+                        finish(test, RealityTestStatus.FAILED)
+                        test.error_messages.append(payload.get("message", "unknown error"))
+                        self.logger.warning(f"❌ Test failed: {test.strategy_name} - {payload.get('message')}")
+
+                if self._should_terminate_early(session):
+                    self.logger.info("🏁 Early termination triggered - remaining strategies cannot win")
+                    break
+        finally:
+            # Perdedores (ou sessão esgotada): mata os processos restantes e contabiliza a CPU gasta
+            for test_id in list(running):
+                test = tests_by_id[test_id]
+                cpu_seconds = stop_process(test_id)
+                if test.status == RealityTestStatus.RUNNING:
+                    cpu_by_test[test_id] = max(cpu_by_test.get(test_id, 0.0), cpu_seconds)
+                    finish(test, RealityTestStatus.TERMINATED_EARLY)
+                    test.resource_usage = {"cpu_seconds": cpu_by_test[test_id]}
+            for test in pending:
+                test.status = RealityTestStatus.TERMINATED_EARLY
+            self._running_processes.pop(session.session_id, None)
+
         # Select final winner
         final_winner = self._get_current_winner(session)
         if final_winner:
             final_winner.status = RealityTestStatus.WINNER
-        
+
+        winner_id = final_winner.test_id if final_winner else None
+        session.comparison_matrix["race"] = {
+            "concurrency": concurrency,
+            "time_to_winner": final_winner.end_time.timestamp() - session_start if final_winner else None,
+            "session_seconds": time.time() - session_start,
+            "wasted_cpu_seconds": sum(cpu for test_id, cpu in cpu_by_test.items() if test_id != winner_id),
+            "winner_cpu_seconds": cpu_by_test.get(winner_id, 0.0),
+            "terminated_early": sum(1 for t in session.reality_tests if t.status == RealityTestStatus.TERMINATED_EARLY)
+        }
+        self.logger.info(f"📊 Race stats: {session.comparison_matrix['race']}")
         return final_winner
     
-    def _execute_single_test(self, test: RealityTest, objective: str) -> Dict[str, Any]:
-        """Executa um teste individual (mock implementation)"""
-        try:
-            # Simulate execution time based on strategy
-            base_time = 5 + (hash(objective) % 10)
-            time_multiplier = test.strategy_config.get("timeout_multiplier", 1.0)
-            execution_time = base_time * time_multiplier
-            
-            # Simulate progress
-            for i in range(int(execution_time)):
-                if self.should_stop.is_set():
-                    break
-                
-                time.sleep(1)
-                
-                # Add intermediate result
-                progress = (i + 1) / execution_time
-                test.intermediate_results.append({
-                    "timestamp": datetime.now().isoformat(),
-                    "progress": progress,
-                    "status": "executing",
-                    "partial_score": progress * 0.8
-                })
-            
-            # Simulate final result based on strategy characteristics
-            strategy_type = test.strategy_type
-            success_base = {
-                StrategyType.CONSERVATIVE: 0.8,
-                StrategyType.AGGRESSIVE: 0.6,
-                StrategyType.BALANCED: 0.75,
-                StrategyType.EXPERIMENTAL: 0.65,
-                StrategyType.OPTIMIZED: 0.85
-            }.get(strategy_type, 0.7)
-            
-            # Add some randomness
-            import random
-            success_probability = min(1.0, success_base + random.uniform(-0.2, 0.2))
-            
-            return {
-                "success": success_probability > 0.5,
-                "success_probability": success_probability,
-                "quality_score": success_probability * 0.9,
-                "efficiency_score": 1.0 / time_multiplier * 0.8,
-                "execution_time": execution_time,
-                "resource_usage": {
-                    "cpu": random.uniform(0.1, 0.8),
-                    "memory": random.uniform(0.1, 0.6),
-                    "io": random.uniform(0.1, 0.4)
-                }
-            }
-            
-        except Exception as e:
-            self.logger.error(f"Error executing test {test.test_id}: {e}")
-            raise
-    
     def _update_test_scores(self, test: RealityTest, result: Dict[str, Any]):
         """Atualiza scores do teste baseado no resultado"""
         test.success_probability = result.get("success_probability", 0.0)
@@ -474,6 +718,15 @@ class ParallelRealityTester:
     def _should_terminate_early(self, session: ParallelTestSession) -> bool:
         """Determina se deve terminar testes antecipadamente"""
         completed_tests = [t for t in session.reality_tests if t.status == RealityTestStatus.COMPLETED]
+        contenders = [t for t in session.reality_tests
+                      if t.status in (RealityTestStatus.PENDING, RealityTestStatus.RUNNING)]
+
+        # Nenhuma estratégia ainda em jogo pode superar a líder, nem no melhor caso
+        if completed_tests and contenders:
+            best_score = max(t.composite_score for t in completed_tests)
+            now = time.time()
+            if all(t.score_upper_bound(now) <= best_score for t in contenders):
+                return True
         
         if len(completed_tests) < 2:
             return False
@@ -491,7 +744,7 @@ class ParallelRealityTester:
     
     def _get_current_winner(self, session: ParallelTestSession) -> Optional[RealityTest]:
         """Obtém o teste com melhor performance atual"""
-        completed_tests = [t for t in session.reality_tests if t.status in [RealityTestStatus.COMPLETED, RealityTestStatus.RUNNING]]
+        completed_tests = [t for t in session.reality_tests if t.status in [RealityTestStatus.COMPLETED, RealityTestStatus.WINNER]]
         
         if not completed_tests:
             return None
@@ -578,7 +831,7 @@ class ParallelRealityTester:
     def _save_session_results(self, session: ParallelTestSession):
         """Salva resultados da sessão"""
         try:
-            results_dir = Path("data/parallel_tests/results")
+            results_dir = self.data_dir / "results"
             results_dir.mkdir(parents=True, exist_ok=True)
             
             session_file = results_dir / f"session_{session.session_id}.json"
@@ -606,7 +859,7 @@ class ParallelRealityTester:
     def _load_historical_data(self):
         """Carrega dados históricos de performance"""
         try:
-            history_file = Path("data/parallel_tests/strategy_performance_history.json")
+            history_file = self.data_dir / "strategy_performance_history.json"
             if history_file.exists():
                 with open(history_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
@@ -655,7 +908,7 @@ class ParallelRealityTester:
     def _save_performance_history(self):
         """Salva histórico de performance"""
         try:
-            history_file = Path("data/parallel_tests/strategy_performance_history.json")
+            history_file = self.data_dir / "strategy_performance_history.json"
             history_file.parent.mkdir(parents=True, exist_ok=True)
             
             history_data = {
@@ -706,7 +959,9 @@ class ParallelRealityTester:
         if self.monitoring_thread and self.monitoring_thread.is_alive():
             self.monitoring_thread.join(timeout=5)
         
-        self.executor.shutdown(wait=True)
+        for running in list(self._running_processes.values()):
+            for test_id in list(running):
+                self._kill_test_process(running, test_id)
         
         # Save final state
         self._save_performance_history()
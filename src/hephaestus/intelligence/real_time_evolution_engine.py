@@ -24,8 +24,11 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 import hashlib
 import copy
+import contextlib
 
 from hephaestus.utils.llm_client import call_llm_api
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+from hephaestus.utils.system_metrics import get_system_metrics_sampler
 from hephaestus.utils.json_parser import parse_json_response
 
 
@@ -154,13 +157,15 @@ class RealTimeEvolutionEngine:
         self.deployed_mutations: Dict[str, EvolutionCandidate] = {}
         self.metrics = EvolutionMetrics()
         
-        # Threading
-        self.evolution_thread: Optional[threading.Thread] = None
+        # Job no escalonador de background; uma fase por execução
+        self.evolution_job = None
         self.evolution_running = False
         self.evolution_lock = threading.Lock()
         
         # Callback system for applying mutations
         self.mutation_callbacks: Dict[MutationType, Callable] = {}
+        # Contexto em volta da fase de deployment (ex.: um commit em lote por ciclo)
+        self.deployment_cycle: Callable[[], Any] = contextlib.nullcontext
         
         # Performance tracking
         self.performance_history: List[Dict[str, Any]] = []
@@ -193,8 +198,10 @@ class RealTimeEvolutionEngine:
             return
         
         self.evolution_running = True
-        self.evolution_thread = threading.Thread(target=self._evolution_loop, daemon=True)
-        self.evolution_thread.start()
+        self.evolution_job = get_background_scheduler().schedule(
+            "real_time_evolution", self._evolution_step, interval=1.0,
+            priority=JobPriority.LOW, max_runtime=60, initial_delay=0
+        )
         
         self.logger.info("🚀 Real-time evolution started!")
     
@@ -202,8 +209,9 @@ class RealTimeEvolutionEngine:
         """Para o processo de evolução"""
         self.evolution_running = False
         
-        if self.evolution_thread:
-            self.evolution_thread.join(timeout=5)
+        if self.evolution_job:
+            self.evolution_job.cancel()
+            self.evolution_job = None
         
         # Cancel active tests
         for task in self.active_tests.values():
@@ -212,46 +220,39 @@ class RealTimeEvolutionEngine:
         
         self.logger.info("🛑 Real-time evolution stopped")
     
-    def _evolution_loop(self):
-        """Loop principal da evolução em tempo real"""
-        self.logger.info("🔄 Evolution loop started")
+    def _evolution_step(self):
+        """Executa uma fase da evolução em tempo real (uma fase por segundo, via escalonador)"""
+        if not self.evolution_running:
+            return
         
-        while self.evolution_running:
-            try:
-                # Update metrics
-                self._update_evolution_metrics()
-                
-                # Phase 1: Monitor current performance
-                if self.current_phase == EvolutionPhase.MONITORING:
-                    self._monitor_performance()
-                    self.current_phase = EvolutionPhase.MUTATION_GENERATION
-                
-                # Phase 2: Generate mutation candidates
-                elif self.current_phase == EvolutionPhase.MUTATION_GENERATION:
-                    self._generate_mutations()
-                    self.current_phase = EvolutionPhase.TESTING
-                
-                # Phase 3: Test mutations in parallel
-                elif self.current_phase == EvolutionPhase.TESTING:
-                    self._test_mutations()
-                    self.current_phase = EvolutionPhase.EVALUATION
-                
-                # Phase 4: Evaluate results
-                elif self.current_phase == EvolutionPhase.EVALUATION:
-                    self._evaluate_mutations()
-                    self.current_phase = EvolutionPhase.DEPLOYMENT
-                
-                # Phase 5: Deploy best mutations
-                elif self.current_phase == EvolutionPhase.DEPLOYMENT:
-                    self._deploy_best_mutations()
-                    self.current_phase = EvolutionPhase.MONITORING
-                
-                # Sleep between phases
-                time.sleep(1)
-                
-            except Exception as e:
-                self.logger.error(f"Error in evolution loop: {e}", exc_info=True)
-                time.sleep(5)  # Longer sleep on error
+        # Update metrics
+        self._update_evolution_metrics()
+        
+        # Phase 1: Monitor current performance
+        if self.current_phase == EvolutionPhase.MONITORING:
+            self._monitor_performance()
+            self.current_phase = EvolutionPhase.MUTATION_GENERATION
+        
+        # Phase 2: Generate mutation candidates
+        elif self.current_phase == EvolutionPhase.MUTATION_GENERATION:
+            self._generate_mutations()
+            self.current_phase = EvolutionPhase.TESTING
+        
+        # Phase 3: Test mutations in parallel
+        elif self.current_phase == EvolutionPhase.TESTING:
+            self._test_mutations()
+            self.current_phase = EvolutionPhase.EVALUATION
+        
+        # Phase 4: Evaluate results
+        elif self.current_phase == EvolutionPhase.EVALUATION:
+            self._evaluate_mutations()
+            self.current_phase = EvolutionPhase.DEPLOYMENT
+        
+        # Phase 5: Deploy best mutations
+        elif self.current_phase == EvolutionPhase.DEPLOYMENT:
+            with self.deployment_cycle():
+                self._deploy_best_mutations()
+            self.current_phase = EvolutionPhase.MONITORING
     
     def _monitor_performance(self):
         """Monitora performance atual do sistema"""
@@ -392,14 +393,9 @@ class RealTimeEvolutionEngine:
         return 0.1  # Default 10% error rate
     
     def _get_memory_usage(self) -> float:
-        """Obtém uso de memória baseado em dados reais"""
-        # Estimate based on number of active candidates and tests
-        base_usage = 0.3
-        candidate_factor = len(self.evolution_candidates) * 0.02
-        test_factor = len(self.active_tests) * 0.05
-        
-        total_usage = base_usage + candidate_factor + test_factor
-        return max(0.1, min(0.9, total_usage))  # Clamp between 10% and 90%
+        """Obtém uso de memória (fração da memória do host, média do último minuto)"""
+        window = get_system_metrics_sampler().aggregate(60)
+        return window["memory_percent"]["avg"] / 100.0
     
     def _calculate_agent_efficiency(self) -> float:
         """Calcula eficiência dos agentes baseada em performance real"""
@@ -1295,6 +1291,10 @@ class RealTimeEvolutionEngine:
         self.mutation_callbacks[mutation_type] = callback
         self.logger.info(f"📋 Registered callback for {mutation_type.value}")
     
+    def register_deployment_cycle(self, context_factory: Callable[[], Any]):
+        """Registra o context manager que envolve cada fase de deployment"""
+        self.deployment_cycle = context_factory
+    
     def get_evolution_status(self) -> Dict[str, Any]:
         """Retorna status atual da evolução"""
         health_status = self.get_evolution_health_status()
@@ -8,6 +8,7 @@ import statistics
 from enum import Enum
 
 from hephaestus.utils.llm_client import call_llm_api
+from hephaestus.utils.rate_limiter import llm_priority, LLMPriority
 from hephaestus.utils.json_parser import parse_json_response
 
 class FailureType(Enum):
@@ -233,12 +234,14 @@ Use the "5 Whys" methodology and systems thinking to identify:
 """
         
         try:
-            response, error = call_llm_api(
-                model_config=self.model_config,
-                prompt=causal_analysis_prompt,
-                temperature=0.3,
-                logger=self.logger
-            )
+            # Root cause analysis is off the cycle's critical path
+            with llm_priority(LLMPriority.BACKGROUND):
+                response, error = call_llm_api(
+                    model_config=self.model_config,
+                    prompt=causal_analysis_prompt,
+                    temperature=0.3,
+                    logger=self.logger
+                )
             
             if error or not response:
                 return self._fallback_causal_analysis(failures)
@@ -401,12 +404,13 @@ Based on this root cause analysis, generate specific, actionable recommendations
 """
         
         try:
-            response, error = call_llm_api(
-                model_config=self.model_config,
-                prompt=recommendation_prompt,
-                temperature=0.4,
-                logger=self.logger
-            )
+            with llm_priority(LLMPriority.BACKGROUND):
+                response, error = call_llm_api(
+                    model_config=self.model_config,
+                    prompt=recommendation_prompt,
+                    temperature=0.4,
+                    logger=self.logger
+                )
             
             if error or not response:
                 return self._fallback_recommendations(root_causes, systemic_issues)
@@ -16,7 +16,6 @@ Este sistema implementa verdadeira auto-consciência através de:
 import json
 import logging
 import time
-import threading
 import statistics
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
@@ -25,6 +24,9 @@ from pathlib import Path
 from collections import defaultdict, deque
 from enum import Enum
 import numpy as np
+
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+from hephaestus.utils.system_metrics import get_system_metrics_sampler
 import hashlib
 
 class CognitiveState(Enum):
@@ -219,10 +221,9 @@ class SelfAwarenessCore:
             "self_knowledge_confidence": 0.5
         }
         
-        # Threading
-        self.monitoring_thread = None
-        self.reflection_thread = None
-        self.should_stop = threading.Event()
+        # Jobs periódicos no escalonador de background
+        self.monitoring_job = None
+        self.reflection_job = None
         
         # Initialize
         self._initialize_personality()
@@ -799,11 +800,12 @@ class SelfAwarenessCore:
         return ["primary_objective", "learning_optimization", "performance_improvement"]
     
     def _get_resource_usage(self) -> Dict[str, float]:
-        """Obtém uso de recursos atual (simulado)"""
+        """Obtém uso de recursos atual (CPU/memória do sampler compartilhado; atenção simulada)"""
         import random
+        snapshot = get_system_metrics_sampler().latest()
         return {
-            "cpu": random.uniform(0.2, 0.8),
-            "memory": random.uniform(0.3, 0.7),
+            "cpu": snapshot.cpu_percent / 100.0,
+            "memory": snapshot.memory_percent / 100.0,
             "attention": random.uniform(0.4, 0.9)
         }
     
@@ -977,30 +979,27 @@ class SelfAwarenessCore:
     
     def _start_continuous_monitoring(self):
         """Inicia monitoramento contínuo"""
-        if self.monitoring_thread is None or not self.monitoring_thread.is_alive():
-            self.monitoring_thread = threading.Thread(target=self._monitoring_loop, daemon=True)
-            self.monitoring_thread.start()
-        
-        if self.reflection_thread is None or not self.reflection_thread.is_alive():
-            self.reflection_thread = threading.Thread(target=self._reflection_loop, daemon=True)
-            self.reflection_thread.start()
+        scheduler = get_background_scheduler()
+        if self.monitoring_job is None or not self.monitoring_job.active:
+            self.monitoring_job = scheduler.schedule(
+                "self_awareness_monitoring", self._monitoring_tick, interval=self.monitoring_interval,
+                jitter=min(10.0, self.monitoring_interval * 0.1), priority=JobPriority.LOW, max_runtime=30
+            )
+        
+        if self.reflection_job is None or not self.reflection_job.active:
+            self.reflection_job = scheduler.schedule(
+                "self_awareness_reflection", self._reflection_tick, interval=self.reflection_frequency,
+                jitter=min(60.0, self.reflection_frequency * 0.1), priority=JobPriority.LOW, max_runtime=120
+            )
     
-    def _monitoring_loop(self):
-        """Loop de monitoramento cognitivo"""
-        while not self.should_stop.wait(self.monitoring_interval):
-            try:
-                self.monitor_cognitive_state()
-                self.detect_optimization_triggers()
-            except Exception as e:
-                self.logger.error(f"Error in monitoring loop: {e}")
+    def _monitoring_tick(self):
+        """Uma rodada de monitoramento cognitivo"""
+        self.monitor_cognitive_state()
+        self.detect_optimization_triggers()
     
-    def _reflection_loop(self):
-        """Loop de auto-reflexão"""
-        while not self.should_stop.wait(self.reflection_frequency):
-            try:
-                self.perform_deep_self_reflection("scheduled")
-            except Exception as e:
-                self.logger.error(f"Error in reflection loop: {e}")
+    def _reflection_tick(self):
+        """Auto-reflexão agendada"""
+        self.perform_deep_self_reflection("scheduled")
     
     def _load_self_awareness_data(self):
         """Carrega dados de auto-consciência salvos"""
@@ -1059,20 +1058,16 @@ class SelfAwarenessCore:
             "self_knowledge_confidence": self.self_awareness_analytics["self_knowledge_confidence"],
             "total_reflections": self.self_awareness_analytics["total_reflections"],
             "analytics": self.self_awareness_analytics,
-            "monitoring_active": self.monitoring_thread.is_alive() if self.monitoring_thread else False
+            "monitoring_active": self.monitoring_job.active if self.monitoring_job else False
         }
     
     def shutdown(self):
         """Encerra sistema de auto-consciência"""
         self.logger.info("🛑 Shutting down Self-Awareness Core...")
         
-        self.should_stop.set()
-        
-        if self.monitoring_thread and self.monitoring_thread.is_alive():
-            self.monitoring_thread.join(timeout=5)
-        
-        if self.reflection_thread and self.reflection_thread.is_alive():
-            self.reflection_thread.join(timeout=5)
+        for job in (self.monitoring_job, self.reflection_job):
+            if job:
+                job.cancel()
         
         # Final save
         self._save_self_awareness_data()
@@ -0,0 +1,351 @@
+"""
+🗃️ TEMPORAL EVENT STORE
+Armazenamento colunar dos eventos da Temporal Intelligence.
+
+Os eventos ficam em arrays numpy ordenados por timestamp (tipo codificado como
+inteiro, métricas numéricas em colunas), o que permite recortar janelas por
+busca binária e rodar os detectores de padrões de forma vetorizada. A
+persistência é feita em registros binários de tamanho fixo, apenas anexados,
+com os payloads em um JSON Lines paralelo.
+"""
+
+import json
+import logging
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import numpy as np
+
+# Registro binário de tamanho fixo (25 bytes) anexado a cada evento
+EVENT_RECORD_DTYPE = np.dtype([
+    ("timestamp", "<f8"),
+    ("recorded_at", "<f8"),
+    ("type_code", "<u4"),
+    ("success", "<i1"),
+    ("execution_time", "<f4"),
+])
+
+SUCCESS_UNKNOWN = -1
+
+
+@dataclass
+class EventWindow:
+    """Recorte colunar (cópia) de uma janela de eventos"""
+    timestamps: np.ndarray
+    type_codes: np.ndarray
+    success: np.ndarray
+    execution_time: np.ndarray
+    start_index: int
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+
+class TemporalEventStore:
+    """
+    Armazena eventos temporais em colunas com capacidade máxima (como um deque).
+
+    - Colunas ordenadas por timestamp: janelas por ``searchsorted`` em O(log n)
+    - Agregados contínuos por tipo (contagem, sucesso, tempo de execução)
+    - Índice de buckets por hora via ``bincount`` sobre a janela pedida
+    - Persistência append-only com compactação quando o arquivo dobra de tamanho
+    """
+
+    def __init__(self, max_events: int, data_dir: Optional[Path] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.max_events = max(1, max_events)
+        self.logger = logger or logging.getLogger(__name__)
+        self.data_dir = Path(data_dir) if data_dir else None
+        self._lock = threading.RLock()
+
+        # Buffer físico com o dobro da capacidade lógica: eventos ativos ficam em
+        # [_start, _end) e só são movidos para o início quando o buffer enche.
+        self._capacity = max(64, self.max_events * 2)
+        self._timestamps = np.empty(self._capacity, dtype=np.float64)
+        self._recorded_at = np.empty(self._capacity, dtype=np.float64)
+        self._type_codes = np.empty(self._capacity, dtype=np.uint32)
+        self._success = np.empty(self._capacity, dtype=np.int8)
+        self._execution_time = np.empty(self._capacity, dtype=np.float32)
+        self._payloads: List[Optional[Dict[str, Any]]] = []
+        self._start = 0
+        self._end = 0
+
+        self.type_names: List[str] = []
+        self._type_index: Dict[str, int] = {}
+
+        # Agregados contínuos por tipo: [count, successes, known_success, exec_sum, exec_sq_sum, exec_count]
+        self._aggregates: Dict[int, np.ndarray] = {}
+
+        self._records_on_disk = 0
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def append(self, event_id: str, event_type: str, timestamp: datetime,
+               data: Dict[str, Any], recorded_at: Optional[datetime] = None,
+               persist: bool = True):
+        """Adiciona um evento mantendo as colunas ordenadas por timestamp"""
+        recorded_at = recorded_at or datetime.now()
+        success = data.get("success")
+        execution_time = data.get("execution_time", data.get("duration"))
+
+        record = np.zeros(1, dtype=EVENT_RECORD_DTYPE)
+        record["timestamp"] = timestamp.timestamp()
+        record["recorded_at"] = recorded_at.timestamp()
+        record["success"] = SUCCESS_UNKNOWN if success is None else int(bool(success))
+        has_time = isinstance(execution_time, (int, float)) and not isinstance(execution_time, bool)
+        record["execution_time"] = float(execution_time) if has_time else np.nan
+        payload = {"event_id": event_id, "data": data}
+
+        with self._lock:
+            type_code, new_type = self._code_for(event_type)
+            record["type_code"] = type_code
+            self._insert(record, payload)
+            if persist and self.data_dir is not None:
+                self._append_to_disk(record, payload, new_type)
+
+    def _code_for(self, event_type: str):
+        code = self._type_index.get(event_type)
+        if code is not None:
+            return code, False
+        code = len(self.type_names)
+        self.type_names.append(event_type)
+        self._type_index[event_type] = code
+        return code, True
+
+    def _columns(self):
+        return (self._timestamps, self._recorded_at, self._type_codes, self._success, self._execution_time)
+
+    def _insert(self, record: np.ndarray, payload: Dict[str, Any]):
+        if self._end - self._start >= self.max_events:
+            self._evict_oldest(self._end - self._start - self.max_events + 1)
+        if self._end == self._capacity:
+            self._compact()
+
+        timestamp = float(record["timestamp"][0])
+        position = self._end
+        if self._end > self._start and timestamp < self._timestamps[self._end - 1]:
+            # Evento fora de ordem: desloca a cauda para manter a ordenação
+            position = self._start + int(np.searchsorted(
+                self._timestamps[self._start:self._end], timestamp, side="right"))
+            for column in self._columns():
+                column[position + 1:self._end + 1] = column[position:self._end]
+            self._payloads.insert(position, payload)
+        else:
+            self._payloads.append(payload)
+
+        self._timestamps[position] = timestamp
+        self._recorded_at[position] = record["recorded_at"][0]
+        self._type_codes[position] = record["type_code"][0]
+        self._success[position] = record["success"][0]
+        self._execution_time[position] = record["execution_time"][0]
+        self._end += 1
+        self._aggregate(record["type_code"], record["success"], record["execution_time"], sign=1)
+
+    def _evict_oldest(self, count: int):
+        count = min(count, self._end - self._start)
+        if count <= 0:
+            return
+        end = self._start + count
+        self._aggregate(self._type_codes[self._start:end], self._success[self._start:end],
+                        self._execution_time[self._start:end], sign=-1)
+        for i in range(self._start, end):
+            self._payloads[i] = None
+        self._start = end
+
+    def _compact(self):
+        """Move os eventos ativos para o início do buffer (amortizado O(1) por evento)"""
+        size = self._end - self._start
+        for column in self._columns():
+            column[:size] = column[self._start:self._end]
+        del self._payloads[:self._start]
+        self._start, self._end = 0, size
+
+    def _aggregate(self, codes: np.ndarray, success: np.ndarray, execution_time: np.ndarray, sign: int):
+        for code in np.unique(codes):
+            mask = codes == code
+            times = execution_time[mask].astype(np.float64)
+            valid_times = times[~np.isnan(times)]
+            delta = np.array([
+                mask.sum(),
+                (success[mask] == 1).sum(),
+                (success[mask] != SUCCESS_UNKNOWN).sum(),
+                valid_times.sum(),
+                (valid_times ** 2).sum(),
+                len(valid_times),
+            ], dtype=np.float64)
+            current = self._aggregates.setdefault(int(code), np.zeros(6, dtype=np.float64))
+            current += sign * delta
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        with self._lock:
+            events = [self._event_at(i) for i in range(self._start, self._end)]
+        return iter(events)
+
+    def _event_at(self, index: int) -> Dict[str, Any]:
+        payload = self._payloads[index]
+        return {
+            "event_id": payload["event_id"],
+            "event_type": self.type_names[int(self._type_codes[index])],
+            "timestamp": datetime.fromtimestamp(float(self._timestamps[index])),
+            "data": payload["data"],
+            "recorded_at": datetime.fromtimestamp(float(self._recorded_at[index])),
+        }
+
+    def _position(self, moment: datetime, side: str) -> int:
+        return self._start + int(np.searchsorted(
+            self._timestamps[self._start:self._end], moment.timestamp(), side=side))
+
+    def window(self, since: Optional[datetime] = None, until: Optional[datetime] = None) -> EventWindow:
+        """Retorna as colunas dos eventos em [since, until] por busca binária"""
+        with self._lock:
+            start = self._start if since is None else self._position(since, "left")
+            end = self._end if until is None else self._position(until, "right")
+            return EventWindow(
+                timestamps=self._timestamps[start:end].copy(),
+                type_codes=self._type_codes[start:end].copy(),
+                success=self._success[start:end].copy(),
+                execution_time=self._execution_time[start:end].copy(),
+                start_index=start - self._start,
+            )
+
+    def events_since(self, since: datetime) -> List[Dict[str, Any]]:
+        """Materializa como dicionários apenas os eventos a partir de ``since``"""
+        with self._lock:
+            return [self._event_at(i) for i in range(self._position(since, "left"), self._end)]
+
+    def count_since(self, since: datetime) -> int:
+        with self._lock:
+            return self._end - self._position(since, "left")
+
+    def bucket_counts(self, window: EventWindow, bucket_seconds: float = 3600.0,
+                      type_code: Optional[int] = None) -> np.ndarray:
+        """Contagem de eventos por bucket de tempo a partir do primeiro evento da janela"""
+        timestamps = window.timestamps if type_code is None else window.timestamps[window.type_codes == type_code]
+        if len(timestamps) == 0:
+            return np.zeros(0, dtype=np.int64)
+        buckets = ((timestamps - window.timestamps[0]) // bucket_seconds).astype(np.int64)
+        return np.bincount(buckets)
+
+    def rolling_aggregates(self) -> Dict[str, Dict[str, float]]:
+        """Agregados por tipo de evento mantidos incrementalmente"""
+        with self._lock:
+            result = {}
+            for code, (count, successes, known, exec_sum, exec_sq_sum, exec_count) in self._aggregates.items():
+                if count <= 0:
+                    continue
+                mean_time = exec_sum / exec_count if exec_count else 0.0
+                variance = max(0.0, exec_sq_sum / exec_count - mean_time ** 2) if exec_count else 0.0
+                result[self.type_names[code]] = {
+                    "count": int(count),
+                    "success_rate": successes / known if known else 0.0,
+                    "mean_execution_time": mean_time,
+                    "execution_time_std": float(np.sqrt(variance)),
+                }
+            return result
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+    @property
+    def _records_file(self) -> Path:
+        return self.data_dir / "temporal_events.bin"
+
+    @property
+    def _payloads_file(self) -> Path:
+        return self.data_dir / "temporal_event_payloads.jsonl"
+
+    @property
+    def _types_file(self) -> Path:
+        return self.data_dir / "temporal_event_types.json"
+
+    def _append_to_disk(self, record: np.ndarray, payload: Dict[str, Any], new_type: bool):
+        try:
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            if new_type:
+                self._write_types()
+            with open(self._records_file, "ab") as f:
+                f.write(record.tobytes())
+            with open(self._payloads_file, "a", encoding="utf-8") as f:
+                f.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+            self._records_on_disk += 1
+
+            if self._records_on_disk > self.max_events * 2:
+                self.rewrite()
+        except Exception as e:
+            self.logger.error(f"Failed to append temporal event: {e}")
+
+    def _write_types(self):
+        tmp = self._types_file.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.type_names, f, ensure_ascii=False)
+        tmp.replace(self._types_file)
+
+    def rewrite(self):
+        """Compacta os arquivos mantendo apenas os eventos em memória"""
+        with self._lock:
+            start, end = self._start, self._end
+            records = np.zeros(end - start, dtype=EVENT_RECORD_DTYPE)
+            records["timestamp"] = self._timestamps[start:end]
+            records["recorded_at"] = self._recorded_at[start:end]
+            records["type_code"] = self._type_codes[start:end]
+            records["success"] = self._success[start:end]
+            records["execution_time"] = self._execution_time[start:end]
+
+            self.data_dir.mkdir(parents=True, exist_ok=True)
+            self._write_types()
+            tmp_records = self._records_file.with_suffix(".tmp")
+            records.tofile(tmp_records)
+            tmp_payloads = self._payloads_file.with_suffix(".tmp")
+            with open(tmp_payloads, "w", encoding="utf-8") as f:
+                for payload in self._payloads[start:end]:
+                    f.write(json.dumps(payload, ensure_ascii=False, default=str) + "\n")
+            tmp_records.replace(self._records_file)
+            tmp_payloads.replace(self._payloads_file)
+            self._records_on_disk = end - start
+
+    def load(self) -> int:
+        """Carrega os últimos ``max_events`` registros do disco"""
+        if self.data_dir is None or not self._records_file.exists():
+            return 0
+
+        with self._lock:
+            if self._types_file.exists():
+                with open(self._types_file, "r", encoding="utf-8") as f:
+                    self.type_names = json.load(f)
+                self._type_index = {name: code for code, name in enumerate(self.type_names)}
+
+            records = np.fromfile(self._records_file, dtype=EVENT_RECORD_DTYPE)
+            payloads = []
+            if self._payloads_file.exists():
+                with open(self._payloads_file, "r", encoding="utf-8") as f:
+                    payloads = [json.loads(line) for line in f if line.strip()]
+
+            # Arquivos truncados por queda do processo: alinha as duas sequências
+            total = min(len(records), len(payloads))
+            self._records_on_disk = total
+            records = records[:total][-self.max_events:]
+            payloads = payloads[:total][-self.max_events:]
+
+            order = np.argsort(records["timestamp"], kind="stable")
+            records = records[order]
+            size = len(records)
+            self._start, self._end = 0, size
+            self._timestamps[:size] = records["timestamp"]
+            self._recorded_at[:size] = records["recorded_at"]
+            self._type_codes[:size] = records["type_code"]
+            self._success[:size] = records["success"]
+            self._execution_time[:size] = records["execution_time"]
+            self._payloads = [payloads[i] for i in order]
+            self._aggregates = {}
+            self._aggregate(records["type_code"], records["success"], records["execution_time"], sign=1)
+            return size
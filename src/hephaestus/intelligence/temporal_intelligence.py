@@ -16,19 +16,20 @@ Este sistema implementa consciência temporal através de:
 import json
 import logging
 import time
-import threading
 import statistics
 from typing import Dict, Any, List, Optional, Tuple, Set
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict, deque
 from enum import Enum
 import numpy as np
 import hashlib
 import re
 from abc import ABC, abstractmethod
 
+from hephaestus.intelligence.temporal_event_store import TemporalEventStore, EventWindow
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
 class TemporalPerspective(Enum):
     """Perspectivas temporais do sistema"""
     PAST = "past"               # Análise histórica
@@ -166,13 +167,10 @@ class TemporalIntelligence:
         self.data_dir = Path("data/intelligence/temporal")
         self.data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Temporal state
-        self.historical_events: deque = deque(maxlen=self.max_historical_events)
+        # Temporal state - eventos em armazenamento colunar ordenado por tempo
+        self.historical_events = TemporalEventStore(self.max_historical_events, self.data_dir, self.logger)
         self.detected_patterns: Dict[str, TemporalPattern] = {}
         self.active_predictions: List[FuturePrediction] = []
-        self.temporal_memory: Dict[TemporalScope, List[Dict[str, Any]]] = {
-            scope: [] for scope in TemporalScope
-        }
         
         # Analytics
         self.temporal_analytics = {
@@ -186,9 +184,8 @@ class TemporalIntelligence:
             "historical_insights_generated": 0
         }
         
-        # Threading
-        self.should_stop = threading.Event()
-        self.analysis_thread = None
+        # Job periódico no escalonador de background
+        self.analysis_job = None
         
         # Load existing data
         self._load_temporal_data()
@@ -340,23 +337,15 @@ class TemporalIntelligence:
         try:
             event_timestamp = timestamp or datetime.now()
             
-            event = {
-                "event_id": f"event_{int(time.time())}_{hashlib.md5(event_type.encode()).hexdigest()[:8]}",
-                "event_type": event_type,
-                "timestamp": event_timestamp,
-                "data": event_data,
-                "recorded_at": datetime.now()
-            }
-            
-            self.historical_events.append(event)
+            # Anexa um registro binário ao disco; não reescreve o histórico
+            self.historical_events.append(
+                event_id=f"event_{int(time.time())}_{hashlib.md5(event_type.encode()).hexdigest()[:8]}",
+                event_type=event_type,
+                timestamp=event_timestamp,
+                data=event_data
+            )
             self.temporal_analytics["total_events_analyzed"] += 1
             
-            # Atualizar memória temporal por escopo
-            self._update_temporal_memory(event)
-            
-            # Salvar dados imediatamente para persistência
-            self._save_temporal_data()
-            
             return True
             
         except Exception as e:
@@ -385,149 +374,154 @@ class TemporalIntelligence:
             self.logger.error(f"❌ Error recording real system event: {e}")
             return False
     
-    def _filter_events_by_scope(self, scope: TemporalScope) -> List[Dict[str, Any]]:
-        """Filtra eventos pelo escopo temporal"""
-        current_time = datetime.now()
-        
-        scope_filters = {
-            TemporalScope.IMMEDIATE: timedelta(hours=6),
-            TemporalScope.SHORT_TERM: timedelta(days=3),
-            TemporalScope.MEDIUM_TERM: timedelta(weeks=2),
-            TemporalScope.LONG_TERM: timedelta(days=90),
-            TemporalScope.DEEP_HISTORY: None  # Todo o histórico
-        }
-        
-        if scope == TemporalScope.DEEP_HISTORY:
-            return list(self.historical_events)
-        
-        cutoff_time = current_time - scope_filters[scope]
-        
-        return [
-            event for event in self.historical_events
-            if event["timestamp"] >= cutoff_time
-        ]
+    SCOPE_WINDOWS = {
+        TemporalScope.IMMEDIATE: timedelta(hours=6),
+        TemporalScope.SHORT_TERM: timedelta(days=3),
+        TemporalScope.MEDIUM_TERM: timedelta(weeks=2),
+        TemporalScope.LONG_TERM: timedelta(days=90),
+        TemporalScope.DEEP_HISTORY: None  # Todo o histórico
+    }
+    
+    def _filter_events_by_scope(self, scope: TemporalScope) -> EventWindow:
+        """Recorta as colunas de eventos do escopo temporal por busca binária"""
+        window = self.SCOPE_WINDOWS[scope]
+        if window is None:
+            return self.historical_events.window()
+        return self.historical_events.window(since=datetime.now() - window)
     
-    def _detect_cyclical_patterns(self, events: List[Dict[str, Any]]) -> List[TemporalPattern]:
-        """Detecta padrões cíclicos nos eventos"""
+    def _detect_cyclical_patterns(self, events: EventWindow) -> List[TemporalPattern]:
+        """Detecta padrões cíclicos por tipo de evento (intervalos + autocorrelação via FFT)"""
         patterns = []
         
-        # Agrupar eventos por tipo
-        events_by_type = defaultdict(list)
-        for event in events:
-            events_by_type[event["event_type"]].append(event)
-        
-        for event_type, type_events in events_by_type.items():
-            if len(type_events) < 3:  # Mínimo para detectar ciclo
+        codes, counts = np.unique(events.type_codes, return_counts=True)
+        for code, count in zip(codes, counts):
+            if count < 3:  # Mínimo para detectar ciclo
                 continue
             
-            # Analisar intervalos entre eventos
-            intervals = []
-            for i in range(1, len(type_events)):
-                interval = type_events[i]["timestamp"] - type_events[i-1]["timestamp"]
-                intervals.append(interval.total_seconds())
-            
-            if len(intervals) < 2:
+            timestamps = events.timestamps[events.type_codes == code]
+            intervals = np.diff(timestamps)
+            avg_interval = float(intervals.mean())
+            if avg_interval <= 0:
                 continue
             
-            # Detectar periodicidade
-            avg_interval = statistics.mean(intervals)
-            interval_variance = statistics.variance(intervals) if len(intervals) > 1 else 0
+            # Regularidade dos intervalos (coeficiente de variação)
+            regularity = 1.0 - float(intervals.std()) / avg_interval
+            period = avg_interval
             
-            # Considerar padrão cíclico se variância é baixa
-            if interval_variance < (avg_interval * 0.3):  # 30% de tolerância
-                pattern_id = f"cyclical_{event_type}_{int(avg_interval)}"
+            # Periodicidade dominante na série de contagens por bucket
+            acf_period, acf_strength = self._autocorrelation_period(timestamps, float(np.median(intervals)))
+            if acf_period and acf_strength > regularity:
+                period, regularity = acf_period, acf_strength
+            
+            # Considerar padrão cíclico se a série é regular o suficiente (30% de tolerância)
+            if regularity >= 0.7:
+                event_type = self.historical_events.type_names[int(code)]
+                pattern_id = f"cyclical_{event_type}_{int(period)}"
                 
                 pattern = TemporalPattern(
                     pattern_id=pattern_id,
                     pattern_type="cyclical",
-                    description=f"Cyclical pattern in {event_type} every {avg_interval/3600:.1f} hours",
-                    first_occurrence=type_events[0]["timestamp"],
-                    last_occurrence=type_events[-1]["timestamp"],
-                    frequency=len(type_events),
-                    confidence=max(0.1, min(0.9, 1.0 - (interval_variance / avg_interval))),
-                    cyclical_period=timedelta(seconds=avg_interval),
-                    impact_score=min(1.0, len(type_events) / 10.0)
+                    description=f"Cyclical pattern in {event_type} every {period/3600:.1f} hours",
+                    first_occurrence=datetime.fromtimestamp(float(timestamps[0])),
+                    last_occurrence=datetime.fromtimestamp(float(timestamps[-1])),
+                    frequency=int(count),
+                    confidence=max(0.1, min(0.9, regularity)),
+                    cyclical_period=timedelta(seconds=period),
+                    impact_score=min(1.0, int(count) / 10.0)
                 )
                 
                 patterns.append(pattern)
         
         return patterns
     
-    def _detect_trend_patterns(self, events: List[Dict[str, Any]]) -> List[TemporalPattern]:
-        """Detecta padrões de tendência nos eventos"""
+    @staticmethod
+    def _autocorrelation_period(timestamps: np.ndarray, typical_interval: float) -> Tuple[Optional[float], float]:
+        """Estima o período dominante pela autocorrelação (FFT) das contagens por bucket"""
+        if len(timestamps) < 6 or typical_interval <= 0:
+            return None, 0.0
+        
+        bucket = typical_interval / 4.0
+        series = np.bincount(((timestamps - timestamps[0]) / bucket).astype(np.int64)).astype(np.float64)
+        n = len(series)
+        if n < 8 or n > 1 << 20:
+            return None, 0.0
+        
+        centered = series - series.mean()
+        size = 1 << int(np.ceil(np.log2(2 * n)))
+        spectrum = np.fft.rfft(centered, size)
+        acf = np.fft.irfft(spectrum * np.conj(spectrum), size)[:n]
+        if acf[0] <= 0:
+            return None, 0.0
+        acf /= acf[0]
+        
+        # Ignora lags muito curtos (vizinhança do próprio evento)
+        lags = acf[2:n // 2 + 1]
+        if len(lags) == 0:
+            return None, 0.0
+        best = int(np.argmax(lags)) + 2
+        return best * bucket, float(acf[best])
+    
+    def _detect_trend_patterns(self, events: EventWindow) -> List[TemporalPattern]:
+        """Detecta tendência na frequência de eventos por mínimos quadrados sobre buckets horários"""
         patterns = []
+        if len(events) == 0:
+            return patterns
         
-        # Analisar frequência de eventos ao longo do tempo
-        time_buckets = defaultdict(int)
-        earliest_time = min(event["timestamp"] for event in events)
-        
-        # Dividir em buckets de 1 hora
-        for event in events:
-            hours_since_start = int((event["timestamp"] - earliest_time).total_seconds() / 3600)
-            time_buckets[hours_since_start] += 1
+        # Contagens em buckets de 1 hora; apenas buckets com eventos entram na regressão
+        bucket_counts = self.historical_events.bucket_counts(events, bucket_seconds=3600)
+        hours = np.flatnonzero(bucket_counts)
         
-        if len(time_buckets) < 3:
+        if len(hours) < 3:
             return patterns
         
-        # Calcular tendência
-        hours = sorted(time_buckets.keys())
-        frequencies = [time_buckets[h] for h in hours]
-        
-        # Regressão linear simples
-        n = len(hours)
-        sum_x = sum(hours)
-        sum_y = sum(frequencies)
-        sum_xy = sum(h * f for h, f in zip(hours, frequencies))
-        sum_x2 = sum(h * h for h in hours)
+        frequencies = bucket_counts[hours].astype(np.float64)
+        slope = float(np.polyfit(hours.astype(np.float64), frequencies, 1)[0])
         
-        if n * sum_x2 - sum_x * sum_x != 0:
-            slope = (n * sum_xy - sum_x * sum_y) / (n * sum_x2 - sum_x * sum_x)
+        # Determinar direção da tendência
+        if abs(slope) > 0.1:  # Threshold para considerar tendência significativa
+            trend_direction = "increasing" if slope > 0 else "decreasing"
+            confidence = min(0.9, abs(slope) / 2.0)
             
-            # Determinar direção da tendência
-            if abs(slope) > 0.1:  # Threshold para considerar tendência significativa
-                trend_direction = "increasing" if slope > 0 else "decreasing"
-                confidence = min(0.9, abs(slope) / 2.0)
-                
-                pattern_id = f"trend_{trend_direction}_{int(time.time())}"
-                
-                pattern = TemporalPattern(
-                    pattern_id=pattern_id,
-                    pattern_type="trend",
-                    description=f"Event frequency is {trend_direction}",
-                    first_occurrence=earliest_time,
-                    last_occurrence=max(event["timestamp"] for event in events),
-                    frequency=len(events),
-                    confidence=confidence,
-                    trend_direction=trend_direction,
-                    impact_score=min(1.0, abs(slope))
-                )
-                
-                patterns.append(pattern)
+            pattern_id = f"trend_{trend_direction}_{int(time.time())}"
+            
+            pattern = TemporalPattern(
+                pattern_id=pattern_id,
+                pattern_type="trend",
+                description=f"Event frequency is {trend_direction}",
+                first_occurrence=datetime.fromtimestamp(float(events.timestamps[0])),
+                last_occurrence=datetime.fromtimestamp(float(events.timestamps[-1])),
+                frequency=len(events),
+                confidence=confidence,
+                trend_direction=trend_direction,
+                impact_score=min(1.0, abs(slope))
+            )
+            
+            patterns.append(pattern)
         
         return patterns
     
-    def _detect_correlation_patterns(self, events: List[Dict[str, Any]]) -> List[TemporalPattern]:
+    def _detect_correlation_patterns(self, events: EventWindow) -> List[TemporalPattern]:
         """Detecta padrões de correlação temporal entre tipos de eventos"""
         patterns = []
         
         # Implementação básica - pode ser expandida
-        event_types = set(event["event_type"] for event in events)
+        codes, counts = np.unique(events.type_codes, return_counts=True)
         
-        for event_type in event_types:
-            type_events = [e for e in events if e["event_type"] == event_type]
-            
-            if len(type_events) >= self.pattern_detection_threshold:
-                pattern_id = f"correlation_{event_type}_{len(type_events)}"
+        for code, count in zip(codes, counts):
+            if count >= self.pattern_detection_threshold:
+                event_type = self.historical_events.type_names[int(code)]
+                timestamps = events.timestamps[events.type_codes == code]
+                pattern_id = f"correlation_{event_type}_{count}"
                 
                 pattern = TemporalPattern(
                     pattern_id=pattern_id,
                     pattern_type="correlation",
                     description=f"Correlation pattern for {event_type}",
-                    first_occurrence=type_events[0]["timestamp"],
-                    last_occurrence=type_events[-1]["timestamp"],
-                    frequency=len(type_events),
+                    first_occurrence=datetime.fromtimestamp(float(timestamps[0])),
+                    last_occurrence=datetime.fromtimestamp(float(timestamps[-1])),
+                    frequency=int(count),
                     confidence=0.5,  # Base confidence
-                    impact_score=min(1.0, len(type_events) / 20.0)
+                    impact_score=min(1.0, int(count) / 20.0)
                 )
                 
                 patterns.append(pattern)
@@ -612,12 +606,9 @@ class TemporalIntelligence:
         predictions = []
         
         # Análise simples do contexto atual
-        recent_events = [
-            event for event in self.historical_events
-            if (start_time - event["timestamp"]).total_seconds() < 3600  # Última hora
-        ]
+        recent_event_count = self.historical_events.count_since(start_time - timedelta(hours=1))
         
-        if len(recent_events) > 5:  # Alta atividade recente
+        if recent_event_count > 5:  # Alta atividade recente
             prediction_id = f"context_pred_{int(time.time())}"
             predicted_time = start_time + timedelta(hours=2)
             
@@ -628,7 +619,7 @@ class TemporalIntelligence:
                     predicted_time=predicted_time,
                     confidence=PredictionConfidence.MODERATE,
                     confidence_score=0.6,
-                    reasoning=f"High recent activity: {len(recent_events)} events in last hour",
+                    reasoning=f"High recent activity: {recent_event_count} events in last hour",
                     impact_assessment="Medium impact expected",
                     preparation_suggestions=[
                         "Monitor system resources",
@@ -668,20 +659,14 @@ class TemporalIntelligence:
         """Obtém eventos passados relevantes"""
         cutoff_time = current_time - timedelta(hours=hours_back)
         
-        return [
-            event for event in self.historical_events
-            if event["timestamp"] >= cutoff_time
-        ]
+        return self.historical_events.events_since(cutoff_time)
     
     def _assess_current_state(self) -> Dict[str, Any]:
         """Avalia estado atual do sistema"""
         return {
             "timestamp": datetime.now().isoformat(),
             "active_patterns": len(self.detected_patterns),
-            "recent_events": len([
-                e for e in self.historical_events
-                if (datetime.now() - e["timestamp"]).total_seconds() < 3600
-            ]),
+            "recent_events": self.historical_events.count_since(datetime.now() - timedelta(hours=1)),
             "prediction_confidence": statistics.mean([
                 pred.confidence_score for pred in self.active_predictions
             ]) if self.active_predictions else 0.0
@@ -725,52 +710,28 @@ class TemporalIntelligence:
             "temporal_span": min(1.0, len(self.historical_events) / 100.0)
         }
     
-    def _update_temporal_memory(self, event: Dict[str, Any]):
-        """Atualiza memória temporal por escopo"""
-        current_time = datetime.now()
-        event_time = event["timestamp"]
-        
-        # Adicionar a todos os escopos relevantes
-        for scope in TemporalScope:
-            scope_limit = {
-                TemporalScope.IMMEDIATE: timedelta(hours=6),
-                TemporalScope.SHORT_TERM: timedelta(days=3),
-                TemporalScope.MEDIUM_TERM: timedelta(weeks=2),
-                TemporalScope.LONG_TERM: timedelta(days=90),
-                TemporalScope.DEEP_HISTORY: None
-            }
-            
-            if scope_limit[scope] is None or (current_time - event_time) <= scope_limit[scope]:
-                self.temporal_memory[scope].append(event)
-                
-                # Limitar tamanho da memória
-                if len(self.temporal_memory[scope]) > 1000:
-                    self.temporal_memory[scope] = self.temporal_memory[scope][-800:]
-    
     def _start_temporal_analysis(self):
         """Inicia análise temporal em background"""
-        self.analysis_thread = threading.Thread(target=self._temporal_analysis_loop, daemon=True)
-        self.analysis_thread.start()
+        self.analysis_job = get_background_scheduler().schedule(
+            "temporal_analysis", self._temporal_analysis_tick, interval=self.analysis_interval,
+            jitter=min(30.0, self.analysis_interval * 0.1), priority=JobPriority.LOW, max_runtime=60
+        )
         self.logger.info("🔄 Temporal analysis started")
     
-    def _temporal_analysis_loop(self):
-        """Loop principal de análise temporal"""
-        while not self.should_stop.wait(self.analysis_interval):
-            try:
-                # Análise de padrões
-                patterns = self.analyze_temporal_patterns()
-                
-                # Predições futuras
-                predictions = self.predict_future_needs()
-                
-                # Atualizar analytics
-                self._update_temporal_analytics()
-                
-                if patterns or predictions:
-                    self.logger.info(f"📊 Temporal analysis: {len(patterns)} patterns, {len(predictions)} predictions")
-                
-            except Exception as e:
-                self.logger.error(f"❌ Error in temporal analysis loop: {e}")
+    def _temporal_analysis_tick(self):
+        """Uma rodada de análise temporal"""
+        # Análise de padrões
+        patterns = self.analyze_temporal_patterns()
+        
+        # Predições futuras
+        predictions = self.predict_future_needs()
+        
+        # Atualizar analytics
+        self._update_temporal_analytics()
+        self._save_temporal_data()
+        
+        if patterns or predictions:
+            self.logger.info(f"📊 Temporal analysis: {len(patterns)} patterns, {len(predictions)} predictions")
     
     def _update_temporal_analytics(self):
         """Atualiza analytics temporais"""
@@ -786,50 +747,53 @@ class TemporalIntelligence:
         data_file = self.data_dir / "temporal_data.json"
         
         try:
+            loaded = self.historical_events.load()
+            
             if data_file.exists():
                 with open(data_file, 'r', encoding='utf-8') as f:
                     data = json.load(f)
                 
-                # Carregar eventos históricos
-                if "historical_events" in data:
+                # Migrar eventos do formato JSON antigo para o armazenamento binário
+                if not loaded and data.get("historical_events"):
                     for event_data in data["historical_events"]:
                         try:
-                            event_data["timestamp"] = datetime.fromisoformat(event_data["timestamp"])
-                            event_data["recorded_at"] = datetime.fromisoformat(event_data["recorded_at"])
-                            self.historical_events.append(event_data)
+                            self.historical_events.append(
+                                event_id=event_data["event_id"],
+                                event_type=event_data["event_type"],
+                                timestamp=datetime.fromisoformat(event_data["timestamp"]),
+                                data=event_data.get("data", {}),
+                                recorded_at=datetime.fromisoformat(event_data["recorded_at"]),
+                                persist=False
+                            )
                         except Exception as e:
                             self.logger.warning(f"Failed to load event: {e}")
+                    self.historical_events.rewrite()
                 
                 # Carregar analytics
                 if "temporal_analytics" in data:
                     self.temporal_analytics.update(data["temporal_analytics"])
-                
+            
+            if len(self.historical_events):
                 self.logger.info(f"📂 Loaded {len(self.historical_events)} temporal events from disk")
                 
         except Exception as e:
             self.logger.warning(f"Failed to load temporal data: {e}")
     
     def _save_temporal_data(self):
-        """Salva dados temporais"""
+        """Salva analytics temporais (os eventos já são anexados ao disco ao serem registrados)"""
         data_file = self.data_dir / "temporal_data.json"
         
         try:
-            # Preparar eventos para serialização
-            events_to_save = []
-            for event in list(self.historical_events)[-1000:]:  # Últimos 1000 eventos
-                event_copy = event.copy()
-                event_copy["timestamp"] = event_copy["timestamp"].isoformat()
-                event_copy["recorded_at"] = event_copy["recorded_at"].isoformat()
-                events_to_save.append(event_copy)
-            
             data = {
-                "historical_events": events_to_save,
                 "temporal_analytics": self.temporal_analytics,
+                "event_aggregates": self.historical_events.rolling_aggregates(),
                 "last_updated": datetime.now().isoformat()
             }
             
-            with open(data_file, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            tmp_file = data_file.with_suffix(".tmp")
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            tmp_file.replace(data_file)
                 
         except Exception as e:
             self.logger.error(f"Failed to save temporal data: {e}")
@@ -841,18 +805,17 @@ class TemporalIntelligence:
             "total_historical_events": len(self.historical_events),
             "detected_patterns": len(self.detected_patterns),
             "active_predictions": len(self.active_predictions),
+            "event_aggregates": self.historical_events.rolling_aggregates(),
             "analytics": self.temporal_analytics,
-            "analysis_active": self.analysis_thread.is_alive() if self.analysis_thread else False
+            "analysis_active": self.analysis_job.active if self.analysis_job else False
         }
     
     def shutdown(self):
         """Encerra sistema temporal"""
         self.logger.info("🛑 Shutting down Temporal Intelligence...")
         
-        self.should_stop.set()
-        
-        if self.analysis_thread and self.analysis_thread.is_alive():
-            self.analysis_thread.join(timeout=5)
+        if self.analysis_job:
+            self.analysis_job.cancel()
         
         # Salvar dados
         self._save_temporal_data()
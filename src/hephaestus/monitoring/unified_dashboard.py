@@ -11,6 +11,7 @@ from collections import defaultdict
 import asyncio
 
 from hephaestus.utils.metrics_collector import get_global_metrics_collector
+from hephaestus.utils.system_metrics import get_system_metrics_sampler
 from hephaestus.utils.config_manager import ConfigManager
 from hephaestus.utils.logger_factory import LoggerFactory
 
@@ -410,11 +411,8 @@ class UnifiedDashboard:
         return len(self.agents) * 2  # Simulated
     
     def _get_memory_usage(self) -> float:
-        """Get current memory usage."""
-        # This would get actual memory usage
-        # For now, return a simulated value
-        import random
-        return random.uniform(0.3, 0.8)
+        """Get current memory usage (fraction of host memory, from the shared sampler)."""
+        return get_system_metrics_sampler().latest().memory_percent / 100.0
     
     def _get_statistics(self) -> Dict[str, Any]:
         """Get system statistics."""
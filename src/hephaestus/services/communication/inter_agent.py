@@ -4,15 +4,16 @@ Permite conversas diretas, colaboração e resolução coletiva de problemas
 """
 
 import asyncio
+import inspect
 import json
 import logging
 import time
-from typing import Dict, List, Optional, Any, Callable
+from typing import Dict, List, Optional, Any, Callable, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
 import uuid
-from collections import defaultdict, deque
+from collections import defaultdict, deque, OrderedDict
 
 from hephaestus.utils.llm_client import call_llm_with_fallback
 
@@ -54,6 +55,7 @@ class AgentMessage:
     requires_response: bool = True
     conversation_id: Optional[str] = None
     context: Dict[str, Any] = field(default_factory=dict)
+    topic: Optional[str] = None  # Entregue também aos assinantes do tópico
     
     def __post_init__(self):
         if self.conversation_id is None:
@@ -88,15 +90,33 @@ class CollaborationSession:
 
 
 class InterAgentCommunication:
-    """Sistema de comunicação inter-agente"""
+    """Sistema de comunicação inter-agente
+    
+    Cada destinatário registrado possui uma caixa de mensagens limitada
+    consumida por uma tarefa de entrega própria. Remetentes aguardam quando
+    a caixa está cheia (backpressure) e desistem após ``send_timeout``.
+    """
     
     def __init__(self, config: Dict[str, Any], logger: logging.Logger):
         self.config = config
         self.logger = logger
         
-        # Sistema de mensagens
-        self.message_queue = asyncio.Queue()
-        self.conversations: Dict[str, Conversation] = {}
+        bus_config = config.get("inter_agent_communication", {})
+        self.mailbox_size = bus_config.get("mailbox_size", 100)
+        self.send_timeout = bus_config.get("send_timeout_seconds", 5.0)
+        self.conversation_ttl = bus_config.get("conversation_ttl_seconds", 3600)
+        self.cleanup_interval = bus_config.get("cleanup_interval_seconds", 60)
+        
+        # Sistema de mensagens: uma caixa limitada e uma tarefa de entrega por destinatário
+        self.mailboxes: Dict[str, asyncio.Queue] = {}
+        self._delivery_tasks: Dict[str, asyncio.Task] = {}
+        self._bus_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self.topic_subscribers: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Conversas ordenadas pela última atividade (índice temporal para expiração)
+        self.conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        self._conversation_activity: Dict[str, float] = {}
         self.collaboration_sessions: Dict[str, CollaborationSession] = {}
         
         # Registro de agentes
@@ -111,10 +131,16 @@ class InterAgentCommunication:
         self.communication_metrics = {
             "messages_sent": 0,
             "messages_received": 0,
+            "messages_dropped": 0,
+            "messages_undeliverable": 0,
+            "delivery_errors": 0,
             "conversations_started": 0,
+            "conversations_evicted": 0,
             "collaborations_completed": 0,
             "average_response_time": 0.0
         }
+        self._delivery_latencies: deque = deque(maxlen=1000)
+        self._delivery_timestamps: deque = deque(maxlen=10000)
         
         self.logger.info("🤝 Inter-Agent Communication System initialized")
     
@@ -129,50 +155,191 @@ class InterAgentCommunication:
         
         self.logger.info(f"📝 Agent '{agent_name}' registered with capabilities: {capabilities}")
     
+    def subscribe(self, agent_name: str, topic: str):
+        """Inscreve um agente para receber mensagens publicadas em um tópico"""
+        self.topic_subscribers[topic].add(agent_name)
+        self.logger.debug(f"📡 Agent '{agent_name}' subscribed to topic '{topic}'")
+    
+    def unsubscribe(self, agent_name: str, topic: str):
+        """Remove a inscrição de um agente em um tópico"""
+        subscribers = self.topic_subscribers.get(topic)
+        if subscribers is not None:
+            subscribers.discard(agent_name)
+            if not subscribers:
+                del self.topic_subscribers[topic]
+    
     async def send_message(self, message: AgentMessage) -> bool:
-        """Envia uma mensagem para outros agentes"""
+        """Envia uma mensagem para os destinatários e assinantes do tópico
+        
+        Retorna ``True`` quando a mensagem foi enfileirada para todos os
+        destinatários entregáveis; a entrega acontece nas tarefas de cada caixa.
+        """
         try:
             self.logger.info(f"📤 Sending message from {message.sender} to {message.recipients}")
             
-            # Adicionar à fila de mensagens
-            await self.message_queue.put(message)
+            self._ensure_bus()
+            self._record_conversation(message)
+            
+            deliverable = []
+            for recipient in self._resolve_recipients(message):
+                if recipient in self.message_routes:
+                    deliverable.append(recipient)
+                else:
+                    self.communication_metrics["messages_undeliverable"] += 1
             
-            # Processar mensagem
-            await self._process_message(message)
+            # Fan-out concorrente: uma caixa cheia não atrasa as demais
+            results = await asyncio.gather(*(self._enqueue(recipient, message) for recipient in deliverable))
             
             self.communication_metrics["messages_sent"] += 1
-            return True
+            self._evict_expired_conversations()
+            return all(results)
             
         except Exception as e:
             self.logger.error(f"❌ Error sending message: {e}")
             return False
     
-    async def _process_message(self, message: AgentMessage):
-        """Processa uma mensagem recebida"""
+    async def flush(self):
+        """Aguarda até que todas as mensagens enfileiradas tenham sido entregues"""
+        await asyncio.gather(*(mailbox.join() for mailbox in list(self.mailboxes.values())))
+    
+    def _resolve_recipients(self, message: AgentMessage) -> List[str]:
+        """Combina destinatários explícitos e assinantes do tópico, sem duplicatas"""
+        recipients = list(dict.fromkeys(message.recipients))
+        if message.topic:
+            for subscriber in sorted(self.topic_subscribers.get(message.topic, ())):
+                if subscriber != message.sender and subscriber not in recipients:
+                    recipients.append(subscriber)
+        return recipients
+    
+    def _ensure_bus(self):
+        """Associa as caixas de mensagens ao event loop em execução"""
+        loop = asyncio.get_running_loop()
+        if self._bus_loop is not loop:
+            # Caixas e tarefas de outro loop não podem ser reutilizadas
+            for task in self._delivery_tasks.values():
+                if not task.done() and self._bus_loop is not None and not self._bus_loop.is_closed():
+                    self._bus_loop.call_soon_threadsafe(task.cancel)
+            self.mailboxes.clear()
+            self._delivery_tasks.clear()
+            self._bus_loop = loop
+    
+    def _get_mailbox(self, recipient: str) -> asyncio.Queue:
+        """Retorna (criando se necessário) a caixa de mensagens de um destinatário"""
+        mailbox = self.mailboxes.get(recipient)
+        if mailbox is None:
+            mailbox = asyncio.Queue(maxsize=self.mailbox_size)
+            self.mailboxes[recipient] = mailbox
+        task = self._delivery_tasks.get(recipient)
+        if task is None or task.done():
+            self._delivery_tasks[recipient] = asyncio.create_task(
+                self._delivery_loop(recipient, mailbox), name=f"inter-agent-{recipient}"
+            )
+        return mailbox
+    
+    async def _enqueue(self, recipient: str, message: AgentMessage) -> bool:
+        """Coloca a mensagem na caixa do destinatário respeitando o backpressure"""
+        mailbox = self._get_mailbox(recipient)
+        item: Tuple[AgentMessage, float] = (message, time.monotonic())
         try:
-            # Criar ou atualizar conversa
-            if message.conversation_id not in self.conversations:
-                self.conversations[message.conversation_id] = Conversation(
-                    conversation_id=message.conversation_id,
-                    participants=list(set([message.sender] + message.recipients)),
-                    topic=message.content.get("topic", "General discussion")
-                )
-            
-            conversation = self.conversations[message.conversation_id]
-            conversation.messages.append(message)
-            
-            # Rotear mensagem para destinatários
-            for recipient in message.recipients:
-                if recipient in self.message_routes:
-                    try:
-                        await self.message_routes[recipient](message)
-                    except Exception as e:
-                        self.logger.error(f"❌ Error routing message to {recipient}: {e}")
-            
-            self.communication_metrics["messages_received"] += 1
-            
-        except Exception as e:
-            self.logger.error(f"❌ Error processing message: {e}")
+            if self.send_timeout is None:
+                await mailbox.put(item)
+            else:
+                await asyncio.wait_for(mailbox.put(item), timeout=self.send_timeout)
+            return True
+        except asyncio.TimeoutError:
+            self.communication_metrics["messages_dropped"] += 1
+            self.logger.warning(
+                f"⚠️ Mailbox of '{recipient}' full for {self.send_timeout}s, dropping message {message.message_id}"
+            )
+            return False
+    
+    async def _delivery_loop(self, recipient: str, mailbox: asyncio.Queue):
+        """Entrega sequencialmente as mensagens de uma caixa ao handler do agente"""
+        while True:
+            message, enqueued_at = await mailbox.get()
+            try:
+                handler = self.message_routes.get(recipient)
+                if handler is None:
+                    self.communication_metrics["messages_undeliverable"] += 1
+                    continue
+                result = handler(message)
+                if inspect.isawaitable(result):
+                    await result
+                self._record_delivery(time.monotonic() - enqueued_at)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.communication_metrics["delivery_errors"] += 1
+                self.logger.error(f"❌ Error routing message to {recipient}: {e}")
+            finally:
+                mailbox.task_done()
+    
+    def _record_delivery(self, latency: float):
+        """Atualiza contadores de vazão e latência de entrega"""
+        self.communication_metrics["messages_received"] += 1
+        self._delivery_latencies.append(latency)
+        self._delivery_timestamps.append(time.monotonic())
+        delivered = self.communication_metrics["messages_received"]
+        average = self.communication_metrics["average_response_time"]
+        self.communication_metrics["average_response_time"] = average + (latency - average) / delivered
+    
+    def _record_conversation(self, message: AgentMessage):
+        """Cria ou atualiza a conversa e a move para o fim do índice temporal"""
+        conversation = self.conversations.get(message.conversation_id)
+        if conversation is None:
+            conversation = Conversation(
+                conversation_id=message.conversation_id,
+                participants=list(set([message.sender] + message.recipients)),
+                topic=message.content.get("topic", "General discussion")
+            )
+            self.conversations[message.conversation_id] = conversation
+        else:
+            self.conversations.move_to_end(message.conversation_id)
+        
+        conversation.messages.append(message)
+        self._conversation_activity[message.conversation_id] = time.monotonic()
+    
+    def _evict_expired_conversations(self) -> int:
+        """Remove conversas ociosas além do TTL, percorrendo apenas as expiradas"""
+        cutoff = time.monotonic() - self.conversation_ttl
+        evicted = 0
+        while self.conversations:
+            conversation_id, conversation = next(iter(self.conversations.items()))
+            if self._conversation_activity.get(conversation_id, 0.0) >= cutoff:
+                break
+            self.conversations.popitem(last=False)
+            self._conversation_activity.pop(conversation_id, None)
+            if conversation.status == "active":
+                conversation.status = "resolved"
+                conversation.resolved_at = datetime.now()
+            evicted += 1
+        
+        if evicted:
+            self.communication_metrics["conversations_evicted"] += evicted
+            self.logger.info(f"📝 Evicted {evicted} idle conversations")
+        return evicted
+    
+    def get_bus_metrics(self) -> Dict[str, Any]:
+        """Retorna profundidade das caixas, vazão e latências de entrega"""
+        now = time.monotonic()
+        window = 60.0
+        recent = sum(1 for ts in self._delivery_timestamps if now - ts <= window)
+        latencies = sorted(self._delivery_latencies)
+        
+        def percentile(p: float) -> float:
+            if not latencies:
+                return 0.0
+            return latencies[min(len(latencies) - 1, int(p * len(latencies)))]
+        
+        return {
+            "mailbox_depths": {name: mailbox.qsize() for name, mailbox in self.mailboxes.items()},
+            "mailbox_capacity": self.mailbox_size,
+            "throughput_per_second": recent / window,
+            "latency_p50_seconds": percentile(0.50),
+            "latency_p95_seconds": percentile(0.95),
+            "latency_max_seconds": latencies[-1] if latencies else 0.0,
+            "topics": {topic: len(subs) for topic, subs in self.topic_subscribers.items()}
+        }
     
     async def start_conversation(self, initiator: str, participants: List[str], topic: str, 
                                initial_message: str) -> str:
@@ -418,42 +585,42 @@ class InterAgentCommunication:
             "active_collaborations": len([s for s in self.collaboration_sessions.values() if s.status != "completed"]),
             "registered_agents": len(self.registered_agents),
             "metrics": self.communication_metrics,
+            "bus": self.get_bus_metrics(),
             "system_status": "operational"
         }
     
     async def start_message_processor(self):
-        """Inicia o processador de mensagens em background"""
+        """Mantém o barramento ativo e expira conversas antigas periodicamente"""
         self.logger.info("🔄 Starting message processor...")
+        self._ensure_bus()
+        self._stop_event = asyncio.Event()
         
-        while True:
+        while not self._stop_event.is_set():
+            try:
+                await asyncio.wait_for(self._stop_event.wait(), timeout=self.cleanup_interval)
+            except asyncio.TimeoutError:
+                pass
+            
             try:
-                # Processar mensagens da fila
-                if not self.message_queue.empty():
-                    message = await self.message_queue.get()
-                    await self._process_message(message)
-                
-                # Limpar conversas antigas
                 await self._cleanup_old_conversations()
-                
-                await asyncio.sleep(0.1)  # Pequena pausa para não sobrecarregar
-                
             except Exception as e:
                 self.logger.error(f"❌ Error in message processor: {e}")
-                await asyncio.sleep(1)
+    
+    async def stop_message_processor(self):
+        """Para o processador e cancela as tarefas de entrega"""
+        if self._stop_event is not None:
+            self._stop_event.set()
+        
+        tasks = list(self._delivery_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._delivery_tasks.clear()
+        self.mailboxes.clear()
     
     async def _cleanup_old_conversations(self):
-        """Limpa conversas antigas e finalizadas"""
-        current_time = datetime.now()
-        cutoff_time = current_time.replace(hour=current_time.hour - 1)  # 1 hora atrás
-        
-        # Marcar conversas antigas como resolvidas
-        for conversation in self.conversations.values():
-            if (conversation.status == "active" and 
-                conversation.messages and 
-                conversation.messages[-1].timestamp < cutoff_time):
-                conversation.status = "resolved"
-                conversation.resolved_at = current_time
-                self.logger.info(f"📝 Marked conversation {conversation.conversation_id} as resolved")
+        """Limpa conversas ociosas além do TTL configurado"""
+        self._evict_expired_conversations()
 
 
 # Instância global do sistema de comunicação
@@ -8,13 +8,14 @@ identificando gargalos e propondo otimizações automáticas.
 
 import time
 import logging
-import threading
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict, deque
 import json
 from pathlib import Path
 
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
 class PerformanceMonitor:
     """Monitor de performance em tempo real"""
     
@@ -29,7 +30,7 @@ class PerformanceMonitor:
         }
         self.alerts = []
         self.monitoring_active = False
-        self.monitor_thread = None
+        self.monitor_job = None
         
     def start_monitoring(self):
         """Inicia o monitoramento em background"""
@@ -37,15 +38,18 @@ class PerformanceMonitor:
             return
             
         self.monitoring_active = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.monitor_job = get_background_scheduler().schedule(
+            "performance_monitor", self._monitor_tick, interval=60, jitter=5.0,
+            priority=JobPriority.NORMAL, max_runtime=10, initial_delay=0
+        )
         self.logger.info("🚀 Monitoramento de performance iniciado")
         
     def stop_monitoring(self):
         """Para o monitoramento"""
         self.monitoring_active = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.monitor_job:
+            self.monitor_job.cancel()
+            self.monitor_job = None
         self.logger.info("🛑 Monitoramento de performance parado")
         
     def record_metric(self, metric_name: str, value: float, context: Optional[Dict[str, Any]] = None):
@@ -170,22 +174,13 @@ class PerformanceMonitor:
                 
         return recommendations
         
-    def _monitor_loop(self):
-        """Loop principal de monitoramento"""
-        while self.monitoring_active:
-            try:
-                # Verificar métricas agregadas
-                self._check_aggregate_metrics()
-                
-                # Salvar métricas em arquivo periodicamente
-                self._save_metrics()
-                
-                # Aguardar próximo ciclo
-                time.sleep(60)  # Verificar a cada minuto
-                
-            except Exception as e:
-                self.logger.error(f"Erro no loop de monitoramento: {e}")
-                time.sleep(30)  # Aguardar menos tempo em caso de erro
+    def _monitor_tick(self):
+        """Verificação periódica (a cada minuto, via escalonador de background)"""
+        # Verificar métricas agregadas
+        self._check_aggregate_metrics()
+        
+        # Salvar métricas em arquivo periodicamente
+        self._save_metrics()
                 
     def _check_aggregate_metrics(self):
         """Verifica métricas agregadas"""
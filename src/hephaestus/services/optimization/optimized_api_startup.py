@@ -7,7 +7,6 @@ Substitui a inicialização sequencial por uma versão paralela e mais eficiente
 """
 
 import asyncio
-import threading
 import logging
 from contextlib import asynccontextmanager
 from typing import Dict, Any, Optional
@@ -20,8 +19,8 @@ error_detector_agent = None
 dependency_fixer_agent = None
 cycle_monitor_agent = None
 agent_expansion_coordinator = None
-hephaestus_worker_thread = None
-log_analyzer_thread = None
+agent_runtime = None
+log_analyzer_job = None
 queue_manager = None
 
 class OptimizedAgentInitializer:
@@ -172,7 +171,7 @@ async def optimized_lifespan(app: FastAPI):
     """
     global hephaestus_agent_instance, interface_generator, error_detector_agent
     global dependency_fixer_agent, cycle_monitor_agent, agent_expansion_coordinator
-    global hephaestus_worker_thread, log_analyzer_thread, queue_manager
+    global agent_runtime, log_analyzer_job, queue_manager
     
     # Startup
     logger = logging.getLogger(__name__)
@@ -215,6 +214,9 @@ async def optimized_lifespan(app: FastAPI):
     logger.info("🔄 Shutting down Hephaestus Meta-Intelligence API Server...")
     
     try:
+        if agent_runtime:
+            await agent_runtime.stop()
+        
         if hephaestus_agent_instance:
             hephaestus_agent_instance.stop_meta_intelligence()
         
@@ -232,37 +234,20 @@ async def optimized_lifespan(app: FastAPI):
 
 
 async def start_background_threads(logger: logging.Logger) -> None:
-    """Inicia threads de background de forma otimizada."""
-    global hephaestus_worker_thread, log_analyzer_thread
-    
-    # Criar threads em paralelo
-    def create_worker_thread():
-        # Importar apenas quando necessário
-        from hephaestus.api.rest.main import worker_thread
-        return threading.Thread(target=worker_thread, daemon=True)
+    """Inicia o ciclo do agente como tarefa supervisionada no loop do servidor."""
+    global agent_runtime, log_analyzer_job
     
-    def create_log_analyzer_thread():
-        # Importar apenas quando necessário
-        from hephaestus.api.rest.main import periodic_log_analysis_task
-        return threading.Thread(target=periodic_log_analysis_task, daemon=True)
+    # Importar apenas quando necessário
+    from hephaestus.api.agent_runtime import AgentRuntime
+    from hephaestus.api.rest.main import schedule_periodic_log_analysis
     
-    # Executar criação de threads em executor separado para não bloquear
-    import concurrent.futures
+    agent_runtime = AgentRuntime(hephaestus_agent_instance, queue_manager, logger)
+    await agent_runtime.start()
     
-    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-        # Criar threads em paralelo
-        worker_future = executor.submit(create_worker_thread)
-        log_future = executor.submit(create_log_analyzer_thread)
-        
-        # Aguardar criação
-        hephaestus_worker_thread = worker_future.result()
-        log_analyzer_thread = log_future.result()
-        
-        # Iniciar threads
-        hephaestus_worker_thread.start()
-        log_analyzer_thread.start()
+    # Tarefas periódicas rodam no escalonador compartilhado, sem thread própria
+    log_analyzer_job = schedule_periodic_log_analysis()
     
-    logger.info("🧵 Background threads started")
+    logger.info("🔄 Agent runtime started")
 
 
 # Função para aplicar a otimização
@@ -284,7 +284,7 @@ class AsyncAgentOrchestrator:
             return await loop.run_in_executor(
                 self.executor,
                 agent.analyze_logs,
-                task.context.get('log_file_path', 'logs/app.log'),
+                task.context.get('log_file_path', 'data/logs/hephaestus_main.log'),
                 task.context.get('lines_to_analyze', 200)
             )
 
@@ -2,7 +2,7 @@
 import logging
 from typing import Tuple, List, Dict, Any
 
-from hephaestus.core.patch_applicator import apply_patches
+from hephaestus.core.patch_applicator import apply_patches, PatchValidationError
 from .base import ValidationStep
 
 class PatchApplicatorStep(ValidationStep):
@@ -21,6 +21,11 @@ class PatchApplicatorStep(ValidationStep):
             apply_patches(instructions=self.patches_to_apply, logger=self.logger, base_path=self.base_path)
             self.logger.info(f"Patches applied successfully in '{self.base_path}'.")
             return True, "PATCH_APPLICATION_SUCCESS", "Patches applied successfully."
+        except PatchValidationError as e:
+            # Fails before the sandbox/pytest steps spend time on code that does not even parse
+            self.logger.error(f"Patches rejected before writing to '{self.base_path}': {e}")
+            reason_code = "PATCH_SYNTAX_ERROR_IN_SANDBOX" if self.use_sandbox else "PATCH_SYNTAX_ERROR"
+            return False, reason_code, str(e)
         except Exception as e:
             self.logger.error(f"CRITICAL ERROR applying patches in '{self.base_path}': {e}", exc_info=True)
             reason_code = "PATCH_APPLICATION_FAILED_IN_SANDBOX" if self.use_sandbox else "PATCH_APPLICATION_FAILED"
@@ -1,8 +1,14 @@
 """Utility functions and helpers."""
 
-from .llm_client import call_llm_with_fallback, call_llm_with_fallback_async
-from .error_handling import safe_execute, retry_with_backoff
-from .infrastructure_manager import get_infrastructure_manager
+from .lazy_import import lazy_module_getattr
+
+__getattr__ = lazy_module_getattr(__name__, {
+    "call_llm_with_fallback": ".llm_client",
+    "call_llm_with_fallback_async": ".llm_client",
+    "safe_execute": ".error_handling",
+    "retry_with_backoff": ".error_handling",
+    "get_infrastructure_manager": ".infrastructure_manager",
+})
 
 __all__ = [
     "call_llm_with_fallback",
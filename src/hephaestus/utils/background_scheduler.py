@@ -0,0 +1,408 @@
+"""
+Background Scheduler - Escalonador único para tarefas periódicas
+
+Substitui as threads dedicadas com ``time.sleep``/``Event.wait`` de cada
+subsistema (monitores, inteligência temporal, meta-aprendizado, DNA, rede
+coletiva, evolução em tempo real, limpeza de logs...) por uma única thread de
+despacho com um heap de próximos vencimentos e um pool limitado de workers.
+
+Cada job declara intervalo, jitter, prioridade e tempo máximo esperado. Uma
+execução que vence enquanto a anterior ainda roda é pulada, jobs pausáveis
+ficam retidos enquanto o ciclo está na fase sensível à latência
+(``latency_critical``) e cada job acumula estatísticas de execução.
+"""
+
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Any, Callable, Dict, List, Optional
+
+from hephaestus.utils.rate_limiter import LLMPriority, llm_priority
+
+
+class JobPriority(IntEnum):
+    """Ordem de despacho entre jobs vencidos ao mesmo tempo (menor primeiro)"""
+    HIGH = 0
+    NORMAL = 1
+    LOW = 2
+
+
+@dataclass
+class JobStats:
+    """Estatísticas acumuladas de um job"""
+    runs: int = 0
+    failures: int = 0
+    skipped_overlaps: int = 0
+    deferred_by_pause: int = 0
+    overruns: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    last_seconds: float = 0.0
+    last_started: Optional[float] = None
+    last_error: Optional[str] = None
+
+    @property
+    def average_seconds(self) -> float:
+        return self.total_seconds / self.runs if self.runs else 0.0
+
+
+@dataclass(eq=False)
+class BackgroundJob:
+    """Tarefa periódica registrada no escalonador"""
+    name: str
+    func: Callable[[], Any]
+    interval: float
+    jitter: float = 0.0
+    priority: JobPriority = JobPriority.NORMAL
+    max_runtime: Optional[float] = None
+    pausable: bool = True
+    next_run: float = 0.0
+    running: bool = False
+    cancelled: bool = False
+    held_by_pause: bool = False
+    stats: JobStats = field(default_factory=JobStats)
+    scheduler: Optional["BackgroundScheduler"] = field(default=None, repr=False)
+
+    def cancel(self):
+        """Remove o job do escalonador (uma execução em andamento termina normalmente)"""
+        if self.scheduler is not None:
+            self.scheduler.cancel(self.name)
+        else:
+            self.cancelled = True
+
+    @property
+    def active(self) -> bool:
+        return not self.cancelled
+
+
+class BackgroundScheduler:
+    """Heap de vencimentos + pool limitado de workers para jobs periódicos"""
+
+    def __init__(self, logger: logging.Logger, max_workers: int = 4, max_pause_seconds: float = 600.0):
+        self.logger = logger.getChild("BackgroundScheduler")
+        self.max_workers = max(1, max_workers)
+        self.max_pause_seconds = max_pause_seconds
+
+        self._jobs: Dict[str, BackgroundJob] = {}
+        self._heap: List[tuple] = []
+        self._ready: List[BackgroundJob] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._running = False
+
+        self._pause_depth = 0
+        self._pause_started: Optional[float] = None
+        self._pause_reasons: Counter = Counter()
+        self._pause_seconds_total = 0.0
+        self._pause_overrides = 0
+        self._overridden_pause: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Registro de jobs
+    # ------------------------------------------------------------------
+    def schedule(self, name: str, func: Callable[[], Any], interval: float, jitter: float = 0.0,
+                 priority: JobPriority = JobPriority.NORMAL, max_runtime: Optional[float] = None,
+                 initial_delay: Optional[float] = None, pausable: bool = True) -> BackgroundJob:
+        """
+        Registra ``func`` para rodar a cada ``interval`` segundos.
+
+        A primeira execução ocorre após ``initial_delay`` (padrão: um intervalo).
+        Nomes repetidos recebem um sufixo (``nome#2``), de modo que várias
+        instâncias do mesmo subsistema podem coexistir.
+        """
+        if interval <= 0:
+            raise ValueError(f"Job '{name}' needs a positive interval, got {interval}")
+
+        with self._cond:
+            unique_name = name
+            suffix = 2
+            while unique_name in self._jobs:
+                unique_name = f"{name}#{suffix}"
+                suffix += 1
+
+            job = BackgroundJob(
+                name=unique_name,
+                func=func,
+                interval=float(interval),
+                jitter=max(0.0, float(jitter)),
+                priority=JobPriority(priority),
+                max_runtime=max_runtime,
+                pausable=pausable,
+                scheduler=self
+            )
+            delay = interval if initial_delay is None else max(0.0, initial_delay)
+            job.next_run = time.monotonic() + delay
+            self._jobs[unique_name] = job
+            self._push(job)
+            self._ensure_started()
+            self._cond.notify_all()
+
+        self.logger.debug(f"Job '{unique_name}' scheduled every {interval}s (priority {job.priority.name})")
+        return job
+
+    def cancel(self, name: str) -> bool:
+        """Cancela um job pelo nome; retorna False se não existir"""
+        with self._cond:
+            job = self._jobs.pop(name, None)
+            if job is None:
+                return False
+            job.cancelled = True
+            self._cond.notify_all()
+        self.logger.debug(f"Job '{name}' cancelled")
+        return True
+
+    def run_now(self, name: str) -> bool:
+        """Antecipa a próxima execução de um job para agora"""
+        with self._cond:
+            job = self._jobs.get(name)
+            if job is None:
+                return False
+            job.next_run = time.monotonic()
+            self._push(job, jitter=False)
+            self._cond.notify_all()
+        return True
+
+    def is_scheduled(self, name: str) -> bool:
+        with self._cond:
+            return name in self._jobs
+
+    # ------------------------------------------------------------------
+    # Pausa durante a fase sensível à latência do ciclo
+    # ------------------------------------------------------------------
+    def pause_background(self, reason: str = "cycle"):
+        """Retém jobs pausáveis até ``resume_background`` (chamadas aninham)"""
+        with self._cond:
+            if self._pause_depth == 0:
+                self._pause_started = time.monotonic()
+            self._pause_depth += 1
+            self._pause_reasons[reason] += 1
+
+    def resume_background(self, reason: str = "cycle"):
+        with self._cond:
+            if self._pause_depth == 0:
+                return
+            self._pause_depth -= 1
+            self._pause_reasons[reason] -= 1
+            if self._pause_reasons[reason] <= 0:
+                del self._pause_reasons[reason]
+            if self._pause_depth == 0:
+                self._pause_seconds_total += time.monotonic() - (self._pause_started or time.monotonic())
+                self._pause_started = None
+                self._cond.notify_all()
+
+    @contextmanager
+    def latency_critical(self, reason: str = "cycle"):
+        """Bloco durante o qual jobs pausáveis não são despachados"""
+        self.pause_background(reason)
+        try:
+            yield
+        finally:
+            self.resume_background(reason)
+
+    @property
+    def paused(self) -> bool:
+        return self._pause_depth > 0
+
+    def _pause_deadline(self) -> Optional[float]:
+        if self._pause_depth == 0 or self._pause_started is None:
+            return None
+        return self._pause_started + self.max_pause_seconds
+
+    # ------------------------------------------------------------------
+    # Despacho
+    # ------------------------------------------------------------------
+    def _push(self, job: BackgroundJob, jitter: bool = True):
+        due = job.next_run + (random.uniform(0, job.jitter) if jitter and job.jitter else 0.0)
+        heapq.heappush(self._heap, (due, int(job.priority), next(self._seq), job, job.next_run))
+
+    def _ensure_started(self):
+        if self._running:
+            return
+        self._running = True
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="hephaestus-job")
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="hephaestus-scheduler", daemon=True)
+        self._dispatcher.start()
+
+    def _reschedule(self, job: BackgroundJob, now: float):
+        """Agenda a próxima execução em taxa fixa; execuções perdidas não se acumulam"""
+        job.next_run += job.interval
+        if job.next_run <= now:
+            job.next_run = now + job.interval
+        self._push(job)
+
+    def _dispatch_loop(self):
+        with self._cond:
+            while self._running:
+                now = time.monotonic()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, _, job, scheduled_for = heapq.heappop(self._heap)
+                    # Entradas de um agendamento anterior (run_now, reagendamento) são obsoletas
+                    if job.cancelled or scheduled_for != job.next_run:
+                        continue
+                    if all(ready is not job for ready in self._ready):
+                        self._ready.append(job)
+
+                pause_deadline = self._pause_deadline()
+                paused = pause_deadline is not None and now < pause_deadline
+                if pause_deadline is not None and not paused and self._overridden_pause != self._pause_started:
+                    # Pausa longa demais (ciclo travado?): não deixar os jobs morrerem de fome
+                    self._overridden_pause = self._pause_started
+                    self._pause_overrides += 1
+                    self.logger.warning(f"Background jobs paused for over {self.max_pause_seconds}s - resuming them anyway")
+
+                self._ready.sort(key=lambda j: (j.priority, j.next_run))
+                still_ready = []
+                for job in self._ready:
+                    if job.cancelled:
+                        continue
+                    if job.running:
+                        job.stats.skipped_overlaps += 1
+                        self._reschedule(job, now)
+                        continue
+                    if paused and job.pausable:
+                        if not job.held_by_pause:
+                            job.held_by_pause = True
+                            job.stats.deferred_by_pause += 1
+                        still_ready.append(job)
+                        continue
+                    if self._in_flight >= self.max_workers:
+                        still_ready.append(job)
+                        continue
+                    job.held_by_pause = False
+                    self._start(job, now)
+                self._ready = still_ready
+
+                timeout = None
+                if self._heap:
+                    timeout = max(0.0, self._heap[0][0] - now)
+                if paused and self._ready:
+                    until_override = max(0.0, pause_deadline - now)
+                    timeout = until_override if timeout is None else min(timeout, until_override)
+                self._cond.wait(timeout)
+
+    def _start(self, job: BackgroundJob, now: float):
+        job.running = True
+        job.stats.last_started = time.time()
+        self._in_flight += 1
+        self._reschedule(job, now)
+        self._executor.submit(self._run_job, job)
+
+    def _run_job(self, job: BackgroundJob):
+        start = time.perf_counter()
+        error = None
+        try:
+            # Jobs periódicos nunca competem com o ciclo por orçamento de LLM
+            with llm_priority(LLMPriority.BACKGROUND):
+                job.func()
+        except Exception as e:
+            error = e
+            self.logger.error(f"Background job '{job.name}' failed: {e}", exc_info=True)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._cond:
+                job.running = False
+                self._in_flight -= 1
+                stats = job.stats
+                stats.runs += 1
+                stats.total_seconds += elapsed
+                stats.last_seconds = elapsed
+                stats.max_seconds = max(stats.max_seconds, elapsed)
+                if error is not None:
+                    stats.failures += 1
+                    stats.last_error = str(error)
+                if job.max_runtime is not None and elapsed > job.max_runtime:
+                    stats.overruns += 1
+                self._cond.notify_all()
+            if job.max_runtime is not None and elapsed > job.max_runtime:
+                self.logger.warning(f"Background job '{job.name}' took {elapsed:.1f}s (max {job.max_runtime}s)")
+
+    # ------------------------------------------------------------------
+    # Estado
+    # ------------------------------------------------------------------
+    def get_stats(self) -> Dict[str, Any]:
+        """Estatísticas por job e do escalonador"""
+        with self._cond:
+            now = time.monotonic()
+            jobs = {}
+            for name, job in self._jobs.items():
+                stats = job.stats
+                jobs[name] = {
+                    "interval": job.interval,
+                    "priority": job.priority.name,
+                    "pausable": job.pausable,
+                    "running": job.running,
+                    "next_run_in": round(max(0.0, job.next_run - now), 2),
+                    "runs": stats.runs,
+                    "failures": stats.failures,
+                    "skipped_overlaps": stats.skipped_overlaps,
+                    "deferred_by_pause": stats.deferred_by_pause,
+                    "overruns": stats.overruns,
+                    "average_seconds": round(stats.average_seconds, 4),
+                    "max_seconds": round(stats.max_seconds, 4),
+                    "last_seconds": round(stats.last_seconds, 4),
+                    "last_error": stats.last_error
+                }
+            return {
+                "jobs": jobs,
+                "max_workers": self.max_workers,
+                "in_flight": self._in_flight,
+                "ready": len(self._ready),
+                "paused": self.paused,
+                "pause_reasons": dict(self._pause_reasons),
+                "pause_seconds_total": round(self._pause_seconds_total, 2),
+                "pause_overrides": self._pause_overrides
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Para o despacho; jobs em execução terminam se ``wait``"""
+        with self._cond:
+            if not self._running:
+                return
+            self._running = False
+            for job in self._jobs.values():
+                job.cancelled = True
+            self._jobs.clear()
+            self._heap.clear()
+            self._ready.clear()
+            self._cond.notify_all()
+        if self._dispatcher is not None and self._dispatcher is not threading.current_thread():
+            self._dispatcher.join(timeout=5)
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+        self.logger.info("🛑 Background scheduler stopped")
+
+
+_background_scheduler: Optional[BackgroundScheduler] = None
+_background_scheduler_lock = threading.Lock()
+
+
+def get_background_scheduler(config: Optional[Dict[str, Any]] = None,
+                             logger: Optional[logging.Logger] = None) -> BackgroundScheduler:
+    """Obtém o escalonador global; a primeira chamada com ``config`` define o pool"""
+    global _background_scheduler
+    with _background_scheduler_lock:
+        if _background_scheduler is None or (config is not None and not getattr(_background_scheduler, "_configured", False)):
+            scheduler_config = (config or {}).get("background_scheduler", {})
+            if _background_scheduler is None:
+                _background_scheduler = BackgroundScheduler(
+                    logger or logging.getLogger("hephaestus"),
+                    max_workers=scheduler_config.get("max_workers", 4),
+                    max_pause_seconds=scheduler_config.get("max_pause_seconds", 600.0)
+                )
+            elif not _background_scheduler._running:
+                # Jobs já registrados são mantidos; só os limites mudam
+                _background_scheduler.max_workers = max(1, scheduler_config.get("max_workers", _background_scheduler.max_workers))
+                _background_scheduler.max_pause_seconds = scheduler_config.get("max_pause_seconds", _background_scheduler.max_pause_seconds)
+            _background_scheduler._configured = config is not None
+        return _background_scheduler
@@ -0,0 +1,172 @@
+"""
+Backup Store - Backups endereçados por conteúdo (deduplicados por hash)
+
+Cada arquivo salvo vira um objeto ``objects/<aa>/<sha256>``, gravado só se
+aquele conteúdo ainda não existe no store; um snapshot é apenas um manifesto
+JSON pequeno ``{caminho: hash}``. Salvar de novo um arquivo que não mudou não
+grava nada (nem relê o arquivo, se mtime e tamanho são os mesmos da última vez).
+
+A restauração lê o manifesto e regrava só os arquivos cujo conteúdo atual é
+diferente do salvo; caminhos que não existiam no snapshot são removidos.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+PathLike = Union[str, Path]
+
+
+def _atomic_write_bytes(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp, "wb") as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ContentAddressedBackupStore:
+    """Objetos deduplicados por SHA-256 e manifestos de snapshot."""
+
+    def __init__(self, root: PathLike = "data/backups/store", base_path: Optional[PathLike] = None):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.base_path = Path(base_path) if base_path is not None else None
+        self._lock = threading.RLock()
+        # caminho absoluto -> (mtime_ns, tamanho, hash): evita reler arquivos que não mudaram
+        self._stat_cache: Dict[str, Tuple[int, int, str]] = {}
+        self.stats = {
+            "objects_written": 0,
+            "bytes_written": 0,
+            "dedup_hits": 0,
+            "bytes_deduplicated": 0,
+            "manifests_written": 0,
+            "files_restored": 0,
+        }
+
+    # --- objetos --- #
+
+    def _object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest[2:]
+
+    def put_bytes(self, data: bytes) -> str:
+        """Guarda o conteúdo (se ainda não existe) e devolve seu hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if path.exists():
+                self.stats["dedup_hits"] += 1
+                self.stats["bytes_deduplicated"] += len(data)
+            else:
+                _atomic_write_bytes(path, data)
+                self.stats["objects_written"] += 1
+                self.stats["bytes_written"] += len(data)
+        return digest
+
+    def put_text(self, text: str) -> str:
+        return self.put_bytes(text.encode("utf-8"))
+
+    def read_bytes(self, digest: str) -> bytes:
+        return self._object_path(digest).read_bytes()
+
+    def read_text(self, digest: str) -> str:
+        return self.read_bytes(digest).decode("utf-8")
+
+    # --- snapshots --- #
+
+    def _resolve(self, path: PathLike) -> Path:
+        path = Path(path)
+        if not path.is_absolute():
+            path = (self.base_path or Path.cwd()) / path
+        return path
+
+    def _file_digest(self, path: Path, store: bool) -> Optional[str]:
+        """Hash do arquivo atual (None se não existe); guarda o objeto se ``store``."""
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        key = str(path)
+        cached = self._stat_cache.get(key)
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            digest = cached[2]
+            if not store or self._object_path(digest).exists():
+                if store:
+                    self.stats["dedup_hits"] += 1
+                    self.stats["bytes_deduplicated"] += stat.st_size
+                return digest
+        data = path.read_bytes()
+        digest = self.put_bytes(data) if store else hashlib.sha256(data).hexdigest()
+        self._stat_cache[key] = (stat.st_mtime_ns, stat.st_size, digest)
+        return digest
+
+    def snapshot(self, paths: Iterable[PathLike], label: str = "snapshot",
+                 metadata: Optional[Dict[str, Any]] = None) -> str:
+        """Salva os arquivos (ausentes são registrados como tal) e devolve o id do manifesto."""
+        with self._lock:
+            files = {}
+            for path in paths:
+                files[str(path)] = self._file_digest(self._resolve(path), store=True)
+            body = json.dumps({"label": label, "files": files}, sort_keys=True)
+            manifest_id = hashlib.sha256(body.encode("utf-8")).hexdigest()[:20]
+            manifest_path = self.manifests_dir / f"{manifest_id}.json"
+            if not manifest_path.exists():
+                manifest = {"id": manifest_id, "label": label, "created_at": time.time(),
+                            "files": files, "metadata": metadata or {}}
+                data = json.dumps(manifest, indent=2, sort_keys=True).encode("utf-8")
+                _atomic_write_bytes(manifest_path, data)
+                self.stats["manifests_written"] += 1
+                self.stats["bytes_written"] += len(data)
+            return manifest_id
+
+    def load_manifest(self, manifest_id: str) -> Dict[str, Any]:
+        with open(self.manifests_dir / f"{manifest_id}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def restore(self, manifest_id: str, paths: Optional[Iterable[PathLike]] = None) -> List[str]:
+        """Volta os arquivos do manifesto (ou só ``paths``) ao conteúdo salvo; devolve os alterados."""
+        manifest = self.load_manifest(manifest_id)
+        wanted = {str(p) for p in paths} if paths is not None else None
+        restored = []
+        with self._lock:
+            for name, digest in manifest["files"].items():
+                if wanted is not None and name not in wanted:
+                    continue
+                target = self._resolve(name)
+                if self._file_digest(target, store=False) == digest:
+                    continue
+                if digest is None:
+                    target.unlink()
+                    self._stat_cache.pop(str(target), None)
+                else:
+                    _atomic_write_bytes(target, self.read_bytes(digest))
+                    stat = target.stat()
+                    self._stat_cache[str(target)] = (stat.st_mtime_ns, stat.st_size, digest)
+                restored.append(name)
+            self.stats["files_restored"] += len(restored)
+        return restored
+
+    def list_manifests(self) -> List[str]:
+        return sorted(p.stem for p in self.manifests_dir.glob("*.json"))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(self.stats)
+
+
+_backup_stores: Dict[str, ContentAddressedBackupStore] = {}
+_backup_stores_lock = threading.Lock()
+
+
+def get_backup_store(root: PathLike = "data/backups/store") -> ContentAddressedBackupStore:
+    """Store compartilhado do processo para um diretório de backups."""
+    key = os.path.abspath(root)
+    with _backup_stores_lock:
+        if key not in _backup_stores:
+            _backup_stores[key] = ContentAddressedBackupStore(root)
+        return _backup_stores[key]
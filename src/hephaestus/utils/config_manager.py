@@ -1,233 +1,377 @@
 """
 Config Manager - Centralized configuration access with caching
+
+Lookups are served from an immutable ConfigSnapshot: the composed configuration
+is frozen, flattened into a dotted-key index and the per-agent/model/service
+views are merged once per snapshot. Rebuilds (reload_config, update_config or a
+change under the config directory) build a new snapshot, swap it in with a
+single reference assignment and notify subscribers.
 """
 
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Callable, List, Tuple
+from pathlib import Path
+import logging
 import os
+import threading
+import time
+import yaml
+from watchdog.observers import Observer
+from watchdog.events import FileSystemEventHandler
 from hephaestus.utils.config_loader import load_config
 
+logger = logging.getLogger(__name__)
+
+DEFAULT_AGENT_CONFIG = {
+    'model_type': 'architect_default',
+    'temperature': 0.4,
+    'max_retries': 3,
+    'timeout': 60,
+    'cache_enabled': True,
+    'metrics_enabled': True,
+}
+
+DEFAULT_MODEL_CONFIG = {
+    'temperature': 0.4,
+    'max_tokens': 4096,
+    'timeout': 60,
+}
+
+DEFAULT_SERVICE_CONFIG = {
+    'enabled': True,
+    'timeout': 30,
+    'retry_count': 3,
+}
+
+CONFIG_FILE_SUFFIXES = ('.yaml', '.yml')
+
+
+class FrozenDict(dict):
+    """Read-only dict: JSON-serializable and isinstance(dict), but mutation raises TypeError."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("configuration snapshots are read-only; use ConfigManager.update_config")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def copy(self) -> Dict[str, Any]:
+        """Mutable deep copy."""
+        return _thaw(self)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return _thaw(self)
+
+    def __reduce__(self):
+        return (FrozenDict, (dict(self),))
+
+
+class FrozenList(tuple):
+    """Read-only list from a snapshot: a tuple that yaml dumps as a plain sequence."""
+
+
+# Snapshots dump like plain dicts and lists with both yaml.safe_dump and yaml.dump
+for _dumper in (yaml.SafeDumper, yaml.Dumper):
+    yaml.add_representer(FrozenDict, yaml.representer.SafeRepresenter.represent_dict, Dumper=_dumper)
+    yaml.add_representer(FrozenList, yaml.representer.SafeRepresenter.represent_list, Dumper=_dumper)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return FrozenList(_freeze(item) for item in value)
+    return value
+
+
+def _thaw(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _thaw(item) for key, item in value.items()}
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    return value
+
+
+def _merge_agent_config(base_config: Dict[str, Any], agent_name: str) -> Dict[str, Any]:
+    """Agent overrides from ``agents.<name>`` on top of the agent defaults."""
+    agents_config = base_config.get('agents', {})
+    agent_config = agents_config.get(agent_name, {}) if isinstance(agents_config, dict) else {}
+    if not isinstance(agent_config, dict):
+        agent_config = {}
+    return {**DEFAULT_AGENT_CONFIG, **agent_config}
+
+
+def _merge_model_config(base_config: Dict[str, Any], model_type: str) -> Dict[str, Any]:
+    """Model settings from ``models.<type>`` with architect_default and hardcoded fallbacks."""
+    models_config = base_config.get('models', {})
+    if not isinstance(models_config, dict):
+        models_config = {}
+
+    # Get specific model config
+    model_config = models_config.get(model_type, {})
+
+    # Fallback to default if not found
+    if not model_config and model_type != 'default':
+        model_config = models_config.get('architect_default', {})
+
+    # Ensure model_config is a dict
+    if not isinstance(model_config, dict):
+        model_config = {}
+
+    merged_config = {**DEFAULT_MODEL_CONFIG, **model_config}
+
+    if 'primary' not in merged_config and model_type in models_config:
+        # Use the model from Hydra config if available
+        hydra_model = models_config.get(model_type)
+        if isinstance(hydra_model, dict):
+            merged_config['primary'] = hydra_model.get('primary', 'deepseek/deepseek-chat-v3-0324:free')
+            merged_config['fallback'] = hydra_model.get('fallback', 'mistralai/mistral-7b-instruct:free')
+        elif isinstance(hydra_model, str):
+            merged_config['primary'] = hydra_model
+
+    # Ensure we have fallback models
+    if 'fallback' not in merged_config:
+        merged_config['fallback'] = 'mistralai/mistral-7b-instruct:free'
+
+    # Ensure we have a primary model
+    if 'primary' not in merged_config:
+        merged_config['primary'] = 'deepseek/deepseek-chat-v3-0324:free'
+
+    return merged_config
+
+
+def _merge_service_config(base_config: Dict[str, Any], service_name: str) -> Dict[str, Any]:
+    """Service overrides from ``services.<name>`` on top of the service defaults."""
+    services_config = base_config.get('services', {})
+    service_config = services_config.get(service_name, {}) if isinstance(services_config, dict) else {}
+    if not isinstance(service_config, dict):
+        service_config = {}
+    return {**DEFAULT_SERVICE_CONFIG, **service_config}
+
+
+def _flatten(config: Dict[str, Any]) -> Dict[str, Any]:
+    """Every dotted path (intermediate sections included) mapped to its frozen value."""
+    flat = {}
+    stack = [("", config)]
+    while stack:
+        prefix, section = stack.pop()
+        for key, value in section.items():
+            path = f"{prefix}{key}"
+            flat.setdefault(path, value)
+            if isinstance(value, dict):
+                stack.append((path + ".", value))
+    return flat
+
+
+class ConfigSnapshot:
+    """Immutable, pre-flattened view of one configuration version."""
+
+    __slots__ = (
+        'version', 'config', 'fingerprint', 'runtime_overrides', 'built_at', 'compose_seconds',
+        '_flat', '_agents', '_models', '_services',
+        '_default_agent', '_fallback_model', '_default_service',
+    )
+
+    def __init__(self, config: Dict[str, Any], version: int, fingerprint: Optional[Tuple] = None,
+                 runtime_overrides: bool = False, compose_seconds: float = 0.0):
+        frozen = _freeze(config or {})
+        base = _thaw(frozen)
+        agents = base.get('agents', {})
+        models = base.get('models', {})
+        services = base.get('services', {})
+        # Any name missing from models resolves to the same fallback view
+        unknown_model = object()
+
+        assign = super().__setattr__
+        assign('version', version)
+        assign('config', frozen)
+        assign('fingerprint', fingerprint)
+        assign('runtime_overrides', runtime_overrides)
+        assign('built_at', time.time())
+        assign('compose_seconds', compose_seconds)
+        assign('_flat', _flatten(frozen))
+        assign('_agents', {name: _freeze(_merge_agent_config(base, name))
+                           for name in (agents if isinstance(agents, dict) else ())})
+        assign('_models', {name: _freeze(_merge_model_config(base, name))
+                           for name in list(models if isinstance(models, dict) else ()) + ['default']})
+        assign('_services', {name: _freeze(_merge_service_config(base, name))
+                             for name in (services if isinstance(services, dict) else ())})
+        assign('_default_agent', _freeze(_merge_agent_config(base, None)))
+        assign('_fallback_model', _freeze(_merge_model_config(base, unknown_model)))
+        assign('_default_service', _freeze(_merge_service_config(base, None)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("ConfigSnapshot is immutable")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Value at a dotted key (e.g. "monitoring.refresh_interval")."""
+        return self._flat.get(key, default)
+
+    def agent(self, agent_name: str) -> Dict[str, Any]:
+        return self._agents.get(agent_name, self._default_agent)
+
+    def model(self, model_type: str) -> Dict[str, Any]:
+        return self._models.get(model_type, self._fallback_model)
+
+    def service(self, service_name: str) -> Dict[str, Any]:
+        return self._services.get(service_name, self._default_service)
+
+    def __len__(self) -> int:
+        return len(self._flat)
+
+
+class _ConfigFileHandler(FileSystemEventHandler):
+    """Schedules a snapshot rebuild when a YAML file under the config directory changes."""
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = (event.src_path, getattr(event, 'dest_path', '') or '')
+        if any(str(path).endswith(CONFIG_FILE_SUFFIXES) for path in paths):
+            ConfigManager._schedule_rebuild()
+
 
 class ConfigManager:
     """Centralized configuration manager with caching and hot reload support."""
-    
+
     _instance: Optional['ConfigManager'] = None
-    _config_cache: Dict[str, Any] = {}
-    _config_loaded = False
-    
+    _snapshot: Optional[ConfigSnapshot] = None
+    _composed: Optional[Tuple[Tuple, Dict[str, Any], float]] = None  # (fingerprint, config, compose_seconds)
+    _lock = threading.RLock()
+    _subscribers: List[Callable[[Optional[ConfigSnapshot], ConfigSnapshot], None]] = []
+    _config_dir: Optional[Path] = None
+    _observer: Optional[Observer] = None
+    _rebuild_timer: Optional[threading.Timer] = None
+    _debounce_seconds = 0.5
+    _stats = {'hydra_compositions': 0, 'compositions_skipped': 0, 'rebuilds': 0}
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
         return cls._instance
-    
+
     @classmethod
-    def _ensure_config_loaded(cls):
-        """Ensure configuration is loaded."""
-        if not cls._config_loaded:
+    def _ensure_config_loaded(cls) -> ConfigSnapshot:
+        """Ensure configuration is loaded and return the current snapshot."""
+        snapshot = cls._snapshot
+        if snapshot is None:
             cls.reload_config()
-    
+            snapshot = cls._snapshot
+        return snapshot
+
+    @classmethod
+    def get_snapshot(cls) -> ConfigSnapshot:
+        """Current immutable configuration snapshot."""
+        return cls._ensure_config_loaded()
+
     @classmethod
     def get_agent_config(cls, agent_name: str) -> Dict[str, Any]:
         """
         Get agent-specific configuration with fallback to defaults.
-        
+
         Args:
             agent_name: Name of the agent (e.g., "ArchitectAgent")
-            
+
         Returns:
-            Agent configuration dictionary
+            Agent configuration dictionary (read-only)
         """
-        cls._ensure_config_loaded()
-        
-        cache_key = f"agent_{agent_name}"
-        if cache_key in cls._config_cache:
-            return cls._config_cache[cache_key]
-        
-        # Load base config
-        base_config = cls._config_cache.get('base', {})
-        
-        # Get agent-specific overrides
-        agents_config = base_config.get('agents', {})
-        agent_config = agents_config.get(agent_name, {})
-        
-        # Merge with defaults
-        default_agent_config = {
-            'model_type': 'architect_default',
-            'temperature': 0.4,
-            'max_retries': 3,
-            'timeout': 60,
-            'cache_enabled': True,
-            'metrics_enabled': True,
-        }
-        
-        merged_config = {**default_agent_config, **agent_config}
-        
-        # Cache result
-        cls._config_cache[cache_key] = merged_config
-        return merged_config
-    
+        return cls._ensure_config_loaded().agent(agent_name)
+
     @classmethod
     def get_model_config(cls, model_type: str) -> Dict[str, Any]:
         """
         Get model configuration with fallback handling.
-        
+
         Args:
             model_type: Type of model (e.g., "architect_default")
-            
+
         Returns:
-            Model configuration dictionary
+            Model configuration dictionary (read-only)
         """
-        cls._ensure_config_loaded()
-        
-        cache_key = f"model_{model_type}"
-        if cache_key in cls._config_cache:
-            return cls._config_cache[cache_key]
-        
-        base_config = cls._config_cache.get('base', {})
-        models_config = base_config.get('models', {})
-        
-        # Get specific model config
-        model_config = models_config.get(model_type, {})
-        
-        # Fallback to default if not found
-        if not model_config and model_type != 'default':
-            model_config = models_config.get('architect_default', {})
-        
-        # Ensure model_config is a dict
-        if not isinstance(model_config, dict):
-            model_config = {}
-        
-        # Add default model settings
-        default_model_config = {
-            'temperature': 0.4,
-            'max_tokens': 4096,
-            'timeout': 60,
-        }
-        
-        merged_config = {**default_model_config, **model_config}
-        
-        # If model_config is just a string (model name), convert to proper format
-        if isinstance(model_config, str):
-            merged_config['primary'] = model_config
-        elif 'primary' not in merged_config and model_type in models_config:
-            # Use the model from Hydra config if available
-            hydra_model = models_config.get(model_type)
-            if isinstance(hydra_model, dict):
-                merged_config['primary'] = hydra_model.get('primary', 'deepseek/deepseek-chat-v3-0324:free')
-                merged_config['fallback'] = hydra_model.get('fallback', 'mistralai/mistral-7b-instruct:free')
-            elif isinstance(hydra_model, str):
-                merged_config['primary'] = hydra_model
-        
-        # Ensure we have fallback models
-        if 'fallback' not in merged_config:
-            merged_config['fallback'] = 'mistralai/mistral-7b-instruct:free'
-        
-        # Ensure we have a primary model
-        if 'primary' not in merged_config:
-            merged_config['primary'] = 'deepseek/deepseek-chat-v3-0324:free'
-        
-        # Cache result
-        cls._config_cache[cache_key] = merged_config
-        return merged_config
-    
+        return cls._ensure_config_loaded().model(model_type)
+
     @classmethod
     def get_service_config(cls, service_name: str) -> Dict[str, Any]:
         """
         Get service-specific configuration.
-        
+
         Args:
             service_name: Name of the service (e.g., "monitoring", "validation")
-            
+
         Returns:
-            Service configuration dictionary
+            Service configuration dictionary (read-only)
         """
-        cls._ensure_config_loaded()
-        
-        cache_key = f"service_{service_name}"
-        if cache_key in cls._config_cache:
-            return cls._config_cache[cache_key]
-        
-        base_config = cls._config_cache.get('base', {})
-        services_config = base_config.get('services', {})
-        service_config = services_config.get(service_name, {})
-        
-        # Add default service settings
-        default_service_config = {
-            'enabled': True,
-            'timeout': 30,
-            'retry_count': 3,
-        }
-        
-        merged_config = {**default_service_config, **service_config}
-        
-        # Cache result
-        cls._config_cache[cache_key] = merged_config
-        return merged_config
-    
+        return cls._ensure_config_loaded().service(service_name)
+
     @classmethod
     def get_config_value(cls, key: str, default: Any = None) -> Any:
         """
         Get a specific configuration value using dot notation.
-        
+
         Args:
             key: Configuration key in dot notation (e.g., "monitoring.refresh_interval")
             default: Default value if key is not found
-            
+
         Returns:
-            Configuration value or default
+            Configuration value or default. Mappings are read-only FrozenDicts and
+            lists come back as tuples (FrozenList); use copy.deepcopy (or .copy()) for a mutable copy.
         """
-        cls._ensure_config_loaded()
-        
-        # Split key by dots
-        keys = key.split('.')
-        
-        # Start with base config
-        value = cls._config_cache.get('base', {})
-        
-        # Navigate through the key path
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
-    
+        return cls._ensure_config_loaded().get(key, default)
+
     @classmethod
     def get_full_config(cls) -> Dict[str, Any]:
-        """Get the full configuration."""
-        cls._ensure_config_loaded()
-        return cls._config_cache.get('base', {})
-    
+        """
+        Get the full configuration.
+
+        Returns:
+            Read-only FrozenDict (lists as FrozenList tuples). It serializes with json and yaml
+            like a plain dict; use copy.deepcopy (or .copy()) for a mutable copy.
+        """
+        return cls._ensure_config_loaded().config
+
     @classmethod
     def reload_config(cls):
-        """Reload configuration from files."""
-        try:
-            # Load fresh config
-            config = load_config()
-            
-            # Clear cache and reload
-            cls._config_cache.clear()
-            cls._config_cache['base'] = config
-            cls._config_loaded = True
-            
-        except Exception as e:
-            # If reload fails, keep existing config
-            if not cls._config_loaded:
-                # First load failed, set empty config
-                cls._config_cache['base'] = {}
-                cls._config_loaded = True
-            
-            # You might want to log this error
-            print(f"Warning: Failed to reload config: {e}")
-    
+        """Reload configuration from files.
+
+        Hydra composition only runs when a file under the config directory changed
+        since the last composition; otherwise the cached composition is reused.
+        Runtime overrides from update_config are discarded either way.
+        """
+        with cls._lock:
+            try:
+                fingerprint = cls._config_fingerprint()
+                if cls._composed is not None and cls._composed[0] == fingerprint:
+                    cls._stats['compositions_skipped'] += 1
+                    current = cls._snapshot
+                    if current is not None and current.fingerprint == fingerprint and not current.runtime_overrides:
+                        return
+                else:
+                    started = time.perf_counter()
+                    config = load_config()
+                    cls._composed = (fingerprint, config, time.perf_counter() - started)
+                    cls._stats['hydra_compositions'] += 1
+
+                _, config, compose_seconds = cls._composed
+                cls._install(config, fingerprint=fingerprint, compose_seconds=compose_seconds)
+
+            except Exception as e:
+                # If reload fails, keep existing config
+                if cls._snapshot is None:
+                    # First load failed, set empty config
+                    cls._install({})
+                logger.warning(f"Failed to reload config: {e}")
+
     @classmethod
     def get_env_config(cls, key: str, default: Any = None) -> Any:
         """
         Get configuration value from environment or config file.
-        
+
         Args:
             key: Environment variable name
             default: Default value if not found
-            
+
         Returns:
             Configuration value
         """
@@ -235,48 +379,174 @@ class ConfigManager:
         env_value = os.getenv(key)
         if env_value is not None:
             return env_value
-        
-        # Check config file
-        cls._ensure_config_loaded()
-        base_config = cls._config_cache.get('base', {})
-        
-        # Support dot notation (e.g., "api.port")
-        keys = key.lower().split('.')
-        value = base_config
-        
-        try:
-            for k in keys:
-                value = value[k]
-            return value
-        except (KeyError, TypeError):
-            return default
-    
+
+        # Check config file (dot notation, e.g. "API.PORT" -> "api.port")
+        return cls._ensure_config_loaded().get(key.lower(), default)
+
     @classmethod
     def update_config(cls, key: str, value: Any) -> None:
         """
         Update a configuration value at runtime.
-        
+
         Args:
             key: Configuration key (supports dot notation)
             value: New value
         """
-        cls._ensure_config_loaded()
-        
-        # Support dot notation
-        keys = key.split('.')
-        config = cls._config_cache['base']
-        
-        # Navigate to parent
-        for k in keys[:-1]:
-            if k not in config:
-                config[k] = {}
-            config = config[k]
-        
-        # Set value
-        config[keys[-1]] = value
-        
-        # Clear related cache entries
-        cache_keys_to_clear = [k for k in cls._config_cache.keys() if k.startswith(keys[0])]
-        for k in cache_keys_to_clear:
-            if k != 'base':
-                cls._config_cache.pop(k, None)
\ No newline at end of file
+        with cls._lock:
+            snapshot = cls._ensure_config_loaded()
+
+            # Copy-on-write: the current snapshot stays valid for readers holding it
+            config = _thaw(snapshot.config)
+            keys = key.split('.')
+            section = config
+            for k in keys[:-1]:
+                if k not in section:
+                    section[k] = {}
+                section = section[k]
+            section[keys[-1]] = value
+
+            cls._install(config, fingerprint=snapshot.fingerprint, runtime_overrides=True,
+                         compose_seconds=snapshot.compose_seconds)
+
+    @classmethod
+    def subscribe(cls, callback: Callable[[Optional[ConfigSnapshot], ConfigSnapshot], None]) -> Callable[[], None]:
+        """
+        Register a callback run after each snapshot swap.
+
+        Args:
+            callback: Called as callback(old_snapshot, new_snapshot)
+
+        Returns:
+            Function that removes the subscription
+        """
+        with cls._lock:
+            cls._subscribers.append(callback)
+
+        def unsubscribe():
+            with cls._lock:
+                if callback in cls._subscribers:
+                    cls._subscribers.remove(callback)
+        return unsubscribe
+
+    @classmethod
+    def start_watching_from_config(cls, config: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Start the watcher if ``config_manager.watch_files`` is set. Called once at agent startup.
+
+        Args:
+            config: Loaded configuration (default: the current snapshot)
+
+        Returns:
+            True if the watcher is running
+        """
+        source = config if config is not None else cls.get_full_config()
+        settings = source.get('config_manager') or {}
+        if not settings.get('watch_files', False):
+            return False
+        return cls.start_watching(debounce_seconds=settings.get('debounce_seconds', 0.5))
+
+    @classmethod
+    def start_watching(cls, config_dir: Optional[str] = None, debounce_seconds: float = 0.5) -> bool:
+        """
+        Rebuild the snapshot when YAML files under the config directory change.
+
+        Args:
+            config_dir: Directory to watch (default: ./config, where load_config reads from)
+            debounce_seconds: Quiet period before a burst of changes triggers one rebuild
+
+        Returns:
+            True if the watcher is running
+        """
+        with cls._lock:
+            if cls._observer is not None:
+                return True
+            if config_dir is not None:
+                cls._config_dir = Path(config_dir).resolve()
+            directory = cls._resolve_config_dir()
+            if not directory.is_dir():
+                logger.warning(f"Config directory not found, not watching: {directory}")
+                return False
+            try:
+                observer = Observer()
+                observer.schedule(_ConfigFileHandler(), str(directory), recursive=True)
+                observer.daemon = True
+                observer.start()
+            except Exception as e:
+                logger.warning(f"Could not watch config directory {directory}: {e}")
+                return False
+            cls._observer = observer
+            cls._debounce_seconds = float(debounce_seconds)
+            logger.info(f"Watching config directory for changes: {directory}")
+            return True
+
+    @classmethod
+    def stop_watching(cls) -> None:
+        """Stop the config file watcher."""
+        with cls._lock:
+            observer, cls._observer = cls._observer, None
+            if cls._rebuild_timer is not None:
+                cls._rebuild_timer.cancel()
+                cls._rebuild_timer = None
+        if observer is not None:
+            observer.stop()
+            observer.join(timeout=5)
+
+    @classmethod
+    def get_snapshot_stats(cls) -> Dict[str, Any]:
+        """Snapshot version, Hydra composition time and rebuild counters."""
+        snapshot = cls._snapshot
+        return {
+            'loaded': snapshot is not None,
+            'version': snapshot.version if snapshot else 0,
+            'keys': len(snapshot) if snapshot else 0,
+            'built_at': snapshot.built_at if snapshot else None,
+            'runtime_overrides': snapshot.runtime_overrides if snapshot else False,
+            'compose_seconds': snapshot.compose_seconds if snapshot else None,
+            'watching': cls._observer is not None,
+            'subscribers': len(cls._subscribers),
+            **cls._stats,
+        }
+
+    @classmethod
+    def _install(cls, config: Dict[str, Any], fingerprint: Optional[Tuple] = None,
+                 runtime_overrides: bool = False, compose_seconds: float = 0.0) -> ConfigSnapshot:
+        """Build a snapshot, swap it in and notify subscribers (caller holds _lock)."""
+        old = cls._snapshot
+        new = ConfigSnapshot(config, version=(old.version + 1) if old else 1, fingerprint=fingerprint,
+                             runtime_overrides=runtime_overrides, compose_seconds=compose_seconds)
+        cls._snapshot = new
+        cls._stats['rebuilds'] += 1
+        for callback in list(cls._subscribers):
+            try:
+                callback(old, new)
+            except Exception as e:
+                logger.error(f"Config subscriber {getattr(callback, '__name__', callback)} failed: {e}")
+        return new
+
+    @classmethod
+    def _resolve_config_dir(cls) -> Path:
+        return cls._config_dir or (Path.cwd() / "config")
+
+    @classmethod
+    def _config_fingerprint(cls) -> Tuple:
+        """(path, mtime_ns, size) of every YAML file under the config directory."""
+        directory = cls._resolve_config_dir()
+        entries = []
+        for root, _, files in os.walk(directory):
+            for name in files:
+                if name.endswith(CONFIG_FILE_SUFFIXES):
+                    stat = os.stat(os.path.join(root, name))
+                    entries.append((os.path.join(root, name), stat.st_mtime_ns, stat.st_size))
+        return (str(directory),) + tuple(sorted(entries))
+
+    @classmethod
+    def _schedule_rebuild(cls) -> None:
+        """Debounce watcher events: one reload after the burst settles."""
+        with cls._lock:
+            if cls._observer is None:
+                return
+            if cls._rebuild_timer is not None:
+                cls._rebuild_timer.cancel()
+            cls._rebuild_timer = threading.Timer(cls._debounce_seconds, cls.reload_config)
+            cls._rebuild_timer.daemon = True
+            cls._rebuild_timer.start()
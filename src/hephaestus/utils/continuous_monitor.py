@@ -3,10 +3,7 @@ Continuous Monitor - Sistema de monitoramento contínuo para detectar problemas
 """
 
 import logging
-import time
-import threading
 import queue
-import psutil
 import os
 from typing import Dict, List, Optional, Any, Callable
 from dataclasses import dataclass
@@ -16,6 +13,9 @@ import json
 import signal
 import sys
 
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+from hephaestus.utils.system_metrics import get_system_metrics_sampler
+
 @dataclass
 class SystemMetrics:
     cpu_percent: float
@@ -40,7 +40,7 @@ class ContinuousMonitor:
         self.logger = logger
         self.check_interval = check_interval
         self.monitoring = False
-        self.monitor_thread = None
+        self.monitor_job = None
         self.alert_queue = queue.Queue()
         self.metrics_history = []
         self.alerts_history = []
@@ -87,27 +87,21 @@ class ContinuousMonitor:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        # Verificação barata e essencial: não é pausada durante o ciclo
+        self.monitor_job = get_background_scheduler().schedule(
+            "continuous_monitor", self._perform_system_check, interval=self.check_interval,
+            jitter=1.0, priority=JobPriority.HIGH, max_runtime=10, initial_delay=0, pausable=False
+        )
         self.logger.info("🔍 Monitoramento contínuo iniciado")
     
     def stop_monitoring(self):
         """Para o monitoramento"""
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.monitor_job:
+            self.monitor_job.cancel()
+            self.monitor_job = None
         self.logger.info("🔍 Monitoramento contínuo parado")
     
-    def _monitor_loop(self):
-        """Loop principal de monitoramento"""
-        while self.monitoring:
-            try:
-                self._perform_system_check()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                self.logger.error(f"Erro no monitoramento: {e}")
-                time.sleep(5)
-    
     def _perform_system_check(self):
         """Executa verificação completa do sistema"""
         self.stats['total_checks'] += 1
@@ -130,19 +124,16 @@ class ContinuousMonitor:
         self._process_alerts()
     
     def _collect_system_metrics(self) -> SystemMetrics:
-        """Coleta métricas do sistema"""
+        """Coleta métricas do sistema (última amostra do sampler compartilhado)"""
         try:
-            cpu_percent = psutil.cpu_percent(interval=1)
-            memory = psutil.virtual_memory()
-            disk = psutil.disk_usage('/')
-            active_threads = threading.active_count()
+            snapshot = get_system_metrics_sampler().latest()
             
             return SystemMetrics(
-                cpu_percent=cpu_percent,
-                memory_percent=memory.percent,
-                disk_usage_percent=disk.percent,
-                active_threads=active_threads,
-                timestamp=datetime.now()
+                cpu_percent=snapshot.cpu_percent,
+                memory_percent=snapshot.memory_percent,
+                disk_usage_percent=snapshot.disk_usage_percent,
+                active_threads=snapshot.active_threads,
+                timestamp=datetime.fromtimestamp(snapshot.timestamp)
             )
         except Exception as e:
             self.logger.error(f"Erro ao coletar métricas: {e}")
@@ -3,7 +3,6 @@ Error Prevention System - Sistema robusto para prevenir e detectar erros automat
 """
 
 import logging
-import time
 import traceback
 import inspect
 import json
@@ -11,12 +10,13 @@ from typing import Dict, List, Optional, Any, Callable, Type
 from dataclasses import dataclass, asdict
 from datetime import datetime, timedelta
 from pathlib import Path
-import threading
 import queue
 import signal
 import sys
 from enum import Enum
 
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
 class ErrorSeverity(Enum):
     LOW = "low"
     MEDIUM = "medium"
@@ -113,7 +113,7 @@ class HealthMonitor:
         self.health_status = {}
         self.last_check = {}
         self.monitoring = False
-        self.monitor_thread = None
+        self.monitor_job = None
         self.error_queue = queue.Queue()
         
     def start_monitoring(self):
@@ -122,27 +122,20 @@ class HealthMonitor:
             return
         
         self.monitoring = True
-        self.monitor_thread = threading.Thread(target=self._monitor_loop, daemon=True)
-        self.monitor_thread.start()
+        self.monitor_job = get_background_scheduler().schedule(
+            "health_monitor", self._perform_health_check, interval=self.check_interval,
+            jitter=1.0, priority=JobPriority.HIGH, max_runtime=5, initial_delay=0, pausable=False
+        )
         self.logger.info("Health monitoring started")
     
     def stop_monitoring(self):
         """Para o monitoramento"""
         self.monitoring = False
-        if self.monitor_thread:
-            self.monitor_thread.join(timeout=5)
+        if self.monitor_job:
+            self.monitor_job.cancel()
+            self.monitor_job = None
         self.logger.info("Health monitoring stopped")
     
-    def _monitor_loop(self):
-        """Loop principal de monitoramento"""
-        while self.monitoring:
-            try:
-                self._perform_health_check()
-                time.sleep(self.check_interval)
-            except Exception as e:
-                self.logger.error(f"Health monitoring error: {e}")
-                time.sleep(5)
-    
     def _perform_health_check(self):
         """Executa verificação de saúde"""
         current_time = datetime.now()
@@ -0,0 +1,299 @@
+"""
+Evolution Rollups - Agregados incrementais do log de evolução (evolution_log.csv)
+
+Em vez de reler o CSV inteiro a cada análise, os agregados (ciclos, sucessos,
+falhas e durações por estratégia e por tipo de objetivo) são atualizados linha
+a linha, no momento em que o ``CycleRunner`` anexa cada ciclo ao log.
+
+As durações ficam em ``DurationSketch``, um histograma logarítmico com erro
+relativo limitado (no estilo DDSketch): percentis aproximados com memória
+constante e mescláveis (somar contagens de baldes), o que permite combinar
+estratégias ou snapshots sem guardar as amostras.
+
+O estado é persistido num snapshot JSON pequeno junto com o offset (em bytes)
+do log até onde ele foi aplicado. Ao carregar, as linhas escritas depois desse
+offset são reaplicadas; se o log foi truncado ou recriado, os agregados são
+reconstruídos do início.
+"""
+
+import csv
+import io
+import json
+import logging
+import math
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Sequence
+
+# Colunas do evolution_log.csv (ver HephaestusAgent._initialize_evolution_log)
+COL_OBJECTIVE = 1
+COL_STATUS = 2
+COL_DURATION = 3
+COL_STRATEGY = 5
+
+SUCCESS_STATUSES = {"success", "sucesso", "true"}
+
+_OBJECTIVE_TYPE = re.compile(r"^\s*\[([^\]]{1,40})\]")
+
+
+def objective_type(objective: str) -> str:
+    """Tipo do objetivo pelo prefixo entre colchetes (ex.: ``[BUGFIX]``); ``GENERAL`` sem prefixo."""
+    match = _OBJECTIVE_TYPE.match(objective or "")
+    return match.group(1).strip().upper() if match else "GENERAL"
+
+
+class DurationSketch:
+    """Histograma logarítmico mesclável: quantis com erro relativo de até ``relative_accuracy``."""
+
+    def __init__(self, relative_accuracy: float = 0.02):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float):
+        self.count += 1
+        self.total += value
+        if value <= 0:
+            self.zero_count += 1
+            return
+        index = math.ceil(math.log(value) / self._log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def merge(self, other: "DurationSketch"):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+
+    def quantile(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if rank < seen:
+                return 2 * self.gamma ** index / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "buckets": {str(index): count for index, count in self.buckets.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DurationSketch":
+        sketch = cls(data.get("relative_accuracy", 0.02))
+        sketch.buckets = {int(index): count for index, count in data.get("buckets", {}).items()}
+        sketch.zero_count = data.get("zero_count", 0)
+        sketch.count = data.get("count", 0)
+        sketch.total = data.get("total", 0.0)
+        return sketch
+
+
+class RollupGroup:
+    """Contagens e durações de um grupo (total, uma estratégia ou um tipo de objetivo)."""
+
+    __slots__ = ("cycles", "successes", "durations")
+
+    def __init__(self):
+        self.cycles = 0
+        self.successes = 0
+        self.durations = DurationSketch()
+
+    @property
+    def failures(self) -> int:
+        return self.cycles - self.successes
+
+    @property
+    def success_rate(self) -> float:
+        return self.successes / self.cycles * 100 if self.cycles else 0.0
+
+    def add(self, success: bool, duration: Optional[float]):
+        self.cycles += 1
+        self.successes += int(success)
+        if duration is not None:
+            self.durations.add(duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"cycles": self.cycles, "successes": self.successes, "durations": self.durations.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "RollupGroup":
+        group = cls()
+        group.cycles = data.get("cycles", 0)
+        group.successes = data.get("successes", 0)
+        group.durations = DurationSketch.from_dict(data.get("durations", {}))
+        return group
+
+
+class EvolutionRollupStore:
+    """Agregados do evolution log, atualizados por linha e persistidos com o offset aplicado."""
+
+    def __init__(self, log_path: str, snapshot_path: Optional[str] = None,
+                 logger: Optional[logging.Logger] = None):
+        self.log_path = Path(log_path)
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.log_path.with_suffix(".rollup.json")
+        self.logger = logger or logging.getLogger("hephaestus.evolution_rollups")
+        self._lock = threading.RLock()
+        self._reset()
+        self._load_snapshot()
+
+    def _reset(self):
+        self.offset = 0
+        self.total = RollupGroup()
+        self.strategies: Dict[str, RollupGroup] = {}
+        self.objective_types: Dict[str, RollupGroup] = {}
+
+    # ------------------------------------------------------------------
+    # Atualização
+    # ------------------------------------------------------------------
+    def record(self, row: Sequence[Any], start_offset: int, end_offset: int):
+        """
+        Aplica uma linha recém-anexada ao log (``start_offset``/``end_offset``:
+        posição do arquivo antes e depois da escrita). Se o snapshot não estava
+        exatamente em ``start_offset`` (outro processo escreveu), reaplica o delta.
+        """
+        with self._lock:
+            if self.offset == start_offset:
+                self._apply(row)
+                self.offset = end_offset
+                self._save_snapshot()
+            else:
+                self.refresh()
+
+    def refresh(self) -> int:
+        """Aplica as linhas escritas depois do offset do snapshot; devolve quantas foram aplicadas."""
+        with self._lock:
+            try:
+                size = self.log_path.stat().st_size
+            except FileNotFoundError:
+                if self.offset:
+                    self._reset()
+                    self._save_snapshot()
+                return 0
+            if size < self.offset:
+                self.logger.info(f"{self.log_path} shrank below the rollup offset; rebuilding rollups")
+                self._reset()
+            if size == self.offset:
+                return 0
+
+            with open(self.log_path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read(size - self.offset)
+            # Só linhas completas; uma escrita em andamento fica para a próxima leitura
+            complete = data[:data.rfind(b"\n") + 1]
+            applied = 0
+            for row in csv.reader(io.StringIO(complete.decode("utf-8", errors="replace"), newline="")):
+                if self._apply(row):
+                    applied += 1
+            self.offset += len(complete)
+            self._save_snapshot()
+            return applied
+
+    def _apply(self, row: Sequence[Any]) -> bool:
+        if len(row) <= COL_STRATEGY or str(row[0]) == "ciclo":
+            return False  # Cabeçalho ou linha malformada
+        success = str(row[COL_STATUS]).strip().lower() in SUCCESS_STATUSES
+        try:
+            duration = float(row[COL_DURATION])
+        except (TypeError, ValueError):
+            duration = None
+        strategy = str(row[COL_STRATEGY]) or "N/A"
+        kind = objective_type(str(row[COL_OBJECTIVE]))
+
+        self.total.add(success, duration)
+        self.strategies.setdefault(strategy, RollupGroup()).add(success, duration)
+        self.objective_types.setdefault(kind, RollupGroup()).add(success, duration)
+        return True
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+    def _load_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.offset = data["offset"]
+            self.total = RollupGroup.from_dict(data["total"])
+            self.strategies = {name: RollupGroup.from_dict(group) for name, group in data["strategies"].items()}
+            self.objective_types = {name: RollupGroup.from_dict(group) for name, group in data["objective_types"].items()}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning(f"Invalid rollup snapshot {self.snapshot_path} ({e}); rebuilding from the log")
+            self._reset()
+        # Recuperação: o que foi escrito depois do snapshot é reaplicado a partir do offset
+        self.refresh()
+
+    def _save_snapshot(self):
+        snapshot = {
+            "log_path": str(self.log_path),
+            "offset": self.offset,
+            "total": self.total.to_dict(),
+            "strategies": {name: group.to_dict() for name, group in self.strategies.items()},
+            "objective_types": {name: group.to_dict() for name, group in self.objective_types.items()},
+        }
+        tmp_path = self.snapshot_path.with_name(f".{self.snapshot_path.name}.{os.getpid()}.tmp")
+        try:
+            self.snapshot_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f)
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            self.logger.warning(f"Failed to persist evolution rollups: {e}")
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def summary(self) -> Dict[str, Any]:
+        """Agregados atuais; custo proporcional ao número de estratégias/tipos, não ao histórico."""
+        self.refresh()
+        with self._lock:
+            def describe(group: RollupGroup) -> Dict[str, Any]:
+                return {
+                    "cycles": group.cycles,
+                    "successes": group.successes,
+                    "failures": group.failures,
+                    "success_rate": group.success_rate,
+                    "avg_duration": group.durations.mean,
+                    "p50_duration": group.durations.quantile(0.5),
+                    "p90_duration": group.durations.quantile(0.9),
+                }
+            return {
+                "total": describe(self.total),
+                "strategies": {name: describe(group) for name, group in self.strategies.items()},
+                "objective_types": {name: describe(group) for name, group in self.objective_types.items()},
+            }
+
+
+_rollup_stores: Dict[str, EvolutionRollupStore] = {}
+_rollup_stores_lock = threading.Lock()
+
+
+def get_evolution_rollups(log_path: str) -> EvolutionRollupStore:
+    """Store compartilhado do processo para um evolution log."""
+    key = os.path.abspath(log_path)
+    with _rollup_stores_lock:
+        if key not in _rollup_stores:
+            _rollup_stores[key] = EvolutionRollupStore(log_path)
+        return _rollup_stores[key]
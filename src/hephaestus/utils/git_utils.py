@@ -1,9 +1,21 @@
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple, Union
 import logging
+import os
+import subprocess
+import threading
+import time
+import warnings
 
 from hephaestus.utils.tool_executor import run_git_command
 
+try:
+    import git
+    from git.db import GitDB
+    GITPYTHON_AVAILABLE = True
+except ImportError:
+    GITPYTHON_AVAILABLE = False
+
 
 def initialize_git_repository(logger: logging.Logger) -> bool:
     """Ensure a git repository exists and is configured.
@@ -213,3 +225,180 @@ hephaestus.log
 
     logger.info("Commit inicial realizado com sucesso ou já existente.")
     return True
+
+
+
+class GitCommitBatch:
+    """Agrupa as mudanças de um ciclo num único commit.
+
+    ``stage`` só acumula caminhos e mensagens; ``flush`` grava tudo de uma vez.
+    Com GitPython o commit é feito escrevendo direto no índice e no banco de
+    objetos, sem processos ``git``; sem a biblioteca (ou se ela falhar) o lote
+    vira um ``git add`` + um ``git commit`` para o ciclo inteiro. Nos dois casos
+    o commit leva só os caminhos do lote: o que já estava no stage fica lá.
+    """
+
+    def __init__(self, logger: logging.Logger, repo_path: Union[str, Path] = "."):
+        self.logger = logger
+        self.repo_path = Path(repo_path).resolve()
+        self._pending: Dict[str, None] = {}  # conjunto ordenado de caminhos absolutos
+        self._messages: List[str] = []
+        self._repo = None
+        self._ignored: Dict[str, bool] = {}
+        self._lock = threading.Lock()
+        self.stats = {
+            "commits": 0,
+            "library_commits": 0,
+            "cli_commits": 0,
+            "files_committed": 0,
+            "processes_spawned": 0,
+            "commit_seconds": 0.0,
+        }
+
+    @property
+    def pending(self) -> int:
+        return len(self._messages)
+
+    def stage(self, paths: Iterable[Union[str, Path]], message: str) -> None:
+        """Registra arquivos alterados e a mensagem da mudança para o próximo flush."""
+        with self._lock:
+            for path in paths:
+                self._pending[str(Path(path).resolve())] = None
+            self._messages.append(message)
+
+    def discard(self) -> None:
+        with self._lock:
+            self._pending.clear()
+            self._messages.clear()
+
+    def flush(self, summary: Optional[str] = None) -> Optional[str]:
+        """Commita o lote pendente; devolve o hash do commit ou None se não houve commit."""
+        with self._lock:
+            paths, self._pending = list(self._pending), {}
+            messages, self._messages = self._messages, []
+        if not messages:
+            return None
+
+        message = messages[0] if len(messages) == 1 and not summary else self._batch_message(messages, summary)
+        started = time.perf_counter()
+        commit_hash = None
+        try:
+            repo = self._open_repo()
+            if repo is None:
+                self.logger.warning("Not in a Git repository, skipping evolution commit")
+                return None
+            relpaths = self._committable(repo, paths)
+            if not relpaths:
+                return None
+            try:
+                commit_hash = self._commit_with_library(repo, relpaths, message)
+                if commit_hash:
+                    self.stats["library_commits"] += 1
+            except Exception as e:
+                self.logger.warning(f"Direct index commit failed ({e}); falling back to git CLI")
+                commit_hash = self._commit_with_cli(self._root(repo), relpaths, message)
+                if commit_hash:
+                    self.stats["cli_commits"] += 1
+            if commit_hash:
+                self.stats["commits"] += 1
+                self.stats["files_committed"] += len(relpaths)
+            return commit_hash
+        finally:
+            self.stats["commit_seconds"] += time.perf_counter() - started
+
+    @staticmethod
+    def _batch_message(messages: List[str], summary: Optional[str]) -> str:
+        header = summary or f"🤖 Evolution cycle: {len(messages)} change(s)"
+        lines = [f"- {m.strip().splitlines()[0]}" for m in messages if m.strip()]
+        return header + "\n\n" + "\n".join(lines) + "\n"
+
+    def _open_repo(self):
+        if self._repo is not None:
+            return self._repo
+        if GITPYTHON_AVAILABLE:
+            try:
+                # GitDB: objetos lidos e gravados em processo (o backend padrão chama git hash-object por objeto)
+                with warnings.catch_warnings():
+                    warnings.simplefilter("ignore", DeprecationWarning)
+                    self._repo = git.Repo(self.repo_path, odbt=GitDB, search_parent_directories=True)
+                return self._repo
+            except (git.InvalidGitRepositoryError, git.NoSuchPathError):
+                return None
+        success, _ = self._run(['rev-parse', '--git-dir'])
+        return self.repo_path if success else None
+
+    def _committable(self, repo, paths: List[str]) -> List[str]:
+        """Caminhos relativos à raiz do repositório, dentro dele e não ignorados."""
+        root = self._root(repo)
+        relpaths = []
+        for path in paths:
+            rel = os.path.relpath(path, root)
+            if not rel.startswith(".."):
+                relpaths.append(Path(rel).as_posix())
+        unknown = [rel for rel in relpaths if rel not in self._ignored]
+        if unknown:
+            # Resultado fica em cache: os callbacks de evolução tocam sempre os mesmos arquivos
+            success, output = self._run(['check-ignore', '--', *unknown], cwd=root)
+            ignored = set(output.splitlines()) if success else set()
+            for rel in unknown:
+                self._ignored[rel] = rel in ignored
+        return [rel for rel in relpaths if not self._ignored[rel]]
+
+    @staticmethod
+    def _root(repo) -> Path:
+        return repo if isinstance(repo, Path) else Path(repo.working_tree_dir)
+
+    def _commit_with_library(self, repo, relpaths: List[str], message: str) -> Optional[str]:
+        if isinstance(repo, Path):
+            raise RuntimeError("GitPython not available")
+        root = self._root(repo)
+        head_valid = repo.head.is_valid()
+        # Índice em memória a partir do HEAD: o que o usuário já tinha no stage fica fora do commit
+        if head_valid:
+            index = git.IndexFile.new(repo, repo.head.commit.tree)
+        else:
+            index = git.IndexFile(repo)
+            index.entries = {}
+        existing = [rel for rel in relpaths if (root / rel).exists()]
+        removed = [rel for rel in relpaths if not (root / rel).exists()]
+        if existing:
+            index.add(existing, write=False)
+        for rel in removed:
+            index.entries.pop((rel, 0), None)
+        tree = index.write_tree()
+        if head_valid and repo.head.commit.tree.hexsha == tree.hexsha:
+            return None
+        commit_hash = index.commit(message).hexsha
+
+        # Como git commit -- <caminhos>: no índice real só as entradas do lote mudam
+        # (index.remove chamaria git rm --cached; as entradas são trocadas direto)
+        real_index = repo.index
+        for rel in existing:
+            real_index.entries[(rel, 0)] = index.entries[(rel, 0)]
+        for rel in removed:
+            real_index.entries.pop((rel, 0), None)
+        real_index.write()
+        return commit_hash
+
+    def _commit_with_cli(self, root: Path, relpaths: List[str], message: str) -> Optional[str]:
+        success, output = self._run(['add', '-A', '--', *relpaths], cwd=root)
+        if not success:
+            self.logger.error(f"git add failed for evolution batch: {output}")
+            return None
+        success, output = self._run(['commit', '-m', message, '--', *relpaths], cwd=root)
+        if not success:
+            if "nothing to commit" not in output.lower():
+                self.logger.error(f"git commit failed for evolution batch: {output}")
+            return None
+        success, output = self._run(['rev-parse', 'HEAD'], cwd=root)
+        return output.strip() if success else None
+
+    def _run(self, args: List[str], cwd: Optional[Path] = None) -> Tuple[bool, str]:
+        """git -C <repo> <args>; devolve só o stdout (run_git_command devolve um relatório)."""
+        self.stats["processes_spawned"] += 1
+        try:
+            result = subprocess.run(['git', '-C', str(cwd or self.repo_path), *args],
+                                    capture_output=True, text=True, timeout=30)
+            return result.returncode == 0, (result.stdout + result.stderr if result.returncode else result.stdout)
+        except Exception as e:
+            return False, str(e)
@@ -1,78 +1,302 @@
+"""
+Extração e reparo de JSON gerado por LLM.
+
+``parse_json_response`` localiza o valor JSON raiz na resposta (ignorando prosa
+e cercas de markdown) e tenta primeiro o decoder estrito, em C. Se falhar, um
+único scanner percorre o texto uma vez, respeitando o estado de strings e
+escapes, encontra o valor balanceado mais externo e corrige no mesmo passo os
+defeitos comuns de LLM: vírgulas sobrando, aspas simples, chaves e valores sem
+aspas, aspas internas não escapadas, barras invertidas inválidas, quebras de
+linha cruas em strings, strings e containers não terminados, comentários e
+literais Python (``True``/``False``/``None``). O tempo é linear no tamanho da
+resposta: trechos de strings, espaços e palavras são consumidos por regex
+ancoradas, sem buscas gulosas que retrocedem.
+"""
+
 import json
 import logging
 import re
 import traceback
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional, Dict, Any, Tuple, Callable, List, NamedTuple
+
+_DECODER = json.JSONDecoder()
+
+_WHITESPACE = re.compile(r"\s+")
+_BAREWORD = re.compile(r"[\w.+\-$]+")
+_BARE_VALUE_END = re.compile(r"[,}\]\n]")
+_STRING_SPECIALS = {'"': re.compile(r'["\\\x00-\x1f]'), "'": re.compile(r"['\"\\\x00-\x1f]")}
+_HEX4 = re.compile(r"[0-9a-fA-F]{4}")
+_VALID_ESCAPES = frozenset('"\\/bfnrtu')
+_CONTROL_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t", "\b": "\\b", "\f": "\\f"}
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_JSON_NUMBER = re.compile(r"-?(0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?\Z")
+_STRING_TERMINATORS = frozenset(",:}]`")
+_CLOSERS = {"object": "}", "array": "]"}
+
+
+class _JSONScan(NamedTuple):
+    """Resultado do scanner: o trecho ``text[start:end]`` e a sua versão em JSON estrito."""
+    start: int
+    end: int
+    repaired: str
+    repairs: Dict[str, int]
+    complete: bool
+
+
+def _locate_json_start(text: str) -> Optional[int]:
+    """
+    Início do valor raiz: o primeiro ``{``; um ``[`` anterior só vence se abrir
+    diretamente esse objeto (lista de objetos) ou se não houver objeto.
+    """
+    brace = text.find("{")
+    bracket = text.find("[", 0, brace if brace >= 0 else len(text))
+    if bracket < 0:
+        return brace if brace >= 0 else None
+    if brace < 0 or not text[bracket:brace].replace("[", "").strip():
+        return bracket
+    return brace
+
+
+def _scan_string(text: str, i: int, repairs: Dict[str, int]) -> Tuple[str, int]:
+    """
+    Lê a string que começa em ``text[i]`` (aspas simples ou duplas) e devolve a
+    versão JSON com aspas duplas e a posição seguinte. Uma aspa só fecha a string
+    se vier seguida de ``, : } ]``, de uma cerca de markdown, do fim do texto ou
+    de uma nova linha com outra string; caso contrário é uma aspa interna e é escapada.
+    """
+    quote = text[i]
+    if quote == "'":
+        repairs["single_quotes"] = repairs.get("single_quotes", 0) + 1
+    specials = _STRING_SPECIALS[quote]
+    n = len(text)
+    parts = ['"']
+    j = i + 1
+    while True:
+        match = specials.search(text, j)
+        if match is None:
+            parts.append(text[j:])
+            parts.append('"')
+            repairs["unterminated_string"] = repairs.get("unterminated_string", 0) + 1
+            return "".join(parts), n
+        k = match.start()
+        parts.append(text[j:k])
+        char = text[k]
+        if char == "\\":
+            following = text[k + 1] if k + 1 < n else ""
+            if following == "'":
+                parts.append("'")
+                j = k + 2
+            elif following in _VALID_ESCAPES and following and (following != "u" or _HEX4.match(text, k + 2)):
+                parts.append(text[k:k + 2])
+                j = k + 2
+            else:
+                parts.append("\\\\")
+                repairs["invalid_escape"] = repairs.get("invalid_escape", 0) + 1
+                j = k + 1
+        elif char == quote:
+            gap = _WHITESPACE.match(text, k + 1)
+            after = gap.end() if gap else k + 1
+            if (after >= n or text[after] in _STRING_TERMINATORS
+                    or (gap and "\n" in gap.group() and text[after] in "\"'")):
+                parts.append('"')
+                return "".join(parts), k + 1
+            parts.append('\\"' if quote == '"' else "'")
+            repairs["unescaped_quote"] = repairs.get("unescaped_quote", 0) + 1
+            j = k + 1
+        elif char == '"':
+            parts.append('\\"')
+            j = k + 1
+        else:
+            parts.append(_CONTROL_ESCAPES.get(char) or f"\\u{ord(char):04x}")
+            repairs["control_character"] = repairs.get("control_character", 0) + 1
+            j = k + 1
+
+
+def _scan_json_value(text: str, start: int) -> _JSONScan:
+    """
+    Percorre ``text`` uma única vez a partir de ``start`` (um ``{`` ou ``[``) até
+    fechar o valor raiz, emitindo JSON estrito e contando os reparos feitos.
+    """
+    out: List[str] = []
+    repairs: Dict[str, int] = {}
+    # Por container: [tipo, estado, índice em ``out`` da última vírgula]
+    stack: List[list] = []
+    n = len(text)
+    i = start
+
+    def repair(kind: str):
+        repairs[kind] = repairs.get(kind, 0) + 1
+
+    def role_of_next_token(can_be_key: bool) -> Optional[str]:
+        """Prepara o container para um novo token (vírgula/dois-pontos faltantes) e diz se é chave ou valor."""
+        frame = stack[-1]
+        if frame[1] == "comma_or_end":
+            out.append(",")
+            repair("missing_comma")
+            frame[1] = "key" if frame[0] == "object" else "value"
+        elif frame[1] == "colon" and not can_be_key:
+            out.append(":")
+            repair("missing_colon")
+            frame[1] = "value"
+        if frame[0] == "object" and frame[1] in ("key", "key_or_end"):
+            return "key" if can_be_key else None
+        if frame[1] == "colon":
+            out.append(":")
+            repair("missing_colon")
+            frame[1] = "value"
+        return "value"
+
+    def value_done() -> bool:
+        if not stack:
+            return True
+        stack[-1][1] = "comma_or_end"
+        return False
+
+    def close(frame: list):
+        kind, state, comma = frame
+        if state in ("key", "value") and comma is not None and (kind == "array" or state == "key"):
+            out[comma] = ""
+            repair("trailing_comma")
+        elif state == "colon":
+            out.append(": null")
+            repair("missing_value")
+        elif state == "value":
+            out.append("null")
+            repair("missing_value")
+        out.append(_CLOSERS[kind])
+
+    while i < n:
+        char = text[i]
+        if char in " \t\r\n":
+            gap = _WHITESPACE.match(text, i)
+            out.append(gap.group())
+            i = gap.end()
+            continue
+        if char == "/" and text.startswith(("//", "/*"), i):
+            end = text.find("\n", i) if text[i + 1] == "/" else text.find("*/", i + 2)
+            i = n if end < 0 else (end if text[i + 1] == "/" else end + 2)
+            repair("comment")
+            continue
+
+        if char in "{[":
+            if stack and role_of_next_token(can_be_key=False) is None:
+                repair("unexpected_character")
+                i += 1
+                continue
+            stack.append(["object" if char == "{" else "array", "key_or_end" if char == "{" else "value_or_end", None])
+            out.append(char)
+            i += 1
+            continue
+
+        if not stack or char == "`":
+            # Uma cerca de markdown fora de strings encerra uma resposta truncada
+            break
+
+        frame = stack[-1]
+        if char in "}]":
+            target = "object" if char == "}" else "array"
+            i += 1
+            if not any(f[0] == target for f in stack):
+                repair("unexpected_character")
+                continue
+            while True:
+                popped = stack.pop()
+                close(popped)
+                if popped[0] == target:
+                    break
+                # O container fechado implicitamente é o valor do container pai
+                stack[-1][1] = "comma_or_end"
+                repair("unclosed_container")
+            if value_done():
+                return _JSONScan(start, i, "".join(out), repairs, True)
+        elif char == ",":
+            if frame[1] == "comma_or_end":
+                out.append(",")
+                frame[1] = "key" if frame[0] == "object" else "value"
+                frame[2] = len(out) - 1
+            else:
+                repair("extra_comma")
+            i += 1
+        elif char == ":":
+            if frame[1] == "colon":
+                out.append(":")
+                frame[1] = "value"
+            else:
+                repair("unexpected_character")
+            i += 1
+        elif char in "\"'":
+            role = role_of_next_token(can_be_key=True)
+            string, i = _scan_string(text, i, repairs)
+            out.append(string)
+            if role == "key":
+                frame[1] = "colon"
+            elif value_done():
+                return _JSONScan(start, i, "".join(out), repairs, True)
+        else:
+            word = _BAREWORD.match(text, i)
+            if word is None:
+                repair("unexpected_character")
+                i += 1
+                continue
+            token = word.group()
+            role = role_of_next_token(can_be_key=True)
+            if role == "key":
+                out.append(json.dumps(token))
+                repair("unquoted_key")
+                frame[1] = "colon"
+                i = word.end()
+                continue
+            if token in ("true", "false", "null") or _JSON_NUMBER.match(token):
+                out.append(token)
+                i = word.end()
+            elif token in _PY_LITERALS:
+                out.append(_PY_LITERALS[token])
+                repair("python_literal")
+                i = word.end()
+            else:
+                # Texto sem aspas: vai até o próximo separador da linha
+                end = _BARE_VALUE_END.search(text, i)
+                raw = text[i:end.start() if end else n].rstrip()
+                out.append(json.dumps(raw))
+                repair("unquoted_value")
+                i += len(raw)
+            if value_done():
+                return _JSONScan(start, i, "".join(out), repairs, True)
+
+    # Fim do texto com containers abertos: fecha na ordem inversa
+    while stack:
+        close(stack.pop())
+        if stack:
+            stack[-1][1] = "comma_or_end"
+        repair("unclosed_container")
+    return _JSONScan(start, i, "".join(out), repairs, False)
+
+
+def _strip_code_fence(raw_str: str) -> str:
+    content = raw_str.strip()
+    if content.startswith("```"):
+        content = content[3:]
+        if content.startswith("json"):
+            content = content[4:]
+        if content.endswith("```"):
+            content = content[:-3]
+    return content
+
+
+def _format_repairs(repairs: Dict[str, int]) -> str:
+    return ", ".join(f"{kind} x{count}" for kind, count in sorted(repairs.items())) or "none"
+
 
 def _fix_common_json_errors(json_string: str, logger: logging.Logger) -> str:
-    """Tenta corrigir erros comuns de JSON gerado por LLM."""
-    corrected_string = json_string
-    
-    # Corrige barras invertidas que não são de escape (causa comum de erro)
-    # Ex: "path": "C:\Users\..." se torna "path": "C:\\Users\\..."
-    # Usando uma função para a substituição para logar as correções
-    def escape_backslashes(match):
-        val = match.group(0)
-        # Não escapar sequências de escape JSON válidas
-        if val in ('\\"', '\\\\', '\\/', '\\b', '\\f', '\\n', '\\r', '\\t'):
-            return val
-        logger.warning(f"JSON parser: Found potentially unescaped backslash. Correcting '{val}' to '\\{val[1:]}'.")
-        return f'\\\\{val[1:]}'
-
-    # Regex para encontrar barras invertidas não escapadas
-    corrected_string = re.sub(r'\\[^"\\/bfnrt]', escape_backslashes, corrected_string)
-    
-    # Corrige aspas faltantes em chaves e valores
-    # Padrão: {chave: valor} -> {"chave": "valor"}
-    def add_quotes_to_keys_and_values(match):
-        key = match.group(1)
-        value = match.group(2)
-        
-        # Verifica se a chave já tem aspas
-        if not (key.startswith('"') and key.endswith('"')):
-            key = f'"{key}"'
-        
-        # Verifica se o valor já tem aspas (e não é um número, boolean, null)
-        if not (value.startswith('"') and value.endswith('"')):
-            # Se não é um número, boolean, null, ou array/object, adiciona aspas
-            if not (value.lower() in ['true', 'false', 'null'] or 
-                   value.replace('.', '').replace('-', '').isdigit() or
-                   value.startswith('[') or value.startswith('{')):
-                value = f'"{value}"'
-        
-        return f'{key}: {value}'
-    
-    # Regex para encontrar pares chave:valor sem aspas
-    # Captura chaves e valores que não estão entre aspas
-    corrected_string = re.sub(r'([a-zA-Z_][a-zA-Z0-9_]*)\s*:\s*([^,}\]]+)', add_quotes_to_keys_and_values, corrected_string)
-    
-    # Corrige aspas simples para aspas duplas
-    corrected_string = corrected_string.replace("'", '"')
-    
-    # Remove espaços extras antes de vírgulas e chaves
-    corrected_string = re.sub(r'\s+([,}\]])', r'\1', corrected_string)
-    
-    # Corrige strings não terminadas - adiciona aspas de fechamento se necessário
-    def fix_unterminated_strings(match):
-        content = match.group(1)
-        # Se a string não termina com aspas, adiciona
-        if not content.endswith('"'):
-            logger.warning(f"JSON parser: Found unterminated string, adding closing quote")
-            return f'"{content}"'
-        return match.group(0)
-    
-    # Procura por strings que começam com aspas mas podem não terminar
-    corrected_string = re.sub(r'"([^"]*(?:\\.[^"]*)*)"?', fix_unterminated_strings, corrected_string)
-    
-    # Remove vírgulas extras antes de chaves de fechamento
-    corrected_string = re.sub(r',(\s*[}\]])', r'\1', corrected_string)
-    
-    # Corrige arrays e objetos malformados
-    corrected_string = re.sub(r'\[\s*,', '[', corrected_string)  # Remove vírgula inicial em arrays
-    corrected_string = re.sub(r'{\s*,', '{', corrected_string)   # Remove vírgula inicial em objetos
-    
-    logger.info(f"JSON parser: Applied fixes to JSON string")
-    return corrected_string
+    """Tenta corrigir erros comuns de JSON gerado por LLM (em uma única passada)."""
+    start = _locate_json_start(json_string)
+    if start is None:
+        return json_string
+    scan = _scan_json_value(json_string, start)
+    if scan.repairs:
+        logger.info(f"JSON parser: Applied fixes to JSON string ({_format_repairs(scan.repairs)})")
+    return scan.repaired
+
 
 def _extract_json_from_response(raw_str: str, logger: logging.Logger) -> str:
     """
@@ -80,27 +304,13 @@ def _extract_json_from_response(raw_str: str, logger: logging.Logger) -> str:
     """
     if not raw_str or not raw_str.strip():
         return ""
-    
-    # Remove markdown code blocks
-    if raw_str.startswith('```json'):
-        content = raw_str.lstrip('```json').rstrip('```')
-    elif raw_str.startswith('```'):
-        content = raw_str.lstrip('```').rstrip('```')
-    else:
-        content = raw_str
-    
-    # Try to find JSON object with regex
-    match = re.search(r'\{.*\}', content, re.DOTALL)
-    if match:
-        return match.group(0)
-    
-    # If no JSON object found, try to find array
-    match = re.search(r'\[.*\]', content, re.DOTALL)
-    if match:
-        return match.group(0)
-    
-    # Fallback: return the cleaned content
-    return content.strip()
+    start = _locate_json_start(raw_str)
+    if start is None:
+        # Fallback: return the cleaned content
+        return _strip_code_fence(raw_str).strip()
+    scan = _scan_json_value(raw_str, start)
+    return raw_str[scan.start:scan.end]
+
 
 def parse_json_response(raw_str: str, logger: logging.Logger) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
     """
@@ -114,57 +324,255 @@ def parse_json_response(raw_str: str, logger: logging.Logger) -> Tuple[Optional[
     if logger: 
         logger.debug(f"parse_json_response: Raw response before cleaning: {raw_str[:300]}...")
 
-    # Extract JSON content
-    clean_content = _extract_json_from_response(raw_str, logger)
-    
-    if not clean_content:
-        if logger:
-            logger.error("parse_json_response: Content became empty after cleaning and extraction.")
-        return None, "Conteúdo ficou vazio após limpeza e extração."
-
-    # Attempt to parse the extracted content
     try:
-        return json.loads(clean_content), None
-    except json.JSONDecodeError as e:
-        logger.warning(f"Initial JSON parsing failed: {e}. Attempting to fix common errors.")
-        
-        # Attempt 2: Fix common errors and retry
-        corrected_json_str = _fix_common_json_errors(clean_content, logger)
+        start = _locate_json_start(raw_str)
+        if start is None:
+            # Sem objeto/array: talvez um valor JSON simples
+            content = _strip_code_fence(raw_str).strip()
+            if not content:
+                if logger:
+                    logger.error("parse_json_response: Content became empty after cleaning and extraction.")
+                return None, "Conteúdo ficou vazio após limpeza e extração."
+            return json.loads(content), None
+
+        # Attempt 1: strict decoder from the root value (ignores trailing prose)
         try:
-            logger.info("Attempting to parse with fixed JSON string...")
-            return json.loads(corrected_json_str), None
-        except json.JSONDecodeError as e2:
-            # Attempt 3: More aggressive fixes
-            logger.warning(f"Second parsing attempt failed: {e2}. Applying aggressive fixes...")
-            
-            # Try to fix more complex issues
-            aggressive_fixes = corrected_json_str
-            
-            # Remove any trailing commas
-            aggressive_fixes = re.sub(r',(\s*[}\]])', r'\1', aggressive_fixes)
-            
-            # Try to balance braces and brackets
-            open_braces = aggressive_fixes.count('{')
-            close_braces = aggressive_fixes.count('}')
-            open_brackets = aggressive_fixes.count('[')
-            close_brackets = aggressive_fixes.count(']')
-            
-            # Add missing closing braces/brackets
-            if open_braces > close_braces:
-                aggressive_fixes += '}' * (open_braces - close_braces)
-            if open_brackets > close_brackets:
-                aggressive_fixes += ']' * (open_brackets - close_brackets)
-            
-            try:
-                logger.info("Attempting to parse with aggressive fixes...")
-                return json.loads(aggressive_fixes), None
-            except json.JSONDecodeError as e3:
-                error_message = f"Erro ao decodificar JSON mesmo após tentativas de correção: {e3}."
-                if logger: 
-                    logger.error(f"parse_json_response: {error_message}. Resposta original (parcial): {raw_str[:200]}")
-                return None, error_message
+            return _DECODER.raw_decode(raw_str, start)[0], None
+        except json.JSONDecodeError as e:
+            if logger:
+                logger.warning(f"Initial JSON parsing failed: {e}. Repairing in a single pass.")
+
+        # Attempt 2: tolerant single-pass scan with in-place repairs
+        scan = _scan_json_value(raw_str, start)
+        value = json.loads(scan.repaired)
+        if logger:
+            logger.info(f"JSON parser: Parsed after repairs ({_format_repairs(scan.repairs)})")
+        return value, None
+    except json.JSONDecodeError as e:
+        error_message = f"Erro ao decodificar JSON mesmo após tentativas de correção: {e}."
+        if logger: 
+            logger.error(f"parse_json_response: {error_message}. Resposta original (parcial): {raw_str[:200]}")
+        return None, error_message
     except Exception as e:
         error_message = f"Erro inesperado ao processar JSON: {str(e)}"
         if logger:
             logger.error(f"parse_json_response: {error_message}", exc_info=True)
         return None, error_message
+
+
+_LITERAL_CHARS = frozenset("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_.+-")
+_VALID_LITERAL = re.compile(r'^(true|false|null|True|False|None|-?\d+(\.\d+)?([eE][+-]?\d+)?)$')
+_VALUE_STATES = ("value", "value_or_end")
+_KEY_STATES = ("key", "key_or_end")
+
+
+class IncrementalJSONParser:
+    """
+    Validates a JSON document while it is still streaming in.
+
+    Chunks are fed as they arrive; the parser tracks nesting, strings and
+    literals so a response can be declared ``complete`` as soon as the root
+    value closes, or ``malformed`` at the first structural error so the call
+    can be cancelled early. It is as lenient as ``parse_json_response`` on the
+    errors that function repairs (trailing commas, single quotes, unquoted
+    keys, Python literals), and skips any prose or markdown fence before the
+    root value. Other syntax errors (e.g. unescaped quotes) are flagged
+    ``repairable``: the caller should read the whole response and hand it to
+    ``parse_json_response`` rather than cancel.
+
+    ``field_validators`` maps top-level keys to callables that receive the
+    decoded value when that field finishes streaming and return an error
+    message (or None), so schema problems also abort the stream early.
+    """
+
+    INCOMPLETE = "incomplete"
+    COMPLETE = "complete"
+    MALFORMED = "malformed"
+
+    def __init__(self, field_validators: Optional[Dict[str, Callable[[Any], Optional[str]]]] = None,
+                 expect_object: bool = True, max_preamble_chars: int = 2000):
+        self.field_validators = field_validators or {}
+        self.expect_object = expect_object
+        self.max_preamble_chars = max_preamble_chars
+        self.status = self.INCOMPLETE
+        self.error: Optional[str] = None
+        self.repairable = False  # MALFORMED by syntax only: parse_json_response may still fix it
+        self.completed_fields: Dict[str, Any] = {}
+
+        self._chunks: List[str] = []
+        self._length = 0
+        self._root_start: Optional[int] = None
+        self._root_end: Optional[int] = None
+        self._stack: List[List[str]] = []  # [kind, state] per open container
+        self._quote: Optional[str] = None
+        self._escape = False
+        self._token_start: Optional[int] = None
+        self._literal_start: Optional[int] = None
+        self._current_key: Optional[str] = None
+        self._field_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    @property
+    def root_text(self) -> Optional[str]:
+        """The root JSON value once complete (without surrounding prose)."""
+        if self._root_start is None or self._root_end is None:
+            return None
+        return self.text[self._root_start:self._root_end]
+
+    def feed(self, chunk: str) -> str:
+        """Consume the next chunk and return the parser status."""
+        if self.status != self.INCOMPLETE or not chunk:
+            return self.status
+        offset = self._length
+        self._chunks.append(chunk)
+        self._length += len(chunk)
+        for index, char in enumerate(chunk, offset):
+            self._consume(char, index)
+            if self.status != self.INCOMPLETE:
+                break
+        if self._root_start is None and self._length > self.max_preamble_chars and self.status == self.INCOMPLETE:
+            self._fail(f"No JSON {'object' if self.expect_object else 'value'} within the first {self.max_preamble_chars} characters",
+                       repairable=False)
+        return self.status
+
+    def value(self, logger: Optional[logging.Logger] = None) -> Tuple[Optional[Any], Optional[str]]:
+        """Decode the completed root value, repairing lenient syntax if needed."""
+        if self.status == self.MALFORMED:
+            return None, self.error
+        root = self.root_text
+        if root is None:
+            return None, "JSON value is incomplete"
+        try:
+            return json.loads(root), None
+        except json.JSONDecodeError:
+            return parse_json_response(root, logger or logging.getLogger(__name__))
+
+    def _fail(self, message: str, repairable: bool = True):
+        self.status = self.MALFORMED
+        self.error = message
+        self.repairable = repairable
+
+    def _consume(self, char: str, index: int):
+        if self._quote is not None:
+            if self._escape:
+                self._escape = False
+            elif char == "\\":
+                self._escape = True
+            elif char == self._quote:
+                self._quote = None
+                self._end_string(index)
+            return
+
+        if self._literal_start is not None:
+            if char in _LITERAL_CHARS:
+                return
+            self._end_literal(index)
+            if self.status != self.INCOMPLETE:
+                return
+
+        if self._root_start is None:
+            if char == "{" or (char == "[" and not self.expect_object):
+                self._root_start = index
+                self._stack.append(["object" if char == "{" else "array", "key_or_end" if char == "{" else "value_or_end"])
+            return
+
+        if char.isspace():
+            return
+
+        frame = self._stack[-1]
+        kind, state = frame
+
+        if char in "\"'":
+            if state in _VALUE_STATES or state in _KEY_STATES:
+                self._mark_value_start(index, state)
+                self._quote = char
+                self._token_start = index
+            else:
+                self._fail(f"Unexpected string at position {index}")
+        elif char in "{[":
+            if state in _VALUE_STATES:
+                self._mark_value_start(index, state)
+                self._stack.append(["object" if char == "{" else "array", "key_or_end" if char == "{" else "value_or_end"])
+            else:
+                self._fail(f"Unexpected '{char}' at position {index}")
+        elif char in "}]":
+            expected = "object" if char == "}" else "array"
+            allowed = ("key_or_end", "key", "comma_or_end") if kind == "object" else ("value_or_end", "value", "comma_or_end")
+            if kind != expected or state not in allowed:
+                self._fail(f"Unexpected '{char}' at position {index}")
+                return
+            self._stack.pop()
+            self._value_done(index + 1)
+        elif char == ":":
+            if kind == "object" and state == "colon":
+                frame[1] = "value"
+            else:
+                self._fail(f"Unexpected ':' at position {index}")
+        elif char == ",":
+            if state == "comma_or_end":
+                frame[1] = "key" if kind == "object" else "value"
+            else:
+                self._fail(f"Unexpected ',' at position {index}")
+        elif char in _LITERAL_CHARS:
+            if state in _VALUE_STATES or (kind == "object" and state in _KEY_STATES):
+                self._mark_value_start(index, state)
+                self._literal_start = index
+            else:
+                self._fail(f"Unexpected '{char}' at position {index}")
+        else:
+            self._fail(f"Unexpected character {char!r} at position {index}")
+
+    def _mark_value_start(self, index: int, state: str):
+        if len(self._stack) == 1 and self._stack[0][0] == "object" and state in _VALUE_STATES:
+            self._field_start = index
+
+    def _end_string(self, index: int):
+        kind, state = self._stack[-1]
+        if kind == "object" and state in _KEY_STATES:
+            self._set_key(self.text[self._token_start + 1:index])
+        else:
+            self._value_done(index + 1)
+
+    def _end_literal(self, index: int):
+        literal = self.text[self._literal_start:index]
+        self._literal_start = None
+        kind, state = self._stack[-1]
+        if kind == "object" and state in _KEY_STATES:
+            self._set_key(literal)
+        elif _VALID_LITERAL.match(literal):
+            self._value_done(index)
+        else:
+            self._fail(f"Invalid literal '{literal}' at position {index - len(literal)}")
+
+    def _set_key(self, key: str):
+        if len(self._stack) == 1:
+            self._current_key = key
+        self._stack[-1][1] = "colon"
+
+    def _value_done(self, end: int):
+        if not self._stack:
+            self._root_end = end
+            self.status = self.COMPLETE
+            return
+        self._stack[-1][1] = "comma_or_end"
+        if len(self._stack) == 1 and self._field_start is not None and self._current_key is not None:
+            key, start = self._current_key, self._field_start
+            self._current_key = self._field_start = None
+            self._complete_field(key, self.text[start:end])
+
+    def _complete_field(self, key: str, raw_value: str):
+        try:
+            value = json.loads(raw_value)
+        except json.JSONDecodeError:
+            return  # Lenient syntax is repaired when the full value is decoded
+        self.completed_fields[key] = value
+        validator = self.field_validators.get(key)
+        if validator:
+            error = validator(value)
+            if error:
+                self._fail(f"Field '{key}' is invalid: {error}", repairable=False)
@@ -0,0 +1,82 @@
+"""
+Lazy Import - Importação adiada de módulos pesados
+
+``lazy_import("pkg.mod", "Name")`` devolve um proxy que só importa o módulo no
+primeiro uso (chamada ou acesso a atributo). Serve para manter ``import
+hephaestus`` e a construção do agente baratos: dependências como
+google-generativeai, matplotlib e os subsistemas de inteligência só são
+carregadas por quem realmente as usa. O tempo gasto em cada importação adiada
+fica registrado em ``import_timings`` para o relatório de inicialização.
+"""
+
+import importlib
+import threading
+import time
+from typing import Any, Dict, Optional
+
+# Segundos gastos por importação adiada ("modulo" ou "modulo:Nome")
+import_timings: Dict[str, float] = {}
+_timings_lock = threading.Lock()
+
+
+class LazyImport:
+    """Proxy que resolve ``module[:attribute]`` no primeiro uso"""
+
+    __slots__ = ("_module", "_attribute", "_target")
+
+    def __init__(self, module: str, attribute: Optional[str] = None):
+        object.__setattr__(self, "_module", module)
+        object.__setattr__(self, "_attribute", attribute)
+        object.__setattr__(self, "_target", None)
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is None:
+            module_name = object.__getattribute__(self, "_module")
+            attribute = object.__getattribute__(self, "_attribute")
+            start = time.perf_counter()
+            target = importlib.import_module(module_name)
+            if attribute:
+                target = getattr(target, attribute)
+            label = f"{module_name}:{attribute}" if attribute else module_name
+            with _timings_lock:
+                import_timings.setdefault(label, time.perf_counter() - start)
+            object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._resolve(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._resolve()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        module_name = object.__getattribute__(self, "_module")
+        attribute = object.__getattribute__(self, "_attribute")
+        state = "loaded" if object.__getattribute__(self, "_target") is not None else "deferred"
+        return f"<LazyImport {module_name}{':' + attribute if attribute else ''} ({state})>"
+
+
+def lazy_import(module: str, attribute: Optional[str] = None) -> Any:
+    """Cria um proxy de importação adiada para um módulo ou atributo"""
+    return LazyImport(module, attribute)
+
+
+def lazy_module_getattr(module_name: str, exports: Dict[str, str]):
+    """
+    Cria o ``__getattr__`` (PEP 562) de um pacote cujos re-exports são
+    carregados sob demanda. ``exports`` mapeia nome -> submódulo relativo, ou
+    ``"submódulo:atributo"`` quando o nome exportado é um alias.
+    """
+    def __getattr__(name: str) -> Any:
+        target = exports.get(name)
+        if target is None:
+            raise AttributeError(f"module {module_name!r} has no attribute {name!r}")
+        submodule, _, attribute = target.partition(":")
+        start = time.perf_counter()
+        value = getattr(importlib.import_module(submodule, module_name), attribute or name)
+        with _timings_lock:
+            import_timings.setdefault(f"{module_name}{submodule}:{name}", time.perf_counter() - start)
+        return value
+
+    return __getattr__
@@ -1,12 +1,22 @@
 import os
 import json
+import time
 import logging
 import requests
+import threading
 import traceback
-from typing import Optional, Tuple, Dict, Any
-import google.generativeai as genai
+from dataclasses import dataclass
+from typing import Optional, Tuple, Dict, Any, AsyncIterator
 import httpx
 import asyncio
+import contextvars
+
+from .rate_limiter import get_llm_scheduler
+from .json_parser import IncrementalJSONParser
+from .lazy_import import lazy_import
+
+# google-generativeai takes ~1s to import; load it on the first Gemini call
+genai = lazy_import("google.generativeai")
 
 # Import our new API Key Manager
 try:
@@ -16,19 +26,36 @@ except ImportError:
     API_KEY_MANAGER_AVAILABLE = False
     logging.warning("API Key Manager not available, falling back to single key mode")
 
-# Configure Gemini client (fallback mode)
+# Gemini key for single-key mode (configured per call in call_gemini_api_with_key)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
 
 # Constants
 OPENROUTER_BASE_URL = "https://openrouter.ai/api/v1"
+DEFAULT_COMPLETION_TOKEN_ESTIMATE = 1024
+
+def _estimate_tokens(prompt: str, max_tokens: Optional[int]) -> int:
+    """Rough budget estimate (~4 chars/token) reserved before the call and settled afterwards."""
+    completion = max_tokens if max_tokens and max_tokens > 0 else DEFAULT_COMPLETION_TOKEN_ESTIMATE
+    return len(prompt) // 4 + completion
+
+def _retry_after_seconds(headers) -> Optional[float]:
+    """Parses a numeric Retry-After header; HTTP-date values fall back to the scheduler default."""
+    value = headers.get("retry-after") if headers is not None else None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
 
-def call_gemini_api_with_key(api_key: str, model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger) -> Tuple[Optional[str], Optional[str]]:
+def _is_gemini_rate_limit(error: Exception) -> bool:
+    text = f"{type(error).__name__} {error}"
+    return "429" in text or "ResourceExhausted" in text or "quota" in text.lower()
+
+def call_gemini_api_with_key(api_key: str, model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger, key_name: str = "default") -> Tuple[Optional[str], Optional[str]]:
     """
     Calls the Google Gemini API with a specific key.
     """
     logger.info(f"Attempting to call Gemini API with model: {model}")
+    permit = get_llm_scheduler().acquire("gemini", key_name, _estimate_tokens(prompt, max_tokens))
     try:
         # Configure client with specific key
         genai.configure(api_key=api_key)
@@ -41,6 +68,8 @@ def call_gemini_api_with_key(api_key: str, model: str, prompt: str, temperature:
             generation_config.max_output_tokens = max_tokens
 
         response = gemini_model.generate_content(prompt, generation_config=generation_config)
+        usage = getattr(response, "usage_metadata", None)
+        permit.release(actual_tokens=getattr(usage, "total_token_count", None) or None)
         
         if response.text:
             logger.debug(f"Gemini API Response: {response.text}")
@@ -54,6 +83,9 @@ def call_gemini_api_with_key(api_key: str, model: str, prompt: str, temperature:
             return None, error_message
 
     except Exception as e:
+        if _is_gemini_rate_limit(e):
+            permit.report_rate_limited()
+        permit.release(success=False)
         error_details = f"Unexpected error during Gemini API call: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_details)
         return None, error_details
@@ -67,7 +99,7 @@ def call_gemini_api(model: str, prompt: str, temperature: float, max_tokens: Opt
         key = manager.get_best_key("gemini")
         
         if key:
-            result, error = call_gemini_api_with_key(key.key, model, prompt, temperature, max_tokens, logger)
+            result, error = call_gemini_api_with_key(key.key, model, prompt, temperature, max_tokens, logger, key.name)
             
             # Mark result in key manager
             success = result is not None
@@ -80,7 +112,7 @@ def call_gemini_api(model: str, prompt: str, temperature: float, max_tokens: Opt
                 logger.warning(f"Key {key.name} failed, trying fallback...")
                 fallback_key, provider = manager.get_key_with_fallback("gemini")
                 if fallback_key and provider == "gemini":
-                    result, error = call_gemini_api_with_key(fallback_key.key, model, prompt, temperature, max_tokens, logger)
+                    result, error = call_gemini_api_with_key(fallback_key.key, model, prompt, temperature, max_tokens, logger, fallback_key.name)
                     manager.mark_key_result(fallback_key, result is not None, error or "")
                     return result, error
         
@@ -90,34 +122,9 @@ def call_gemini_api(model: str, prompt: str, temperature: float, max_tokens: Opt
     if not GEMINI_API_KEY:
         return None, "GEMINI_API_KEY environment variable not set."
     
-    logger.info(f"Attempting to call Gemini API with model: {model}")
-    try:
-        # Model name in config is "gemini/model-name", we need to pass "model-name"
-        model_name = model.split('/')[-1]
-        gemini_model = genai.GenerativeModel(model_name)
-        generation_config = genai.types.GenerationConfig(temperature=temperature)
-        if max_tokens and max_tokens > 0:
-            generation_config.max_output_tokens = max_tokens
-
-        response = gemini_model.generate_content(prompt, generation_config=generation_config)
-        
-        if response.text:
-            logger.debug(f"Gemini API Response: {response.text}")
-            return response.text, None
-        else:
-            # Handle cases where the response might be blocked or empty
-            error_message = "Gemini API call failed: No text in response."
-            if response.prompt_feedback:
-                error_message += f" Prompt Feedback: {response.prompt_feedback}"
-            logger.error(error_message)
-            return None, error_message
-
-    except Exception as e:
-        error_details = f"Unexpected error during Gemini API call: {str(e)}\n{traceback.format_exc()}"
-        logger.error(error_details)
-        return None, error_details
+    return call_gemini_api_with_key(GEMINI_API_KEY, model, prompt, temperature, max_tokens, logger)
 
-def call_openrouter_api_with_key(api_key: str, model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger) -> Tuple[Optional[str], Optional[str]]:
+def call_openrouter_api_with_key(api_key: str, model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger, key_name: str = "default") -> Tuple[Optional[str], Optional[str]]:
     """
     Calls OpenRouter API with a specific key.
     """
@@ -135,10 +142,12 @@ def call_openrouter_api_with_key(api_key: str, model: str, prompt: str, temperat
     if max_tokens and max_tokens > 0:
         payload['max_tokens'] = max_tokens
 
+    permit = get_llm_scheduler().acquire("openrouter", key_name, _estimate_tokens(prompt, max_tokens))
     try:
         response = requests.post(url, json=payload, headers=headers)
         response.raise_for_status()
         response_json = response.json()
+        permit.release(actual_tokens=(response_json.get("usage") or {}).get("total_tokens"))
 
         logger.debug(f"OpenRouter API Response: {json.dumps(response_json, indent=2)}")
 
@@ -151,10 +160,14 @@ def call_openrouter_api_with_key(api_key: str, model: str, prompt: str, temperat
             return None, f"{err_msg} Full response: {response_json}"
 
     except requests.exceptions.HTTPError as http_err:
+        if http_err.response.status_code == 429:
+            permit.report_rate_limited(_retry_after_seconds(http_err.response.headers))
+        permit.release(success=False)
         error_details = f"HTTP error occurred: {http_err} - Status: {http_err.response.status_code}, Response: {http_err.response.text}"
         logger.error(error_details)
         return None, error_details
     except Exception as e:
+        permit.release(success=False)
         error_details = f"Unexpected error during OpenRouter API call: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_details)
         return None, error_details
@@ -168,7 +181,7 @@ def call_openrouter_api(model: str, prompt: str, temperature: float, max_tokens:
         key = manager.get_best_key("openrouter")
         
         if key:
-            result, error = call_openrouter_api_with_key(key.key, model, prompt, temperature, max_tokens, logger)
+            result, error = call_openrouter_api_with_key(key.key, model, prompt, temperature, max_tokens, logger, key.name)
             
             # Mark result in key manager
             success = result is not None
@@ -181,7 +194,7 @@ def call_openrouter_api(model: str, prompt: str, temperature: float, max_tokens:
                 logger.warning(f"Key {key.name} failed, trying fallback...")
                 fallback_key, provider = manager.get_key_with_fallback("openrouter")
                 if fallback_key and provider == "openrouter":
-                    result, error = call_openrouter_api_with_key(fallback_key.key, model, prompt, temperature, max_tokens, logger)
+                    result, error = call_openrouter_api_with_key(fallback_key.key, model, prompt, temperature, max_tokens, logger, fallback_key.name)
                     manager.mark_key_result(fallback_key, result is not None, error or "")
                     return result, error
         
@@ -253,11 +266,13 @@ async def call_openrouter_api_async(model: str, prompt: str, temperature: float,
     if max_tokens and max_tokens > 0:
         payload['max_tokens'] = max_tokens
 
+    permit = await get_llm_scheduler().acquire_async("openrouter", "default", _estimate_tokens(prompt, max_tokens))
     try:
         async with httpx.AsyncClient(timeout=60) as client:
             response = await client.post(url, json=payload, headers=headers)
             response.raise_for_status()
             response_json = response.json()
+        permit.release(actual_tokens=(response_json.get("usage") or {}).get("total_tokens"))
 
         logger.debug(f"[async] OpenRouter API Response: {json.dumps(response_json, indent=2)}")
 
@@ -270,6 +285,9 @@ async def call_openrouter_api_async(model: str, prompt: str, temperature: float,
             return None, f"{err_msg} Full response: {response_json}"
 
     except httpx.HTTPStatusError as http_err:
+        if http_err.response.status_code == 429:
+            permit.report_rate_limited(_retry_after_seconds(http_err.response.headers))
+        permit.release(success=False)
         error_details = f"HTTP error occurred: {http_err} - Status: {http_err.response.status_code}, Response: {http_err.response.text}"
         logger.error(error_details)
         return None, error_details
@@ -277,13 +295,18 @@ async def call_openrouter_api_async(model: str, prompt: str, temperature: float,
         error_details = f"Unexpected error during OpenRouter API call: {str(e)}\n{traceback.format_exc()}"
         logger.error(error_details)
         return None, error_details
+    finally:
+        # No-op when already settled; returns the budget if the request was cancelled mid-flight
+        permit.release(success=False)
 
 async def call_gemini_api_async(model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger) -> Tuple[Optional[str], Optional[str]]:
     """
     Async version of Gemini API call (runs in thread pool since google.generativeai is sync).
     """
     loop = asyncio.get_running_loop()
-    return await loop.run_in_executor(None, call_gemini_api, model, prompt, temperature, max_tokens, logger)
+    # Copy the context so the caller's scheduling priority follows the call into the worker thread
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(None, context.run, call_gemini_api, model, prompt, temperature, max_tokens, logger)
 
 async def call_llm_with_fallback_async(model_config: dict, prompt: str, temperature: float, logger: logging.Logger) -> Tuple[Optional[str], Optional[str]]:
     """
@@ -318,3 +341,218 @@ async def call_llm_with_fallback_async(model_config: dict, prompt: str, temperat
 
 # Alias para uso externo
 call_llm_api_async = call_llm_with_fallback_async
+
+
+# ---------------------------------------------------------------------------
+# Streaming
+# ---------------------------------------------------------------------------
+
+@dataclass
+class StreamResult:
+    """Outcome of a streamed completion, including latency and cancellation info."""
+    content: Optional[str]
+    error: Optional[str]
+    model: Optional[str] = None
+    time_to_first_token: Optional[float] = None
+    total_time: float = 0.0
+    chunks: int = 0
+    cancelled: bool = False  # Stopped early because the JSON monitor found the response malformed
+
+def _resolve_api_key(provider: str, env_var: str):
+    """Returns (api_key, key_name, manager_key) using the key manager when available."""
+    if API_KEY_MANAGER_AVAILABLE:
+        key = get_api_key_manager().get_best_key(provider)
+        if key:
+            return key.key, key.name, key
+    api_key = os.getenv(env_var)
+    return api_key, "default", None
+
+async def stream_openrouter_api_async(model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger) -> AsyncIterator[str]:
+    """
+    Streams content deltas from OpenRouter's server-sent events endpoint.
+    Closing the generator aborts the HTTP request.
+    """
+    api_key, key_name, manager_key = _resolve_api_key("openrouter", "OPENROUTER_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENROUTER_API_KEY environment variable not set.")
+
+    payload = {
+        "model": model,
+        "messages": [{"role": "user", "content": prompt}],
+        "temperature": temperature,
+        "stream": True
+    }
+    if max_tokens and max_tokens > 0:
+        payload['max_tokens'] = max_tokens
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+
+    permit = await get_llm_scheduler().acquire_async("openrouter", key_name, _estimate_tokens(prompt, max_tokens))
+    usage_tokens = None
+    success = False
+    try:
+        async with httpx.AsyncClient(timeout=60) as client:
+            async with client.stream("POST", f"{OPENROUTER_BASE_URL}/chat/completions", json=payload, headers=headers) as response:
+                if response.status_code >= 400:
+                    body = (await response.aread()).decode("utf-8", errors="replace")
+                    if response.status_code == 429:
+                        permit.report_rate_limited(_retry_after_seconds(response.headers))
+                    raise RuntimeError(f"HTTP error occurred - Status: {response.status_code}, Response: {body}")
+
+                async for line in response.aiter_lines():
+                    # SSE comments (": OPENROUTER PROCESSING") keep the connection alive
+                    if not line.startswith("data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == "[DONE]":
+                        break
+                    event = json.loads(data)
+                    if event.get("error"):
+                        raise RuntimeError(f"OpenRouter stream error: {event['error']}")
+                    if event.get("usage"):
+                        usage_tokens = event["usage"].get("total_tokens")
+                    delta = (event.get("choices") or [{}])[0].get("delta", {}).get("content")
+                    if delta:
+                        yield delta
+        success = True
+    except GeneratorExit:
+        success = True  # The consumer stopped reading early; the key itself worked
+        raise
+    finally:
+        permit.release(actual_tokens=usage_tokens, success=success)
+        if manager_key is not None:
+            get_api_key_manager().mark_key_result(manager_key, success, "" if success else "stream failed")
+
+async def stream_gemini_api_async(model: str, prompt: str, temperature: float, max_tokens: Optional[int], logger: logging.Logger) -> AsyncIterator[str]:
+    """
+    Streams text chunks from Gemini. The SDK iterator is synchronous, so it is
+    drained on a worker thread that stops as soon as the consumer goes away.
+    """
+    api_key, key_name, manager_key = _resolve_api_key("gemini", "GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY environment variable not set.")
+
+    loop = asyncio.get_running_loop()
+    chunks: asyncio.Queue = asyncio.Queue()
+    stop = threading.Event()
+    done = object()
+    permit = await get_llm_scheduler().acquire_async("gemini", key_name, _estimate_tokens(prompt, max_tokens))
+
+    def produce():
+        usage_tokens = None
+        try:
+            genai.configure(api_key=api_key)
+            generation_config = genai.types.GenerationConfig(temperature=temperature)
+            if max_tokens and max_tokens > 0:
+                generation_config.max_output_tokens = max_tokens
+            gemini_model = genai.GenerativeModel(model.split('/')[-1])
+            response = gemini_model.generate_content(prompt, generation_config=generation_config, stream=True)
+            for chunk in response:
+                if stop.is_set():
+                    break
+                usage = getattr(chunk, "usage_metadata", None)
+                usage_tokens = getattr(usage, "total_token_count", None) or usage_tokens
+                text = getattr(chunk, "text", "")
+                if text:
+                    loop.call_soon_threadsafe(chunks.put_nowait, text)
+            permit.release(actual_tokens=usage_tokens)
+            loop.call_soon_threadsafe(chunks.put_nowait, done)
+        except Exception as e:
+            if _is_gemini_rate_limit(e):
+                permit.report_rate_limited()
+            permit.release(success=False)
+            loop.call_soon_threadsafe(chunks.put_nowait, e)
+
+    producer = loop.run_in_executor(None, produce)
+    success = False
+    try:
+        while True:
+            item = await chunks.get()
+            if item is done:
+                break
+            if isinstance(item, Exception):
+                raise RuntimeError(f"Gemini stream error: {item}") from item
+            yield item
+        success = True
+        await producer
+    except GeneratorExit:
+        success = True  # The consumer stopped reading early; the key itself worked
+        raise
+    finally:
+        stop.set()
+        if manager_key is not None:
+            get_api_key_manager().mark_key_result(manager_key, success, "" if success else "stream failed")
+
+async def _consume_stream(stream: AsyncIterator[str], model: str, monitor: Optional[IncrementalJSONParser], logger: logging.Logger) -> StreamResult:
+    started = time.perf_counter()
+    result = StreamResult(content=None, error=None, model=model)
+    parts = []
+    try:
+        async for delta in stream:
+            if result.time_to_first_token is None:
+                result.time_to_first_token = time.perf_counter() - started
+            parts.append(delta)
+            result.chunks += 1
+            if monitor is not None:
+                status = monitor.feed(delta)
+                if status == IncrementalJSONParser.MALFORMED and monitor.repairable:
+                    # Syntax the repair pass can fix: read the rest instead of cancelling
+                    logger.info(f"[stream] {model}: {monitor.error}; reading the full response for repair")
+                    monitor = None
+                    continue
+                if status == IncrementalJSONParser.MALFORMED:
+                    result.cancelled = True
+                    result.error = f"Streaming response malformed: {monitor.error}"
+                    logger.warning(f"[stream] Cancelling {model} after {result.chunks} chunks: {monitor.error}")
+                    break
+                if status == IncrementalJSONParser.COMPLETE:
+                    # Root JSON value closed: nothing after it is useful
+                    break
+    except Exception as e:
+        result.error = f"Streaming call to {model} failed: {e}"
+        logger.error(result.error)
+    finally:
+        await stream.aclose()
+        result.total_time = time.perf_counter() - started
+
+    if result.error is None:
+        result.content = "".join(parts)
+        if not result.content:
+            result.error = f"Streaming call to {model} returned no content"
+    if result.time_to_first_token is not None:
+        logger.info(f"[stream] {model}: TTFT {result.time_to_first_token:.2f}s, total {result.total_time:.2f}s, {result.chunks} chunks")
+    return result
+
+async def call_llm_streaming_async(model_config: dict, prompt: str, temperature: float, logger: logging.Logger,
+                                   monitor_factory=None) -> StreamResult:
+    """
+    Streaming counterpart of ``call_llm_with_fallback_async``.
+
+    ``monitor_factory`` builds a fresh ``IncrementalJSONParser`` per attempt; the
+    stream is cancelled as soon as it reports the response malformed beyond repair
+    (a failed field validator, no JSON at all), and stops reading once the JSON
+    value is complete. A malformed primary response is
+    returned as-is (the caller decides whether to retry); transport failures
+    fall back to the fallback model.
+    """
+    if isinstance(model_config, str):
+        model_config = {"primary": model_config}
+
+    max_tokens = model_config.get("max_tokens")
+    result = StreamResult(content=None, error="Both primary and fallback models failed or are not configured.")
+
+    for role in ("primary", "fallback"):
+        model = model_config.get(role)
+        if not model:
+            continue
+        logger.info(f"[stream] Calling {role} model: {model}")
+        if model.startswith("gemini/"):
+            stream = stream_gemini_api_async(model, prompt, temperature, max_tokens, logger)
+        else:
+            stream = stream_openrouter_api_async(model, prompt, temperature, max_tokens, logger)
+        monitor = monitor_factory() if monitor_factory else None
+        result = await _consume_stream(stream, model, monitor, logger)
+        if result.content is not None or result.cancelled:
+            return result
+        logger.warning(f"[stream] {role.capitalize()} model '{model}' failed. Error: {result.error}.")
+
+    return result
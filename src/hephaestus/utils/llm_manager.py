@@ -6,12 +6,13 @@ import asyncio
 import time
 import json
 from typing import Dict, Any, Optional, Tuple, List, Callable
+from collections import deque
 from functools import wraps
 from contextlib import asynccontextmanager
 import logging
 
-from hephaestus.utils.llm_client import call_llm_api, call_llm_with_fallback, call_llm_with_fallback_async
-from hephaestus.utils.json_parser import parse_json_response
+from hephaestus.utils.llm_client import call_llm_api, call_llm_with_fallback, call_llm_with_fallback_async, call_llm_streaming_async
+from hephaestus.utils.json_parser import parse_json_response, IncrementalJSONParser
 from hephaestus.utils.intelligent_cache import IntelligentCache
 from hephaestus.utils.metrics_collector import MetricsCollector
 
@@ -32,6 +33,13 @@ class LLMCallManager:
             'timeout': 60,
             'cache_enabled': True,
         }
+        
+        # Streaming latency tracking (time-to-first-token and early cancellations)
+        self.streaming_stats = {
+            'streamed_calls': 0,
+            'cancelled_early': 0,
+            'recent_ttft': deque(maxlen=200)
+        }
     
     async def safe_call_with_retry(self, 
                                  prompt: str, 
@@ -162,17 +170,25 @@ class LLMCallManager:
     
     async def call_with_json_response(self, 
                                     prompt: str, 
+                                    stream: bool = False,
+                                    field_validators: Optional[Dict[str, Callable[[Any], Optional[str]]]] = None,
                                     **kwargs) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
         """
         Make an LLM call expecting a JSON response.
         
         Args:
             prompt: The prompt to send to the LLM
+            stream: Stream the completion and validate the JSON as it arrives
+            field_validators: Per top-level key validators used while streaming;
+                a failing validator cancels the call early
             **kwargs: Additional parameters for LLM call
             
         Returns:
             Tuple of (parsed_json, error_message)
         """
+        if stream:
+            return await self._call_with_streaming_json(prompt, field_validators, **kwargs)
+        
         response, error = await self.safe_call_with_retry(prompt, **kwargs)
         
         if error:
@@ -190,6 +206,101 @@ class LLMCallManager:
         
         return parsed_json, None
     
+    async def _call_with_streaming_json(self,
+                                        prompt: str,
+                                        field_validators: Optional[Dict[str, Callable[[Any], Optional[str]]]] = None,
+                                        temperature: float = None,
+                                        max_retries: int = None,
+                                        fallback_models: List[str] = None,
+                                        cache_key: Optional[str] = None,
+                                        **kwargs) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """
+        Streaming JSON call: responses failing a field validator are cancelled mid-stream
+        and retried; syntax errors are repaired by parse_json_response once the stream ends.
+        """
+        temperature = temperature if temperature is not None else self.default_settings['temperature']
+        max_retries = max_retries if max_retries is not None else self.default_settings['max_retries']
+        
+        if cache_key is None and self.default_settings['cache_enabled']:
+            cache_key = self._generate_cache_key(prompt, temperature, kwargs)
+        cached_result = self.cache.get(cache_key) if cache_key else None
+        if cached_result:
+            parsed_json, parse_error = parse_json_response(cached_result, self.logger)
+            if not parse_error:
+                return parsed_json, None
+        
+        configs = [(self.model_config, False)] * max_retries
+        configs += [({**self.model_config, 'primary': model, 'fallback': None}, True) for model in (fallback_models or [])]
+        
+        def monitor_factory() -> IncrementalJSONParser:
+            return IncrementalJSONParser(field_validators=field_validators)
+        
+        last_error = "All LLM call attempts failed"
+        for attempt, (model_config, is_fallback) in enumerate(configs, start=1):
+            result = await call_llm_streaming_async(model_config, prompt, temperature, self.logger, monitor_factory)
+            
+            self.streaming_stats['streamed_calls'] += 1
+            if result.cancelled:
+                self.streaming_stats['cancelled_early'] += 1
+            if result.time_to_first_token is not None:
+                self.streaming_stats['recent_ttft'].append(result.time_to_first_token)
+            
+            parsed_json, error = None, result.error
+            if result.content is not None:
+                parsed_json, error = parse_json_response(result.content, self.logger)
+                if error is None:
+                    # The stream may have stopped validating after a repairable syntax error
+                    error = self._validate_fields(parsed_json, field_validators)
+            
+            self.metrics.record_llm_call(
+                model=result.model or str(model_config),
+                prompt_tokens=len(prompt.split()),
+                completion_tokens=len(result.content.split()) if result.content else 0,
+                duration=result.total_time,
+                success=error is None,
+                fallback=is_fallback,
+                attempt=attempt,
+                time_to_first_token=result.time_to_first_token,
+                streamed=True,
+                cancelled=result.cancelled
+            )
+            
+            if error is None:
+                if cache_key:
+                    self.cache.set(cache_key, result.content)
+                return parsed_json, None
+            
+            last_error = error
+            self.logger.warning(f"Streaming JSON attempt {attempt} failed: {error}")
+            # Early-cancelled responses are retried immediately; transport errors back off
+            if not result.cancelled and attempt < len(configs):
+                await asyncio.sleep(2 ** min(attempt - 1, 3))
+        
+        return None, last_error
+    
+    @staticmethod
+    def _validate_fields(parsed_json: Any,
+                         field_validators: Optional[Dict[str, Callable[[Any], Optional[str]]]]) -> Optional[str]:
+        if not field_validators or not isinstance(parsed_json, dict):
+            return None
+        for key, validator in field_validators.items():
+            if key in parsed_json:
+                error = validator(parsed_json[key])
+                if error:
+                    return f"Field '{key}' is invalid: {error}"
+        return None
+    
+    def get_streaming_stats(self) -> Dict[str, Any]:
+        """Time-to-first-token and early-cancellation statistics for streamed calls."""
+        ttft = sorted(self.streaming_stats['recent_ttft'])
+        return {
+            'streamed_calls': self.streaming_stats['streamed_calls'],
+            'cancelled_early': self.streaming_stats['cancelled_early'],
+            'average_ttft': sum(ttft) / len(ttft) if ttft else None,
+            'p50_ttft': ttft[len(ttft) // 2] if ttft else None,
+            'p95_ttft': ttft[min(len(ttft) - 1, int(len(ttft) * 0.95))] if ttft else None,
+        }
+    
     @asynccontextmanager
     async def _call_context(self, operation_name: str):
         """Context manager for LLM call metrics and error handling."""
@@ -0,0 +1,412 @@
+"""
+Log Index - Índice local e incremental dos arquivos de log do agente
+
+Cada arquivo registrado é acompanhado por um ``LogTailer``, que lê apenas os
+bytes novos desde a última leitura (offset + inode). Quando o arquivo é
+rotacionado (o inode muda) o restante do arquivo antigo é lido a partir do
+backup ``<arquivo>.1`` antes de recomeçar no arquivo novo; se for truncado, a
+leitura recomeça do início.
+
+As entradas recebem um número de sequência crescente (usado como cursor) e são
+indexadas em baldes de tempo, por nível, logger e ciclo. O ciclo vem do marcador
+``START CYCLE #N`` que o ``CycleRunner`` registra. Consultas filtradas (ex.:
+"últimos N erros desde T") percorrem só os baldes e listas relevantes, sem
+reler arquivos.
+
+Formatos reconhecidos: o texto do ``LoggerFactory`` (``data - logger - NÍVEL -
+mensagem``), o de ``logging.basicConfig`` (``NÍVEL:logger:mensagem``) e o sink
+JSON Lines. Linhas que não casam (tracebacks) são anexadas à entrada anterior.
+Por padrão é indexado um único sink, já que os dois recebem os mesmos registros:
+o JSON Lines quando ``logging_pipeline.jsonl`` está ativo, senão o texto.
+"""
+
+import bisect
+import json
+import logging
+import re
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from hephaestus.utils.logger_factory import DEFAULT_PIPELINE_SETTINGS
+
+DEFAULT_TEXT_LOG = "data/logs/hephaestus_main.log"
+READ_CHUNK_BYTES = 1024 * 1024  # leitura limitada por bloco, mesmo na primeira indexação de um log grande
+
+_TEXT_LINE = re.compile(
+    r"^(?P<ts>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2})(?:[,.]\d+)? - (?P<logger>\S+) - "
+    r"(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL) - (?P<msg>.*)$"
+)
+_BASIC_LINE = re.compile(r"^(?P<level>DEBUG|INFO|WARNING|ERROR|CRITICAL):(?P<logger>[^:]+):(?P<msg>.*)$")
+_CYCLE_MARKER = re.compile(r"START CYCLE #(\d+)")
+
+
+class LogEntry:
+    """Uma entrada de log indexada (mensagens multilinha incluem o traceback)."""
+
+    __slots__ = ("seq", "ts", "level", "logger", "message", "cycle", "source")
+
+    def __init__(self, seq: int, ts: float, level: str, logger: str, message: str,
+                 cycle: Optional[int], source: str):
+        self.seq = seq
+        self.ts = ts
+        self.level = level
+        self.logger = logger
+        self.message = message
+        self.cycle = cycle
+        self.source = source
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.seq,
+            "timestamp": datetime.fromtimestamp(self.ts).isoformat(),
+            "level": self.level,
+            "component": self.logger,
+            "message": self.message,
+            "cycle": self.cycle,
+            "source": self.source,
+        }
+
+    def to_line(self) -> str:
+        stamp = datetime.fromtimestamp(self.ts).strftime("%Y-%m-%d %H:%M:%S")
+        return f"{stamp} - {self.logger} - {self.level} - {self.message}"
+
+
+class LogTailer:
+    """Lê incrementalmente um arquivo de log, acompanhando offset e inode."""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.inode: Optional[int] = None
+        self.offset = 0
+        self._partial = b""
+
+    def read_new_lines(self) -> List[str]:
+        return [line for lines in self.iter_new_lines() for line in lines]
+
+    def iter_new_lines(self) -> Iterator[List[str]]:
+        """Linhas novas, em lotes de até ``READ_CHUNK_BYTES``; o offset avança a cada lote."""
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return
+
+        if self.inode is not None and stat.st_ino != self.inode:
+            # Rotacionado: termina o arquivo antigo (agora <arquivo>.1) antes de trocar
+            rotated = self.path.with_name(self.path.name + ".1")
+            try:
+                if rotated.stat().st_ino == self.inode:
+                    yield from self._read_from(rotated, final=True)
+            except FileNotFoundError:
+                pass
+            self.offset = 0
+            self._partial = b""
+        elif stat.st_size < self.offset:
+            # Truncado no lugar
+            self.offset = 0
+            self._partial = b""
+
+        self.inode = stat.st_ino
+        if stat.st_size > self.offset:
+            yield from self._read_from(self.path)
+
+    def _read_from(self, path: Path, final: bool = False) -> Iterator[List[str]]:
+        with open(path, "rb") as f:
+            f.seek(self.offset)
+            while True:
+                data = f.read(READ_CHUNK_BYTES)
+                if not data:
+                    break
+                self.offset += len(data)
+                chunks = (self._partial + data).split(b"\n")
+                # A última linha só entra quando estiver completa
+                self._partial = chunks.pop()
+                yield [chunk.decode("utf-8", errors="replace").rstrip("\r") for chunk in chunks]
+        if final and self._partial:
+            # Arquivo já rotacionado: a última linha não vai mais crescer
+            partial, self._partial = self._partial, b""
+            yield [partial.decode("utf-8", errors="replace").rstrip("\r")]
+
+
+class _Bucket:
+    """Entradas de uma janela de tempo, com listas de sequência por chave."""
+
+    __slots__ = ("seqs", "by_level", "by_logger", "by_cycle")
+
+    def __init__(self):
+        self.seqs: List[int] = []
+        self.by_level: Dict[str, List[int]] = {}
+        self.by_logger: Dict[str, List[int]] = {}
+        self.by_cycle: Dict[int, List[int]] = {}
+
+    def add(self, entry: LogEntry):
+        self.seqs.append(entry.seq)
+        self.by_level.setdefault(entry.level, []).append(entry.seq)
+        self.by_logger.setdefault(entry.logger, []).append(entry.seq)
+        if entry.cycle is not None:
+            self.by_cycle.setdefault(entry.cycle, []).append(entry.seq)
+
+
+class LogIndex:
+    """Índice em memória dos logs, atualizado incrementalmente a partir dos arquivos."""
+
+    def __init__(self, sources: Optional[Iterable[str]] = None, bucket_seconds: float = 60.0,
+                 max_entries: int = 100000, refresh_interval: float = 1.0):
+        self.bucket_seconds = bucket_seconds
+        self.max_entries = max_entries
+        self.refresh_interval = refresh_interval
+
+        self._tailers: Dict[str, LogTailer] = {}
+        self._entries: Deque[LogEntry] = deque()
+        self._next_seq = 1
+        self._buckets: Dict[int, _Bucket] = {}
+        self._bucket_keys: List[int] = []
+        # Último ciclo visto e última entrada (para linhas de continuação) por arquivo
+        self._current_cycle: Dict[str, Optional[int]] = {}
+        self._last_entry: Dict[str, LogEntry] = {}
+        # Cursores dos consumidores de delta (ex.: LogAnalysisAgent)
+        self._consumer_cursors: Dict[str, int] = {}
+        self._last_refresh = 0.0
+        self._ts_cache: Tuple[str, float] = ("", 0.0)
+        self._lock = threading.RLock()
+
+        for source in sources or []:
+            self.add_source(source)
+
+    # ------------------------------------------------------------------
+    # Ingestão
+    # ------------------------------------------------------------------
+    def add_source(self, path: str):
+        with self._lock:
+            key = str(path)
+            if key not in self._tailers:
+                self._tailers[key] = LogTailer(key)
+
+    def refresh(self, force: bool = False) -> int:
+        """Indexa as linhas novas de todos os arquivos; devolve quantas entradas entraram."""
+        with self._lock:
+            now = time.monotonic()
+            if not force and now - self._last_refresh < self.refresh_interval:
+                return 0
+            self._last_refresh = now
+            added = 0
+            for source, tailer in self._tailers.items():
+                try:
+                    for lines in tailer.iter_new_lines():
+                        for line in lines:
+                            added += self._ingest_line(source, line)
+                        self._evict()
+                except OSError as e:
+                    logging.getLogger("hephaestus.log_index").debug(f"Could not tail {source}: {e}")
+            return added
+
+    def _ingest_line(self, source: str, line: str) -> int:
+        if not line.strip():
+            return 0
+        parsed = self._parse_line(line)
+        if parsed is None:
+            previous = self._last_entry.get(source)
+            if previous is not None:
+                previous.message += "\n" + line
+                return 0
+            parsed = (time.time(), "UNKNOWN", "unknown", line)
+
+        ts, level, logger_name, message = parsed
+        marker = _CYCLE_MARKER.search(message)
+        if marker:
+            self._current_cycle[source] = int(marker.group(1))
+        entry = LogEntry(self._next_seq, ts, level, logger_name, message,
+                         self._current_cycle.get(source), source)
+        self._next_seq += 1
+        self._entries.append(entry)
+        self._last_entry[source] = entry
+
+        bucket_key = int(ts // self.bucket_seconds)
+        bucket = self._buckets.get(bucket_key)
+        if bucket is None:
+            bucket = self._buckets[bucket_key] = _Bucket()
+            bisect.insort(self._bucket_keys, bucket_key)
+        bucket.add(entry)
+        return 1
+
+    def _parse_line(self, line: str) -> Optional[Tuple[float, str, str, str]]:
+        if line.startswith("{"):
+            try:
+                data = json.loads(line)
+                return (float(data["ts"]), str(data["level"]), str(data["logger"]),
+                        str(data["msg"]) + (f"\n{data['exc']}" if data.get("exc") else ""))
+            except (ValueError, KeyError, TypeError):
+                return None
+        match = _TEXT_LINE.match(line)
+        if match:
+            return self._timestamp(match.group("ts")), match.group("level"), match.group("logger"), match.group("msg")
+        match = _BASIC_LINE.match(line)
+        if match:
+            return time.time(), match.group("level"), match.group("logger"), match.group("msg")
+        return None
+
+    def _timestamp(self, text: str) -> float:
+        # Linhas vizinhas costumam repetir o mesmo segundo
+        if self._ts_cache[0] == text:
+            return self._ts_cache[1]
+        ts = datetime.strptime(text.replace("T", " "), "%Y-%m-%d %H:%M:%S").timestamp()
+        self._ts_cache = (text, ts)
+        return ts
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popleft()
+        if not self._entries:
+            return
+        first_seq = self._entries[0].seq
+        # Baldes inteiramente anteriores à entrada mais antiga saem do índice
+        while self._bucket_keys:
+            bucket = self._buckets[self._bucket_keys[0]]
+            if bucket.seqs and bucket.seqs[-1] >= first_seq:
+                break
+            del self._buckets[self._bucket_keys.pop(0)]
+
+    def _entry(self, seq: int) -> Optional[LogEntry]:
+        if not self._entries:
+            return None
+        position = seq - self._entries[0].seq
+        if 0 <= position < len(self._entries):
+            return self._entries[position]
+        return None
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def query(self, level: Optional[str] = None, logger_name: Optional[str] = None,
+              cycle: Optional[int] = None, since: Optional[float] = None,
+              until: Optional[float] = None, cursor: Optional[int] = None,
+              limit: int = 50) -> Dict[str, Any]:
+        """
+        Entradas mais recentes primeiro. ``logger_name`` casa o nome exato ou
+        descendentes (``hephaestus.agents`` casa ``hephaestus.agents.architect``).
+        ``cursor`` é o ``next_cursor`` da página anterior.
+        """
+        self.refresh()
+        levels = {part.strip().upper() for part in level.split(",")} if level else None
+        limit = max(1, limit)
+
+        with self._lock:
+            results: List[LogEntry] = []
+            first_key = int(since // self.bucket_seconds) if since is not None else None
+            last_key = int(until // self.bucket_seconds) if until is not None else None
+            start = bisect.bisect_left(self._bucket_keys, first_key) if first_key is not None else 0
+            end = bisect.bisect_right(self._bucket_keys, last_key) if last_key is not None else len(self._bucket_keys)
+
+            for bucket_key in reversed(self._bucket_keys[start:end]):
+                bucket = self._buckets[bucket_key]
+                for seq in reversed(self._candidates(bucket, levels, logger_name, cycle)):
+                    if cursor is not None and seq >= cursor:
+                        continue
+                    entry = self._entry(seq)
+                    if entry is None or not self._matches(entry, levels, logger_name, cycle, since, until):
+                        continue
+                    results.append(entry)
+                    if len(results) > limit:
+                        break
+                if len(results) > limit:
+                    break
+
+            # Baldes fora de ordem de sequência (fontes intercaladas) são reordenados
+            results.sort(key=lambda entry: entry.seq, reverse=True)
+            has_more = len(results) > limit
+            page = results[:limit]
+            return {
+                "entries": [entry.to_dict() for entry in page],
+                "next_cursor": page[-1].seq if has_more else None,
+                "indexed_entries": len(self._entries),
+            }
+
+    def _candidates(self, bucket: _Bucket, levels: Optional[set], logger_name: Optional[str],
+                    cycle: Optional[int]) -> List[int]:
+        """A menor lista de sequência que satisfaz um dos filtros indexados."""
+        options = [bucket.seqs]
+        if cycle is not None:
+            options.append(bucket.by_cycle.get(cycle, []))
+        if levels:
+            options.append(sorted(seq for lvl in levels for seq in bucket.by_level.get(lvl, [])))
+        if logger_name:
+            options.append(sorted(
+                seq for name, seqs in bucket.by_logger.items()
+                if name == logger_name or name.startswith(logger_name + ".")
+                for seq in seqs
+            ))
+        return min(options, key=len)
+
+    @staticmethod
+    def _matches(entry: LogEntry, levels: Optional[set], logger_name: Optional[str],
+                 cycle: Optional[int], since: Optional[float], until: Optional[float]) -> bool:
+        if levels and entry.level not in levels:
+            return False
+        if logger_name and not (entry.logger == logger_name or entry.logger.startswith(logger_name + ".")):
+            return False
+        if cycle is not None and entry.cycle != cycle:
+            return False
+        if since is not None and entry.ts < since:
+            return False
+        if until is not None and entry.ts > until:
+            return False
+        return True
+
+    def delta_since(self, consumer: str, source: Optional[str] = None, limit: int = 200) -> List[LogEntry]:
+        """
+        Entradas indexadas depois da última chamada do mesmo ``consumer`` (em
+        ordem cronológica, no máximo as ``limit`` mais recentes) e avança o cursor.
+        """
+        self.refresh(force=True)
+        with self._lock:
+            last_seq = self._consumer_cursors.get(consumer, 0)
+            new_entries = [entry for entry in self._entries_after(last_seq)
+                           if source is None or entry.source == str(source)]
+            if self._entries:
+                self._consumer_cursors[consumer] = self._entries[-1].seq
+            return new_entries[-limit:] if limit else new_entries
+
+    def _entries_after(self, seq: int) -> List[LogEntry]:
+        if not self._entries:
+            return []
+        position = max(0, seq - self._entries[0].seq + 1)
+        return [self._entries[i] for i in range(position, len(self._entries))]
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sources": {source: {"offset": tailer.offset, "inode": tailer.inode}
+                            for source, tailer in self._tailers.items()},
+                "indexed_entries": len(self._entries),
+                "buckets": len(self._buckets),
+                "consumers": dict(self._consumer_cursors),
+            }
+
+
+def default_log_sources(config: Optional[Dict[str, Any]] = None) -> List[str]:
+    """Um único sink do LoggerFactory: o JSON Lines se estiver ativo, senão o log de texto"""
+    pipeline = (config or {}).get("logging_pipeline") or {}
+    jsonl = {**DEFAULT_PIPELINE_SETTINGS["jsonl"], **(pipeline.get("jsonl") or {})}
+    return [str(jsonl["path"])] if jsonl["enabled"] else [DEFAULT_TEXT_LOG]
+
+
+_log_index: Optional[LogIndex] = None
+_log_index_lock = threading.Lock()
+
+
+def get_log_index(config: Optional[Dict[str, Any]] = None) -> LogIndex:
+    """Obtém o índice global; a primeira chamada define fontes e limites"""
+    global _log_index
+    with _log_index_lock:
+        if _log_index is None:
+            index_config = (config or {}).get("log_index", {})
+            _log_index = LogIndex(
+                sources=index_config.get("sources") or default_log_sources(config),
+                bucket_seconds=index_config.get("bucket_seconds", 60.0),
+                max_entries=index_config.get("max_entries", 100000),
+                refresh_interval=index_config.get("refresh_interval_seconds", 1.0),
+            )
+        return _log_index
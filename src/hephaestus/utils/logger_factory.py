@@ -1,25 +1,351 @@
 """
 Logger Factory - Standardized logger creation and configuration
+
+Loggers never write to disk on the calling thread: the root logger has a single
+``BoundedQueueHandler`` that puts records on a bounded queue, and a
+``BatchingQueueListener`` thread drains it in batches into the console, file
+and (optional) JSON Lines handlers, flushing once per batch. When the queue is
+full the configured overflow policy decides what is dropped, and the pipeline
+counts emitted/dropped records and flush latency.
 """
 
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from datetime import datetime
 
 
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block")
+
+# Renders tracebacks on the caller's thread, while exc_info is still alive
+_TRACEBACK_FORMATTER = logging.Formatter()
+
+DEFAULT_PIPELINE_SETTINGS: Dict[str, Any] = {
+    "enabled": True,
+    "queue_size": 10000,
+    "overflow_policy": "drop_newest",
+    "block_timeout_seconds": 0.05,
+    "preserve_level": "ERROR",
+    "batch_size": 256,
+    "flush_interval_seconds": 0.5,
+    "jsonl": {
+        "enabled": False,
+        "path": "data/logs/hephaestus_main.jsonl",
+        "max_bytes": 10 * 1024 * 1024,
+        "backup_count": 5,
+    },
+}
+
+
+class LogPipelineStats:
+    """Thread-safe counters describing what logging costs."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.emitted = 0
+        self.dropped = 0
+        self.blocked = 0
+        self.written = 0
+        self.batches = 0
+        self.flush_seconds_total = 0.0
+        self.flush_seconds_max = 0.0
+        self.queue_high_water = 0
+
+    def record_enqueue(self, depth: int, blocked: bool = False):
+        with self._lock:
+            self.emitted += 1
+            if blocked:
+                self.blocked += 1
+            if depth > self.queue_high_water:
+                self.queue_high_water = depth
+
+    def record_drop(self):
+        with self._lock:
+            self.dropped += 1
+
+    def record_batch(self, size: int, flush_seconds: float):
+        with self._lock:
+            self.written += size
+            self.batches += 1
+            self.flush_seconds_total += flush_seconds
+            self.flush_seconds_max = max(self.flush_seconds_max, flush_seconds)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "emitted": self.emitted,
+                "dropped": self.dropped,
+                "blocked": self.blocked,
+                "written": self.written,
+                "batches": self.batches,
+                "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0.0,
+                "flush_latency_ms_avg": round(self.flush_seconds_total * 1000 / self.batches, 3) if self.batches else 0.0,
+                "flush_latency_ms_max": round(self.flush_seconds_max * 1000, 3),
+                "flush_latency_ms_total": round(self.flush_seconds_total * 1000, 3),
+                "queue_high_water": self.queue_high_water,
+            }
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records without blocking the caller (unless the policy says so).
+
+    Overflow policies: ``drop_newest`` discards the incoming record,
+    ``drop_oldest`` evicts the oldest queued record, ``block`` waits up to
+    ``block_timeout`` and then drops. Records at or above ``preserve_level``
+    always wait up to ``block_timeout`` before the policy applies.
+    """
+
+    def __init__(self, log_queue: queue.Queue, stats: LogPipelineStats,
+                 overflow_policy: str = "drop_newest", block_timeout: float = 0.05,
+                 preserve_level: int = logging.ERROR):
+        super().__init__(log_queue)
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown log overflow policy '{overflow_policy}' (expected one of {OVERFLOW_POLICIES})")
+        self.stats = stats
+        self.overflow_policy = overflow_policy
+        self.block_timeout = block_timeout
+        self.preserve_level = preserve_level
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only merges msg/args and renders the traceback; formatting happens on the listener thread
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _TRACEBACK_FORMATTER.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.stats.record_enqueue(self.queue.qsize())
+            return
+        except queue.Full:
+            pass
+
+        if self.overflow_policy == "block" or record.levelno >= self.preserve_level:
+            try:
+                self.queue.put(record, timeout=self.block_timeout)
+                self.stats.record_enqueue(self.queue.qsize(), blocked=True)
+                return
+            except queue.Full:
+                pass
+
+        if self.overflow_policy == "drop_oldest":
+            try:
+                self.queue.get_nowait()
+                self.stats.record_drop()
+                self.queue.put_nowait(record)
+                self.stats.record_enqueue(self.queue.qsize())
+                return
+            except (queue.Empty, queue.Full):
+                pass
+        self.stats.record_drop()
+
+
+class _BatchFlushMixin:
+    """Stream handlers that leave flushing to the listener (once per batch)."""
+
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+    def close(self):
+        self.flush_batch()
+        super().close()
+
+
+class BatchedFileHandler(_BatchFlushMixin, logging.FileHandler):
+    pass
+
+
+class BatchedRotatingFileHandler(_BatchFlushMixin, logging.handlers.RotatingFileHandler):
+    pass
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """One compact JSON object per record."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "thread": record.threadName,
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class BatchingQueueListener:
+    """
+    Drains the log queue on a background thread and dispatches records in batches.
+
+    Handlers can be added while running; each handler's level and filters are
+    respected (component files use a ``logging.Filter`` on the logger name).
+    """
+
+    def __init__(self, log_queue: queue.Queue, stats: LogPipelineStats,
+                 batch_size: int = 256, flush_interval: float = 0.5):
+        self.queue = log_queue
+        self.stats = stats
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self._handlers: List[logging.Handler] = []
+        self._handlers_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+    @property
+    def handlers(self) -> List[logging.Handler]:
+        with self._handlers_lock:
+            return list(self._handlers)
+
+    def add_handler(self, handler: logging.Handler):
+        with self._handlers_lock:
+            if handler not in self._handlers:
+                self._handlers.append(handler)
+
+    def remove_handler(self, handler: logging.Handler):
+        with self._handlers_lock:
+            if handler in self._handlers:
+                self._handlers.remove(handler)
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="hephaestus-log-listener", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """Writes everything still queued, then stops the thread."""
+        if self._thread is None:
+            return
+        self._stopping = True
+        self._thread.join(timeout)
+        self._thread = None
+        while not self.queue.empty():
+            self._drain()
+
+    def _run(self):
+        while not self._stopping:
+            self._drain(wait=self.flush_interval)
+
+    def _drain(self, wait: Optional[float] = None):
+        batch = []
+        try:
+            if wait is not None:
+                batch.append(self.queue.get(timeout=wait))
+            while len(batch) < self.batch_size:
+                batch.append(self.queue.get_nowait())
+        except queue.Empty:
+            pass
+        if batch:
+            self._dispatch(batch)
+
+    def _dispatch(self, batch: List[logging.LogRecord]):
+        handlers = self.handlers
+        for record in batch:
+            for handler in handlers:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        started = time.perf_counter()
+        for handler in handlers:
+            try:
+                getattr(handler, "flush_batch", handler.flush)()
+            except Exception:
+                handler.handleError(batch[-1])
+        self.stats.record_batch(len(batch), time.perf_counter() - started)
+
+
+class LoggingPipeline:
+    """Bounded queue + batching listener; ``queue_handler`` goes on the root logger."""
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = {**DEFAULT_PIPELINE_SETTINGS, **(settings or {})}
+        self.settings = settings
+        self.stats = LogPipelineStats()
+        self.queue: queue.Queue = queue.Queue(maxsize=max(1, int(settings["queue_size"])))
+        self.queue_handler = BoundedQueueHandler(
+            self.queue,
+            self.stats,
+            overflow_policy=settings["overflow_policy"],
+            block_timeout=float(settings["block_timeout_seconds"]),
+            preserve_level=logging.getLevelName(str(settings["preserve_level"]).upper()),
+        )
+        self.listener = BatchingQueueListener(
+            self.queue,
+            self.stats,
+            batch_size=int(settings["batch_size"]),
+            flush_interval=float(settings["flush_interval_seconds"]),
+        )
+
+    def add_handler(self, handler: logging.Handler):
+        self.listener.add_handler(handler)
+
+    def start(self):
+        self.listener.start()
+
+    def stop(self):
+        self.listener.stop()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = self.stats.snapshot()
+        stats["queue_depth"] = self.queue.qsize()
+        stats["queue_size"] = self.queue.maxsize
+        stats["overflow_policy"] = self.queue_handler.overflow_policy
+        return stats
+
+
 class LoggerFactory:
     """Factory for creating standardized loggers with consistent formatting."""
     
     _loggers: Dict[str, logging.Logger] = {}
     _configured = False
+    _pipeline_settings: Dict[str, Any] = {}
+    _pipeline: Optional[LoggingPipeline] = None
+    # Agent/service file handlers (re-attached when the pipeline is reconfigured)
+    _component_handlers: Dict[str, logging.Handler] = {}
+    _lock = threading.RLock()
+    
+    @classmethod
+    def configure(cls, config: Optional[Dict[str, Any]] = None):
+        """
+        Apply the ``logging_pipeline`` section of the agent configuration.
+
+        Replaces the root handlers (e.g. from ``logging.basicConfig``) with the
+        pipeline. Can be called after loggers were created: the pipeline is
+        rebuilt and the component file handlers are carried over.
+        """
+        with cls._lock:
+            cls._pipeline_settings = dict((config or {}).get("logging_pipeline") or {})
+            cls._configure_logging()
     
     @classmethod
     def _ensure_configured(cls):
         """Ensure logging is configured."""
         if not cls._configured:
-            cls._configure_logging()
+            with cls._lock:
+                if not cls._configured:
+                    cls._configure_logging()
     
     @classmethod
     def _configure_logging(cls):
@@ -32,9 +358,12 @@ class LoggerFactory:
         root_logger = logging.getLogger()
         root_logger.setLevel(logging.INFO)
         
-        # Clear existing handlers
+        # Clear existing handlers (writing out whatever the previous pipeline still holds)
         for handler in root_logger.handlers[:]:
             root_logger.removeHandler(handler)
+        if cls._pipeline is not None:
+            cls._pipeline.stop()
+            cls._pipeline = None
         
         # Create formatters
         detailed_formatter = logging.Formatter(
@@ -46,23 +375,68 @@ class LoggerFactory:
             '%(levelname)s - %(name)s - %(message)s'
         )
         
+        settings = {**DEFAULT_PIPELINE_SETTINGS, **cls._pipeline_settings}
+        jsonl_settings = {**DEFAULT_PIPELINE_SETTINGS["jsonl"], **(settings.get("jsonl") or {})}
+        handlers: List[logging.Handler] = []
+        
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(simple_formatter)
-        root_logger.addHandler(console_handler)
+        handlers.append(console_handler)
         
         # File handler for all logs
-        main_file_handler = logging.FileHandler(
+        main_file_handler = BatchedFileHandler(
             logs_dir / "hephaestus_main.log",
             encoding='utf-8'
         )
         main_file_handler.setLevel(logging.DEBUG)
         main_file_handler.setFormatter(detailed_formatter)
-        root_logger.addHandler(main_file_handler)
+        handlers.append(main_file_handler)
+        
+        # Optional structured sink, rotated by size
+        if jsonl_settings["enabled"]:
+            jsonl_path = Path(jsonl_settings["path"])
+            jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+            jsonl_handler = BatchedRotatingFileHandler(
+                jsonl_path,
+                maxBytes=int(jsonl_settings["max_bytes"]),
+                backupCount=int(jsonl_settings["backup_count"]),
+                encoding='utf-8'
+            )
+            jsonl_handler.setLevel(logging.DEBUG)
+            jsonl_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(jsonl_handler)
+        
+        if settings["enabled"]:
+            cls._pipeline = LoggingPipeline(settings)
+            for handler in handlers + list(cls._component_handlers.values()):
+                cls._pipeline.add_handler(handler)
+            root_logger.addHandler(cls._pipeline.queue_handler)
+            cls._pipeline.start()
+        else:
+            for handler in handlers:
+                root_logger.addHandler(handler)
+            for handler in cls._component_handlers.values():
+                root_logger.addHandler(handler)
         
+        if not cls._configured:
+            atexit.register(cls.shutdown)
         cls._configured = True
     
+    @classmethod
+    def shutdown(cls):
+        """Write out queued records and stop the listener thread."""
+        with cls._lock:
+            if cls._pipeline is not None:
+                cls._pipeline.stop()
+    
+    @classmethod
+    def get_pipeline_stats(cls) -> Optional[Dict[str, Any]]:
+        """Emitted/dropped/flush-latency counters, or None without the pipeline."""
+        pipeline = cls._pipeline
+        return pipeline.get_stats() if pipeline is not None else None
+    
     @classmethod
     def get_component_logger(cls, 
                            component_name: str, 
@@ -157,15 +531,14 @@ class LoggerFactory:
     def _add_agent_file_handler(cls, logger: logging.Logger, agent_name: str):
         """Add agent-specific file handler."""
         # Check if agent file handler already exists
-        for handler in logger.handlers:
-            if isinstance(handler, logging.FileHandler) and agent_name in handler.baseFilename:
-                return
+        if logger.name in cls._component_handlers:
+            return
         
         # Create agent-specific log file
         logs_dir = Path("data/logs/agents")
         logs_dir.mkdir(parents=True, exist_ok=True)
         
-        agent_file_handler = logging.FileHandler(
+        agent_file_handler = BatchedFileHandler(
             logs_dir / f"{agent_name}_agent.log",
             encoding='utf-8'
         )
@@ -177,21 +550,20 @@ class LoggerFactory:
         )
         agent_file_handler.setFormatter(formatter)
         
-        logger.addHandler(agent_file_handler)
+        cls._add_component_handler(logger, agent_file_handler)
     
     @classmethod
     def _add_service_file_handler(cls, logger: logging.Logger, service_name: str):
         """Add service-specific file handler."""
         # Check if service file handler already exists
-        for handler in logger.handlers:
-            if isinstance(handler, logging.FileHandler) and service_name in handler.baseFilename:
-                return
+        if logger.name in cls._component_handlers:
+            return
         
         # Create service-specific log file
         logs_dir = Path("data/logs/services")
         logs_dir.mkdir(parents=True, exist_ok=True)
         
-        service_file_handler = logging.FileHandler(
+        service_file_handler = BatchedFileHandler(
             logs_dir / f"{service_name}_service.log",
             encoding='utf-8'
         )
@@ -203,7 +575,19 @@ class LoggerFactory:
         )
         service_file_handler.setFormatter(formatter)
         
-        logger.addHandler(service_file_handler)
+        cls._add_component_handler(logger, service_file_handler)
+    
+    @classmethod
+    def _add_component_handler(cls, logger: logging.Logger, handler: logging.Handler):
+        """Route the logger's records (and its children's) to a dedicated file."""
+        # Records reach the root queue handler by propagation; the filter keeps the file per component
+        handler.addFilter(logging.Filter(logger.name))
+        with cls._lock:
+            cls._component_handlers[logger.name] = handler
+            if cls._pipeline is not None:
+                cls._pipeline.add_handler(handler)
+            else:
+                logging.getLogger().addHandler(handler)
     
     @classmethod
     def set_global_level(cls, level: int):
@@ -218,6 +602,7 @@ class LoggerFactory:
             'total_loggers': len(cls._loggers),
             'logger_names': list(cls._loggers.keys()),
             'configured': cls._configured,
+            'pipeline': cls.get_pipeline_stats(),
         }
     
     @classmethod
@@ -65,7 +65,10 @@ class MetricsCollector:
                        success: bool,
                        cached: bool = False,
                        fallback: bool = False,
-                       attempt: int = 1):
+                       attempt: int = 1,
+                       time_to_first_token: Optional[float] = None,
+                       streamed: bool = False,
+                       cancelled: bool = False):
         """
         Record LLM call metrics.
         
@@ -78,6 +81,9 @@ class MetricsCollector:
             cached: Whether result was from cache
             fallback: Whether a fallback model was used
             attempt: Attempt number (for retries)
+            time_to_first_token: Seconds until the first streamed token arrived
+            streamed: Whether the response was streamed
+            cancelled: Whether the stream was cancelled early as malformed
         """
         with self._lock:
             metric = {
@@ -90,7 +96,10 @@ class MetricsCollector:
                 'success': success,
                 'cached': cached,
                 'fallback': fallback,
-                'attempt': attempt
+                'attempt': attempt,
+                'time_to_first_token': time_to_first_token,
+                'streamed': streamed,
+                'cancelled': cancelled
             }
             
             self.llm_metrics.append(metric)
@@ -207,6 +216,7 @@ class MetricsCollector:
             
             total_tokens = sum(m['total_tokens'] for m in metrics)
             total_duration = sum(m['duration'] for m in metrics)
+            ttfts = [m['time_to_first_token'] for m in metrics if m.get('time_to_first_token') is not None]
             
             # Model usage
             models = defaultdict(int)
@@ -232,6 +242,9 @@ class MetricsCollector:
                 'total_duration': total_duration,
                 'average_duration': total_duration / total_calls if total_calls > 0 else 0,
                 'tokens_per_second': total_tokens / total_duration if total_duration > 0 else 0,
+                'streamed_calls': sum(1 for m in metrics if m.get('streamed', False)),
+                'cancelled_streams': sum(1 for m in metrics if m.get('cancelled', False)),
+                'average_time_to_first_token': sum(ttfts) / len(ttfts) if ttfts else None,
                 'models_used': dict(models),
                 'recent_activity_count': len(recent_metrics),
                 'last_activity': metrics[-1]['timestamp'] if metrics else None
@@ -0,0 +1,716 @@
+"""
+Objective Leases - Fila de objetivos compartilhada entre várias instâncias do agente
+
+Vários processos do agente (na mesma máquina ou em máquinas diferentes)
+consomem a mesma fila. Cada objetivo é *arrendado* por um worker durante
+``lease_seconds``; enquanto o ciclo roda, o worker renova o arrendamento com
+heartbeats. Se o processo morre, o arrendamento expira e o objetivo volta para
+a fila (até ``max_attempts`` tentativas; depois vai para ``dead``). Um ciclo
+que termina, com sucesso ou falha, conclui o arrendamento.
+
+Backends (mesma interface ``LeaseBackend``):
+
+- ``SQLiteLeaseBackend``: arquivo local em modo WAL, para workers na mesma máquina
+  (ou num volume compartilhado com suporte a locks)
+- ``RedisLeaseBackend``: opcional (``redis`` instalado), para workers em várias
+  máquinas; operações atômicas via scripts Lua
+
+O mesmo backend guarda o histórico compartilhado usado pelo ``SharedMemorySync``
+para mesclar a memória (objetivos concluídos/falhos e capacidades) entre workers.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+
+# (chave, tipo, registro) publicados no histórico compartilhado
+HistoryRecord = Tuple[str, str, Dict[str, Any]]
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+@dataclass
+class Lease:
+    """Arrendamento de um objetivo; ``attempt`` identifica esta tentativa"""
+    objective_id: str
+    objective: Any
+    worker_id: str
+    attempt: int
+    expires_at: float
+
+
+class LeaseBackend(ABC):
+    """Armazenamento da fila arrendada e do histórico compartilhado"""
+
+    def __init__(self, max_attempts: int = 3):
+        self.max_attempts = max(1, max_attempts)
+
+    @abstractmethod
+    def enqueue(self, objective: Any) -> str:
+        """Adiciona um objetivo ao fim da fila e retorna seu id"""
+
+    @abstractmethod
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Lease]:
+        """Arrenda o objetivo pendente mais antigo (devolvendo antes os arrendamentos expirados)"""
+
+    @abstractmethod
+    def heartbeat(self, worker_id: str, leases: Sequence[Lease], lease_seconds: float) -> Set[str]:
+        """Renova os arrendamentos e registra o worker como vivo; retorna os ids ainda mantidos"""
+
+    @abstractmethod
+    def complete(self, lease: Lease, success: bool) -> bool:
+        """Conclui o arrendamento; False se ele já tinha sido perdido"""
+
+    @abstractmethod
+    def release(self, lease: Lease, retry: bool = True) -> bool:
+        """Devolve o objetivo à fila (ou o descarta, se ``retry`` for False ou acabarem as tentativas)"""
+
+    @abstractmethod
+    def pending_count(self) -> int:
+        """Objetivos prontos para arrendar, incluindo arrendamentos expirados"""
+
+    @abstractmethod
+    def worker_stats(self, window_seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Vazão por worker na janela: concluídos, falhos, em andamento e último heartbeat"""
+
+    @abstractmethod
+    def purge_finished(self, older_than: float) -> int:
+        """Remove objetivos finalizados antes do timestamp ``older_than``"""
+
+    @abstractmethod
+    def publish_history(self, worker_id: str, records: Sequence[HistoryRecord]) -> int:
+        """Publica registros de memória (ignorando chaves já publicadas)"""
+
+    @abstractmethod
+    def history_since(self, cursor: int, exclude_worker: Optional[str] = None,
+                      limit: int = 500) -> Tuple[List[HistoryRecord], int]:
+        """Registros publicados após ``cursor`` e o novo cursor"""
+
+    def close(self):
+        pass
+
+
+def _summarize_workers(rows, workers: Dict[str, float], window_seconds: float,
+                       now: float) -> Dict[str, Dict[str, Any]]:
+    """Monta as estatísticas por worker a partir de (worker, status, duração) e dos heartbeats"""
+    stats: Dict[str, Dict[str, Any]] = {}
+
+    def entry(worker_id: str) -> Dict[str, Any]:
+        if worker_id not in stats:
+            stats[worker_id] = {"completed": 0, "failed": 0, "in_flight": 0, "busy_seconds": 0.0,
+                                "last_seen": workers.get(worker_id)}
+        return stats[worker_id]
+
+    for worker_id in workers:
+        entry(worker_id)
+    for worker_id, status, duration in rows:
+        item = entry(worker_id)
+        if status == "leased":
+            item["in_flight"] += 1
+        elif status in ("completed", "failed"):
+            item[status] += 1
+            item["busy_seconds"] += duration or 0.0
+
+    hours = window_seconds / 3600.0
+    for item in stats.values():
+        finished = item["completed"] + item["failed"]
+        item["objectives_per_hour"] = round(finished / hours, 2) if hours > 0 else 0.0
+        item["avg_cycle_seconds"] = round(item["busy_seconds"] / finished, 2) if finished else None
+        item["busy_seconds"] = round(item["busy_seconds"], 2)
+        item["seconds_since_seen"] = round(now - item["last_seen"], 1) if item["last_seen"] else None
+    return stats
+
+
+class SQLiteLeaseBackend(LeaseBackend):
+    """Fila arrendada num arquivo SQLite (WAL); cada operação é uma transação ``BEGIN IMMEDIATE``"""
+
+    def __init__(self, db_path, max_attempts: int = 3):
+        super().__init__(max_attempts)
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript("""
+            CREATE TABLE IF NOT EXISTS objectives (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                worker_id TEXT,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_expires_at REAL,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            );
+            CREATE INDEX IF NOT EXISTS idx_objectives_status ON objectives (status, id);
+            CREATE INDEX IF NOT EXISTS idx_objectives_finished ON objectives (finished_at);
+            CREATE TABLE IF NOT EXISTS workers (
+                worker_id TEXT PRIMARY KEY,
+                last_seen REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS shared_history (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                record_key TEXT NOT NULL UNIQUE,
+                worker_id TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                record TEXT NOT NULL
+            );
+        """)
+
+    def _connection(self) -> sqlite3.Connection:
+        # Uma conexão por thread (o heartbeat roda no escalonador de background)
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, func):
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            result = func(conn)
+            conn.execute("COMMIT")
+            return result
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def enqueue(self, objective: Any) -> str:
+        cursor = self._connection().execute(
+            "INSERT INTO objectives (payload, enqueued_at) VALUES (?, ?)",
+            (json.dumps(objective, ensure_ascii=False, default=str), time.time())
+        )
+        return str(cursor.lastrowid)
+
+    def _requeue_expired(self, conn: sqlite3.Connection, now: float):
+        conn.execute("""
+            UPDATE objectives
+            SET status = CASE WHEN attempts >= ? THEN 'dead' ELSE 'pending' END,
+                finished_at = CASE WHEN attempts >= ? THEN ? ELSE NULL END,
+                lease_expires_at = NULL
+            WHERE status = 'leased' AND lease_expires_at < ?
+        """, (self.max_attempts, self.max_attempts, now, now))
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Lease]:
+        def take(conn: sqlite3.Connection) -> Optional[Lease]:
+            now = time.time()
+            self._requeue_expired(conn, now)
+            row = conn.execute(
+                "SELECT id, payload, attempts FROM objectives WHERE status = 'pending' ORDER BY id LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            expires_at = now + lease_seconds
+            conn.execute("""
+                UPDATE objectives SET status = 'leased', worker_id = ?, attempts = attempts + 1,
+                    lease_expires_at = ?, started_at = ?
+                WHERE id = ?
+            """, (worker_id, expires_at, now, row[0]))
+            conn.execute("INSERT OR REPLACE INTO workers (worker_id, last_seen) VALUES (?, ?)", (worker_id, now))
+            return Lease(str(row[0]), json.loads(row[1]), worker_id, row[2] + 1, expires_at)
+
+        return self._transaction(take)
+
+    def heartbeat(self, worker_id: str, leases: Sequence[Lease], lease_seconds: float) -> Set[str]:
+        def renew(conn: sqlite3.Connection) -> Set[str]:
+            now = time.time()
+            conn.execute("INSERT OR REPLACE INTO workers (worker_id, last_seen) VALUES (?, ?)", (worker_id, now))
+            held = set()
+            for lease in leases:
+                cursor = conn.execute("""
+                    UPDATE objectives SET lease_expires_at = ?
+                    WHERE id = ? AND status = 'leased' AND worker_id = ? AND attempts = ?
+                """, (now + lease_seconds, int(lease.objective_id), worker_id, lease.attempt))
+                if cursor.rowcount:
+                    lease.expires_at = now + lease_seconds
+                    held.add(lease.objective_id)
+            return held
+
+        return self._transaction(renew)
+
+    def complete(self, lease: Lease, success: bool) -> bool:
+        cursor = self._connection().execute("""
+            UPDATE objectives SET status = ?, finished_at = ?, lease_expires_at = NULL
+            WHERE id = ? AND status = 'leased' AND worker_id = ? AND attempts = ?
+        """, ("completed" if success else "failed", time.time(), int(lease.objective_id),
+              lease.worker_id, lease.attempt))
+        return cursor.rowcount == 1
+
+    def release(self, lease: Lease, retry: bool = True) -> bool:
+        requeue = retry and lease.attempt < self.max_attempts
+        cursor = self._connection().execute("""
+            UPDATE objectives SET status = ?, finished_at = ?, lease_expires_at = NULL
+            WHERE id = ? AND status = 'leased' AND worker_id = ? AND attempts = ?
+        """, ("pending" if requeue else "dead", None if requeue else time.time(),
+              int(lease.objective_id), lease.worker_id, lease.attempt))
+        return cursor.rowcount == 1
+
+    def pending_count(self) -> int:
+        return self._connection().execute("""
+            SELECT COUNT(*) FROM objectives
+            WHERE status = 'pending' OR (status = 'leased' AND lease_expires_at < ? AND attempts < ?)
+        """, (time.time(), self.max_attempts)).fetchone()[0]
+
+    def worker_stats(self, window_seconds: float) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        conn = self._connection()
+        rows = conn.execute("""
+            SELECT worker_id, status, finished_at - started_at FROM objectives
+            WHERE worker_id IS NOT NULL
+              AND ((status IN ('completed', 'failed') AND finished_at >= ?) OR status = 'leased')
+        """, (now - window_seconds,)).fetchall()
+        workers = dict(conn.execute("SELECT worker_id, last_seen FROM workers WHERE last_seen >= ?",
+                                    (now - window_seconds,)).fetchall())
+        return _summarize_workers(rows, workers, window_seconds, now)
+
+    def purge_finished(self, older_than: float) -> int:
+        conn = self._connection()
+        cursor = conn.execute(
+            "DELETE FROM objectives WHERE status IN ('completed', 'failed', 'dead') AND finished_at < ?",
+            (older_than,)
+        )
+        conn.execute("DELETE FROM workers WHERE last_seen < ?", (older_than,))
+        return cursor.rowcount
+
+    def publish_history(self, worker_id: str, records: Sequence[HistoryRecord]) -> int:
+        def insert(conn: sqlite3.Connection) -> int:
+            published = 0
+            for key, kind, record in records:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO shared_history (record_key, worker_id, kind, record) VALUES (?, ?, ?, ?)",
+                    (key, worker_id, kind, json.dumps(record, ensure_ascii=False, default=str))
+                )
+                published += cursor.rowcount
+            return published
+
+        return self._transaction(insert) if records else 0
+
+    def history_since(self, cursor: int, exclude_worker: Optional[str] = None,
+                      limit: int = 500) -> Tuple[List[HistoryRecord], int]:
+        rows = self._connection().execute(
+            "SELECT seq, record_key, worker_id, kind, record FROM shared_history WHERE seq > ? ORDER BY seq LIMIT ?",
+            (cursor, limit)
+        ).fetchall()
+        records = [(key, kind, json.loads(record)) for _, key, worker_id, kind, record in rows
+                   if worker_id != exclude_worker]
+        return records, rows[-1][0] if rows else cursor
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+# Scripts Lua: cada operação sobre um objetivo é atômica no servidor Redis.
+# ARGV[1] é sempre o prefixo das chaves.
+_REDIS_LEASE = """
+local p, now, ttl, worker, max_attempts = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), ARGV[4], tonumber(ARGV[5])
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', p .. 'leases', '-inf', '(' .. now)) do
+  redis.call('ZREM', p .. 'leases', id)
+  if tonumber(redis.call('HGET', p .. 'obj:' .. id, 'attempts')) >= max_attempts then
+    redis.call('HSET', p .. 'obj:' .. id, 'status', 'dead', 'finished_at', now)
+    redis.call('ZADD', p .. 'finished', now, id)
+  else
+    redis.call('HSET', p .. 'obj:' .. id, 'status', 'pending')
+    redis.call('LPUSH', p .. 'pending', id)
+  end
+end
+local id = redis.call('LPOP', p .. 'pending')
+if not id then return false end
+local attempts = redis.call('HINCRBY', p .. 'obj:' .. id, 'attempts', 1)
+redis.call('HSET', p .. 'obj:' .. id, 'status', 'leased', 'worker_id', worker, 'started_at', now)
+redis.call('ZADD', p .. 'leases', now + ttl, id)
+redis.call('HSET', p .. 'workers', worker, now)
+return {id, redis.call('HGET', p .. 'obj:' .. id, 'payload'), attempts}
+"""
+
+_REDIS_FINISH = """
+local p, id, worker, attempt, status, now, requeue = ARGV[1], ARGV[2], ARGV[3], ARGV[4], ARGV[5], tonumber(ARGV[6]), ARGV[7]
+local key = p .. 'obj:' .. id
+local current = redis.call('HMGET', key, 'status', 'worker_id', 'attempts')
+if current[1] ~= 'leased' or current[2] ~= worker or current[3] ~= attempt then return 0 end
+redis.call('ZREM', p .. 'leases', id)
+if requeue == '1' then
+  redis.call('HSET', key, 'status', 'pending')
+  redis.call('LPUSH', p .. 'pending', id)
+else
+  redis.call('HSET', key, 'status', status, 'finished_at', now)
+  redis.call('ZADD', p .. 'finished', now, id)
+end
+return 1
+"""
+
+_REDIS_HEARTBEAT = """
+local p, worker, now, ttl = ARGV[1], ARGV[2], tonumber(ARGV[3]), tonumber(ARGV[4])
+redis.call('HSET', p .. 'workers', worker, now)
+local held = {}
+for i = 5, #ARGV, 2 do
+  local id, attempt = ARGV[i], ARGV[i + 1]
+  local current = redis.call('HMGET', p .. 'obj:' .. id, 'status', 'worker_id', 'attempts')
+  if current[1] == 'leased' and current[2] == worker and current[3] == attempt then
+    redis.call('ZADD', p .. 'leases', now + ttl, id)
+    table.insert(held, id)
+  end
+end
+return held
+"""
+
+
+class RedisLeaseBackend(LeaseBackend):
+    """
+    Fila arrendada num servidor Redis (ou compatível), para workers em várias máquinas.
+
+    Chaves (com ``prefix``): ``pending`` (lista de ids), ``leases`` (zset id → expiração),
+    ``finished`` (zset id → fim), ``obj:<id>`` (hash do objetivo), ``workers``
+    (hash worker → último heartbeat), ``history`` (zset seq → registro) e
+    ``history_keys`` (set de chaves publicadas).
+    """
+
+    def __init__(self, url: str = "redis://localhost:6379/0", prefix: str = "hephaestus:objectives:",
+                 max_attempts: int = 3):
+        if not REDIS_AVAILABLE:
+            raise RuntimeError("The redis package is required for the Redis lease backend")
+        super().__init__(max_attempts)
+        self.prefix = prefix
+        self._redis = redis.Redis.from_url(url, decode_responses=True)
+        self._lease_script = self._redis.register_script(_REDIS_LEASE)
+        self._finish_script = self._redis.register_script(_REDIS_FINISH)
+        self._heartbeat_script = self._redis.register_script(_REDIS_HEARTBEAT)
+
+    def _key(self, name: str) -> str:
+        return self.prefix + name
+
+    def enqueue(self, objective: Any) -> str:
+        objective_id = str(self._redis.incr(self._key("seq")))
+        pipe = self._redis.pipeline()
+        pipe.hset(self._key(f"obj:{objective_id}"), mapping={
+            "payload": json.dumps(objective, ensure_ascii=False, default=str),
+            "status": "pending", "attempts": 0, "enqueued_at": time.time()
+        })
+        pipe.rpush(self._key("pending"), objective_id)
+        pipe.execute()
+        return objective_id
+
+    def lease(self, worker_id: str, lease_seconds: float) -> Optional[Lease]:
+        now = time.time()
+        result = self._lease_script(args=[self.prefix, now, lease_seconds, worker_id, self.max_attempts])
+        if not result:
+            return None
+        objective_id, payload, attempts = result
+        return Lease(str(objective_id), json.loads(payload), worker_id, int(attempts), now + lease_seconds)
+
+    def heartbeat(self, worker_id: str, leases: Sequence[Lease], lease_seconds: float) -> Set[str]:
+        now = time.time()
+        args = [self.prefix, worker_id, now, lease_seconds]
+        for lease in leases:
+            args += [lease.objective_id, lease.attempt]
+        held = set(self._heartbeat_script(args=args) or [])
+        for lease in leases:
+            if lease.objective_id in held:
+                lease.expires_at = now + lease_seconds
+        return held
+
+    def _finish(self, lease: Lease, status: str, requeue: bool) -> bool:
+        return bool(self._finish_script(args=[
+            self.prefix, lease.objective_id, lease.worker_id, lease.attempt, status, time.time(),
+            "1" if requeue else "0"
+        ]))
+
+    def complete(self, lease: Lease, success: bool) -> bool:
+        return self._finish(lease, "completed" if success else "failed", requeue=False)
+
+    def release(self, lease: Lease, retry: bool = True) -> bool:
+        return self._finish(lease, "dead", requeue=retry and lease.attempt < self.max_attempts)
+
+    def pending_count(self) -> int:
+        pending = self._redis.llen(self._key("pending"))
+        expired = self._redis.zcount(self._key("leases"), "-inf", f"({time.time()}")
+        return pending + expired
+
+    def worker_stats(self, window_seconds: float) -> Dict[str, Dict[str, Any]]:
+        now = time.time()
+        finished_ids = self._redis.zrangebyscore(self._key("finished"), now - window_seconds, "+inf")
+        leased_ids = self._redis.zrange(self._key("leases"), 0, -1)
+        pipe = self._redis.pipeline()
+        for objective_id in finished_ids + leased_ids:
+            pipe.hmget(self._key(f"obj:{objective_id}"), "worker_id", "status", "started_at", "finished_at")
+        rows = []
+        for worker_id, status, started_at, finished_at in pipe.execute():
+            if worker_id is None:
+                continue
+            duration = float(finished_at) - float(started_at) if finished_at and started_at else None
+            rows.append((worker_id, status, duration))
+        workers = {worker_id: float(last_seen) for worker_id, last_seen in self._redis.hgetall(self._key("workers")).items()
+                   if float(last_seen) >= now - window_seconds}
+        return _summarize_workers(rows, workers, window_seconds, now)
+
+    def purge_finished(self, older_than: float) -> int:
+        expired_ids = self._redis.zrangebyscore(self._key("finished"), "-inf", f"({older_than}")
+        if expired_ids:
+            pipe = self._redis.pipeline()
+            pipe.delete(*[self._key(f"obj:{objective_id}") for objective_id in expired_ids])
+            pipe.zrem(self._key("finished"), *expired_ids)
+            pipe.execute()
+        stale = [worker_id for worker_id, last_seen in self._redis.hgetall(self._key("workers")).items()
+                 if float(last_seen) < older_than]
+        if stale:
+            self._redis.hdel(self._key("workers"), *stale)
+        return len(expired_ids)
+
+    def publish_history(self, worker_id: str, records: Sequence[HistoryRecord]) -> int:
+        published = 0
+        for key, kind, record in records:
+            if not self._redis.sadd(self._key("history_keys"), key):
+                continue
+            seq = self._redis.incr(self._key("history_seq"))
+            entry = json.dumps({"key": key, "worker_id": worker_id, "kind": kind, "record": record},
+                               ensure_ascii=False, default=str)
+            self._redis.zadd(self._key("history"), {entry: seq})
+            published += 1
+        return published
+
+    def history_since(self, cursor: int, exclude_worker: Optional[str] = None,
+                      limit: int = 500) -> Tuple[List[HistoryRecord], int]:
+        entries = self._redis.zrangebyscore(self._key("history"), f"({cursor}", "+inf",
+                                            start=0, num=limit, withscores=True)
+        records = []
+        for entry, seq in entries:
+            data = json.loads(entry)
+            if data["worker_id"] != exclude_worker:
+                records.append((data["key"], data["kind"], data["record"]))
+        return records, int(entries[-1][1]) if entries else cursor
+
+    def close(self):
+        self._redis.close()
+
+
+def create_lease_backend(config: Optional[Dict[str, Any]] = None) -> LeaseBackend:
+    """Cria o backend configurado em ``objective_queue`` (SQLite por padrão)"""
+    queue_config = (config or {}).get("objective_queue", {})
+    backend = queue_config.get("backend", "sqlite")
+    max_attempts = queue_config.get("max_attempts", 3)
+    if backend == "redis":
+        return RedisLeaseBackend(queue_config.get("redis_url", "redis://localhost:6379/0"),
+                                 prefix=queue_config.get("redis_prefix", "hephaestus:objectives:"),
+                                 max_attempts=max_attempts)
+    if backend != "sqlite":
+        raise ValueError(f"Unknown objective queue backend '{backend}' (expected 'sqlite' or 'redis')")
+    return SQLiteLeaseBackend(queue_config.get("sqlite_path", "data/runtime/objectives.db"), max_attempts=max_attempts)
+
+
+class LeasedQueueManager:
+    """
+    Fila arrendada com a interface do ``QueueManager``, usada pelo ``CycleRunner``.
+
+    ``get_objective`` arrenda um objetivo e ``complete_objective`` conclui o
+    arrendamento ao fim do ciclo. Se um novo objetivo é pedido sem que o anterior
+    tenha sido concluído (o runner caiu no meio do ciclo), o anterior é devolvido
+    à fila para nova tentativa. Enquanto houver um arrendamento, um job de
+    heartbeat não pausável o renova a cada ``heartbeat_seconds``.
+    """
+
+    def __init__(self, backend: LeaseBackend, worker_id: Optional[str] = None, lease_seconds: float = 120.0,
+                 heartbeat_seconds: float = 30.0, poll_seconds: float = 0.5,
+                 throughput_window_seconds: float = 3600.0, logger: Optional[logging.Logger] = None):
+        self.backend = backend
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.heartbeat_seconds = min(heartbeat_seconds, lease_seconds / 2)
+        self.poll_seconds = poll_seconds
+        self.throughput_window_seconds = throughput_window_seconds
+        self.logger = logger or logging.getLogger("hephaestus.LeasedQueueManager")
+
+        self._lock = threading.Lock()
+        self._current: Optional[Lease] = None
+        self._heartbeat_job = None
+        self.lost_leases = 0
+
+    def put_objective(self, objective):
+        self.backend.enqueue(objective)
+
+    def get_objective(self, timeout=None):
+        self._release_unfinished()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            lease = self.backend.lease(self.worker_id, self.lease_seconds)
+            if lease is not None:
+                with self._lock:
+                    self._current = lease
+                self.start_consuming()
+                return lease.objective
+            if deadline is not None and time.monotonic() >= deadline:
+                return None
+            time.sleep(self.poll_seconds if deadline is None else
+                       max(0.0, min(self.poll_seconds, deadline - time.monotonic())))
+
+    def complete_objective(self, objective, success: bool = True):
+        with self._lock:
+            lease = self._current
+            if lease is None or lease.objective is not objective:
+                return
+            self._current = None
+        if not self.backend.complete(lease, success):
+            self.lost_leases += 1
+            self.logger.warning(f"Lease on objective {lease.objective_id} was lost before completion "
+                                f"(another worker may have retried it)")
+
+    def _release_unfinished(self):
+        with self._lock:
+            lease, self._current = self._current, None
+        if lease is not None:
+            self.logger.warning(f"Objective {lease.objective_id} was not completed - releasing it for retry")
+            self.backend.release(lease, retry=True)
+
+    def is_empty(self):
+        return self.backend.pending_count() == 0
+
+    def qsize(self):
+        return self.backend.pending_count()
+
+    # ------------------------------------------------------------------
+    # Heartbeat e ciclo de vida
+    # ------------------------------------------------------------------
+    def start_consuming(self):
+        """Registra o worker e agenda o heartbeat (idempotente)"""
+        if self._heartbeat_job is not None and self._heartbeat_job.active:
+            return
+        self._heartbeat_job = get_background_scheduler().schedule(
+            "objective_lease_heartbeat", self.heartbeat, interval=self.heartbeat_seconds,
+            priority=JobPriority.HIGH, max_runtime=self.heartbeat_seconds, initial_delay=0, pausable=False
+        )
+
+    def heartbeat(self):
+        with self._lock:
+            leases = [self._current] if self._current is not None else []
+        held = self.backend.heartbeat(self.worker_id, leases, self.lease_seconds)
+        for lease in leases:
+            if lease.objective_id not in held:
+                self.lost_leases += 1
+                self.logger.warning(f"Lease on objective {lease.objective_id} expired before its heartbeat")
+
+    def worker_stats(self) -> Dict[str, Dict[str, Any]]:
+        return self.backend.worker_stats(self.throughput_window_seconds)
+
+    def close(self, release: bool = True):
+        """Para o heartbeat e devolve o objetivo em andamento à fila"""
+        if self._heartbeat_job is not None:
+            self._heartbeat_job.cancel()
+            self._heartbeat_job = None
+        if release:
+            self._release_unfinished()
+
+
+def _record_key(kind: str, record: Dict[str, Any]) -> str:
+    identity = record.get("objective") or record.get("description") or ""
+    return hashlib.sha1(f"{kind}\x00{identity}\x00{record.get('date', '')}".encode("utf-8")).hexdigest()
+
+
+class SharedMemorySync:
+    """
+    Mescla a memória do agente entre workers através do histórico do backend.
+
+    Cada ``sync`` publica os registros locais ainda não publicados (objetivos
+    concluídos, falhos e capacidades) e incorpora os publicados pelos outros
+    workers desde o último cursor. Roda numa thread do scheduler: leitura,
+    merge e gravação usam o ``memory.lock``, o mesmo do ``Memory.save``.
+    """
+
+    KINDS = (("completed", "completed_objectives"), ("failed", "failed_objectives"),
+             ("capability", "acquired_capabilities"))
+
+    def __init__(self, backend: LeaseBackend, memory, worker_id: str, logger: Optional[logging.Logger] = None):
+        self.backend = backend
+        self.memory = memory
+        self.worker_id = worker_id
+        self.logger = logger or logging.getLogger("hephaestus.SharedMemorySync")
+        self._known: Set[str] = set()
+        self._cursor = 0
+        self._lock = threading.Lock()
+        self._job = None
+
+    def sync(self) -> Dict[str, int]:
+        with self._lock:
+            outgoing = []
+            with self.memory.lock:
+                snapshot = [(kind, list(getattr(self.memory, attribute))) for kind, attribute in self.KINDS]
+            for kind, local_records in snapshot:
+                for record in local_records:
+                    key = _record_key(kind, record)
+                    if key not in self._known:
+                        outgoing.append((key, kind, record))
+                        self._known.add(key)
+            published = self.backend.publish_history(self.worker_id, outgoing)
+
+            merged = 0
+            while True:
+                records, cursor = self.backend.history_since(self._cursor, exclude_worker=self.worker_id)
+                if cursor == self._cursor:
+                    break
+                self._cursor = cursor
+                incoming: Dict[str, List[Dict[str, Any]]] = {}
+                for key, kind, record in records:
+                    if key not in self._known:
+                        self._known.add(key)
+                        incoming.setdefault(kind, []).append(record)
+                with self.memory.lock:
+                    for kind, attribute in self.KINDS:
+                        if incoming.get(kind):
+                            merged += self.memory.merge_shared_records(attribute, incoming[kind])
+            if merged:
+                self.memory.save()  # também sob memory.lock
+            return {"published": published, "merged": merged}
+
+    def _sync_job(self):
+        try:
+            self.sync()
+        except Exception as e:
+            self.logger.warning(f"Shared memory sync failed: {e}")
+
+    def start(self, interval: float = 30.0):
+        if self._job is None or not self._job.active:
+            self._job = get_background_scheduler().schedule(
+                "shared_memory_sync", self._sync_job, interval=interval, jitter=interval * 0.1,
+                priority=JobPriority.LOW, max_runtime=interval, initial_delay=0
+            )
+
+    def stop(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+        self._sync_job()
+
+
+def create_objective_queue(config: Optional[Dict[str, Any]] = None, worker_id: Optional[str] = None,
+                           logger: Optional[logging.Logger] = None) -> LeasedQueueManager:
+    """Fila arrendada configurada em ``objective_queue``"""
+    queue_config = (config or {}).get("objective_queue", {})
+    return LeasedQueueManager(
+        create_lease_backend(config),
+        worker_id=worker_id or queue_config.get("worker_id"),
+        lease_seconds=queue_config.get("lease_seconds", 120.0),
+        heartbeat_seconds=queue_config.get("heartbeat_seconds", 30.0),
+        throughput_window_seconds=queue_config.get("throughput_window_seconds", 3600.0),
+        logger=logger
+    )
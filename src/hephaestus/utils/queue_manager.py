@@ -1,8 +1,20 @@
+import os
 import queue
+import threading
+import time
+from collections import deque
+
 
 class QueueManager:
-    def __init__(self):
+    """Fila em processo. Para vários workers, ver ``objective_leases.LeasedQueueManager``"""
+
+    def __init__(self, throughput_window_seconds: float = 3600.0):
         self._queue = queue.Queue()
+        self.worker_id = f"local-{os.getpid()}"
+        self.throughput_window_seconds = throughput_window_seconds
+        # (fim, sucesso) dos objetivos concluídos neste processo
+        self._finished = deque()
+        self._lock = threading.Lock()
 
     def put_objective(self, objective):
         self._queue.put(objective)
@@ -15,3 +27,27 @@ class QueueManager:
 
     def is_empty(self):
         return self._queue.empty()
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def start_consuming(self):
+        pass
+
+    def complete_objective(self, objective, success: bool = True):
+        with self._lock:
+            self._finished.append((time.time(), success))
+
+    def worker_stats(self):
+        with self._lock:
+            cutoff = time.time() - self.throughput_window_seconds
+            while self._finished and self._finished[0][0] < cutoff:
+                self._finished.popleft()
+            completed = sum(1 for _, success in self._finished if success)
+            failed = len(self._finished) - completed
+        hours = self.throughput_window_seconds / 3600.0
+        return {self.worker_id: {
+            "completed": completed,
+            "failed": failed,
+            "objectives_per_hour": round((completed + failed) / hours, 2) if hours > 0 else 0.0
+        }}
@@ -1,13 +1,24 @@
 """
 Rate Limiter - Sistema global de controle de taxa de chamadas à API
+
+Inclui o ``LLMCallScheduler``: um escalonador token-bucket compartilhado por
+todos os subsistemas, com orçamento de requisições e tokens por provedor e
+chave, prioridade para o tráfego interativo do ciclo sobre o tráfego de
+inteligência em background, fila justa em vez de rejeição e ajuste adaptativo
+das taxas a partir de respostas 429/Retry-After.
 """
 
 import asyncio
+import contextvars
+import functools
 import time
 import logging
-from typing import Dict, Any, Optional
-from dataclasses import dataclass
+from contextlib import contextmanager
+from enum import IntEnum
+from typing import Dict, Any, Optional, List, Tuple
+from dataclasses import dataclass, field
 from collections import deque
+import itertools
 import threading
 
 
@@ -42,16 +53,16 @@ class RateLimiter:
         self.logger.info(f"🚦 Rate limiter initialized: {config.max_concurrent_calls} concurrent, {config.calls_per_minute}/min")
     
     async def acquire_call_slot(self) -> bool:
-        """Adquire um slot para fazer uma chamada à API"""
+        """Adquire um slot para fazer uma chamada à API, aguardando na fila se necessário"""
         try:
-            # Verificar se não excedemos o limite por minuto
-            if not self._can_make_call():
-                self.logger.warning("Rate limit exceeded - too many calls per minute")
-                return False
-            
             # Aguardar semáforo para chamadas simultâneas
             await self.concurrent_semaphore.acquire()
             
+            # Aguardar a janela por minuto em vez de rejeitar a chamada
+            while (delay := self._seconds_until_call_allowed()) > 0:
+                self.logger.debug(f"Calls-per-minute budget exhausted - waiting {delay:.1f}s")
+                await asyncio.sleep(delay)
+            
             # Registrar chamada
             self._record_call()
             
@@ -80,6 +91,13 @@ class RateLimiter:
             # Verificar se não excedemos o limite
             return len(self.call_history) < self.config.calls_per_minute
     
+    def _seconds_until_call_allowed(self) -> float:
+        """Segundos até a chamada mais antiga sair da janela de 1 minuto"""
+        if self._can_make_call():
+            return 0.0
+        with self.call_history_lock:
+            return max(0.01, 60 - (time.time() - self.call_history[0]))
+    
     def _record_call(self):
         """Registra uma chamada no histórico"""
         with self.call_history_lock:
@@ -164,4 +182,384 @@ async def with_rate_limiting(func, *args, **kwargs):
         rate_limiter.record_failure()
         raise
     finally:
-        rate_limiter.release_call_slot() 
\ No newline at end of file
+        rate_limiter.release_call_slot() 
+
+
+class LLMPriority(IntEnum):
+    """Classes de tráfego do escalonador (menor valor = atendido antes)"""
+    INTERACTIVE = 0  # Chamadas do ciclo principal (architect, maestro, etc.)
+    BACKGROUND = 1   # Inteligência em background (meta-learning, RCA, evolução...)
+
+
+_current_priority: contextvars.ContextVar = contextvars.ContextVar("llm_priority", default=LLMPriority.INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority: LLMPriority):
+    """Define a classe de tráfego das chamadas LLM feitas dentro do bloco"""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_llm_priority() -> LLMPriority:
+    return _current_priority.get()
+
+
+def background_llm_task(func):
+    """Decora loops de threads de background para que suas chamadas LLM cedam ao ciclo"""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with llm_priority(LLMPriority.BACKGROUND):
+            return func(*args, **kwargs)
+    return wrapper
+
+
+@dataclass
+class ProviderBudget:
+    """Limites de uma chave de um provedor"""
+    requests_per_minute: float = 30
+    tokens_per_minute: float = 100000
+    max_concurrent_calls: int = 2
+
+
+class TokenBucket:
+    """Balde de tokens com reposição contínua; pode ficar negativo (dívida)"""
+    
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+    
+    def refill(self, now: float):
+        elapsed = now - self.updated_at
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+            self.updated_at = now
+    
+    def time_until(self, amount: float) -> float:
+        """Segundos até haver ``amount`` tokens (limitado à capacidade)"""
+        needed = min(amount, self.capacity) - self.tokens
+        if needed <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return float("inf")
+        return needed / self.refill_per_second
+
+
+@dataclass
+class _Waiter:
+    priority: LLMPriority
+    seq: int
+    tokens: int
+    enqueued_at: float
+    granted: bool = False
+    event: Optional[asyncio.Event] = None
+    loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+class _KeyState:
+    """Estado de escalonamento de uma chave (provedor, nome da chave)"""
+    
+    def __init__(self, provider: str, key_name: str, budget: ProviderBudget):
+        self.provider = provider
+        self.key_name = key_name
+        self.base_budget = budget
+        # Rajada de requisições limitada a ~10s de taxa; tokens podem usar o minuto inteiro
+        self.requests = TokenBucket(max(1.0, budget.requests_per_minute / 6), budget.requests_per_minute / 60)
+        self.tokens = TokenBucket(budget.tokens_per_minute, budget.tokens_per_minute / 60)
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.waiters: List[_Waiter] = []
+        self.cond = threading.Condition(threading.Lock())
+        self.stats = {
+            "granted": 0,
+            "granted_background": 0,
+            "rate_limited": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "tokens_used": 0
+        }
+
+
+@dataclass
+class LLMCallPermit:
+    """Autorização para uma chamada; deve ser liberada com ``release``"""
+    scheduler: "LLMCallScheduler"
+    provider: str
+    key_name: str
+    estimated_tokens: int
+    priority: LLMPriority
+    waited_seconds: float
+    released: bool = field(default=False)
+    
+    def release(self, actual_tokens: Optional[int] = None, success: bool = True):
+        if not self.released:
+            self.released = True
+            self.scheduler._release(self, actual_tokens, success)
+    
+    def report_rate_limited(self, retry_after: Optional[float] = None):
+        """Informa um 429 do provedor para pausar e reduzir a taxa da chave"""
+        self.scheduler.report_rate_limited(self.provider, self.key_name, retry_after)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.release(success=exc_type is None)
+        return False
+
+
+class LLMCallScheduler:
+    """
+    Escalonador token-bucket compartilhado para chamadas LLM (sync e async).
+    
+    Cada chave de cada provedor tem baldes de requisições e de tokens, um limite
+    de concorrência e uma fila de espera. Chamadas interativas passam à frente
+    das de background; dentro da mesma classe a ordem é de chegada. Esperas
+    longas de background são promovidas para evitar inanição.
+    """
+    
+    def __init__(self, budgets: Dict[str, ProviderBudget], default_budget: ProviderBudget,
+                 logger: logging.Logger, background_aging_seconds: float = 120.0,
+                 min_rate_fraction: float = 0.1, recovery_fraction: float = 0.05):
+        self.budgets = budgets
+        self.default_budget = default_budget
+        self.logger = logger.getChild("LLMCallScheduler")
+        self.background_aging_seconds = background_aging_seconds
+        self.min_rate_fraction = min_rate_fraction
+        self.recovery_fraction = recovery_fraction
+        self._keys: Dict[Tuple[str, str], _KeyState] = {}
+        self._keys_lock = threading.Lock()
+        self._seq = itertools.count()
+    
+    def _state(self, provider: str, key_name: str) -> _KeyState:
+        with self._keys_lock:
+            state = self._keys.get((provider, key_name))
+            if state is None:
+                budget = self.budgets.get(provider, self.default_budget)
+                state = _KeyState(provider, key_name, budget)
+                self._keys[(provider, key_name)] = state
+            return state
+    
+    # ------------------------------------------------------------------
+    # Aquisição
+    # ------------------------------------------------------------------
+    def acquire(self, provider: str, key_name: str = "default", estimated_tokens: int = 0,
+                priority: Optional[LLMPriority] = None, timeout: Optional[float] = None) -> LLMCallPermit:
+        """Aguarda (bloqueando a thread) até a chamada caber no orçamento"""
+        state = self._state(provider, key_name)
+        waiter = self._enqueue(state, estimated_tokens, priority)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        with state.cond:
+            while True:
+                delay = self._dispatch_locked(state)
+                if waiter.granted:
+                    return self._permit(state, waiter)
+                wait_for = delay
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        state.waiters.remove(waiter)
+                        raise TimeoutError(f"Timed out waiting for {provider}/{key_name} LLM budget")
+                    wait_for = min(wait_for, remaining)
+                state.cond.wait(timeout=min(wait_for, 5.0))
+    
+    async def acquire_async(self, provider: str, key_name: str = "default", estimated_tokens: int = 0,
+                            priority: Optional[LLMPriority] = None, timeout: Optional[float] = None) -> LLMCallPermit:
+        """Versão async: espera sem bloquear o event loop"""
+        state = self._state(provider, key_name)
+        waiter = self._enqueue(state, estimated_tokens, priority)
+        waiter.loop = asyncio.get_running_loop()
+        waiter.event = asyncio.Event()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        
+        try:
+            while True:
+                with state.cond:
+                    delay = self._dispatch_locked(state)
+                    if waiter.granted:
+                        return self._permit(state, waiter)
+                wait_for = min(delay, 5.0)
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Timed out waiting for {provider}/{key_name} LLM budget")
+                    wait_for = min(wait_for, remaining)
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), timeout=wait_for)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        except BaseException:
+            with state.cond:
+                if waiter in state.waiters:
+                    state.waiters.remove(waiter)
+                elif waiter.granted:
+                    # Concedido mas abandonado (cancelamento): devolve o orçamento
+                    self._permit(state, waiter).release(actual_tokens=0)
+            raise
+    
+    def _enqueue(self, state: _KeyState, estimated_tokens: int, priority: Optional[LLMPriority]) -> _Waiter:
+        waiter = _Waiter(
+            priority=current_llm_priority() if priority is None else priority,
+            seq=next(self._seq),
+            tokens=max(0, int(estimated_tokens)),
+            enqueued_at=time.monotonic()
+        )
+        with state.cond:
+            state.waiters.append(waiter)
+        return waiter
+    
+    def _effective_priority(self, waiter: _Waiter, now: float) -> Tuple[int, int]:
+        priority = waiter.priority
+        if priority == LLMPriority.BACKGROUND and now - waiter.enqueued_at > self.background_aging_seconds:
+            priority = LLMPriority.INTERACTIVE
+        return int(priority), waiter.seq
+    
+    def _dispatch_locked(self, state: _KeyState) -> float:
+        """Concede o orçamento aos próximos da fila; retorna segundos até a próxima chance"""
+        now = time.monotonic()
+        state.requests.refill(now)
+        state.tokens.refill(now)
+        
+        while state.waiters:
+            if now < state.blocked_until:
+                return state.blocked_until - now
+            if state.in_flight >= state.base_budget.max_concurrent_calls:
+                return 5.0  # Acordado por release()
+            
+            head = min(state.waiters, key=lambda w: self._effective_priority(w, now))
+            delay = max(state.requests.time_until(1), state.tokens.time_until(head.tokens))
+            if delay > 0:
+                # Fila justa: ninguém fura a fila enquanto o primeiro aguarda orçamento
+                return delay
+            
+            state.waiters.remove(head)
+            state.requests.tokens -= 1
+            state.tokens.tokens -= head.tokens
+            state.in_flight += 1
+            head.granted = True
+            
+            waited = now - head.enqueued_at
+            state.stats["granted"] += 1
+            if head.priority == LLMPriority.BACKGROUND:
+                state.stats["granted_background"] += 1
+            state.stats["total_wait_seconds"] += waited
+            state.stats["max_wait_seconds"] = max(state.stats["max_wait_seconds"], waited)
+            
+            if head.event is not None:
+                head.loop.call_soon_threadsafe(head.event.set)
+            state.cond.notify_all()
+        return 5.0
+    
+    def _permit(self, state: _KeyState, waiter: _Waiter) -> LLMCallPermit:
+        return LLMCallPermit(
+            scheduler=self,
+            provider=state.provider,
+            key_name=state.key_name,
+            estimated_tokens=waiter.tokens,
+            priority=waiter.priority,
+            waited_seconds=time.monotonic() - waiter.enqueued_at
+        )
+    
+    # ------------------------------------------------------------------
+    # Liberação e adaptação
+    # ------------------------------------------------------------------
+    def _release(self, permit: LLMCallPermit, actual_tokens: Optional[int], success: bool):
+        state = self._state(permit.provider, permit.key_name)
+        with state.cond:
+            state.in_flight = max(0, state.in_flight - 1)
+            if actual_tokens is not None:
+                # Acerta a diferença entre o estimado e o consumido de fato
+                state.tokens.tokens += permit.estimated_tokens - actual_tokens
+                state.stats["tokens_used"] += actual_tokens
+            else:
+                state.stats["tokens_used"] += permit.estimated_tokens
+            if success:
+                self._recover_rate_locked(state)
+            self._dispatch_locked(state)
+            state.cond.notify_all()
+            self._wake_async_waiters_locked(state)
+    
+    def report_rate_limited(self, provider: str, key_name: str = "default", retry_after: Optional[float] = None):
+        """Pausa a chave e reduz sua taxa pela metade (AIMD)"""
+        state = self._state(provider, key_name)
+        with state.cond:
+            pause = retry_after if retry_after is not None else 60.0 / max(1.0, state.requests.refill_per_second * 60)
+            state.blocked_until = max(state.blocked_until, time.monotonic() + pause)
+            floor = state.base_budget.requests_per_minute / 60 * self.min_rate_fraction
+            state.requests.refill_per_second = max(floor, state.requests.refill_per_second / 2)
+            state.requests.tokens = min(state.requests.tokens, 0.0)
+            state.stats["rate_limited"] += 1
+            self.logger.warning(
+                f"🚦 {provider}/{key_name} rate limited - pausing {pause:.1f}s, "
+                f"rate now {state.requests.refill_per_second * 60:.1f}/min"
+            )
+    
+    def _recover_rate_locked(self, state: _KeyState):
+        base = state.base_budget.requests_per_minute / 60
+        if state.requests.refill_per_second < base:
+            state.requests.refill_per_second = min(base, state.requests.refill_per_second + base * self.recovery_fraction)
+    
+    def _wake_async_waiters_locked(self, state: _KeyState):
+        for waiter in state.waiters:
+            if waiter.event is not None:
+                waiter.loop.call_soon_threadsafe(waiter.event.set)
+    
+    def get_status(self) -> Dict[str, Any]:
+        """Estado por chave: filas, taxas atuais e esperas"""
+        status = {}
+        with self._keys_lock:
+            states = list(self._keys.values())
+        for state in states:
+            with state.cond:
+                granted = state.stats["granted"]
+                status[f"{state.provider}/{state.key_name}"] = {
+                    "queued": len(state.waiters),
+                    "queued_background": sum(1 for w in state.waiters if w.priority == LLMPriority.BACKGROUND),
+                    "in_flight": state.in_flight,
+                    "requests_per_minute": round(state.requests.refill_per_second * 60, 2),
+                    "configured_requests_per_minute": state.base_budget.requests_per_minute,
+                    "tokens_available": round(state.tokens.tokens),
+                    "blocked_for_seconds": round(max(0.0, state.blocked_until - time.monotonic()), 2),
+                    "average_wait_seconds": round(state.stats["total_wait_seconds"] / granted, 3) if granted else 0.0,
+                    **state.stats
+                }
+        return status
+
+
+_llm_scheduler: Optional[LLMCallScheduler] = None
+_llm_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler(config: Optional[Dict[str, Any]] = None, logger: Optional[logging.Logger] = None) -> LLMCallScheduler:
+    """Obtém o escalonador global; a primeira chamada com ``config`` define os orçamentos"""
+    global _llm_scheduler
+    with _llm_scheduler_lock:
+        if _llm_scheduler is None or (config is not None and not getattr(_llm_scheduler, "_configured", False)):
+            rate_config = (config or {}).get("rate_limiting", {})
+            default_budget = ProviderBudget(
+                requests_per_minute=rate_config.get("calls_per_minute", 30),
+                tokens_per_minute=rate_config.get("tokens_per_minute", 100000),
+                max_concurrent_calls=rate_config.get("max_concurrent_llm_calls", 2)
+            )
+            budgets = {}
+            for provider, provider_config in (rate_config.get("providers") or {}).items():
+                budgets[provider] = ProviderBudget(
+                    requests_per_minute=provider_config.get("requests_per_minute", default_budget.requests_per_minute),
+                    tokens_per_minute=provider_config.get("tokens_per_minute", default_budget.tokens_per_minute),
+                    max_concurrent_calls=provider_config.get("max_concurrent_calls", default_budget.max_concurrent_calls)
+                )
+            _llm_scheduler = LLMCallScheduler(
+                budgets,
+                default_budget,
+                logger or logging.getLogger("hephaestus"),
+                background_aging_seconds=rate_config.get("background_aging_seconds", 120.0)
+            )
+            _llm_scheduler._configured = config is not None
+        return _llm_scheduler
@@ -0,0 +1,301 @@
+"""
+Sandbox Runner - Execução de benchmarks em sandboxes a partir de um forkserver
+
+``run_in_sandbox`` iniciava um ``python main.py`` novo a cada benchmark e
+amostrava a memória a cada 100 ms entre leituras bloqueantes do stdout, o que
+subestimava o pico de RSS e misturava o custo de importar as dependências ao
+tempo medido. Aqui:
+
+- um forkserver com as dependências pesadas já importadas cria um worker por
+  execução; o worker faz ``fork`` do processo medido, que roda o ``main.py`` do
+  sandbox com ``runpy`` (o pacote ``hephaestus`` do sandbox é sempre importado
+  do próprio sandbox, nunca reaproveitado do forkserver);
+- CPU de usuário/sistema, pico de RSS e I/O em blocos vêm do ``wait4`` (rusage
+  exato do processo), bytes lidos/escritos de ``/proc/<pid>/io`` antes do reap,
+  e o tempo de parede de ``perf_counter``;
+- a saída é transmitida em blocos para o processo pai e consumida de forma
+  assíncrona, sem bloquear a medição;
+- ``run_many`` roda vários candidatos em paralelo, cada um fixado numa CPU
+  distinta, para que as comparações sejam justas.
+"""
+
+import asyncio
+import codecs
+import logging
+import multiprocessing
+import os
+import select
+import signal
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Dependências importadas uma única vez no forkserver (falhas de import são ignoradas)
+DEFAULT_PRELOAD = ["yaml", "numpy", "pydantic", "requests", "dotenv", "psutil"]
+
+OutputCallback = Callable[[str], None]
+
+
+@dataclass
+class SandboxResult:
+    """Medições de uma execução de benchmark"""
+    execution_time: float
+    cpu_user_seconds: float
+    cpu_system_seconds: float
+    peak_memory_mb: float
+    exit_code: int
+    output: str = ""
+    read_bytes: int = 0
+    write_bytes: int = 0
+    block_reads: int = 0
+    block_writes: int = 0
+    cpu: Optional[int] = None
+    timed_out: bool = False
+
+    @property
+    def cpu_time(self) -> float:
+        return self.cpu_user_seconds + self.cpu_system_seconds
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["cpu_time"] = self.cpu_time
+        return data
+
+
+def forkserver_available() -> bool:
+    """O runner precisa de forkserver, fork e wait4 (Linux/macOS)"""
+    return (
+        "forkserver" in multiprocessing.get_all_start_methods()
+        and hasattr(os, "fork") and hasattr(os, "wait4")
+    )
+
+
+def _read_proc_io(pid: int) -> Dict[str, int]:
+    """Contadores de I/O de um processo (ainda não colhido) no Linux"""
+    counters = {}
+    try:
+        with open(f"/proc/{pid}/io", "r") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                counters[key.strip()] = int(value)
+    except (OSError, ValueError):
+        pass
+    return counters
+
+
+def _run_measured_child(sandbox_dir: str, argv: List[str], write_fd: int, cpu: Optional[int]):
+    """Corpo do processo medido: nunca retorna"""
+    code = 1
+    try:
+        os.dup2(write_fd, 1)
+        os.dup2(write_fd, 2)
+        os.close(write_fd)
+        sys.stdout = os.fdopen(1, "w", buffering=1, closefd=False)
+        sys.stderr = os.fdopen(2, "w", buffering=1, closefd=False)
+        if cpu is not None and hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, {cpu})
+        os.chdir(sandbox_dir)
+
+        # O código sob teste é o do sandbox: descarta o hephaestus carregado pelo worker
+        for name in [m for m in sys.modules if m == "hephaestus" or m.startswith("hephaestus.")]:
+            del sys.modules[name]
+        sys.path[:0] = [sandbox_dir, os.path.join(sandbox_dir, "src")]
+        sys.argv = list(argv)
+
+        import runpy
+        runpy.run_path(argv[0], run_name="__main__")
+        code = 0
+    except SystemExit as e:
+        if e.code is None:
+            code = 0
+        elif isinstance(e.code, int):
+            code = e.code
+        else:
+            print(e.code, file=sys.stderr)
+            code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+        finally:
+            os._exit(code)
+
+
+def _benchmark_worker(sandbox_dir: str, argv: List[str], cpu: Optional[int],
+                      timeout: Optional[float], conn):
+    """Roda no processo criado pelo forkserver: mede um filho e envia saída e resultado por ``conn``"""
+    read_fd, write_fd = os.pipe()
+    start = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        conn.close()
+        _run_measured_child(sandbox_dir, argv, write_fd, cpu)
+    os.close(write_fd)
+
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    deadline = start + timeout if timeout else None
+    timed_out = False
+    try:
+        while True:
+            wait = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            ready, _, _ = select.select([read_fd], [], [], wait)
+            if not ready:
+                # Tempo esgotado: mata o processo medido e para de ler
+                timed_out = True
+                os.kill(pid, signal.SIGKILL)
+                break
+            chunk = os.read(read_fd, 65536)
+            if not chunk:
+                break
+            text = decoder.decode(chunk)
+            if text:
+                conn.send(("output", text))
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            conn.send(("output", tail))
+    finally:
+        os.close(read_fd)
+
+    # Lê /proc/<pid>/io do processo encerrado antes de colhê-lo
+    io_counters = {}
+    if hasattr(os, "waitid"):
+        os.waitid(os.P_PID, pid, os.WEXITED | os.WNOWAIT)
+        io_counters = _read_proc_io(pid)
+    _, status, usage = os.wait4(pid, 0)
+    wall = time.perf_counter() - start
+
+    # ru_maxrss é em KiB no Linux e em bytes no macOS
+    maxrss_bytes = usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+    conn.send(("result", {
+        "execution_time": wall,
+        "cpu_user_seconds": usage.ru_utime,
+        "cpu_system_seconds": usage.ru_stime,
+        "peak_memory_mb": maxrss_bytes / (1024 ** 2),
+        "exit_code": os.waitstatus_to_exitcode(status),
+        "read_bytes": io_counters.get("read_bytes", 0),
+        "write_bytes": io_counters.get("write_bytes", 0),
+        "block_reads": usage.ru_inblock,
+        "block_writes": usage.ru_oublock,
+        "cpu": cpu,
+        "timed_out": timed_out,
+    }))
+    conn.close()
+
+
+class SandboxRunner:
+    """Executa benchmarks de sandboxes via forkserver com medições por rusage"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, preload: Optional[Sequence[str]] = None,
+                 max_parallel: Optional[int] = None):
+        if not forkserver_available():
+            raise RuntimeError("SandboxRunner requires the forkserver start method, fork and wait4")
+        self.logger = logger or logging.getLogger("hephaestus.SandboxRunner")
+        self._context = multiprocessing.get_context("forkserver")
+        self._context.set_forkserver_preload(list(DEFAULT_PRELOAD if preload is None else preload))
+
+        cpus = sorted(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else []
+        self.cpus: List[Optional[int]] = cpus or [None] * (os.cpu_count() or 1)
+        self.max_parallel = max(1, min(max_parallel or len(self.cpus), len(self.cpus)))
+        self.runs = 0
+
+    async def run(self, sandbox_dir: str, argv: Sequence[str], timeout: Optional[float] = None,
+                  cpu: Optional[int] = None, on_output: Optional[OutputCallback] = None) -> SandboxResult:
+        """
+        Executa ``argv`` (``argv[0]`` é o script, relativo ao sandbox) e retorna as medições.
+
+        ``on_output`` recebe cada bloco de saída assim que ele chega.
+        """
+        loop = asyncio.get_running_loop()
+        parent_conn, child_conn = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_benchmark_worker,
+            args=(os.path.abspath(sandbox_dir), list(argv), cpu, timeout, child_conn),
+            daemon=True
+        )
+        await loop.run_in_executor(None, process.start)
+        child_conn.close()
+
+        messages: asyncio.Queue = asyncio.Queue()
+
+        def on_readable():
+            try:
+                while parent_conn.poll():
+                    messages.put_nowait(parent_conn.recv())
+            except (EOFError, OSError):
+                loop.remove_reader(parent_conn.fileno())
+                messages.put_nowait(None)
+
+        loop.add_reader(parent_conn.fileno(), on_readable)
+        output: List[str] = []
+        result: Optional[Dict[str, Any]] = None
+        try:
+            while True:
+                message = await messages.get()
+                if message is None:
+                    break
+                kind, payload = message
+                if kind == "output":
+                    output.append(payload)
+                    if on_output is not None:
+                        on_output(payload)
+                elif kind == "result":
+                    result = payload
+        finally:
+            if not parent_conn.closed:
+                loop.remove_reader(parent_conn.fileno())
+                parent_conn.close()
+            await loop.run_in_executor(None, process.join)
+
+        self.runs += 1
+        if result is None:
+            self.logger.error(f"Sandbox worker for {sandbox_dir} exited with code {process.exitcode} without a result")
+            return SandboxResult(execution_time=0.0, cpu_user_seconds=0.0, cpu_system_seconds=0.0,
+                                 peak_memory_mb=0.0, exit_code=process.exitcode or -1,
+                                 output="".join(output), cpu=cpu)
+        return SandboxResult(output="".join(output), **result)
+
+    async def run_many(self, sandbox_dirs: Sequence[str], argv: Sequence[str], timeout: Optional[float] = None,
+                       on_output: Optional[Callable[[str, str], None]] = None) -> List[SandboxResult]:
+        """
+        Roda o mesmo ``argv`` em vários sandboxes, em paralelo, cada execução fixada
+        numa CPU livre. Os resultados seguem a ordem de ``sandbox_dirs``.
+        """
+        free_cpus: asyncio.Queue = asyncio.Queue()
+        for cpu in self.cpus[:self.max_parallel]:
+            free_cpus.put_nowait(cpu)
+
+        async def run_one(sandbox_dir: str) -> SandboxResult:
+            cpu = await free_cpus.get()
+            try:
+                callback = (lambda chunk: on_output(sandbox_dir, chunk)) if on_output else None
+                return await self.run(sandbox_dir, argv, timeout=timeout, cpu=cpu, on_output=callback)
+            finally:
+                free_cpus.put_nowait(cpu)
+
+        return list(await asyncio.gather(*(run_one(d) for d in sandbox_dirs)))
+
+
+_runner: Optional[SandboxRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_sandbox_runner(config: Optional[Dict[str, Any]] = None,
+                       logger: Optional[logging.Logger] = None) -> SandboxRunner:
+    """Obtém o runner global (o forkserver é compartilhado pelo processo)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            runner_config = (config or {}).get("sandbox_runner", {})
+            _runner = SandboxRunner(
+                logger or logging.getLogger("hephaestus"),
+                preload=runner_config.get("preload_modules"),
+                max_parallel=runner_config.get("max_parallel")
+            )
+        return _runner
@@ -0,0 +1,164 @@
+"""
+System Metrics Sampler - Amostragem única e não bloqueante de métricas do sistema
+
+Os monitores (ContinuousMonitor, CycleMonitorAgent, SelfEvolutionEngine,
+UnifiedDashboard, RealTimeEvolutionEngine, SelfAwarenessCore) liam o psutil
+cada um por conta própria, vários com ``cpu_percent(interval=1)``, que bloqueia
+a thread por um segundo a cada leitura. O sampler coleta métricas do host e do
+processo uma vez por intervalo, via job no escalonador de background, usando
+``cpu_percent(interval=None)`` (delta desde a amostra anterior, sem bloquear),
+e publica num ring buffer compartilhado. Os consumidores leem a última amostra
+ou agregados de uma janela.
+"""
+
+import logging
+import math
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Any, Deque, Dict, List, Optional
+
+import psutil
+
+from hephaestus.utils.background_scheduler import get_background_scheduler, JobPriority
+
+
+@dataclass(frozen=True)
+class SystemSnapshot:
+    """Uma amostra de métricas do host e do processo"""
+    timestamp: float
+    cpu_percent: float
+    memory_percent: float
+    memory_available: int
+    disk_usage_percent: float
+    process_cpu_percent: float
+    process_memory_rss: int
+    active_threads: int
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# Campos numéricos agregados por ``aggregate``
+_AGGREGATED_FIELDS = (
+    "cpu_percent", "memory_percent", "disk_usage_percent",
+    "process_cpu_percent", "process_memory_rss", "active_threads"
+)
+
+
+class SystemMetricsSampler:
+    """Coleta periódica compartilhada com ring buffer de amostras"""
+
+    def __init__(self, logger: logging.Logger, interval: float = 5.0, history_size: int = 720,
+                 disk_path: str = "/"):
+        self.logger = logger.getChild("SystemMetricsSampler")
+        self.interval = interval
+        self.disk_path = disk_path
+        self._samples: Deque[SystemSnapshot] = deque(maxlen=history_size)
+        self._lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+        self._job = None
+        self.samples_taken = 0
+
+        # A primeira leitura de cpu_percent(None) só estabelece a referência
+        psutil.cpu_percent(interval=None)
+        self._process.cpu_percent(interval=None)
+
+    def start(self):
+        """Agenda a coleta periódica (idempotente)"""
+        if self._job is not None and self._job.active:
+            return
+        self._job = get_background_scheduler().schedule(
+            "system_metrics_sampler", self.sample, interval=self.interval,
+            priority=JobPriority.HIGH, max_runtime=1.0, initial_delay=0, pausable=False
+        )
+
+    def stop(self):
+        if self._job is not None:
+            self._job.cancel()
+            self._job = None
+
+    def sample(self) -> SystemSnapshot:
+        """Coleta uma amostra agora e a publica no buffer"""
+        memory = psutil.virtual_memory()
+        try:
+            disk_percent = psutil.disk_usage(self.disk_path).percent
+        except OSError:
+            disk_percent = 0.0
+        try:
+            with self._process.oneshot():
+                process_cpu = self._process.cpu_percent(interval=None)
+                process_rss = self._process.memory_info().rss
+        except psutil.Error:
+            process_cpu, process_rss = 0.0, 0
+
+        snapshot = SystemSnapshot(
+            timestamp=time.time(),
+            cpu_percent=psutil.cpu_percent(interval=None),
+            memory_percent=memory.percent,
+            memory_available=memory.available,
+            disk_usage_percent=disk_percent,
+            process_cpu_percent=process_cpu,
+            process_memory_rss=process_rss,
+            active_threads=threading.active_count()
+        )
+        with self._lock:
+            self._samples.append(snapshot)
+            self.samples_taken += 1
+        return snapshot
+
+    def latest(self, max_age: Optional[float] = None) -> SystemSnapshot:
+        """
+        Última amostra publicada. Se não houver nenhuma, ou se for mais velha
+        que ``max_age`` (padrão: dois intervalos), coleta uma na hora.
+        """
+        max_age = 2 * self.interval if max_age is None else max_age
+        with self._lock:
+            snapshot = self._samples[-1] if self._samples else None
+        if snapshot is None or time.time() - snapshot.timestamp > max_age:
+            snapshot = self.sample()
+        return snapshot
+
+    def window(self, seconds: float) -> List[SystemSnapshot]:
+        """Amostras dos últimos ``seconds`` segundos, da mais antiga à mais recente"""
+        cutoff = time.time() - seconds
+        with self._lock:
+            return [s for s in self._samples if s.timestamp >= cutoff]
+
+    def aggregate(self, seconds: float) -> Dict[str, Dict[str, float]]:
+        """Média, mínimo e máximo de cada métrica na janela"""
+        samples = self.window(seconds) or [self.latest()]
+        result = {}
+        for field_name in _AGGREGATED_FIELDS:
+            values = [getattr(s, field_name) for s in samples]
+            # fsum + clamp: a média de valores iguais não pode escapar de [min, max] por arredondamento
+            average = math.fsum(values) / len(values)
+            result[field_name] = {
+                "avg": min(max(average, min(values)), max(values)),
+                "min": min(values),
+                "max": max(values)
+            }
+        result["samples"] = {"count": len(samples)}
+        return result
+
+
+_sampler: Optional[SystemMetricsSampler] = None
+_sampler_lock = threading.Lock()
+
+
+def get_system_metrics_sampler(config: Optional[Dict[str, Any]] = None,
+                               logger: Optional[logging.Logger] = None) -> SystemMetricsSampler:
+    """Obtém o sampler global, já coletando em background"""
+    global _sampler
+    with _sampler_lock:
+        if _sampler is None:
+            metrics_config = (config or {}).get("system_metrics", {})
+            _sampler = SystemMetricsSampler(
+                logger or logging.getLogger("hephaestus"),
+                interval=metrics_config.get("sample_interval_seconds", 5.0),
+                history_size=metrics_config.get("history_size", 720)
+            )
+            _sampler.start()
+        return _sampler
@@ -1,6 +1,9 @@
+import asyncio
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 import requests  # Adicionado para suportar web_search
 from typing import Tuple, Dict, Any, Optional
 
@@ -8,6 +11,9 @@ import psutil
 import os
 from pathlib import Path # ADICIONADO
 
+from hephaestus.utils.config_manager import ConfigManager
+from hephaestus.utils.sandbox_runner import forkserver_available, get_sandbox_runner
+
 def run_pytest(test_dir: str = "tests/", cwd: str | Path | None = None) -> Tuple[bool, str]:
     """
     Executa testes pytest no diretório especificado e retorna resultados.
@@ -95,51 +101,72 @@ def read_file(file_path: str) -> Optional[str]:
         return None
 
 
-def run_in_sandbox(temp_dir_path: str, objective: str) -> Dict[str, Any]:
-    """Executa o main.py de um diretório isolado monitorando tempo e memória."""
-    cmd = [sys.executable, "main.py", objective, "--benchmark"]
+def run_in_sandbox(temp_dir_path: str, objective: str, timeout: Optional[float] = None,
+                   config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Executa o main.py de um diretório isolado medindo tempo, CPU, memória e I/O.
 
-    start_time = time.time()
+    Usa o SandboxRunner (forkserver + wait4) quando disponível; em plataformas
+    sem fork, recorre a um subprocesso monitorado via psutil. O runner é criado
+    com a seção ``sandbox_runner`` de ``config`` (padrão: a config carregada).
+    Chamada de dentro de um event loop, a execução roda numa thread própria.
+    """
+    argv = ["main.py", objective, "--benchmark"]
+    if forkserver_available():
+        runner = get_sandbox_runner(config if config is not None else ConfigManager.get_full_config())
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            result = asyncio.run(runner.run(temp_dir_path, argv, timeout=timeout))
+        else:
+            # asyncio.run não pode ser chamado com um loop ativo nesta thread
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                result = pool.submit(asyncio.run, runner.run(temp_dir_path, argv, timeout=timeout)).result()
+        return result.to_dict()
+    return _run_in_sandbox_subprocess(temp_dir_path, argv, timeout)
+
+
+def _run_in_sandbox_subprocess(temp_dir_path: str, argv: list[str], timeout: Optional[float]) -> Dict[str, Any]:
+    """Fallback sem forkserver: subprocesso com leitura da saída numa thread separada."""
+    start_time = time.perf_counter()
     process = subprocess.Popen(
-        cmd,
+        [sys.executable, *argv],
         cwd=temp_dir_path,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
     )
 
-    ps_proc = psutil.Process(process.pid)
-    peak_memory = 0.0
+    # A leitura da saída não pode atrasar a amostragem de memória
     output_lines = []
+    reader = threading.Thread(target=lambda: output_lines.extend(process.stdout), daemon=True)
+    reader.start()
 
-    while True:
-        if process.poll() is not None:
-            if process.stdout:
-                remaining = process.stdout.read()
-                if remaining:
-                    output_lines.append(remaining)
-            break
-
+    ps_proc = psutil.Process(process.pid)
+    peak_memory = 0.0
+    cpu_times = None
+    timed_out = False
+    while process.poll() is None:
         try:
-            mem = ps_proc.memory_info().rss / (1024 ** 2)
-            if mem > peak_memory:
-                peak_memory = mem
+            peak_memory = max(peak_memory, ps_proc.memory_info().rss / (1024 ** 2))
+            cpu_times = ps_proc.cpu_times()
         except psutil.NoSuchProcess:
             pass
-
-        line = process.stdout.readline() if process.stdout else ""
-        if line:
-            output_lines.append(line)
-        time.sleep(0.1)
+        if timeout and time.perf_counter() - start_time > timeout:
+            process.kill()
+            timed_out = True
+        time.sleep(0.05)
 
     exit_code = process.wait()
-    execution_time = time.time() - start_time
-
+    reader.join(timeout=1)
     return {
-        "execution_time": execution_time,
+        "execution_time": time.perf_counter() - start_time,
+        "cpu_user_seconds": cpu_times.user if cpu_times else 0.0,
+        "cpu_system_seconds": cpu_times.system if cpu_times else 0.0,
         "peak_memory_mb": peak_memory,
         "exit_code": exit_code,
         "output": "".join(output_lines),
+        "timed_out": timed_out,
     }
 
 
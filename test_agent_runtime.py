@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+🔄 Teste do runtime do agente na API
+Verifica o ciclo supervisionado no loop do servidor, snapshots somente leitura,
+reinício após falha e a eleição do worker que roda o ciclo
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.api.agent_runtime import AgentRuntime, RuntimeLeaderLock, SharedSnapshotReader
+from hephaestus.core.state import AgentState
+from hephaestus.utils.queue_manager import QueueManager
+
+
+class FakeMemory:
+    def __init__(self, fail_saves: int = 0):
+        self.fail_saves = fail_saves
+        self.saves = 0
+
+    def has_degenerative_failure_pattern(self, objective, reason, threshold=3):
+        return False
+
+    def save(self):
+        self.saves += 1
+        if self.fail_saves:
+            self.fail_saves -= 1
+            raise RuntimeError("disk full")
+
+
+class FakeAgent:
+    """Agente mínimo: objetivos com task_type desconhecido completam o ciclo sem LLM"""
+
+    def __init__(self, log_dir: Path, memory: FakeMemory):
+        self.logger = logging.getLogger("test_agent_runtime")
+        self.config = {"idle_poll_seconds": 0.01, "cycle_delay_seconds": 0}
+        self.state = AgentState()
+        self.memory = memory
+        self.objective_stack = []
+        self.continuous_mode = False
+        self.objective_stack_depth_for_testing = None
+        self.evolution_log_file = str(log_dir / "evolution_log.csv")
+
+
+async def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def test_runtime_waits_for_objectives_and_publishes_snapshots():
+    """O ciclo não termina com a fila vazia e o snapshot reflete o progresso"""
+    async def scenario(tmp: Path):
+        queue = QueueManager()
+        runtime = AgentRuntime(FakeAgent(tmp, FakeMemory()), queue, snapshot_path=tmp / "snapshot.json")
+        await runtime.start()
+
+        await wait_for(lambda: runtime.snapshot()["phase"] == "idle")
+        assert runtime.is_running and runtime.snapshot()["worker_active"]
+
+        queue.put_objective({"task_type": "noop"})
+        queue.put_objective({"task_type": "noop"})
+        await wait_for(lambda: runtime.snapshot()["cycle_count"] == 2 and runtime.snapshot()["phase"] == "idle")
+        snapshot = runtime.snapshot()
+        assert snapshot["queue_size"] == 0
+
+        # Snapshots são cópias: alterá-los não afeta o runtime
+        snapshot["current_cycle"]["current_objective"] = "tampered"
+        assert runtime.snapshot()["current_cycle"]["current_objective"] != "tampered"
+
+        # Workers sem o ciclo leem o snapshot publicado em arquivo
+        assert SharedSnapshotReader(tmp / "snapshot.json").snapshot()["cycle_count"] == 2
+
+        await runtime.stop(timeout=5)
+        assert not runtime.is_running
+        assert runtime.snapshot()["phase"] == "stopped"
+        assert not runtime.snapshot()["worker_active"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(Path(tmp)))
+
+
+def test_runtime_restarts_crashed_runner():
+    """Uma exceção fora do ciclo derruba o runner, que é reiniciado com back-off"""
+    async def scenario(tmp: Path):
+        queue = QueueManager()
+        memory = FakeMemory(fail_saves=1)
+        runtime = AgentRuntime(FakeAgent(tmp, memory), queue, restart_backoff=0.01)
+        await runtime.start()
+
+        queue.put_objective({"task_type": "noop"})
+        await wait_for(lambda: runtime.restarts == 1)
+        queue.put_objective({"task_type": "noop"})
+        await wait_for(lambda: memory.saves == 2)
+        await wait_for(lambda: runtime.snapshot()["phase"] == "idle")
+        assert runtime.is_running and runtime.snapshot()["restarts"] == 1
+
+        await runtime.stop(timeout=5)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        asyncio.run(scenario(Path(tmp)))
+
+
+def test_leader_lock_elects_single_worker():
+    """Só um worker da API obtém o lock e roda o ciclo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        leader = RuntimeLeaderLock(Path(tmp) / "agent.lock")
+        follower = RuntimeLeaderLock(Path(tmp) / "agent.lock")
+        assert leader.acquire()
+        assert not follower.acquire()
+        leader.release()
+        assert follower.acquire()
+        follower.release()
+
+
+if __name__ == "__main__":
+    test_runtime_waits_for_objectives_and_publishes_snapshots()
+    test_runtime_restarts_crashed_runner()
+    test_leader_lock_elects_single_worker()
+    print("✅ Agent runtime tests passed!")
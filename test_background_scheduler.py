@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+⏰ Teste do escalonador único de tarefas em background
+Verifica execução periódica, sobreposição pulada, pausa durante o ciclo, prioridade e estatísticas
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils.background_scheduler import BackgroundScheduler, JobPriority
+from hephaestus.utils.rate_limiter import LLMPriority, current_llm_priority
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("BackgroundSchedulerTest")
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.01)
+    return condition()
+
+
+def test_periodic_runs_and_stats():
+    """Jobs rodam no intervalo, em prioridade de background, e acumulam estatísticas"""
+    scheduler = BackgroundScheduler(logger, max_workers=2)
+    priorities = []
+    try:
+        job = scheduler.schedule("tick", lambda: priorities.append(current_llm_priority()),
+                                 interval=0.05, initial_delay=0)
+        assert wait_for(lambda: len(priorities) >= 3)
+        job.cancel()
+        stats = scheduler.get_stats()
+        assert "tick" not in stats["jobs"]
+        assert job.stats.runs >= 3 and job.stats.failures == 0
+        assert set(priorities) == {LLMPriority.BACKGROUND}
+    finally:
+        scheduler.shutdown()
+
+
+def test_overlapping_runs_are_skipped():
+    """Uma execução que vence enquanto a anterior roda é pulada, não enfileirada"""
+    scheduler = BackgroundScheduler(logger, max_workers=2)
+    release = threading.Event()
+    concurrent = []
+    active = []
+
+    def slow():
+        active.append(1)
+        concurrent.append(len(active))
+        release.wait(2)
+        active.pop()
+
+    try:
+        job = scheduler.schedule("slow", slow, interval=0.02, initial_delay=0, max_runtime=0.01)
+        assert wait_for(lambda: job.stats.skipped_overlaps >= 2)
+        release.set()
+        assert wait_for(lambda: job.stats.runs >= 1)
+        assert max(concurrent) == 1
+        assert job.stats.overruns >= 1
+    finally:
+        release.set()
+        scheduler.shutdown()
+
+
+def test_latency_critical_pauses_background_jobs():
+    """Durante a fase crítica só jobs não pausáveis rodam; os demais rodam ao retomar"""
+    scheduler = BackgroundScheduler(logger, max_workers=2)
+    runs = {"health": 0, "analysis": 0}
+    try:
+        with scheduler.latency_critical("cycle"):
+            scheduler.schedule("health", lambda: runs.__setitem__("health", runs["health"] + 1),
+                               interval=0.02, initial_delay=0, pausable=False, priority=JobPriority.HIGH)
+            analysis = scheduler.schedule("analysis", lambda: runs.__setitem__("analysis", runs["analysis"] + 1),
+                                          interval=0.02, initial_delay=0, priority=JobPriority.LOW)
+            assert wait_for(lambda: runs["health"] >= 2)
+            assert runs["analysis"] == 0
+            assert scheduler.get_stats()["paused"]
+        assert wait_for(lambda: runs["analysis"] >= 1)
+        assert analysis.stats.deferred_by_pause == 1
+    finally:
+        scheduler.shutdown()
+
+
+def test_priority_order_with_single_worker():
+    """Com um worker, jobs vencidos ao mesmo tempo rodam em ordem de prioridade"""
+    scheduler = BackgroundScheduler(logger, max_workers=1)
+    order = []
+    try:
+        with scheduler.latency_critical():
+            scheduler.schedule("low", lambda: order.append("low"), interval=60, initial_delay=0, priority=JobPriority.LOW)
+            scheduler.schedule("high", lambda: order.append("high"), interval=60, initial_delay=0, priority=JobPriority.HIGH)
+            scheduler.schedule("normal", lambda: order.append("normal"), interval=60, initial_delay=0)
+            time.sleep(0.05)
+        assert wait_for(lambda: len(order) == 3)
+        assert order == ["high", "normal", "low"]
+    finally:
+        scheduler.shutdown()
+
+
+if __name__ == "__main__":
+    test_periodic_runs_and_stats()
+    test_overlapping_runs_are_skipped()
+    test_latency_critical_pauses_background_jobs()
+    test_priority_order_with_single_worker()
+    print("✅ Background scheduler tests passed!")
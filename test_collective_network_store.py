@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+🗄️ Teste do store em arquivo único da Collective Intelligence Network
+Verifica escrita em lote, partida só com o índice, hidratação sob demanda e migração dos JSON antigos
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.intelligence.collective_network_store import CollectiveNetworkStore
+from hephaestus.intelligence.collective_intelligence_network import (
+    CollectiveIntelligenceNetwork, KnowledgeType, KnowledgeRelevance
+)
+from hephaestus.utils.background_scheduler import get_background_scheduler
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("CollectiveNetworkStoreTest")
+
+CONFIG = {"collective_intelligence": {"store_batch_size": 1000, "max_hydrated_items": 2}}
+
+
+def in_temp_dir(test):
+    """Roda o teste num diretório temporário, com os jobs de background pausados"""
+    def wrapper():
+        cwd = os.getcwd()
+        with tempfile.TemporaryDirectory() as tmp:
+            os.chdir(tmp)
+            try:
+                with get_background_scheduler().latency_critical("test"):
+                    test()
+            finally:
+                os.chdir(cwd)
+    wrapper.__name__ = test.__name__
+    wrapper.__doc__ = test.__doc__
+    return wrapper
+
+
+def make_network():
+    network = CollectiveIntelligenceNetwork(CONFIG, logger)
+    network.stop_insight_generation()
+    return network
+
+
+def test_batched_writes_keep_unloaded_content():
+    """Escritas ficam pendentes até o flush, e atualizar o índice não apaga o conteúdo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = CollectiveNetworkStore(Path(tmp) / "network.db", logger, batch_size=3)
+        row = {
+            "knowledge_id": "k1", "knowledge_type": "solution_pattern", "source_agent": "a",
+            "title": "Cache", "relevance": "medium", "confidence": 0.8,
+            "created_at": "2026-01-01T00:00:00", "last_accessed": "2026-01-01T00:00:00",
+            "access_count": 0, "validation_count": 0, "success_applications": 0,
+            "failed_applications": 0, "tags": ["cache"], "related_knowledge": [],
+            "content": "Use an LRU cache for prompts", "context": {"area": "llm"}
+        }
+        store.put_knowledge(row)
+        store.put_agent("a", {"agent_id": "a"})
+        assert store.pending_count == 2 and store.stats["batches_written"] == 0
+
+        store.put_insight("i1", {"insight_id": "i1"})
+        assert store.pending_count == 0 and store.stats["batches_written"] == 1
+
+        store.put_knowledge({**row, "access_count": 7, "content": "", "context": {}}, with_content=False)
+        store.flush()
+        index = store.load_knowledge_index()
+        assert index[0]["access_count"] == 7 and "content" not in index[0]
+        assert store.load_content("k1") == ("Use an LRU cache for prompts", {"area": "llm"})
+        assert store.content_matches("lru CACHE") == {"k1"}
+
+        # Linhas legadas são completadas na entrada; sem as colunas obrigatórias são rejeitadas
+        legacy = {key: value for key, value in row.items() if key not in ("relevance", "tags", "content")}
+        store.put_knowledge({**legacy, "knowledge_id": "k2"})
+        try:
+            store.put_knowledge({**legacy, "knowledge_id": "k3", "knowledge_type": None})
+            assert False, "row without knowledge_type was accepted"
+        except ValueError:
+            pass
+
+        # Uma linha que não pode ser gravada é descartada sem bloquear o resto do lote
+        store.put_agent("b", {"agent_id": "b"})
+        store.put_knowledge({**row, "knowledge_id": "k4", "tags": [object()]})  # completa o lote de 3
+        assert store.pending_count == 0 and store.stats["rows_rejected"] == 1
+        assert {item["knowledge_id"] for item in store.load_knowledge_index()} == {"k1", "k2"}
+        assert store.load_content("k2") == ("", {"area": "llm"})
+        assert {agent["agent_id"] for agent in store.load_agents()} == {"a", "b"}
+        store.close()
+
+
+@in_temp_dir
+def test_startup_loads_index_and_hydrates_on_access():
+    """Uma nova instância carrega só o índice; busca e acesso hidratam o conteúdo"""
+    network = make_network()
+    network.register_agent("architect", "architect", ["design"], ["patterns"])
+    knowledge_id = network.share_knowledge(
+        "architect", KnowledgeType.SOLUTION_PATTERN, "Retry policy",
+        "Exponential backoff with jitter avoids thundering herds", {"source": "incident"}, ["patterns"]
+    )
+    network.store.close()
+
+    restarted = make_network()
+    assert len(restarted.knowledge_base) == 2
+    assert not restarted.knowledge_base[knowledge_id].hydrated
+    assert "architect" in restarted.agent_profiles
+
+    results = restarted.search_knowledge("tester", "thundering herds")
+    assert results[0].knowledge_id == knowledge_id
+    assert results[0].content.startswith("Exponential backoff")
+
+    restarted.validate_knowledge("tester", knowledge_id, True)
+    item = restarted.get_knowledge(knowledge_id)
+    assert item.context == {"source": "incident"} and item.success_applications == 1
+    restarted.store.close()
+
+
+@in_temp_dir
+def test_legacy_json_files_are_migrated():
+    """Os arquivos JSON por item de versões antigas são importados uma única vez"""
+    knowledge_dir = Path("data/collective_intelligence/knowledge")
+    knowledge_dir.mkdir(parents=True)
+    (knowledge_dir / "legacy_1.json").write_text(json.dumps({
+        "knowledge_id": "legacy_1", "knowledge_type": "failure_pattern", "source_agent": "old",
+        "title": "Old failure", "content": "Timeouts on large diffs", "context": {},
+        "relevance": "high", "confidence": 0.9, "created_at": "2026-01-01T00:00:00",
+        "last_accessed": "2026-01-01T00:00:00", "access_count": 3, "validation_count": 0,
+        "success_applications": 0, "failed_applications": 0, "tags": ["timeout"], "related_knowledge": []
+    }))
+
+    # Sem relevance é completado; com tipo desconhecido é ignorado sem impedir os demais
+    (knowledge_dir / "legacy_2.json").write_text(json.dumps({
+        "knowledge_id": "legacy_2", "knowledge_type": "solution_pattern", "source_agent": "old",
+        "title": "Old fix", "content": "Split large diffs", "created_at": "2026-01-01T00:00:00"
+    }))
+    (knowledge_dir / "legacy_3.json").write_text(json.dumps({
+        "knowledge_id": "legacy_3", "knowledge_type": "unknown_type", "source_agent": "old"
+    }))
+
+    network = make_network()
+    assert "legacy_1" in network.knowledge_base and "legacy_3" not in network.knowledge_base
+    assert network.get_knowledge("legacy_2").relevance == KnowledgeRelevance.MEDIUM
+    assert not knowledge_dir.exists()
+    assert Path("data/collective_intelligence/knowledge.migrated/legacy_1.json").exists()
+    assert network.get_knowledge("legacy_1").content == "Timeouts on large diffs"
+    network.store.close()
+
+
+if __name__ == "__main__":
+    test_batched_writes_keep_unloaded_content()
+    test_startup_loads_index_and_hydrates_on_access()
+    test_legacy_json_files_are_migrated()
+    print("✅ Collective network store tests passed!")
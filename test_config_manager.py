@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+⚙️ Teste dos snapshots de configuração do ConfigManager
+Verifica as consultas por chave pontuada e as views por agente/modelo, a
+imutabilidade do snapshot, a troca com notificação dos assinantes e a
+reconstrução disparada pelo watcher (sem recompor o Hydra se nada mudou)
+"""
+
+import sys
+import copy
+import json
+import time
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+import yaml
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils import config_manager
+from hephaestus.utils.config_manager import ConfigManager
+
+CONFIG = {
+    "monitoring": {"refresh_interval": 15, "thresholds": {"cpu": 80}},
+    "agents": {"ArchitectAgent": {"temperature": 0.1, "model_type": "architect_default"}},
+    "models": {"architect_default": {"primary": "model/a", "fallback": "model/b"}, "named": "model/c"},
+    "services": {"validation": {"timeout": 5}},
+    "api": {"port": 8000},
+    "watchers": ["a", "b"],
+}
+
+
+def reset_manager(config_dir: Path):
+    ConfigManager.stop_watching()
+    ConfigManager._snapshot = None
+    ConfigManager._composed = None
+    ConfigManager._config_dir = config_dir
+    ConfigManager._subscribers = []
+
+
+def load_from(config_dir: Path):
+    """Substitui a composição do Hydra pela leitura direta do YAML temporário."""
+    calls = []
+
+    def fake_load_config():
+        calls.append(time.time())
+        return yaml.safe_load((config_dir / "default.yaml").read_text(encoding="utf-8"))
+    return fake_load_config, calls
+
+
+def test_snapshot_lookups_and_immutability():
+    """Consultas O(1) equivalem à navegação antiga; o snapshot não pode ser alterado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp)
+        (config_dir / "default.yaml").write_text(yaml.safe_dump(CONFIG), encoding="utf-8")
+        fake_load, calls = load_from(config_dir)
+        reset_manager(config_dir)
+        try:
+            with mock.patch.object(config_manager, "load_config", fake_load):
+                assert ConfigManager.get_config_value("monitoring.refresh_interval") == 15
+                assert ConfigManager.get_config_value("monitoring.thresholds") == {"cpu": 80}
+                assert ConfigManager.get_config_value("monitoring.missing", "d") == "d"
+                assert ConfigManager.get_config_value("api.port.deeper", 1) == 1
+                assert ConfigManager.get_env_config("API.PORT") == 8000
+
+                agent = ConfigManager.get_agent_config("ArchitectAgent")
+                assert agent["temperature"] == 0.1 and agent["max_retries"] == 3
+                assert ConfigManager.get_agent_config("Unknown")["temperature"] == 0.4
+                assert ConfigManager.get_model_config("architect_default")["primary"] == "model/a"
+                assert ConfigManager.get_model_config("missing")["primary"] == "model/a"
+                assert ConfigManager.get_model_config("named")["primary"] == "model/c"
+                assert ConfigManager.get_model_config("default")["primary"] == "deepseek/deepseek-chat-v3-0324:free"
+                assert ConfigManager.get_service_config("validation") == {"enabled": True, "timeout": 5, "retry_count": 3}
+                # Mesma view a cada chamada: nada é mesclado de novo
+                assert ConfigManager.get_agent_config("ArchitectAgent") is agent
+
+                full = ConfigManager.get_full_config()
+                assert json.loads(json.dumps(full))["watchers"] == ["a", "b"]
+                for mutate in (lambda: full.__setitem__("x", 1), lambda: full["monitoring"].update(x=1),
+                               lambda: agent.pop("temperature")):
+                    try:
+                        mutate()
+                        assert False, "TypeError esperado"
+                    except TypeError:
+                        pass
+                editable = copy.deepcopy(full)
+                editable["monitoring"]["refresh_interval"] = 1
+                assert ConfigManager.get_config_value("monitoring.refresh_interval") == 15
+                assert len(calls) == 1
+
+                # Listas voltam como tuplas, mas o snapshot se serializa como a config original
+                assert ConfigManager.get_config_value("watchers") == ("a", "b")
+                assert yaml.safe_load(yaml.safe_dump(full)) == CONFIG
+                assert yaml.safe_load(yaml.dump(ConfigManager.get_config_value("monitoring"))) == CONFIG["monitoring"]
+                # Consultar não inicia o watcher: isso é feito na partida do agente
+                assert ConfigManager._observer is None
+        finally:
+            reset_manager(None)
+
+
+def test_update_reload_and_subscribers():
+    """update_config troca o snapshot (copy-on-write); reload descarta o override sem recompor"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp)
+        (config_dir / "default.yaml").write_text(yaml.safe_dump(CONFIG), encoding="utf-8")
+        fake_load, calls = load_from(config_dir)
+        reset_manager(config_dir)
+        try:
+            with mock.patch.object(config_manager, "load_config", fake_load):
+                swaps = []
+                unsubscribe = ConfigManager.subscribe(lambda old, new: swaps.append((old, new)))
+                held = ConfigManager.get_snapshot()
+
+                ConfigManager.update_config("agents.ArchitectAgent.temperature", 0.9)
+                assert ConfigManager.get_agent_config("ArchitectAgent")["temperature"] == 0.9
+                assert held.agent("ArchitectAgent")["temperature"] == 0.1  # leitores antigos não veem a troca
+                assert swaps[-1][0] is held and swaps[-1][1].version == held.version + 1
+
+                ConfigManager.reload_config()
+                assert ConfigManager.get_agent_config("ArchitectAgent")["temperature"] == 0.1
+                swap_count = len(swaps)
+                ConfigManager.reload_config()  # nada mudou: nem composição nem troca
+                assert len(calls) == 1 and len(swaps) == swap_count
+
+                stats = ConfigManager.get_snapshot_stats()
+                assert stats["hydra_compositions"] >= 1 and stats["compositions_skipped"] >= 2
+                unsubscribe()
+                ConfigManager.update_config("api.port", 9000)
+                assert len(swaps) == swap_count
+        finally:
+            reset_manager(None)
+
+
+def test_watcher_rebuilds_once_per_burst():
+    """Uma rajada de gravações no YAML vira uma reconstrução e uma notificação"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config_dir = Path(tmp)
+        config_file = config_dir / "default.yaml"
+        config_file.write_text(yaml.safe_dump(CONFIG), encoding="utf-8")
+        fake_load, calls = load_from(config_dir)
+        reset_manager(config_dir)
+        try:
+            with mock.patch.object(config_manager, "load_config", fake_load):
+                ConfigManager.get_snapshot()
+                assert not ConfigManager.start_watching_from_config({"config_manager": {"watch_files": False}})
+                assert ConfigManager.start_watching_from_config(
+                    {"config_manager": {"watch_files": True, "debounce_seconds": 0.3}})
+                swaps = []
+                ConfigManager.subscribe(lambda old, new: swaps.append(new))
+
+                for interval in (20, 25, 30):
+                    changed = dict(CONFIG, monitoring={"refresh_interval": interval})
+                    config_file.write_text(yaml.safe_dump(changed), encoding="utf-8")
+                    time.sleep(0.05)
+
+                deadline = time.time() + 5
+                while not swaps and time.time() < deadline:
+                    time.sleep(0.05)
+                time.sleep(0.5)
+                assert len(swaps) == 1 and len(calls) == 2
+                assert ConfigManager.get_config_value("monitoring.refresh_interval") == 30
+        finally:
+            reset_manager(None)
+
+
+if __name__ == "__main__":
+    test_snapshot_lookups_and_immutability()
+    test_update_reload_and_subscribers()
+    test_watcher_rebuilds_once_per_burst()
+    print("✅ Config manager tests passed!")
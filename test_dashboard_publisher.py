@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+📡 Teste do publicador de snapshots do dashboard
+Verifica cálculo único por tick, deltas, keyframes periódicos e ressincronização de clientes lentos
+"""
+
+import sys
+import json
+import asyncio
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.api.dashboard_publisher import DashboardPublisher, compute_delta, apply_delta
+
+
+def test_delta_round_trip():
+    """Aplicar o delta ao estado antigo reproduz o novo snapshot"""
+    old = {"health": {"score": 90, "status": "ok"}, "alerts": [1, 2], "stale": True}
+    new = {"health": {"score": 85, "status": "ok"}, "alerts": [1, 2, 3], "agents": {"maestro": "active"}}
+    changes, removed = compute_delta(old, new)
+    assert (["health", "score"], 85) in changes
+    assert ["stale"] in removed
+    assert all(path != ["health", "status"] for path, _ in changes)
+
+    message = json.loads(json.dumps({"type": "delta", "changes": changes, "removed": removed}))
+    assert apply_delta(json.loads(json.dumps(old)), message) == new
+
+
+def test_snapshot_computed_once_for_all_subscribers():
+    """N assinantes recebem a mesma mensagem de um único cálculo por tick"""
+    async def scenario():
+        counter = {"calls": 0}
+
+        def compute():
+            counter["calls"] += 1
+            return {"tick": counter["calls"], "static": {"name": "hephaestus"}}
+
+        publisher = DashboardPublisher(compute, tick_seconds=3600, keyframe_every=3)
+        subscribers = [publisher.subscribe() for _ in range(5)]
+        await publisher.refresh()
+        await publisher.refresh()
+        await publisher.stop()
+        assert counter["calls"] == 2
+
+        for subscriber in subscribers:
+            keyframe = json.loads(await subscriber.next_message())
+            delta = json.loads(await subscriber.next_message())
+            assert keyframe["type"] == "keyframe" and keyframe["data"]["tick"] == 1
+            assert delta["type"] == "delta" and delta["changes"] == [[["tick"], 2]]
+
+        # Cached snapshot: no recomputation within the tick
+        assert (await publisher.get_snapshot())["tick"] == 2
+        assert counter["calls"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_slow_subscriber_is_resynced_with_keyframe():
+    """Um cliente lento não bloqueia os outros e volta a sincronizar com um keyframe"""
+    async def scenario():
+        counter = {"calls": 0}
+
+        def compute():
+            counter["calls"] += 1
+            return {"value": counter["calls"]}
+
+        publisher = DashboardPublisher(compute, tick_seconds=3600, keyframe_every=100, max_queue=2)
+        fast = publisher.subscribe()
+        slow = publisher.subscribe()
+        received = []
+        for _ in range(6):
+            await publisher.refresh()
+            received.append(json.loads(await fast.next_message()))
+        await publisher.stop()
+
+        assert [message["version"] for message in received] == [1, 2, 3, 4, 5, 6]
+        assert slow.resyncs >= 1
+        state = None
+        while not slow.queue.empty():
+            message = json.loads(await slow.next_message())
+            state = apply_delta(state or {}, message)
+        assert state == {"value": 6}
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_delta_round_trip()
+    test_snapshot_computed_once_for_all_subscribers()
+    test_slow_subscriber_is_resynced_with_keyframe()
+    print("✅ Dashboard publisher tests passed!")
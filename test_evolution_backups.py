@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+🗄️ Teste dos backups por conteúdo e dos commits em lote dos callbacks de evolução
+Verifica a deduplicação e a restauração por manifesto, que um ciclo com várias
+mudanças vira um único commit sem processos git e que o rollback restaura e
+commita os arquivos
+"""
+
+import os
+import sys
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils import git_utils
+from hephaestus.utils.backup_store import ContentAddressedBackupStore
+from hephaestus.utils.git_utils import GitCommitBatch
+from hephaestus.intelligence.evolution_callbacks import RealEvolutionCallbacks
+
+logger = logging.getLogger("test_evolution_backups")
+
+
+class SpawnCounter:
+    """Conta todos os processos criados (subprocess e GitPython passam por _execute_child)."""
+
+    def __init__(self):
+        self.commands = []
+        self._original = subprocess.Popen._execute_child
+
+    def __enter__(self):
+        counter = self
+
+        def execute_child(popen, args, *rest, **kwargs):
+            counter.commands.append(args)
+            return counter._original(popen, args, *rest, **kwargs)
+        self._patch = mock.patch.object(subprocess.Popen, "_execute_child", execute_child)
+        self._patch.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._patch.stop()
+
+
+def git(*args, cwd):
+    return subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, check=True).stdout
+
+
+def test_store_deduplicates_and_restores_by_manifest():
+    """Conteúdo repetido não é regravado; a restauração volta só o que mudou"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp)
+        (base / "a.yaml").write_text("a: 1\n", encoding="utf-8")
+        (base / "b.yaml").write_text("a: 1\n", encoding="utf-8")  # mesmo conteúdo de a.yaml
+        store = ContentAddressedBackupStore(base / "store", base_path=base)
+
+        first = store.snapshot(["a.yaml", "b.yaml", "new.yaml"], label="before")
+        stats = store.get_stats()
+        assert stats["objects_written"] == 1 and stats["dedup_hits"] == 1
+        assert store.load_manifest(first)["files"]["new.yaml"] is None
+
+        # Nada mudou: mesmo manifesto e nenhum byte novo
+        written = stats["bytes_written"]
+        assert store.snapshot(["a.yaml", "b.yaml", "new.yaml"], label="before") == first
+        assert store.get_stats()["bytes_written"] == written
+
+        (base / "a.yaml").write_text("a: 2\n", encoding="utf-8")
+        (base / "new.yaml").write_text("x: 1\n", encoding="utf-8")
+        second = store.snapshot(["a.yaml", "b.yaml", "new.yaml"], label="after")
+        assert second != first and store.get_stats()["objects_written"] == 3
+
+        assert sorted(store.restore(first)) == ["a.yaml", "new.yaml"]
+        assert (base / "a.yaml").read_text(encoding="utf-8") == "a: 1\n"
+        assert not (base / "new.yaml").exists()
+        assert store.restore(first) == []
+        assert store.restore(second, paths=["new.yaml"]) == ["new.yaml"]
+        assert (base / "a.yaml").read_text(encoding="utf-8") == "a: 1\n"
+        assert sorted(store.list_manifests()) == sorted([first, second])
+
+
+def test_cycle_is_one_commit_without_git_processes():
+    """Quatro mudanças num ciclo = um commit; o rollback restaura e commita"""
+    previous_cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = Path(tmp)
+        git("init", "-q", cwd=repo)
+        git("config", "user.name", "Test", cwd=repo)
+        git("config", "user.email", "test@example.com", cwd=repo)
+        (repo / "README.md").write_text("test\n", encoding="utf-8")
+        (repo / ".gitignore").write_text("data/backups/\n", encoding="utf-8")
+        git("add", "-A", cwd=repo)
+        git("commit", "-qm", "init", cwd=repo)
+        os.chdir(repo)
+        try:
+            callbacks = RealEvolutionCallbacks({}, logger)
+            with SpawnCounter() as spawned:
+                with callbacks.evolution_cycle():
+                    assert callbacks.apply_parameter_tuning(
+                        {"parameter": "temperature", "component": "llm_calls", "new_value": 0.2})
+                    assert callbacks.apply_parameter_tuning(
+                        {"parameter": "max_tokens", "component": "llm_calls", "new_value": 2048})
+                    assert callbacks.apply_strategy_adjustment({"strategy": "cycle_delay_seconds", "new_value": 3})
+                    assert callbacks.apply_workflow_modification(
+                        {"workflow": "main", "modification": "Add retry mechanism", "impact": "fewer failures"})
+                    assert not any(c.git_committed for c in callbacks.applied_changes)
+            # No máximo o git check-ignore da primeira vez que cada caminho aparece
+            assert len(spawned.commands) <= 1, spawned.commands
+
+            log = git("log", "--format=%s", cwd=repo).splitlines()
+            assert log == ["🤖 Evolution cycle: 4 changes", "init"]
+            hashes = {c.commit_hash for c in callbacks.applied_changes}
+            assert len(hashes) == 1 and all(c.git_committed for c in callbacks.applied_changes)
+            committed = git("show", "--name-only", "--format=", "HEAD", cwd=repo).split()
+            assert sorted(committed) == ["config/dynamic/runtime_config.yaml", "data/workflows/main_workflow.yaml"]
+            assert git("status", "--porcelain", "--", "config", "data/workflows", cwd=repo) == ""
+
+            cycle = callbacks.get_cycle_stats()["cycles"][-1]
+            assert cycle["changes"] == 4 and cycle["processes_spawned"] <= 1 and cycle["seconds"] > 0
+            assert cycle["backup_bytes_written"] > 0
+
+            # Rollback fora de ciclo: commit imediato, ainda sem processos
+            workflow_change = callbacks.applied_changes[-1]
+            with SpawnCounter() as spawned:
+                assert callbacks.rollback_change(workflow_change.change_id)
+            assert spawned.commands == [], spawned.commands
+            assert not (repo / "data" / "workflows" / "main_workflow.yaml").exists()
+            assert git("status", "--porcelain", "--", "data/workflows", cwd=repo) == ""
+            assert git("log", "-1", "--format=%s", cwd=repo).startswith("🤖 Evolution: Rollback Modified workflow main")
+            assert callbacks.get_cycle_stats()["cycles"][-1]["processes_spawned"] == 0
+        finally:
+            os.chdir(previous_cwd)
+
+
+def test_batch_commits_only_its_own_paths():
+    """O que o usuário já tinha no stage continua no stage, fora do commit do lote (biblioteca e CLI)"""
+    for library in (True, False):
+        with tempfile.TemporaryDirectory() as tmp:
+            repo = Path(tmp)
+            git("init", "-q", cwd=repo)
+            git("config", "user.name", "Test", cwd=repo)
+            git("config", "user.email", "test@example.com", cwd=repo)
+            (repo / "old.txt").write_text("old\n", encoding="utf-8")
+            git("add", "-A", cwd=repo)
+            git("commit", "-qm", "init", cwd=repo)
+
+            (repo / "user.txt").write_text("work in progress\n", encoding="utf-8")
+            git("add", "user.txt", cwd=repo)
+            (repo / "evolved.yaml").write_text("a: 1\n", encoding="utf-8")
+            (repo / "old.txt").unlink()
+
+            with mock.patch.object(git_utils, "GITPYTHON_AVAILABLE", library):
+                batch = GitCommitBatch(logger, repo)
+                batch.stage([repo / "evolved.yaml", repo / "old.txt"], "Evolve config")
+                assert batch.flush("🤖 Evolution cycle: 1 change")
+                assert batch.stats["library_commits" if library else "cli_commits"] == 1
+
+            committed = git("show", "--name-status", "--format=", "HEAD", cwd=repo).split()
+            assert sorted(zip(committed[::2], committed[1::2])) == [("A", "evolved.yaml"), ("D", "old.txt")], committed
+            assert git("status", "--porcelain", cwd=repo).splitlines() == ["A  user.txt"]
+
+
+if __name__ == "__main__":
+    test_store_deduplicates_and_restores_by_manifest()
+    test_cycle_is_one_commit_without_git_processes()
+    test_batch_commits_only_its_own_paths()
+    print("✅ Evolution backup tests passed!")
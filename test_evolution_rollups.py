@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+📈 Teste dos agregados incrementais do evolution log
+Verifica os sketches de duração mescláveis, a atualização por linha, a
+recuperação a partir do offset do snapshot e o resumo do PerformanceAnalysisAgent
+"""
+
+import csv
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.agents.performance_analyzer import PerformanceAnalysisAgent
+from hephaestus.utils.evolution_rollups import DurationSketch, EvolutionRollupStore, get_evolution_rollups
+
+HEADER = ["ciclo", "objetivo", "status", "tempo_gasto_segundos", "score_qualidade", "estrategia_usada",
+          "timestamp_inicio", "timestamp_fim", "razao_status", "contexto_status"]
+
+
+def make_row(cycle: int, objective: str, success: bool, duration: float, strategy: str):
+    return [cycle, objective, "success" if success else "failure", duration, "", strategy,
+            "2026-01-01T00:00:00", "2026-01-01T00:01:00", "APPLIED_AND_VALIDATED" if success else "FAILED", ""]
+
+
+def append_row(path: Path, row, store: EvolutionRollupStore = None):
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        start = f.tell()
+        csv.writer(f).writerow(row)
+        end = f.tell()
+    if store is not None:
+        store.record(row, start, end)
+
+
+def test_duration_sketch_quantiles_and_merge():
+    """Quantis dentro do erro relativo; mesclar sketches equivale a um sketch único"""
+    rng = random.Random(7)
+    values = [rng.lognormvariate(3, 1) for _ in range(5000)]
+    left, right, whole = DurationSketch(), DurationSketch(), DurationSketch()
+    for i, value in enumerate(values):
+        (left if i % 2 else right).add(value)
+        whole.add(value)
+    left.merge(right)
+    assert left.buckets == whole.buckets and left.count == whole.count
+
+    ordered = sorted(values)
+    for q in (0.5, 0.9, 0.99):
+        exact = ordered[int(q * (len(ordered) - 1))]
+        assert abs(left.quantile(q) - exact) / exact <= 0.02 + 1e-9
+    assert DurationSketch.from_dict(whole.to_dict()).quantile(0.9) == whole.quantile(0.9)
+
+
+def test_rows_are_applied_and_recovered_from_offset():
+    """Linhas gravadas com o store parado são reaplicadas a partir do offset do snapshot"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "evolution_log.csv"
+        append_row(log_path, HEADER)
+        store = EvolutionRollupStore(str(log_path))
+        append_row(log_path, make_row(1, "[BUGFIX] Fix parser", True, 10.0, "SYNTAX_ONLY"), store)
+        append_row(log_path, make_row(2, "Add type hints\nacross modules", False, 20.0, "FULL_VALIDATION"), store)
+        assert store.offset == log_path.stat().st_size
+
+        # Processo novo: snapshot + linhas escritas depois dele (uma delas incompleta)
+        append_row(log_path, make_row(3, "[BUGFIX] Fix cache", False, 30.0, "SYNTAX_ONLY"))
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("4,[CHORE] partial")
+        recovered = EvolutionRollupStore(str(log_path))
+        summary = recovered.summary()
+        assert summary["total"]["cycles"] == 3 and summary["total"]["successes"] == 1
+        assert summary["strategies"]["SYNTAX_ONLY"]["failures"] == 1
+        assert summary["objective_types"]["BUGFIX"]["cycles"] == 2
+        assert summary["objective_types"]["GENERAL"]["cycles"] == 1
+
+        # Log recriado (menor que o offset): os agregados são reconstruídos
+        log_path.write_text("", encoding="utf-8")
+        append_row(log_path, HEADER)
+        append_row(log_path, make_row(1, "Fresh start", True, 5.0, "SYNTAX_ONLY"))
+        assert recovered.summary()["total"]["cycles"] == 1
+
+
+def test_performance_analysis_uses_rollups():
+    """O resumo vem dos agregados: estratégias ordenadas por falhas e tipos de objetivo"""
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "evolution_log.csv"
+        agent = PerformanceAnalysisAgent(str(log_path))
+        assert agent.analyze_performance() == "Evolution log not found. No performance analysis available."
+
+        append_row(log_path, HEADER)
+        assert agent.analyze_performance() == "Evolution log is empty. No performance analysis available."
+
+        store = get_evolution_rollups(str(log_path))
+        append_row(log_path, make_row(1, "[BUGFIX] a", True, 10.0, "SYNTAX_ONLY"), store)
+        append_row(log_path, make_row(2, "[BUGFIX] b", False, 30.0, "FULL_VALIDATION"), store)
+        append_row(log_path, make_row(3, "[CHORE] c", False, 20.0, "FULL_VALIDATION"), store)
+
+        summary = agent.analyze_performance()
+        assert "- Total Cycles: 3" in summary and "- Success Rate: 33.33%" in summary
+        assert "- Average Cycle Duration: 20.00 seconds" in summary
+        assert summary.index("Strategy 'FULL_VALIDATION'") < summary.index("Strategy 'SYNTAX_ONLY'")
+        assert "(Failures: 2/2)" in summary
+        assert "- BUGFIX: Success Rate: 50.00% (1/2)" in summary
+
+
+if __name__ == "__main__":
+    test_duration_sketch_quantiles_and_merge()
+    test_rows_are_applied_and_recovered_from_offset()
+    test_performance_analysis_uses_rollups()
+    print("✅ Evolution rollup tests passed!")
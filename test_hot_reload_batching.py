@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+🔁 Teste do hot reload em lote com dependências
+Verifica que uma rajada de mudanças vira um único lote, que os dependentes são
+recarregados depois das dependências (sem referências velhas) e que os
+callbacks rodam uma vez por lote
+"""
+
+import sys
+import time
+import logging
+import tempfile
+import importlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.core.hot_reload_manager import HotReloadManager
+
+logger = logging.getLogger("test_hot_reload_batching")
+
+
+def make_package(root: Path, name: str):
+    """base <- middle <- top (top também importa base); other é independente"""
+    package = root / name
+    package.mkdir()
+    (package / "__init__.py").write_text("", encoding="utf-8")
+    (package / "base.py").write_text("VALUE = 1\n\ndef value():\n    return VALUE\n", encoding="utf-8")
+    (package / "middle.py").write_text(
+        f"from {name}.base import value\n\ndef doubled():\n    return value() * 2\n", encoding="utf-8")
+    (package / "top.py").write_text(
+        f"from {name} import base\nfrom {name}.middle import doubled\n\n"
+        "def report():\n    return (base.VALUE, doubled())\n", encoding="utf-8")
+    (package / "other.py").write_text("NAME = 'other'\n", encoding="utf-8")
+    return package
+
+
+def load(name: str):
+    for module in ("base", "middle", "top", "other"):
+        importlib.import_module(f"{name}.{module}")
+    return sys.modules[f"{name}.top"]
+
+
+def unload(name: str):
+    for module in [m for m in sys.modules if m == name or m.startswith(name + ".")]:
+        del sys.modules[module]
+
+
+def test_burst_is_one_ordered_batch():
+    """Várias mudanças na janela viram um lote: base antes de middle antes de top"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        package = make_package(root, "hr_batch_pkg")
+        sys.path.insert(0, str(root))
+        manager = HotReloadManager(logger, {"hot_reload": {"quiet_window_seconds": 0.2}})
+        try:
+            top = load("hr_batch_pkg")
+            assert top.report() == (1, 2)
+            manager._add_watch_root(package)
+
+            calls = []
+            for module in ("base", "middle", "top", "other"):
+                manager.register_reload_callback(
+                    f"hr_batch_pkg.{module}", lambda name, old, new: calls.append((name, new.__name__)))
+
+            # Rajada: base muda duas vezes e middle uma; nenhuma delas toca top
+            base_file = package / "base.py"
+            base_file.write_text("VALUE = 5\n\ndef value():\n    return VALUE\n", encoding="utf-8")
+            manager._handle_file_change(str(base_file))
+            manager._handle_file_change(str(package / "middle.py"))
+            # Tamanho diferente do original: o .pyc é validado por mtime (em segundos) e tamanho
+            base_file.write_text("VALUE = 777\n\ndef value():\n    return VALUE\n", encoding="utf-8")
+            manager._handle_file_change(str(base_file))
+
+            deadline = time.time() + 5
+            while manager.last_batch_stats is None and time.time() < deadline:
+                time.sleep(0.05)
+            stats = manager.last_batch_stats
+            assert stats is not None and stats["batch_id"] == 1
+            assert stats["changed_files"] == 2
+            assert stats["changed_modules"] == ["hr_batch_pkg.base", "hr_batch_pkg.middle"]
+
+            order = stats["reload_order"]
+            assert "hr_batch_pkg.other" not in order
+            assert order.index("hr_batch_pkg.base") < order.index("hr_batch_pkg.middle") < order.index("hr_batch_pkg.top")
+            assert stats["modules_reloaded"] == len(order)
+            assert stats["latency_seconds"] >= 0.2 > stats["reload_seconds"]
+
+            # Dependentes transitivos enxergam o valor novo
+            assert sys.modules["hr_batch_pkg.top"].report() == (777, 1554)
+            assert [name for name, _ in calls] == [
+                name for name in order if name != "hr_batch_pkg"]
+
+            report = manager.get_reload_stats()
+            assert report["batches"] == 1 and report["pending_files"] == 0
+            assert report["avg_modules_per_batch"] == len(order)
+        finally:
+            manager.stop_watching()
+            sys.path.remove(str(root))
+            unload("hr_batch_pkg")
+
+
+def test_force_reload_and_failures():
+    """force_reload leva os dependentes junto; erro num módulo não interrompe o lote"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        package = make_package(root, "hr_force_pkg")
+        sys.path.insert(0, str(root))
+        manager = HotReloadManager(logger)
+        try:
+            load("hr_force_pkg")
+            manager._add_watch_root(package)
+            (package / "base.py").write_text("VALUE = 33\n\ndef value():\n    return VALUE\n", encoding="utf-8")
+            assert manager.force_reload("hr_force_pkg.base") is True
+            assert sys.modules["hr_force_pkg.top"].report() == (33, 66)
+            assert manager.force_reload("hr_force_pkg.missing") is False
+
+            (package / "middle.py").write_text("def doubled(:\n", encoding="utf-8")
+            manager._handle_file_change(str(package / "middle.py"))
+            stats = manager.flush_pending_changes()
+            assert list(stats["failed"]) == ["hr_force_pkg.middle"]
+            assert "hr_force_pkg.top" in stats["reload_order"]
+            assert manager.flush_pending_changes() is None
+        finally:
+            manager.stop_watching()
+            sys.path.remove(str(root))
+            unload("hr_force_pkg")
+
+
+if __name__ == "__main__":
+    test_burst_is_one_ordered_batch()
+    test_force_reload_and_failures()
+    print("✅ Hot reload batching tests passed!")
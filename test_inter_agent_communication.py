@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+🤝 Teste do barramento de comunicação inter-agente
+Verifica entrega única, backpressure, tópicos e expiração de conversas
+"""
+
+import sys
+import asyncio
+import logging
+import uuid
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.services.communication.inter_agent import (
+    InterAgentCommunication,
+    AgentMessage,
+    MessageType
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("InterAgentBusTest")
+
+
+class RecordingAgent:
+    """Agente falso que registra as mensagens recebidas"""
+
+    def __init__(self, delay: float = 0.0):
+        self.received = []
+        self.delay = delay
+
+    async def handle_message(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.received.append(message.message_id)
+        return True
+
+
+def _message(sender, recipients, **kwargs):
+    return AgentMessage(
+        message_id=str(uuid.uuid4()),
+        sender=sender,
+        recipients=recipients,
+        message_type=MessageType.KNOWLEDGE_SHARE,
+        content={"topic": "test"},
+        **kwargs
+    )
+
+
+def test_each_message_delivered_once():
+    """Cada destinatário recebe a mensagem exatamente uma vez"""
+    async def scenario():
+        comm = InterAgentCommunication({}, logger)
+        a, b = RecordingAgent(), RecordingAgent()
+        comm.register_agent("a", a, [])
+        comm.register_agent("b", b, [])
+
+        message = _message("system", ["a", "b", "ghost"])
+        assert await comm.send_message(message)
+        await comm.flush()
+        await comm.stop_message_processor()
+
+        assert a.received == [message.message_id]
+        assert b.received == [message.message_id]
+        assert comm.communication_metrics["messages_received"] == 2
+        assert comm.communication_metrics["messages_undeliverable"] == 1
+
+    asyncio.run(scenario())
+
+
+def test_topic_subscribers_receive_published_messages():
+    """Assinantes de um tópico recebem mensagens publicadas nele"""
+    async def scenario():
+        comm = InterAgentCommunication({}, logger)
+        listener, sender = RecordingAgent(), RecordingAgent()
+        comm.register_agent("listener", listener, [])
+        comm.register_agent("sender", sender, [])
+        comm.subscribe("listener", "insights")
+        comm.subscribe("sender", "insights")
+
+        message = _message("sender", [], topic="insights")
+        assert await comm.send_message(message)
+        await comm.flush()
+        await comm.stop_message_processor()
+
+        assert listener.received == [message.message_id]
+        assert sender.received == []
+
+    asyncio.run(scenario())
+
+
+def test_full_mailbox_applies_backpressure():
+    """Caixa cheia bloqueia o remetente e descarta após o timeout"""
+    async def scenario():
+        config = {"inter_agent_communication": {"mailbox_size": 1, "send_timeout_seconds": 0.05}}
+        comm = InterAgentCommunication(config, logger)
+        comm.register_agent("slow", RecordingAgent(delay=0.5), [])
+
+        results = [await comm.send_message(_message("system", ["slow"])) for _ in range(3)]
+        await comm.stop_message_processor()
+
+        assert results[0] is True
+        assert False in results
+        assert comm.communication_metrics["messages_dropped"] >= 1
+
+    asyncio.run(scenario())
+
+
+def test_idle_conversations_are_evicted():
+    """Conversas ociosas além do TTL saem do índice"""
+    async def scenario():
+        comm = InterAgentCommunication({"inter_agent_communication": {"conversation_ttl_seconds": 0.05}}, logger)
+        comm.register_agent("a", RecordingAgent(), [])
+
+        await comm.send_message(_message("system", ["a"]))
+        assert len(comm.conversations) == 1
+        await asyncio.sleep(0.1)
+        await comm._cleanup_old_conversations()
+        await comm.stop_message_processor()
+
+        assert len(comm.conversations) == 0
+        assert comm.communication_metrics["conversations_evicted"] == 1
+
+    asyncio.run(scenario())
+
+
+if __name__ == "__main__":
+    test_each_message_delivered_once()
+    test_topic_subscribers_receive_published_messages()
+    test_full_mailbox_applies_backpressure()
+    test_idle_conversations_are_evicted()
+    print("✅ Inter-agent communication tests passed!")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+🧹 Teste do LinterAgent incremental
+Verifica que só os arquivos alterados vão para o overlay, que o cache por hash
+de conteúdo evita novas execuções do ruff e que os importadores entram quando pedido
+"""
+
+import sys
+import logging
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.agents.linter_agent import LinterAgent
+
+
+def make_project(root: Path):
+    (root / "pkg").mkdir()
+    (root / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (root / "pkg" / "util.py").write_text("def helper():\n    return 1\n", encoding="utf-8")
+    (root / "pkg" / "user.py").write_text("from pkg.util import helper\n\nVALUE = helper()\n", encoding="utf-8")
+    (root / "pkg" / "other.py").write_text("import os\n", encoding="utf-8")
+    subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+    subprocess.run(["git", "add", "."], cwd=root, check=True)
+    subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "init"], cwd=root, check=True)
+
+
+def test_only_changed_files_are_linted_and_cached():
+    """Um arquivo alterado gera o patch; o mesmo conteúdo depois vem do cache"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+        agent = LinterAgent(logging.getLogger("test_linter"), project_root=str(root),
+                            cache_path=str(root / "cache" / "lint.json"))
+
+        (root / "pkg" / "util.py").write_text("import sys\n\ndef helper():\n    return 1\n", encoding="utf-8")
+        objective = agent.run_linter_and_propose_objective()
+        assert objective.startswith("[CHORE] Apply and validate automated linting fixes.")
+        assert "diff --git a/pkg/util.py b/pkg/util.py" in objective and "-import sys" in objective
+        # other.py também tem import sem uso, mas não foi alterado
+        assert "other.py" not in objective
+        stats = agent.last_run_stats
+        assert stats["files_linted"] == 1 and stats["cache_hits"] == 0
+        assert stats["bytes_copied"] == len((root / "pkg" / "util.py").read_bytes())
+        # O arquivo do projeto não é tocado: o ruff corrige a cópia no overlay
+        assert (root / "pkg" / "util.py").read_text(encoding="utf-8").startswith("import sys")
+
+        again = LinterAgent(logging.getLogger("test_linter"), project_root=str(root),
+                            cache_path=str(root / "cache" / "lint.json"))
+        assert again.run_linter_and_propose_objective() == objective
+        assert again.last_run_stats["files_linted"] == 0 and again.last_run_stats["cache_hits"] == 1
+
+
+def test_commits_since_last_run_and_importers():
+    """Arquivos de commits feitos após a última execução entram; importadores quando pedido"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_project(root)
+        agent = LinterAgent(logging.getLogger("test_linter"), project_root=str(root),
+                            cache_path=str(root / ".lint.json"), include_importers=True)
+        assert agent.run_linter_and_propose_objective() is None
+        assert agent.last_run_stats["files_considered"] == 0
+
+        (root / "pkg" / "util.py").write_text("def helper():\n    return 2\n", encoding="utf-8")
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-am", "cycle"],
+                       cwd=root, check=True)
+        assert agent.run_linter_and_propose_objective() is None
+        assert agent.last_run_stats["files_considered"] == 2
+        assert agent.last_run_stats["files_linted"] == 2
+
+
+if __name__ == "__main__":
+    test_only_changed_files_are_linted_and_cached()
+    test_commits_since_last_run_and_importers()
+    print("✅ Linter agent tests passed!")
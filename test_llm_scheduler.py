@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+🚦 Teste do escalonador compartilhado de chamadas LLM
+Verifica prioridade interativa, fila em vez de rejeição e adaptação a 429
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils.rate_limiter import (
+    LLMCallScheduler,
+    LLMPriority,
+    ProviderBudget,
+    llm_priority,
+    background_llm_task
+)
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("LLMSchedulerTest")
+
+
+def _scheduler(**budget):
+    return LLMCallScheduler({"test": ProviderBudget(**budget)}, ProviderBudget(), logger)
+
+
+def test_interactive_calls_jump_background_queue():
+    """Com a concorrência esgotada, o próximo slot vai para a chamada interativa"""
+    scheduler = _scheduler(requests_per_minute=6000, tokens_per_minute=10**6, max_concurrent_calls=1)
+    holder = scheduler.acquire("test")
+    order = []
+
+    def call(priority, label):
+        permit = scheduler.acquire("test", priority=priority)
+        order.append(label)
+        permit.release()
+
+    background = threading.Thread(target=call, args=(LLMPriority.BACKGROUND, "background"))
+    background.start()
+    time.sleep(0.05)
+    interactive = threading.Thread(target=call, args=(LLMPriority.INTERACTIVE, "interactive"))
+    interactive.start()
+    time.sleep(0.05)
+
+    holder.release()
+    background.join(timeout=5)
+    interactive.join(timeout=5)
+    assert order == ["interactive", "background"]
+    assert scheduler.get_status()["test/default"]["granted_background"] == 1
+
+
+def test_token_budget_queues_instead_of_rejecting():
+    """Chamadas além do orçamento de tokens esperam a reposição do balde"""
+    scheduler = _scheduler(requests_per_minute=6000, tokens_per_minute=600, max_concurrent_calls=5)
+    scheduler.acquire("test", estimated_tokens=600).release()
+
+    started = time.monotonic()
+    permit = scheduler.acquire("test", estimated_tokens=20)
+    waited = time.monotonic() - started
+    permit.release(actual_tokens=5)
+    assert 1.5 < waited < 5
+
+
+def test_rate_limit_response_pauses_and_halves_rate():
+    """Um 429 com Retry-After pausa a chave e reduz a taxa; async respeita a pausa"""
+    scheduler = _scheduler(requests_per_minute=600, tokens_per_minute=10**6, max_concurrent_calls=5)
+    permit = scheduler.acquire("test")
+    permit.report_rate_limited(retry_after=0.3)
+    permit.release(success=False)
+    assert scheduler.get_status()["test/default"]["requests_per_minute"] == 300
+
+    async def scenario():
+        started = time.monotonic()
+        async_permit = await scheduler.acquire_async("test")
+        async_permit.release()
+        return time.monotonic() - started
+
+    assert asyncio.run(scenario()) >= 0.25
+
+
+def test_background_decorator_sets_priority():
+    """Loops decorados e blocos llm_priority marcam as chamadas como background"""
+    scheduler = _scheduler(requests_per_minute=6000, tokens_per_minute=10**6, max_concurrent_calls=5)
+
+    @background_llm_task
+    def loop():
+        return scheduler.acquire("test")
+
+    assert loop().priority == LLMPriority.BACKGROUND
+    with llm_priority(LLMPriority.BACKGROUND):
+        assert scheduler.acquire("test").priority == LLMPriority.BACKGROUND
+    assert scheduler.acquire("test").priority == LLMPriority.INTERACTIVE
+
+
+if __name__ == "__main__":
+    test_interactive_calls_jump_background_queue()
+    test_token_budget_queues_instead_of_rejecting()
+    test_rate_limit_response_pauses_and_halves_rate()
+    test_background_decorator_sets_priority()
+    print("✅ LLM scheduler tests passed!")
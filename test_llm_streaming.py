@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+📡 Teste do streaming de respostas LLM
+Verifica o parser JSON incremental, o cancelamento antecipado, o reparo de
+sintaxe ao fim do stream e o TTFT
+"""
+
+import sys
+import asyncio
+import logging
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils.json_parser import IncrementalJSONParser
+from hephaestus.utils import llm_manager
+from hephaestus.utils.llm_client import _consume_stream
+from hephaestus.utils.llm_manager import LLMCallManager
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("LLMStreamingTest")
+
+
+def _feed_in_chunks(parser, text, size=3):
+    status = parser.status
+    for i in range(0, len(text), size):
+        status = parser.feed(text[i:i + size])
+    return status
+
+
+def test_incremental_parser_completes_after_preamble():
+    """Texto antes do JSON é ignorado e o valor raiz é detectado ao fechar"""
+    parser = IncrementalJSONParser()
+    text = 'Here is the plan:\n```json\n{"patches": [{"file_path": "a.py", "content": "x = \\"}\\""}], "ok": true}\n```'
+    assert _feed_in_chunks(parser, text) == IncrementalJSONParser.COMPLETE
+    value, error = parser.value(logger)
+    assert error is None
+    assert value["patches"][0]["content"] == 'x = "}"'
+    assert parser.completed_fields["ok"] is True
+
+
+def test_incremental_parser_flags_malformed_early():
+    """Erros estruturais e validadores de campo interrompem o parse"""
+    parser = IncrementalJSONParser()
+    assert _feed_in_chunks(parser, '{"a": 1 "b": 2, "rest": "' + "x" * 1000) == IncrementalJSONParser.MALFORMED
+
+    parser = IncrementalJSONParser(field_validators={"patches": lambda v: None if isinstance(v, list) else "must be a list"})
+    assert _feed_in_chunks(parser, '{"patches": "none", "later": 1}') == IncrementalJSONParser.MALFORMED
+    assert "patches" in parser.error
+
+    assert not parser.repairable
+
+    lenient = IncrementalJSONParser()
+    assert _feed_in_chunks(lenient, "{plan: 'x', \"items\": [1, 2,],}") == IncrementalJSONParser.COMPLETE
+    python_literals = IncrementalJSONParser()
+    assert _feed_in_chunks(python_literals, '{"ok": True, "v": None}') == IncrementalJSONParser.COMPLETE
+    assert python_literals.value(logger) == ({"ok": True, "v": None}, None)
+
+
+def test_stream_cancelled_when_response_goes_malformed():
+    """O stream é fechado assim que um campo falha no validador"""
+    consumed = []
+
+    async def fake_stream():
+        for chunk in ['{"name": ', '"s", ', '"patches": "none", ', '"never": 1}']:
+            await asyncio.sleep(0.01)
+            consumed.append(chunk)
+            yield chunk
+
+    monitor = IncrementalJSONParser(field_validators={"patches": lambda v: None if isinstance(v, list) else "must be a list"})
+    result = asyncio.run(_consume_stream(fake_stream(), "fake/model", monitor, logger))
+    assert result.cancelled
+    assert result.content is None
+    assert consumed == ['{"name": ', '"s", ', '"patches": "none", ']
+    assert result.time_to_first_token is not None and result.time_to_first_token <= result.total_time
+
+
+def test_repairable_syntax_is_read_to_the_end_and_repaired():
+    """Aspas sem escape não cancelam: a resposta inteira vai para o parse_json_response"""
+    chunks = ['{"content": "say "hi', '" now", ', '"patches": [1]}']
+
+    async def fake_stream():
+        for chunk in chunks:
+            yield chunk
+
+    result = asyncio.run(_consume_stream(fake_stream(), "fake/model", IncrementalJSONParser(), logger))
+    assert not result.cancelled and result.content == "".join(chunks)
+
+    async def fake_call(model_config, prompt, temperature, call_logger, monitor_factory):
+        return await _consume_stream(fake_stream(), "fake/model", monitor_factory(), call_logger)
+
+    manager = LLMCallManager({"primary": "fake/model"}, logger)
+    with mock.patch.object(llm_manager, "call_llm_streaming_async", fake_call):
+        parsed, error = asyncio.run(manager.call_with_json_response(
+            "prompt", stream=True, field_validators={"patches": lambda v: None if isinstance(v, list) else "must be a list"}))
+        assert error is None and parsed == {"content": 'say "hi" now', "patches": [1]}
+
+        # Os validadores ainda valem para a resposta reparada
+        chunks[-1] = '"patches": "none"}'
+        parsed, error = asyncio.run(manager.call_with_json_response(
+            "other prompt", stream=True, max_retries=1,
+            field_validators={"patches": lambda v: None if isinstance(v, list) else "must be a list"}))
+        assert parsed is None and "patches" in error
+
+
+def test_stream_stops_reading_once_json_is_complete():
+    """Depois que o JSON fecha, o restante da resposta não é lido"""
+    async def fake_stream():
+        yield '{"name": "s", "confidence": 0.5}'
+        yield "\nAnd a long explanation that nobody needs..."
+
+    result = asyncio.run(_consume_stream(fake_stream(), "fake/model", IncrementalJSONParser(), logger))
+    assert not result.cancelled
+    assert result.content == '{"name": "s", "confidence": 0.5}'
+    assert result.chunks == 1
+
+
+if __name__ == "__main__":
+    test_incremental_parser_completes_after_preamble()
+    test_incremental_parser_flags_malformed_early()
+    test_stream_cancelled_when_response_goes_malformed()
+    test_repairable_syntax_is_read_to_the_end_and_repaired()
+    test_stream_stops_reading_once_json_is_complete()
+    print("✅ LLM streaming tests passed!")
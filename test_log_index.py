@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+🔎 Teste do índice incremental de logs
+Verifica a leitura incremental (offset/inode, rotação), as consultas filtradas
+com paginação por cursor e o delta entregue ao LogAnalysisAgent
+"""
+
+import sys
+import json
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils import log_index
+from hephaestus.utils.log_index import LogIndex, LogTailer, default_log_sources
+from hephaestus.agents.log_analysis_agent import LogAnalysisAgent
+
+
+def line(ts: str, logger_name: str, level: str, message: str) -> str:
+    return f"{ts} - {logger_name} - {level} - {message}\n"
+
+
+def test_tailer_reads_only_new_bytes_and_follows_rotation():
+    """Só as linhas novas entram; a linha incompleta espera e a rotação não perde entradas"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "main.log"
+        path.write_text(line("2026-01-01 10:00:00", "hephaestus", "INFO", "first"), encoding="utf-8")
+        index = LogIndex([str(path)], refresh_interval=0)
+        assert index.refresh() == 1
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(line("2026-01-01 10:00:01", "hephaestus", "ERROR", "boom"))
+            f.write("Traceback (most recent call last):\nValueError: bad\n")
+            f.write("2026-01-01 10:00:02 - hephaestus - INFO - partial")
+        assert index.refresh() == 1
+        offset = index.get_stats()["sources"][str(path)]["offset"]
+        assert offset == path.stat().st_size
+
+        # Rotação: o arquivo vira .1 e um novo começa; o resto do antigo é lido do backup
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(" line\n")
+        path.rename(Path(tmp) / "main.log.1")
+        path.write_text(line("2026-01-01 10:00:03", "hephaestus", "INFO", "after rotation"), encoding="utf-8")
+        assert index.refresh() == 2
+
+        messages = [entry["message"] for entry in index.query(limit=10)["entries"]]
+        assert messages == ["after rotation", "partial line",
+                            "boom\nTraceback (most recent call last):\nValueError: bad", "first"]
+
+
+def test_filtered_queries_with_cursor_pagination():
+    """Filtros por nível, componente (com descendentes), ciclo e tempo; páginas sem repetição"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "main.log"
+        jsonl = Path(tmp) / "main.jsonl"
+        with open(path, "w", encoding="utf-8") as f:
+            for cycle in (1, 2):
+                f.write(line(f"2026-01-01 1{cycle}:00:00", "hephaestus.cycle", "INFO", f"===== START CYCLE #{cycle} ====="))
+                for i in range(30):
+                    level = "ERROR" if i % 3 == 0 else "INFO"
+                    f.write(line(f"2026-01-01 1{cycle}:{i:02d}:30", f"hephaestus.agents.a{i % 2}", level, f"c{cycle} m{i}"))
+        jsonl.write_text(json.dumps({"ts": datetime(2026, 1, 1, 13).timestamp(), "level": "WARNING",
+                                     "logger": "hephaestus.api", "msg": "slow"}) + "\n", encoding="utf-8")
+        index = LogIndex([str(path), str(jsonl)], bucket_seconds=300, refresh_interval=0)
+
+        errors = index.query(level="error", cycle=2, limit=100)["entries"]
+        assert len(errors) == 10 and all(e["cycle"] == 2 and e["level"] == "ERROR" for e in errors)
+
+        agent_a1 = index.query(logger_name="hephaestus.agents.a1", limit=100)["entries"]
+        assert len(agent_a1) == 30
+        assert index.query(logger_name="hephaestus.agents", limit=100)["entries"][0]["message"] == "c2 m29"
+        assert index.query(level="WARNING")["entries"][0]["source"] == str(jsonl)
+
+        since = datetime(2026, 1, 1, 12, 20).timestamp()
+        recent_errors = index.query(level="ERROR", since=since, limit=3)
+        assert [e["message"] for e in recent_errors["entries"]] == ["c2 m27", "c2 m24", "c2 m21"]
+
+        seen = []
+        cursor = None
+        while True:
+            page = index.query(level="ERROR", limit=7, cursor=cursor)
+            seen.extend(e["id"] for e in page["entries"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert len(seen) == len(set(seen)) == 20
+
+
+def test_log_analysis_agent_gets_only_the_delta():
+    """O agente só recebe as entradas novas desde a última análise"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "main.log"
+        path.write_text(line("2026-01-01 10:00:00", "hephaestus", "INFO", "old"), encoding="utf-8")
+        index = LogIndex(refresh_interval=0)
+        index.add_source(str(path))
+
+        consumer = f"log_analysis:{path}"
+        assert [e.message for e in index.delta_since(consumer)] == ["old"]
+        assert index.delta_since(consumer) == []
+        with open(path, "a", encoding="utf-8") as f:
+            for i in range(5):
+                f.write(line("2026-01-01 10:00:01", "hephaestus", "WARNING", f"new {i}"))
+        assert [e.message for e in index.delta_since(consumer, limit=2)] == ["new 3", "new 4"]
+
+        # Sem entradas novas o agente responde sem chamar o LLM
+        agent = LogAnalysisAgent({"primary": "none"}, logging.getLogger("test_log_index"), log_index=index)
+        result = agent.analyze_logs(str(path))
+        assert result["issues"] == [] and result["suggested_objective"] is None
+        assert agent.analyze_logs(str(Path(tmp) / "missing.log")) is None
+
+
+def test_large_backlog_is_read_in_bounded_chunks():
+    """A primeira leitura de um log grande vai em blocos; linhas cortadas no limite não se perdem"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "main.log"
+        path.write_text("".join(line("2026-01-01 10:00:00", "hephaestus", "INFO", f"entry {i}")
+                                for i in range(200)), encoding="utf-8")
+        with mock.patch.object(log_index, "READ_CHUNK_BYTES", 100):
+            tailer = LogTailer(str(path))
+            batches = []
+            for lines in tailer.iter_new_lines():
+                batches.append(lines)
+                assert tailer.offset <= len(batches) * 100
+            index = LogIndex([str(path)], refresh_interval=0, max_entries=50)
+            assert index.refresh() == 200
+        assert len(batches) > 100
+        assert [line for lines in batches for line in lines][-1].endswith("entry 199")
+        assert index.get_stats()["indexed_entries"] == 50
+
+
+def test_default_sources_index_a_single_sink():
+    """Os dois sinks recebem os mesmos registros: só um é indexado"""
+    assert default_log_sources({}) == ["data/logs/hephaestus_main.log"]
+    config = {"logging_pipeline": {"jsonl": {"enabled": True, "path": "logs/main.jsonl"}}}
+    assert default_log_sources(config) == ["logs/main.jsonl"]
+
+
+if __name__ == "__main__":
+    test_tailer_reads_only_new_bytes_and_follows_rotation()
+    test_filtered_queries_with_cursor_pagination()
+    test_log_analysis_agent_gets_only_the_delta()
+    test_large_backlog_is_read_in_bounded_chunks()
+    test_default_sources_index_a_single_sink()
+    print("✅ Log index tests passed!")
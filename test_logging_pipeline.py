@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+🪵 Teste do pipeline de logs em fila
+Verifica a política de descarte com a fila cheia, a gravação em lotes pela
+thread do listener, o sink JSON Lines com rotação e os contadores do pipeline
+"""
+
+import sys
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils.logger_factory import (
+    BatchedFileHandler,
+    BatchedRotatingFileHandler,
+    JsonLinesFormatter,
+    LoggingPipeline,
+)
+
+
+def make_logger(name: str, pipeline: LoggingPipeline) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers = [pipeline.queue_handler]
+    logger.setLevel(logging.DEBUG)
+    logger.propagate = False
+    return logger
+
+
+def test_full_queue_applies_overflow_policy():
+    """Com a fila cheia, drop_newest descarta o novo e drop_oldest o mais antigo; ERROR espera"""
+    pipeline = LoggingPipeline({"queue_size": 3, "overflow_policy": "drop_newest", "block_timeout_seconds": 0.01})
+    logger = make_logger("test_pipeline.drop_newest", pipeline)
+    for i in range(5):
+        logger.info("record %d", i)
+    logger.error("still dropped after waiting")
+    assert [record.msg for record in list(pipeline.queue.queue)] == ["record 0", "record 1", "record 2"]
+    stats = pipeline.get_stats()
+    assert stats["emitted"] == 3 and stats["dropped"] == 3 and stats["queue_high_water"] == 3
+
+    pipeline = LoggingPipeline({"queue_size": 3, "overflow_policy": "drop_oldest"})
+    logger = make_logger("test_pipeline.drop_oldest", pipeline)
+    for i in range(5):
+        logger.info("record %d", i)
+    assert [record.msg for record in list(pipeline.queue.queue)] == ["record 2", "record 3", "record 4"]
+    assert pipeline.get_stats()["dropped"] == 2
+
+    try:
+        LoggingPipeline({"overflow_policy": "explode"})
+        assert False, "unknown policy should be rejected"
+    except ValueError:
+        pass
+
+
+def test_listener_writes_batches_off_the_caller_thread():
+    """Os registros vão para os handlers em lotes; stop() grava o que ainda está na fila"""
+    with tempfile.TemporaryDirectory() as tmp:
+        pipeline = LoggingPipeline({"batch_size": 50, "flush_interval_seconds": 0.01})
+        handler = BatchedFileHandler(Path(tmp) / "main.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+        pipeline.add_handler(handler)
+        logger = make_logger("test_pipeline.batches", pipeline)
+
+        # Registros enfileirados antes do listener começar saem em lotes de até batch_size
+        for i in range(120):
+            logger.info("line %d", i)
+        try:
+            raise ValueError("bad value")
+        except ValueError:
+            logger.exception("failed")
+        pipeline.start()
+        pipeline.stop()
+        handler.close()
+
+        lines = (Path(tmp) / "main.log").read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "INFO line 0" and lines[119] == "INFO line 119"
+        assert lines[120] == "ERROR failed" and "ValueError: bad value" in lines[-1]
+        stats = pipeline.get_stats()
+        assert stats["written"] == 121 and stats["batches"] == 3
+        assert stats["dropped"] == 0 and stats["flush_latency_ms_max"] >= 0
+
+
+def test_jsonl_sink_rotates_by_size():
+    """O sink JSON Lines grava um objeto compacto por linha e rotaciona pelo tamanho"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "events.jsonl"
+        pipeline = LoggingPipeline({"flush_interval_seconds": 0.01})
+        handler = BatchedRotatingFileHandler(path, maxBytes=2000, backupCount=2, encoding="utf-8")
+        handler.setFormatter(JsonLinesFormatter())
+        handler.addFilter(logging.Filter("test_pipeline.jsonl"))
+        pipeline.add_handler(handler)
+        logger = make_logger("test_pipeline.jsonl.component", pipeline)
+        other = make_logger("test_pipeline.other", pipeline)
+
+        pipeline.start()
+        for i in range(60):
+            logger.warning("event %d ✅", i)
+            other.warning("filtered out")
+        pipeline.stop()
+        handler.close()
+
+        assert Path(f"{path}.1").exists()
+        entries = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert entries[-1]["msg"] == "event 59 ✅"
+        assert entries[-1]["logger"] == "test_pipeline.jsonl.component" and entries[-1]["level"] == "WARNING"
+        assert all(entry["msg"].startswith("event") for entry in entries)
+
+
+if __name__ == "__main__":
+    test_full_queue_applies_overflow_policy()
+    test_listener_writes_batches_off_the_caller_thread()
+    test_jsonl_sink_rotates_by_size()
+    print("✅ Logging pipeline tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+📼 Teste do armazenamento em segmentos das métricas de evolução
+Verifica escrita append-only, recorte por intervalo, retenção por segmento e tendências vetorizadas
+"""
+
+import os
+import sys
+import json
+import logging
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.intelligence.metric_segment_store import MetricSegmentStore, METRIC_RECORD_DTYPE
+from hephaestus.intelligence.evolution_analytics import EvolutionAnalytics
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("MetricSegmentStoreTest")
+
+
+def test_append_only_segments_and_range():
+    """Cada amostra é um registro de 16 bytes anexado ao segmento da sua janela"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MetricSegmentStore(Path(tmp), segment_seconds=100, logger=logger)
+        for t in range(0, 500, 10):
+            store.append("latency ms/op", float(t), float(t) * 2)
+
+        metric_dir = Path(tmp) / "latency%20ms%2Fop"
+        segments = sorted(metric_dir.iterdir())
+        assert len(segments) == 5
+        assert all(path.stat().st_size == 10 * METRIC_RECORD_DTYPE.itemsize for path in segments)
+
+        timestamps, values = store.range("latency ms/op", start=95, end=230)
+        assert timestamps.tolist() == [float(t) for t in range(100, 230, 10)]
+        assert np.array_equal(values, timestamps * 2)
+
+        # Um novo store redescobre as séries a partir dos arquivos
+        reopened = MetricSegmentStore(Path(tmp), segment_seconds=100, logger=logger)
+        assert reopened.metric_names() == ["latency ms/op"]
+        assert reopened.count("latency ms/op") == 50
+        reopened.append("latency ms/op", 10.0, 1.0)  # relógio atrasado não quebra a ordem
+        assert np.all(np.diff(reopened.range("latency ms/op")[0]) >= 0)
+
+
+def test_retention_drops_whole_segments():
+    """A retenção apaga segmentos expirados inteiros e mantém o que contém o corte"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MetricSegmentStore(Path(tmp), segment_seconds=100, logger=logger)
+        store.append_many("m", np.arange(0, 400, 25, dtype=float), np.ones(16))
+        assert store.drop_before(250) == 2
+        timestamps, _ = store.range("m")
+        assert timestamps[0] == 200 and len(timestamps) == 8
+        assert store.range("m", start=250)[0][0] == 250
+
+
+def test_analytics_trends_from_segments():
+    """A Evolution Analytics calcula tendências sobre os arrays do store e migra o JSON legado"""
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        try:
+            data_dir = Path("data/evolution_analytics")
+            data_dir.mkdir(parents=True)
+            now = datetime.now()
+            legacy = {"success_rate": [
+                {"timestamp": (now - timedelta(days=5 - i)).isoformat(), "metric_name": "success_rate",
+                 "value": 0.5 + 0.1 * i, "context": {}}
+                for i in range(5)
+            ]}
+            (data_dir / "metrics_history.json").write_text(json.dumps(legacy))
+            analytics = EvolutionAnalytics({"evolution_analytics": {"min_data_points": 3}}, logger)
+            _check_analytics(analytics, data_dir)
+        finally:
+            os.chdir(cwd)
+
+
+def _check_analytics(analytics, data_dir):
+    assert (data_dir / "metrics_history.json.migrated").exists()
+    trends = analytics.analyze_trends(days=7)
+    assert len(trends) == 1
+    trend = trends[0]
+    assert trend.trend_type == "improving" and trend.data_points == 5
+    assert abs(trend.slope - 0.1) < 1e-6 and trend.confidence > 0.99
+
+    prediction = analytics.predict_future_performance("success_rate", days_ahead=2)
+    assert abs(prediction["predicted_value"] - (0.9 + 0.2)) < 0.05
+
+
+if __name__ == "__main__":
+    test_append_only_segments_and_range()
+    test_retention_drops_whole_segments()
+    test_analytics_trends_from_segments()
+    print("✅ Metric segment store tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+🗄️ Teste da persistência em lote do Model Optimizer
+Verifica gravação write-behind, rollups por agente e compressão dos textos
+"""
+
+import sys
+import logging
+import sqlite3
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.intelligence.model_optimizer import ModelOptimizer, PerformanceDataRecorder
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ModelOptimizerStorageTest")
+
+
+def test_batched_writes_and_rollup_summary():
+    """Os dados capturados são gravados em lote e resumidos pelos rollups"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "perf.db"
+        optimizer = ModelOptimizer("test-model", logger, {
+            "db_path": str(db_path),
+            "batch_size": 4,
+            "flush_interval_seconds": 60,
+            "text_compression": "zlib"
+        })
+
+        for i in range(10):
+            optimizer.capture_performance_data("maestro", f"prompt {i}", '{"strategy": "x"}', i % 2 == 0, 1.0)
+        optimizer.capture_performance_data("architect", "prompt", "response", True, 2.0)
+
+        summary = optimizer.get_agent_performance_summary()
+        assert summary["maestro"]["total_calls"] == 10
+        assert summary["maestro"]["success_calls"] == 5
+        assert summary["architect"]["total_calls"] == 1
+
+        rows = optimizer.recorder.execute("SELECT prompt_text, text_codec FROM performance_data ORDER BY id LIMIT 1")
+        prompt_blob, codec = rows[0]
+        assert codec == "zlib"
+        assert PerformanceDataRecorder.decode_text(prompt_blob, codec) == "prompt 0"
+
+        indexes = optimizer.recorder.execute("PRAGMA index_list(performance_data)")
+        assert any(index[1] == "idx_performance_agent_time" for index in indexes)
+        optimizer.recorder.close()
+
+
+def test_rollup_rebuilt_for_existing_database():
+    """Bancos antigos sem rollup têm o resumo reconstruído na abertura"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "perf.db"
+        first = ModelOptimizer("test-model", logger, {"db_path": str(db_path), "text_compression": "none"})
+        first.capture_performance_data("maestro", "p", "r", True, 1.0)
+        first.recorder.close()
+
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("DELETE FROM agent_performance_rollup")
+
+        second = ModelOptimizer("test-model", logger, {"db_path": str(db_path), "text_compression": "none"})
+        assert second.get_agent_performance_summary()["maestro"]["total_calls"] == 1
+        second.recorder.close()
+
+
+if __name__ == "__main__":
+    test_batched_writes_and_rollup_summary()
+    test_rollup_rebuilt_for_existing_database()
+    print("✅ Model optimizer storage tests passed!")
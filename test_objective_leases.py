@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+📬 Teste da fila de objetivos arrendada
+Verifica arrendamentos exclusivos entre workers, nova tentativa após queda,
+vazão por worker e a mesclagem da memória entre instâncias
+"""
+
+import sys
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.core.memory import Memory
+from hephaestus.utils.objective_leases import LeasedQueueManager, SharedMemorySync, SQLiteLeaseBackend
+
+
+def test_concurrent_workers_never_share_a_lease():
+    """Vários workers (conexões independentes) arrendam cada objetivo uma única vez"""
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = Path(tmp) / "objectives.db"
+        producer = SQLiteLeaseBackend(db_path)
+        for i in range(40):
+            producer.enqueue({"objective": f"objective {i}"})
+
+        leased = {}
+
+        def consume(worker_id: str):
+            backend = SQLiteLeaseBackend(db_path)
+            taken = []
+            while True:
+                lease = backend.lease(worker_id, lease_seconds=60)
+                if lease is None:
+                    break
+                taken.append(lease.objective["objective"])
+                assert backend.complete(lease, success=True)
+            leased[worker_id] = taken
+
+        threads = [threading.Thread(target=consume, args=(f"worker-{n}",)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        all_taken = [objective for taken in leased.values() for objective in taken]
+        assert sorted(all_taken) == sorted(f"objective {i}" for i in range(40))
+        stats = producer.worker_stats(window_seconds=3600)
+        assert sum(item["completed"] for item in stats.values()) == 40
+        assert producer.pending_count() == 0
+
+
+def test_expired_lease_is_retried_then_dead_lettered():
+    """Sem heartbeat o arrendamento expira e o objetivo volta à fila até max_attempts"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteLeaseBackend(Path(tmp) / "objectives.db", max_attempts=2)
+        backend.enqueue("fragile objective")
+
+        crashed = backend.lease("worker-a", lease_seconds=0.05)
+        assert crashed.attempt == 1
+        assert backend.lease("worker-b", lease_seconds=60) is None
+        time.sleep(0.1)
+        assert backend.pending_count() == 1
+
+        retried = backend.lease("worker-b", lease_seconds=0.05)
+        assert retried.objective == "fragile objective" and retried.attempt == 2
+        # O worker que caiu não consegue mais concluir nem renovar
+        assert not backend.complete(crashed, success=True)
+        assert backend.heartbeat("worker-a", [crashed], lease_seconds=60) == set()
+
+        time.sleep(0.1)
+        assert backend.pending_count() == 0
+        assert backend.lease("worker-c", lease_seconds=60) is None
+
+
+def test_leased_queue_manager_releases_unfinished_objective():
+    """Um runner que cai no meio do ciclo devolve o objetivo; o ciclo concluído conta na vazão"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteLeaseBackend(Path(tmp) / "objectives.db")
+        queue = LeasedQueueManager(backend, worker_id="worker-a", lease_seconds=60, heartbeat_seconds=30)
+        try:
+            queue.put_objective("first")
+            queue.put_objective("second")
+            assert queue.qsize() == 2
+
+            assert queue.get_objective(timeout=0) == "first"
+            # Sem complete_objective: o próximo pedido devolve "first" para nova tentativa
+            assert queue.get_objective(timeout=0) == "first"
+            objective = queue.get_objective(timeout=0)
+            assert objective == "first"
+            queue.complete_objective(objective, success=True)
+            second = queue.get_objective(timeout=0)
+            queue.complete_objective(second, success=False)
+            assert queue.get_objective(timeout=0.05) is None
+
+            stats = queue.worker_stats()["worker-a"]
+            assert stats["completed"] == 1 and stats["failed"] == 1 and stats["in_flight"] == 0
+            assert stats["objectives_per_hour"] == 2.0
+        finally:
+            queue.close()
+
+
+def test_shared_memory_sync_merges_workers_history():
+    """Objetivos concluídos/falhos de um worker aparecem na memória do outro"""
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = SQLiteLeaseBackend(Path(tmp) / "objectives.db")
+        memory_a = Memory(filepath=str(Path(tmp) / "memory_a.json"))
+        memory_b = Memory(filepath=str(Path(tmp) / "memory_b.json"))
+        sync_a = SharedMemorySync(backend, memory_a, "worker-a")
+        sync_b = SharedMemorySync(backend, memory_b, "worker-b")
+
+        memory_a.add_completed_objective("Add type hints", "SYNTAX_ONLY", "ok")
+        memory_b.add_failed_objective("Refactor parser", "VALIDATION_FAILED", "tests failed")
+
+        assert sync_a.sync() == {"published": 1, "merged": 0}
+        assert sync_b.sync() == {"published": 1, "merged": 1}
+        assert sync_a.sync() == {"published": 0, "merged": 1}
+        # Nada é republicado nem duplicado em novas sincronizações
+        assert sync_b.sync() == {"published": 0, "merged": 0}
+
+        for memory in (memory_a, memory_b):
+            assert [o["objective"] for o in memory.completed_objectives] == ["Add type hints"]
+            assert [o["objective"] for o in memory.failed_objectives] == ["Refactor parser"]
+        assert Path(tmp, "memory_b.json").exists()
+
+        # O merge da thread do scheduler espera quem está usando a memória (ex.: um save no executor)
+        memory_b.add_completed_objective("Cache prompts", "SYNTAX_ONLY", "ok")
+        sync_b.sync()
+        result = {}
+        with memory_a.lock:
+            worker = threading.Thread(target=lambda: result.update(sync_a.sync()))
+            worker.start()
+            worker.join(timeout=0.3)
+            assert worker.is_alive() and len(memory_a.completed_objectives) == 1
+        worker.join(timeout=5)
+        assert result == {"published": 0, "merged": 1} and len(memory_a.completed_objectives) == 2
+
+
+if __name__ == "__main__":
+    test_concurrent_workers_never_share_a_lease()
+    test_expired_lease_is_retried_then_dead_lettered()
+    test_leased_queue_manager_releases_unfinished_objective()
+    test_shared_memory_sync_merges_workers_history()
+    print("✅ Objective lease tests passed!")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+🏁 Teste da corrida de estratégias do ParallelRealityTester
+Verifica que cada estratégia roda seu pipeline num processo isolado, que os
+perdedores (e o pytest que eles iniciaram) são mortos e que a concorrência
+respeita CPU e memória
+"""
+
+import sys
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+import psutil
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.intelligence.parallel_reality_tester import (
+    ParallelRealityTester, RealityTestStatus, StrategyType
+)
+
+logger = logging.getLogger("test_parallel_reality_tester")
+
+
+def make_tester(tmp: Path, **overrides) -> ParallelRealityTester:
+    settings = {"max_parallel_tests": 3, "data_dir": str(tmp / "parallel_tests"), "max_session_time": 60}
+    settings.update(overrides)
+    return ParallelRealityTester({"parallel_reality": settings}, logger)
+
+
+def make_project(root: Path, pid_file: Path):
+    (root / "tests").mkdir(parents=True)
+    (root / "mod.py").write_text("def value():\n    return 1\n", encoding="utf-8")
+    (root / "tests" / "test_mod.py").write_text(
+        "import mod\n\n\ndef test_value():\n    assert mod.value() == 1\n", encoding="utf-8")
+    slow_test = [
+        "", "", "def test_slow():",
+        "    import os, time",
+        f"    open({str(pid_file)!r}, 'w').write(str(os.getpid()))",
+        "    time.sleep(60)",
+    ]
+    return {
+        # Passa rápido: vence
+        StrategyType.AGGRESSIVE.value: [
+            {"file_path": "mod.py", "operation": "REPLACE", "block_to_replace": "return 1", "content": "    return 1"}],
+        # Sintaxe inválida: rejeitada antes do pytest
+        StrategyType.OPTIMIZED.value: [
+            {"file_path": "mod.py", "operation": "REPLACE", "block_to_replace": "return 1", "content": "    return (1"}],
+        # Teste lento: deve ser morto quando não puder mais vencer
+        StrategyType.EXPERIMENTAL.value: [
+            {"file_path": "tests/test_mod.py", "operation": "INSERT", "content": "\n".join(slow_test)}],
+    }
+
+
+def test_losers_are_killed_as_soon_as_they_cannot_win():
+    """O vencedor é escolhido sem esperar o teste lento, cujo pytest é morto junto"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        pid_file = tmp / "slow.pid"
+        project = tmp / "project"
+        patches = make_project(project, pid_file)
+        tester = make_tester(tmp)
+        # Força as três estratégias ao mesmo tempo mesmo numa máquina com uma só CPU
+        tester._resource_aware_concurrency = lambda: 3
+        context = {
+            "project_root": str(project),
+            "patches_by_strategy": patches,
+            "test_command": [sys.executable, "-m", "pytest", "-q", "-p", "no:cacheprovider", "tests"],
+            "validation_timeout": 120,
+        }
+        try:
+            started = time.time()
+            winner, session = asyncio.run(tester.test_multiple_realities("Tweak value", context))
+            elapsed = time.time() - started
+        finally:
+            tester.shutdown()
+
+        tests = {t.strategy_type: t for t in session.reality_tests}
+        assert winner is tests[StrategyType.AGGRESSIVE] and winner.status == RealityTestStatus.WINNER
+        assert winner.success_probability == 1.0
+        assert tests[StrategyType.OPTIMIZED].status == RealityTestStatus.COMPLETED
+        assert tests[StrategyType.OPTIMIZED].success_probability == 0.0
+        assert tests[StrategyType.EXPERIMENTAL].status == RealityTestStatus.TERMINATED_EARLY
+        assert elapsed < 40
+
+        race = session.comparison_matrix["race"]
+        assert race["concurrency"] == 3 and race["terminated_early"] == 1
+        assert 0 < race["time_to_winner"] <= race["session_seconds"]
+        assert race["wasted_cpu_seconds"] > 0
+        saved = json.loads((tmp / "parallel_tests" / "results" / f"session_{session.session_id}.json").read_text())
+        assert saved["winner_test_id"] == winner.test_id
+
+        # O pytest do perdedor morreu junto com o worker
+        if pid_file.exists():
+            pid = int(pid_file.read_text())
+            deadline = time.time() + 5
+            while time.time() < deadline:
+                try:
+                    if psutil.Process(pid).status() == psutil.STATUS_ZOMBIE:
+                        break
+                except psutil.NoSuchProcess:
+                    break
+                time.sleep(0.1)
+            else:
+                assert False, "pytest process of the losing strategy is still running"
+
+
+def test_priors_without_pipeline_and_concurrency_limits():
+    """Sem patches nem testes o score vem do prior; memória escassa reduz a concorrência"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        tester = make_tester(tmp)
+        try:
+            winner, session = asyncio.run(tester.test_multiple_realities("Tweak value"))
+            assert winner.strategy_type == StrategyType.OPTIMIZED
+            assert all(t.status in (RealityTestStatus.COMPLETED, RealityTestStatus.WINNER,
+                                    RealityTestStatus.TERMINATED_EARLY) for t in session.reality_tests)
+            assert 1 <= tester._resource_aware_concurrency() <= 3
+
+            # Sessões simultâneas não disputam nem matam os processos uma da outra
+            async def overlapping():
+                return await asyncio.gather(tester.test_multiple_realities("Tweak a"),
+                                            tester.test_multiple_realities("Tweak b"))
+            for winner, session in asyncio.run(overlapping()):
+                assert winner is not None and winner.status == RealityTestStatus.WINNER
+                assert not any(t.error_messages for t in session.reality_tests)
+            assert tester._running_processes == {}
+        finally:
+            tester.shutdown()
+
+        starved = make_tester(tmp, memory_per_test_mb=10 ** 9)
+        try:
+            assert starved._resource_aware_concurrency() == 1
+        finally:
+            starved.shutdown()
+
+
+if __name__ == "__main__":
+    test_losers_are_killed_as_soon_as_they_cannot_win()
+    test_priors_without_pipeline_and_concurrency_limits()
+    print("✅ Parallel reality racing tests passed!")
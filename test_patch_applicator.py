@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+🩹 Teste da aplicação de patches em lote
+Verifica que cada arquivo é lido e gravado uma única vez, que patches que
+quebram a sintaxe Python não tocam o disco e que criação/remoção continuam funcionando
+"""
+
+import sys
+import logging
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.core import patch_applicator
+from hephaestus.core.patch_applicator import apply_patches, PatchValidationError
+from hephaestus.services.validation.patch_applicator import PatchApplicatorStep
+
+logger = logging.getLogger("test_patch_applicator")
+
+
+def test_many_edits_one_write_per_file():
+    """30 edições no mesmo módulo resultam em uma única gravação atômica"""
+    with tempfile.TemporaryDirectory() as tmp:
+        target = Path(tmp) / "module.py"
+        target.write_text("VALUES = []\n", encoding="utf-8")
+        instructions = [{"file_path": "module.py", "operation": "INSERT", "content": f"V{i} = {i}"}
+                        for i in range(30)]
+        instructions.append({"file_path": "module.py", "operation": "REPLACE",
+                             "block_to_replace": "V0 = 0", "content": "V0 = -1"})
+
+        with mock.patch.object(patch_applicator, "_atomic_write", wraps=patch_applicator._atomic_write) as write:
+            assert apply_patches(instructions, logger, base_path=tmp) is True
+        assert write.call_count == 1
+        lines = target.read_text(encoding="utf-8").splitlines()
+        assert lines[0] == "VALUES = []" and lines[1] == "V0 = -1" and lines[-1] == "V29 = 29"
+        assert [p.name for p in Path(tmp).iterdir()] == ["module.py"]
+
+
+def test_invalid_python_leaves_disk_untouched():
+    """Se um alvo Python ficaria inválido, nenhum arquivo do lote é gravado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        good = Path(tmp) / "good.py"
+        bad = Path(tmp) / "bad.py"
+        good.write_text("a = 1", encoding="utf-8")
+        bad.write_text("def f():\n    return 1", encoding="utf-8")
+        instructions = [
+            {"file_path": "good.py", "operation": "REPLACE", "block_to_replace": "a = 1", "content": "a = 2"},
+            {"file_path": "bad.py", "operation": "REPLACE", "block_to_replace": "return 1", "content": "return (1"},
+        ]
+        try:
+            apply_patches(instructions, logger, base_path=tmp)
+            assert False, "PatchValidationError esperado"
+        except PatchValidationError as e:
+            assert list(e.errors) == [str(bad.resolve())]
+        assert good.read_text(encoding="utf-8") == "a = 1"
+        assert bad.read_text(encoding="utf-8") == "def f():\n    return 1"
+
+        step = PatchApplicatorStep(logger, tmp, instructions, use_sandbox=True)
+        success, reason, details = step.execute()
+        assert not success and reason == "PATCH_SYNTAX_ERROR_IN_SANDBOX" and "bad.py" in details
+
+
+def test_create_and_delete_files():
+    """Arquivos novos são criados; DELETE_BLOCK sem bloco remove o arquivo no commit"""
+    with tempfile.TemporaryDirectory() as tmp:
+        doomed = Path(tmp) / "old.txt"
+        doomed.write_text("bye", encoding="utf-8")
+        instructions = [
+            {"file_path": "pkg/new.py", "operation": "INSERT", "content": "import os"},
+            {"file_path": "pkg/new.py", "operation": "INSERT", "content": "x = 1", "line_number": 1},
+            {"file_path": "old.txt", "operation": "DELETE_BLOCK", "block_to_delete": None},
+            {"file_path": "old.txt", "operation": "DELETE_BLOCK", "block_to_delete": "bye"},
+        ]
+        assert apply_patches(instructions, logger, base_path=tmp) is True
+        assert (Path(tmp) / "pkg" / "new.py").read_text(encoding="utf-8") == "x = 1\nimport os"
+        assert not doomed.exists()
+
+
+if __name__ == "__main__":
+    test_many_edits_one_write_per_file()
+    test_invalid_python_leaves_disk_untouched()
+    test_create_and_delete_files()
+    print("✅ Patch applicator tests passed!")
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+🧩 Teste dos templates de prompt pré-compilados
+Verifica o cache por seção (só o que mudou é renderizado de novo), o relatório
+de tokens por seção e o cache de documentos estratégicos
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.core.prompt_builder import (
+    DocumentCache,
+    PromptTemplate,
+    STANDARD_OBJECTIVE_TEMPLATE,
+    build_standard_objective_prompt,
+    get_prompt_token_report,
+)
+
+
+def standard_args(**overrides):
+    args = {
+        "memory_context_section": "\n[HISTÓRICO]\nciclo anterior\n",
+        "performance_summary_str": "taxa de sucesso 80%",
+        "code_analysis_summary_str": "main.py: 900 LOC",
+        "current_manifest": "# Manifesto",
+        "capabilities_content": "capabilities",
+        "roadmap_content": "roadmap",
+        "dashboard_content": "<html></html>",
+    }
+    args.update(overrides)
+    return args
+
+
+def test_only_changed_sections_are_rendered():
+    """Uma segunda montagem só renderiza as seções cujo conteúdo mudou"""
+    calls = []
+    template = PromptTemplate("test", "A {first} B {second} C {first}", renderers={
+        "first": lambda value: calls.append("first") or value.upper(),
+        "second": lambda value: calls.append("second") or value,
+    })
+
+    assert template.render(first="x", second="y") == "A X B y C X"
+    assert calls == ["first", "second"]
+
+    # Conteúdo igual (ainda que outro objeto str): nada é renderizado
+    assert template.render(first="".join(["x"]), second="y") == "A X B y C X"
+    assert calls == ["first", "second"]
+
+    assert template.render(first="x", second="z") == "A X B z C X"
+    assert calls == ["first", "second", "second"]
+    assert template.stats["section_renders"] == 3
+
+
+def test_standard_prompt_fallbacks_and_token_report():
+    """Manifesto/dashboard vazios usam os textos de N/A e o relatório cobre todas as seções"""
+    prompt = build_standard_objective_prompt(**standard_args(current_manifest="  ", dashboard_content=""))
+    assert "N/A (Manifesto non-existent or empty)" in prompt
+    assert "N/A (Dashboard file not found or empty)" in prompt
+    assert "main.py: 900 LOC" in prompt
+
+    report = {entry["section"]: entry for entry in get_prompt_token_report("standard_objective")}
+    assert set(report) == {"(template)"} | set(STANDARD_OBJECTIVE_TEMPLATE.sections)
+    assert report["code_analysis_summary"]["tokens"] == 4
+    total = sum(entry["tokens"] for entry in report.values())
+    assert total * 4 >= len(prompt)
+
+    build_standard_objective_prompt(**standard_args(current_manifest="  ", dashboard_content=""))
+    assert all(entry["cached"] for entry in get_prompt_token_report("standard_objective"))
+
+
+def test_document_cache_rereads_only_changed_files():
+    """O documento só é relido quando muda em disco; sem mudança, o mesmo objeto é devolvido"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "ROADMAP.md"
+        path.write_text("v1", encoding="utf-8")
+        cache = DocumentCache()
+
+        first = cache.read(str(path))
+        assert first == "v1"
+        assert cache.read(str(path)) is first
+
+        path.write_text("v2 longer", encoding="utf-8")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert cache.read(str(path)) == "v2 longer"
+
+        path.unlink()
+        try:
+            cache.read(str(path))
+            assert False, "missing file should raise"
+        except FileNotFoundError:
+            pass
+
+
+if __name__ == "__main__":
+    test_only_changed_sections_are_rendered()
+    test_standard_prompt_fallbacks_and_token_report()
+    test_document_cache_rereads_only_changed_files()
+    print("✅ Prompt builder tests passed!")
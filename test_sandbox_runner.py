@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+🧪 Teste do runner de benchmarks em sandbox via forkserver
+Verifica medições por rusage, saída em streaming, timeout, isolamento do pacote e execução paralela fixada por CPU
+"""
+
+import os
+import sys
+import asyncio
+import logging
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils import sandbox_runner
+from hephaestus.utils.sandbox_runner import SandboxRunner
+from hephaestus.utils.tool_executor import run_in_sandbox
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("SandboxRunnerTest")
+
+MAIN_PY = '''
+import sys, time
+import hephaestus
+print("package", hephaestus.__file__)
+print("args", " ".join(sys.argv[1:]))
+block = bytearray(64 * 1024 * 1024)
+for i in range(len(block) // 4096):
+    block[i * 4096] = 1
+if "--sleep" in sys.argv:
+    time.sleep(30)
+sys.exit(3)
+'''
+
+
+def make_sandbox(root: Path, name: str) -> Path:
+    sandbox = root / name
+    (sandbox / "src" / "hephaestus").mkdir(parents=True)
+    (sandbox / "src" / "hephaestus" / "__init__.py").write_text("")
+    (sandbox / "main.py").write_text(MAIN_PY)
+    return sandbox
+
+
+def test_run_measures_child_and_streams_output():
+    """Exit code, pico de RSS e CPU vêm do wait4; a saída chega em blocos"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sandbox = make_sandbox(Path(tmp), "candidate")
+        runner = SandboxRunner(logger, preload=[])
+        chunks = []
+        result = asyncio.run(runner.run(str(sandbox), ["main.py", "objetivo", "--benchmark"], on_output=chunks.append))
+
+        assert result.exit_code == 3 and not result.timed_out
+        assert result.peak_memory_mb >= 64
+        assert result.cpu_time > 0 and result.execution_time > 0
+        assert "".join(chunks) == result.output
+        # O pacote importado é o do sandbox, não o do processo que mede
+        assert f"package {sandbox / 'src' / 'hephaestus' / '__init__.py'}" in result.output
+        assert "args objetivo --benchmark" in result.output
+
+        legacy = run_in_sandbox(str(sandbox), "objetivo")
+        assert legacy["exit_code"] == 3 and legacy["peak_memory_mb"] >= 64
+
+
+def test_timeout_kills_child():
+    """Um benchmark que passa do timeout é morto e marcado"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sandbox = make_sandbox(Path(tmp), "slow")
+        runner = SandboxRunner(logger, preload=[])
+        result = asyncio.run(runner.run(str(sandbox), ["main.py", "--sleep"], timeout=2))
+        assert result.timed_out and result.exit_code < 0
+        assert result.execution_time < 10
+
+
+def test_run_many_pins_each_candidate_to_a_cpu():
+    """Candidatos em paralelo rodam em CPUs distintas e mantêm a ordem dos resultados"""
+    with tempfile.TemporaryDirectory() as tmp:
+        sandboxes = [str(make_sandbox(Path(tmp), f"c{i}")) for i in range(3)]
+        runner = SandboxRunner(logger, preload=[])
+        results = asyncio.run(runner.run_many(sandboxes, ["main.py"]))
+        assert [r.exit_code for r in results] == [3, 3, 3]
+        assert all(Path(s).name in r.output for s, r in zip(sandboxes, results))
+        concurrent_cpus = [r.cpu for r in results[:runner.max_parallel]]
+        assert len(set(concurrent_cpus)) == len(concurrent_cpus)
+        assert all(cpu in os.sched_getaffinity(0) for cpu in concurrent_cpus)
+
+
+def test_run_in_sandbox_uses_config_inside_event_loop():
+    """A seção sandbox_runner configura o runner; a chamada síncrona funciona dentro de um loop"""
+    previous = sandbox_runner._runner
+    sandbox_runner._runner = None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            sandbox = make_sandbox(Path(tmp), "from_loop")
+            config = {"sandbox_runner": {"preload_modules": [], "max_parallel": 1}}
+
+            async def from_coroutine():
+                return run_in_sandbox(str(sandbox), "objetivo", config=config)
+            result = asyncio.run(from_coroutine())
+            assert result["exit_code"] == 3
+            assert sandbox_runner.get_sandbox_runner().max_parallel == 1
+    finally:
+        sandbox_runner._runner = previous
+
+
+if __name__ == "__main__":
+    test_run_measures_child_and_streams_output()
+    test_timeout_kills_child()
+    test_run_many_pins_each_candidate_to_a_cpu()
+    test_run_in_sandbox_uses_config_inside_event_loop()
+    print("✅ Sandbox runner tests passed!")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+🧩 Teste do container de serviços e das importações adiadas
+Verifica criação sob demanda, perfis, dependências circulares e o custo de `import hephaestus`
+"""
+
+import sys
+import logging
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.core.service_container import ServiceContainer, ServiceAttribute, ServiceResolutionError
+from hephaestus.utils.lazy_import import lazy_import, import_timings
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("ServiceContainerTest")
+
+
+def test_profiles_and_on_demand_creation():
+    """Só os serviços do perfil são criados; os demais no primeiro acesso, com dependências"""
+    created = []
+    container = ServiceContainer(logger)
+    container.register("queue", lambda: created.append("queue") or "Q", profile="minimal")
+    container.register("architect", lambda: created.append("architect") or "A", depends_on=("queue",), profile="cycle")
+    container.register("analytics", lambda: created.append("analytics") or "X", depends_on=("architect",))
+
+    report = container.start_profile("cycle")
+    assert created == ["queue", "architect"]
+    assert report["services_deferred"] == ["analytics"]
+
+    assert container.get("analytics") == "X"
+    assert container.get("analytics") == "X"
+    assert created == ["queue", "architect", "analytics"]
+    triggers = {entry["name"]: entry["trigger"] for entry in container.startup_report()["services"]}
+    assert triggers["analytics"] == "on_demand"
+    assert "analytics" in container.format_startup_report()
+
+
+def test_circular_dependency_is_reported():
+    """Dependências circulares geram erro com o caminho do ciclo"""
+    container = ServiceContainer(logger)
+    container.register("a", lambda: "a", depends_on=("b",))
+    container.register("b", lambda: "b", depends_on=("a",))
+    try:
+        container.get("a")
+    except ServiceResolutionError as e:
+        assert "a -> b -> a" in str(e)
+    else:
+        raise AssertionError("Circular dependency not detected")
+    assert not container.is_started("a")
+
+
+def test_service_attribute_descriptor():
+    """O descritor cria o serviço na leitura e permite substituí-lo"""
+    class Holder:
+        monitor = ServiceAttribute()
+
+        def __init__(self):
+            self.services = ServiceContainer(logger)
+            self.services.register("monitor", lambda: {"started": True})
+
+    holder = Holder()
+    assert not holder.services.is_started("monitor")
+    assert holder.monitor == {"started": True}
+    holder.monitor = None
+    assert holder.monitor is None
+
+
+def test_lazy_import_defers_until_use():
+    """O proxy só importa o módulo no primeiro uso e registra o tempo"""
+    dumps = lazy_import("json", "dumps")
+    assert "deferred" in repr(dumps)
+    assert dumps({"a": 1}) == '{"a": 1}'
+    assert "json:dumps" in import_timings
+
+
+def test_package_import_is_light():
+    """`import hephaestus` não carrega o agente nem o SDK do Gemini"""
+    code = (
+        "import sys; sys.path.insert(0, 'src'); import hephaestus; "
+        "heavy = [m for m in ('hephaestus.core.agent', 'google.generativeai', 'matplotlib') if m in sys.modules]; "
+        "print(','.join(heavy))"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent,
+                            capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ""
+
+
+if __name__ == "__main__":
+    test_profiles_and_on_demand_creation()
+    test_circular_dependency_is_reported()
+    test_service_attribute_descriptor()
+    test_lazy_import_defers_until_use()
+    test_package_import_is_light()
+    print("✅ Service container tests passed!")
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+📈 Teste do sampler compartilhado de métricas do sistema
+Verifica amostragem sem bloqueio, ring buffer limitado, agregados por janela e o uso pelos monitores
+"""
+
+import sys
+import time
+import logging
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.utils.system_metrics import SystemMetricsSampler, get_system_metrics_sampler
+from hephaestus.utils.continuous_monitor import ContinuousMonitor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("SystemMetricsTest")
+
+
+def test_sample_does_not_block():
+    """Uma amostra leva bem menos que o segundo de cpu_percent(interval=1)"""
+    sampler = SystemMetricsSampler(logger, interval=60)
+    start = time.perf_counter()
+    snapshot = sampler.sample()
+    assert time.perf_counter() - start < 0.5
+    assert 0.0 <= snapshot.memory_percent <= 100.0
+    assert snapshot.process_memory_rss > 0
+    assert snapshot.active_threads >= 1
+
+
+def test_ring_buffer_and_aggregates():
+    """O buffer guarda só as últimas amostras e os agregados cobrem a janela"""
+    sampler = SystemMetricsSampler(logger, interval=60, history_size=3)
+    for _ in range(5):
+        sampler.sample()
+    assert len(sampler.window(60)) == 3
+    assert sampler.samples_taken == 5
+
+    aggregate = sampler.aggregate(60)
+    assert aggregate["samples"]["count"] == 3
+    memory = aggregate["memory_percent"]
+    assert memory["min"] <= memory["avg"] <= memory["max"]
+
+
+def test_latest_reuses_recent_sample():
+    """Leituras seguidas reutilizam a amostra publicada em vez de consultar o psutil"""
+    sampler = SystemMetricsSampler(logger, interval=60)
+    first = sampler.latest()
+    assert sampler.latest() is first
+    assert sampler.latest(max_age=0) is not first
+
+
+def test_monitor_reads_shared_sampler():
+    """O ContinuousMonitor usa a amostra compartilhada, sem bloquear por um segundo"""
+    shared = get_system_metrics_sampler()
+    monitor = ContinuousMonitor(logger)
+    start = time.perf_counter()
+    metrics = monitor._collect_system_metrics()
+    assert time.perf_counter() - start < 0.5
+    published = {round(snapshot.timestamp, 3) for snapshot in shared.window(60)}
+    assert round(metrics.timestamp.timestamp(), 3) in published
+
+
+if __name__ == "__main__":
+    test_sample_does_not_block()
+    test_ring_buffer_and_aggregates()
+    test_latest_reuses_recent_sample()
+    test_monitor_reads_shared_sampler()
+    print("✅ System metrics sampler tests passed!")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+🗃️ Teste do armazenamento colunar de eventos temporais
+Verifica ordenação, limite de capacidade, persistência binária e detecção vetorizada
+"""
+
+import sys
+import logging
+import tempfile
+from pathlib import Path
+from datetime import datetime, timedelta
+
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from hephaestus.intelligence.temporal_event_store import TemporalEventStore, EVENT_RECORD_DTYPE
+from hephaestus.intelligence.temporal_intelligence import TemporalIntelligence
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("TemporalEventStoreTest")
+
+
+def test_window_is_sorted_and_bounded():
+    """Eventos fora de ordem ficam ordenados e a capacidade é respeitada"""
+    store = TemporalEventStore(max_events=4)
+    now = datetime.now()
+    for minutes in [5, 1, 3, 2, 4, 0]:
+        store.append(f"e{minutes}", "tick", now - timedelta(minutes=minutes), {"execution_time": minutes})
+
+    assert len(store) == 4
+    window = store.window()
+    assert list(window.timestamps) == sorted(window.timestamps)
+    assert store.count_since(now - timedelta(minutes=1, seconds=30)) == 2
+    assert store.rolling_aggregates()["tick"]["count"] == 4
+
+
+def test_binary_log_round_trip():
+    """Os registros anexados ao disco são recarregados com tipos e payloads"""
+    with tempfile.TemporaryDirectory() as tmp:
+        store = TemporalEventStore(max_events=10, data_dir=Path(tmp))
+        now = datetime.now()
+        for i in range(3):
+            store.append(f"e{i}", "cycle" if i % 2 else "error", now + timedelta(seconds=i), {"success": i != 1})
+
+        records_file = Path(tmp) / "temporal_events.bin"
+        assert records_file.stat().st_size == 3 * EVENT_RECORD_DTYPE.itemsize
+
+        reloaded = TemporalEventStore(max_events=10, data_dir=Path(tmp))
+        assert reloaded.load() == 3
+        assert [event["event_type"] for event in reloaded] == ["error", "cycle", "error"]
+        assert reloaded.rolling_aggregates()["error"]["success_rate"] == 1.0
+
+
+def test_vectorized_cycle_detection():
+    """Eventos regulares produzem um padrão cíclico com o período correto"""
+    with tempfile.TemporaryDirectory() as tmp:
+        config = {"temporal_intelligence": {"enabled": False, "pattern_detection_threshold": 3}}
+        temporal = TemporalIntelligence(config, logger)
+        temporal.enabled = True
+        temporal.historical_events = TemporalEventStore(1000, Path(tmp), logger)
+
+        start = datetime.now() - timedelta(hours=10)
+        for i in range(20):
+            temporal.record_temporal_event("heartbeat", {}, start + timedelta(minutes=30 * i))
+
+        window = temporal.historical_events.window()
+        cycles = temporal._detect_cyclical_patterns(window)
+        assert len(cycles) == 1
+        assert abs(cycles[0].cyclical_period.total_seconds() - 1800) < 1
+
+
+if __name__ == "__main__":
+    test_window_is_sorted_and_bounded()
+    test_binary_log_round_trip()
+    test_vectorized_cycle_detection()
+    print("✅ Temporal event store tests passed!")